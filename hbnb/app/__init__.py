@@ -4,21 +4,41 @@ from hbnb.config import config
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
+from app.passwords import PasswordService
+from app.persistence.unit_of_work import RequestUnitOfWork
+from app.persistence.sqlite_tuning import SQLiteTuning
+from app.persistence.replicas import ReadReplicaRouter, RoutingSession
+from app.persistence.sharding import ShardSet
+from app.instrumentation import SQLInstrumentation
 
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
-db = SQLAlchemy()  # inicializo la instancia de SQLAlchemy
+db = SQLAlchemy(session_options={'class_': RoutingSession})  # lecturas marcadas -> réplicas
+passwords = PasswordService()  # hash de contraseñas en un pool acotado de hilos
+unit_of_work = RequestUnitOfWork()  # una sola transacción (un commit) por petición
+sql_instrumentation = SQLInstrumentation()  # sentencias y tiempos de SQL por petición
+sqlite_tuning = SQLiteTuning()  # PRAGMA del perfil configurado en cada conexión SQLite
+read_replicas = ReadReplicaRouter()  # réplicas de lectura con guardia de lag
+sharding = ShardSet()  # lugares y reseñas repartidos entre varias bases (SHARDS)
 
 
-def create_app(config_class='development'):
+def create_app(config_class='development', config_overrides=None):
     app = Flask(__name__)
     app.config.from_object(config[config_class])
+    # Ajustes puntuales (p. ej. otra base de datos para benchmarks); antes de inicializar las extensiones
+    app.config.update(config_overrides or {})
     api = Api(app, version='1.0', title='HBnB API', description='HBnB Application API')
     
     bcrypt.init_app(app)
     jwt.init_app(app)
     db.init_app(app)  # inicializo sql alquemy con la app
+    sqlite_tuning.init_app(app, db)
+    read_replicas.init_app(app, db)
+    sharding.init_app(app, db)
+    passwords.init_app(app)
+    sql_instrumentation.init_app(app)  # antes que la unidad de trabajo: mide también el COMMIT final
+    unit_of_work.init_app(app, db)
 
     # importamos los namespaces dentro para evitar circular imports
     from app.api.v1.amenities import api as amenities_ns
@@ -26,11 +46,13 @@ def create_app(config_class='development'):
     from app.api.v1.reviews import api as reviews_ns
     from app.api.v1.auth import api as auth_ns
     from app.api.v1.users import api as users_ns
+    from app.api.v1.metrics import api as metrics_ns
 
     api.add_namespace(users_ns, path='/api/v1/users')
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
     api.add_namespace(auth_ns, path='/api/v1/auth')
+    api.add_namespace(metrics_ns, path='/api/v1/_metrics')
     
     return app
\ No newline at end of file
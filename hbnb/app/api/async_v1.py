@@ -0,0 +1,224 @@
+# app/api/async_v1.py
+
+"""
+Rutas v1 más usadas servidas por ASGI (Starlette) con la fachada asyncio
+The busiest v1 routes served over ASGI (Starlette) with the asyncio facade
+
+Mismas rutas, parámetros y cuerpos de respuesta que app/api/v1 para que un
+cliente (o el benchmark de concurrencia) pueda apuntar a cualquiera de los dos
+servidores. Los tokens son los de flask_jwt_extended, firmados y verificados
+con la configuración de la app Flask, así que sirven en ambos modos. Sin
+ETag/304 en este modo: cada respuesta es un 200 completo.
+
+Same routes, parameters and response bodies as app/api/v1, so any client can
+target either server. Tokens are flask_jwt_extended's, signed and checked with
+the Flask app's config. No ETag/304 handling in this mode.
+"""
+
+import contextlib
+import functools
+from flask_jwt_extended import create_access_token, decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import ExpiredSignatureError, PyJWTError
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app import db, passwords
+from app.persistence.async_repository import AsyncDatabase
+from app.services.async_facade import AsyncHBnBFacade
+
+
+class SessionScope:
+    """Middleware ASGI puro: descarta la sesión asyncio de la petición al terminar"""
+
+    def __init__(self, app, database):
+        self.app = app
+        self.database = database
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if scope['type'] == 'http':
+                await self.database.remove()
+
+
+def _error(message, status):
+    return JSONResponse({'error': message}, status_code=status)
+
+
+def _int_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer.")
+
+
+async def _json_body(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, dict):
+        raise ValueError("Invalid JSON body.")
+    return body
+
+
+def jwt_required(endpoint):
+    """Equivalente a flask_jwt_extended.jwt_required(): deja la identidad en request.state.identity"""
+    @functools.wraps(endpoint)
+    async def wrapper(request):
+        flask_app = request.app.state.flask_app
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme != 'Bearer' or not token:
+            return JSONResponse({'msg': 'Missing Authorization Header'}, status_code=401)
+        try:
+            with flask_app.app_context():
+                claims = decode_token(token)
+        except ExpiredSignatureError:
+            return JSONResponse({'msg': 'Token has expired'}, status_code=401)
+        except (PyJWTError, JWTExtendedException) as e:
+            return JSONResponse({'msg': str(e)}, status_code=422)
+        if claims.get('type') != 'access':
+            return JSONResponse({'msg': 'Only non-refresh tokens are allowed'}, status_code=422)
+        request.state.identity = claims[flask_app.config['JWT_IDENTITY_CLAIM']]
+        return await endpoint(request)
+    return wrapper
+
+
+# 🏠 Places
+
+async def list_places(request):
+    facade = request.app.state.facade
+    try:
+        amenity_ids = [value.strip() for value in request.query_params.get('amenities', '').split(',') if value.strip()]
+        places, next_cursor = await facade.get_places_page(
+            _int_param(request, 'limit'), request.query_params.get('cursor'), amenity_ids,
+            request.query_params.get('match', 'all')
+        )
+    except ValueError as e:
+        return _error(str(e), 400)
+    return JSONResponse({'items': [place.to_dict() for place in places], 'next_cursor': next_cursor})
+
+
+@jwt_required
+async def get_place(request):
+    place = await request.app.state.facade.get_place(request.path_params['place_id'])
+    if place:
+        return JSONResponse(place)
+    return _error('Place not found / Lugar no encontrado', 404)
+
+
+# 🏨 Amenities
+
+@jwt_required
+async def list_amenities(request):
+    facade = request.app.state.facade
+    try:
+        amenities, next_cursor = await facade.get_amenities_page(
+            _int_param(request, 'limit'), request.query_params.get('cursor')
+        )
+    except ValueError as e:
+        return JSONResponse({'message': str(e)}, status_code=400)
+    return JSONResponse({'items': [amenity.to_dict() for amenity in amenities], 'next_cursor': next_cursor})
+
+
+@jwt_required
+async def get_amenity(request):
+    try:
+        amenity = await request.app.state.facade.get_amenity(request.path_params['amenity_id'])
+    except ValueError:
+        return JSONResponse({'message': 'Amenity not found'}, status_code=404)
+    return JSONResponse(amenity.to_dict())
+
+
+# 📝 Reviews
+
+async def list_reviews(request):
+    facade = request.app.state.facade
+    try:
+        reviews, next_cursor = await facade.get_reviews_page(
+            _int_param(request, 'limit'), request.query_params.get('cursor')
+        )
+    except ValueError as e:
+        return _error(str(e), 400)
+    return JSONResponse({'items': [review.to_dict() for review in reviews], 'next_cursor': next_cursor})
+
+
+@jwt_required
+async def create_review(request):
+    try:
+        review = await request.app.state.facade.create_review(await _json_body(request))
+    except ValueError as e:
+        return _error(str(e), 400)
+    return JSONResponse(review, status_code=201)
+
+
+async def get_review(request):
+    try:
+        review = await request.app.state.facade.get_review(request.path_params['review_id'])
+    except ValueError:
+        return _error('Review not found', 404)
+    return JSONResponse(review.to_dict())
+
+
+async def list_place_reviews(request):
+    reviews = await request.app.state.facade.get_reviews_by_place(request.path_params['place_id'])
+    if reviews:
+        return JSONResponse([review.to_dict() for review in reviews])
+    return _error('Place not found', 404)
+
+
+# 🔑 Auth
+
+async def login(request):
+    try:
+        credentials = await _json_body(request)
+    except ValueError as e:
+        return _error(str(e), 400)
+    try:
+        user = await request.app.state.facade.authenticate_user(credentials.get('email'), credentials.get('password'))
+    except ValueError as e:
+        return _error(str(e), 400)
+    if not user:
+        return _error('Credenciales inválidas', 401)
+    with request.app.state.flask_app.app_context():
+        access_token = create_access_token(identity=user.id)
+    return JSONResponse({'access_token': access_token})
+
+
+routes = [
+    Route('/api/v1/places/', list_places, methods=['GET']),
+    Route('/api/v1/places/{place_id}', get_place, methods=['GET']),
+    Route('/api/v1/amenities/', list_amenities, methods=['GET']),
+    Route('/api/v1/amenities/{amenity_id}', get_amenity, methods=['GET']),
+    Route('/api/v1/reviews/', list_reviews, methods=['GET']),
+    Route('/api/v1/reviews/', create_review, methods=['POST']),
+    Route('/api/v1/reviews/places/{place_id}/reviews', list_place_reviews, methods=['GET']),
+    Route('/api/v1/reviews/{review_id}', get_review, methods=['GET']),
+    Route('/api/v1/auth/login', login, methods=['POST']),
+]
+
+
+def create_asgi_app(flask_app):
+    """
+    App ASGI que comparte configuración, JWT y pool de contraseñas con la app Flask
+    ASGI app sharing config, JWT settings and the password pool with the Flask app
+    """
+    async_db = AsyncDatabase(flask_app, db)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        yield
+        await async_db.dispose()
+
+    asgi_app = Starlette(routes=routes, middleware=[Middleware(SessionScope, database=async_db)], lifespan=lifespan)
+    asgi_app.state.flask_app = flask_app
+    asgi_app.state.async_db = async_db
+    asgi_app.state.facade = AsyncHBnBFacade(async_db, passwords)
+    return asgi_app
@@ -0,0 +1,64 @@
+# app/api/conditional.py
+
+"""
+ETag / Last-Modified y GET condicional (304) a partir de updated_at
+ETag / Last-Modified and conditional GET (304) derived from updated_at
+
+Los endpoints consultan primero la versión (una consulta de metadatos) y solo
+cargan y serializan la entidad si el cliente no tiene ya esa versión.
+Endpoints first ask for the version (a metadata-only query) and only load and
+serialize the entity when the client doesn't already hold that version.
+"""
+
+import hashlib
+from datetime import timezone
+from flask import Response, request
+from werkzeug.http import http_date
+
+
+def make_etag(*parts):
+    """Etiqueta opaca a partir de las partes que definen la versión"""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:24]
+
+
+def validators(parts, last_modified, weak=False):
+    """Cabeceras ETag y Last-Modified para la versión dada / ETag and Last-Modified headers"""
+    etag = make_etag(*parts)
+    headers = {"ETag": f'W/"{etag}"' if weak else f'"{etag}"'}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified.replace(tzinfo=timezone.utc))
+    return etag, headers
+
+
+def is_not_modified(etag, last_modified):
+    """
+    True si If-None-Match / If-Modified-Since indican que el cliente ya tiene esta versión.
+    If-None-Match tiene prioridad y usa comparación débil, como pide la RFC 9110 para GET.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        # HTTP-date tiene resolución de segundos / HTTP-date has one-second resolution
+        stamp = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+        return stamp <= request.if_modified_since
+    return False
+
+
+def conditional(parts, last_modified, weak=False, etag_only=False):
+    """
+    Devuelve (respuesta_304_o_None, cabeceras). Si la respuesta no es None el
+    endpoint debe devolverla tal cual, sin cargar ni serializar nada.
+    Returns (304_response_or_None, headers). When the response is not None the
+    endpoint returns it as is, without loading or serializing anything.
+
+    etag_only: para colecciones y entidades con hijos embebidos. Borrar una fila no
+    sube ningún updated_at, así que solo el ETag (que incluye los conteos) decide:
+    sin Last-Modified y sin responder a If-Modified-Since.
+    """
+    if etag_only:
+        last_modified = None
+    etag, headers = validators(parts, last_modified, weak)
+    if is_not_modified(etag, last_modified):
+        return Response(status=304, headers=headers), headers
+    return None, headers
@@ -0,0 +1,21 @@
+# app/api/permissions.py
+
+"""
+Comprobaciones de permisos compartidas por los endpoints protegidos con JWT
+Permission checks shared by the JWT-protected endpoints
+"""
+
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from app.services import facade
+
+
+def is_admin():
+    """True si el token es de un administrador; llamar dentro de un endpoint con @jwt_required()"""
+    # El token puede traer is_admin como claim, en la identidad, o solo el id del usuario
+    if get_jwt().get('is_admin'):
+        return True
+    identity = get_jwt_identity()
+    if isinstance(identity, dict):
+        return bool(identity.get('is_admin'))
+    user = facade.user_repo.get(identity) if identity else None
+    return bool(user and user.is_admin)
@@ -1,6 +1,9 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required
+from flask import request
+from app.api.conditional import conditional
+from app.api.permissions import is_admin
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -14,21 +17,49 @@ amenity_response_model = api.inherit('AmenityResponse', amenity_model, {
     'updated_at': fields.String(description='Last update timestamp')
 })
 
+amenity_page_model = api.model('AmenityPage', {
+    'items': fields.List(fields.Nested(amenity_response_model)),
+    'next_cursor': fields.String(description='Cursor for the next page, null on the last page')
+})
+
+page_parser = api.parser()
+page_parser.add_argument('limit', type=int, location='args', help='Maximum amenities per page')
+page_parser.add_argument('cursor', type=str, location='args', help='Opaque cursor from the previous page')
+
 @api.route('/')
 class AmenityList(Resource):
     @jwt_required()
     @api.doc('list_amenities')
-    @api.marshal_list_with(amenity_response_model)
+    @api.expect(page_parser)
+    @api.response(200, 'Success', amenity_page_model)
+    @api.response(304, 'Not modified')
+    @api.response(400, 'Invalid pagination parameters')
     def get(self):
-        amenities = facade.get_all_amenities()
-        return [amenity.to_dict() for amenity in amenities]
+        """Retrieve a page of amenities"""
+        args = page_parser.parse_args()
+
+        last_modified, count = facade.get_amenities_version()
+        not_modified, headers = conditional(('amenities', last_modified, count, request.query_string), last_modified,
+                                            weak=True, etag_only=True)
+        if not_modified:
+            return not_modified
+
+        try:
+            amenities, next_cursor = facade.get_amenities_page(args['limit'], args['cursor'])
+        except ValueError as e:
+            api.abort(400, str(e))
+        return {'items': [amenity.to_dict() for amenity in amenities], 'next_cursor': next_cursor}, 200, headers
 
+    @jwt_required()
     @api.doc('create_amenity')
     @api.expect(amenity_model, validate=True)
     @api.response(201, 'Amenity successfully created', amenity_response_model)
     @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
     def post(self):
-        """Register a new amenity"""
+        """Register a new amenity (admin only)"""
+        if not is_admin():
+            api.abort(403, 'Admin privileges required')
         amenity_data = api.payload
 
         try:
@@ -37,6 +68,31 @@ class AmenityList(Resource):
         except ValueError as e:
             api.abort(400, str(e))
 
+batch_result_model = api.model('AmenityBatchResult', {
+    'index': fields.Integer(description='Position of the item in the request'),
+    'id': fields.String(description='ID of the created amenity'),
+    'error': fields.String(description='Validation error for the item')
+})
+
+@api.route('/batch')
+class AmenityBatch(Resource):
+    @jwt_required()
+    @api.doc('create_amenities_batch')
+    @api.expect([amenity_model])
+    @api.response(201, 'Amenities created; per-item results', [batch_result_model])
+    @api.response(400, 'Invalid batch')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """Register many amenities in one transaction (admin only)"""
+        if not is_admin():
+            api.abort(403, 'Admin privileges required')
+        try:
+            results = facade.create_amenities_batch(api.payload)
+        except ValueError as e:
+            api.abort(400, str(e))
+        created = any('id' in result for result in results)
+        return results, 201 if created else 400
+
 @api.route('/<string:amenity_id>')
 @api.param('amenity_id', 'The amenity identifier')
 class AmenityResource(Resource):
@@ -44,12 +100,20 @@ class AmenityResource(Resource):
     @api.doc('get_amenity')
     @api.response(200, 'Success', amenity_response_model)
     @api.response(404, 'Amenity not found')
+    @api.response(304, 'Not modified')
     def get(self, amenity_id):
         """Get amenity details by ID"""
+        version = facade.get_amenity_version(amenity_id)
+        if not version:
+            api.abort(404, 'Amenity not found')
+        not_modified, headers = conditional(version, version[1])
+        if not_modified:
+            return not_modified
+
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             api.abort(404, 'Amenity not found')
-        return amenity.to_dict()
+        return amenity.to_dict(), 200, headers
 
     @api.doc('update_amenity')
     @api.expect(amenity_model)
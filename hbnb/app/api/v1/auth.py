@@ -26,7 +26,7 @@ class UserList(Resource):
         if not user_data.get('email') or not user_data.get('email').strip():
             return {'error': 'El correo electrónico es obligatorio'}, 400
         
-        if not user_data.get('password').strip().endswith('@example.com'):
+        if not user_data['email'].strip().endswith('@example.com'):
             return {'error': 'El correo electrónico debe terminar con @example.com'}, 400
         
         if not user_data.get('first_name') or not user_data.get('first_name').strip():
@@ -39,8 +39,12 @@ class UserList(Resource):
         if existing_user:
             return {'error': 'Email already registered / Correo ya registrado'}, 400
 
-        new_user = facade.create_user(user_data)
-        access_token = create_access_token(identity={'id': new_user.id, 'is_admin': new_user.is_admin})
+        try:
+            new_user = facade.create_user(user_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        # Misma identidad que /login: el id del usuario como texto
+        access_token = create_access_token(identity=new_user.id)
         return {'access_token': access_token, 'user': new_user.to_dict()}, 201
 
 
@@ -73,9 +77,12 @@ class Login(Resource):
     def post(self):
         """Login and return JWT token"""
         user_data = api.payload
-        user = facade.get_user_by_email(user_data.get("email"))
+        try:
+            user = facade.authenticate_user(user_data.get("email"), user_data.get("password"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
-        if not user or not user.verify_password(user_data.get("password")):
+        if not user:
             return {"error": "Credenciales inválidas"}, 401
 
         access_token = create_access_token(identity=user.id)
@@ -0,0 +1,56 @@
+from flask import Response, current_app
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required
+from app.api.permissions import is_admin
+from app.services import facade
+
+api = Namespace('metrics', description='Operational metrics / Métricas operativas (admin)')
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _extra_metrics():
+    """Caché de entidades, unidad de trabajo y réplicas, en el formato de render_prometheus"""
+    cache = facade.get_cache_stats()
+    extra = [
+        ('hbnb_entity_cache_hits_total', 'counter', 'Entity cache hits by model.',
+         [((('model', stats['model']),), stats['hits']) for stats in cache]),
+        ('hbnb_entity_cache_misses_total', 'counter', 'Entity cache misses by model.',
+         [((('model', stats['model']),), stats['misses']) for stats in cache]),
+        ('hbnb_entity_cache_entries', 'gauge', 'Entities currently cached by model.',
+         [((('model', stats['model']),), stats['size']) for stats in cache]),
+    ]
+    unit_of_work = current_app.extensions.get('unit_of_work')
+    if unit_of_work is not None:
+        stats = unit_of_work.stats()
+        extra += [
+            ('hbnb_db_commits_total', 'counter', 'COMMITs sent to the database during requests.',
+             [((), stats['commits'])]),
+            ('hbnb_db_commits_per_request', 'gauge', 'Requests by number of COMMITs they issued.',
+             [((('commits', commits),), count) for commits, count in stats['histogram'].items()]),
+        ]
+    read_replicas = current_app.extensions.get('read_replicas')
+    if read_replicas is not None and read_replicas.enabled:
+        stats = read_replicas.stats()
+        extra += [
+            ('hbnb_db_routed_reads_total', 'counter', 'Repository reads by the bind that served them.',
+             [((('bind', bind),), count) for bind, count in stats['reads'].items()]),
+            ('hbnb_db_replica_lag_seconds', 'gauge', 'Last measured replication lag (-1 if unreachable).',
+             [((('bind', bind),), -1 if lag is None else lag) for bind, lag in stats['lag_seconds'].items()]),
+            ('hbnb_db_replica_fallbacks_total', 'counter', 'Reads sent to the primary because no replica was fresh.',
+             [((), stats['lagging'])]),
+        ]
+    return extra
+
+
+@api.route('')
+class Metrics(Resource):
+    @jwt_required()
+    @api.response(200, 'Prometheus text exposition format / Formato de texto de Prometheus')
+    @api.response(403, 'Admin privileges required / Se requieren privilegios de administrador')
+    def get(self):
+        """Per-endpoint request, SQL and cache metrics / Métricas por endpoint de peticiones, SQL y caché"""
+        if not is_admin():
+            return {'error': 'Admin privileges required'}, 403
+        instrumentation = current_app.extensions['sql_instrumentation']
+        return Response(instrumentation.render_prometheus(_extra_metrics()), content_type=PROMETHEUS_CONTENT_TYPE)
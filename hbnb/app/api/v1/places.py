@@ -1,6 +1,8 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required
+from flask import request
+from app.api.conditional import conditional
 
 api = Namespace('places', description='Place operations / Operaciones de lugares')
 
@@ -28,6 +30,13 @@ place_model = api.model('Place', {
     'amenities': fields.List(fields.String, required=True, description="List of amenities ID's / Lista de ID de amenidades")
 })
 
+# Parámetros de paginación por cursor / Cursor pagination parameters
+page_parser = api.parser()
+page_parser.add_argument('limit', type=int, location='args', help='Maximum places per page / Máximo de lugares por página')
+page_parser.add_argument('cursor', type=str, location='args', help='Opaque cursor from the previous page / Cursor opaco de la página anterior')
+page_parser.add_argument('amenities', type=str, location='args', help='Comma-separated amenity IDs / IDs de amenidades separados por comas')
+page_parser.add_argument('match', type=str, location='args', default='all', help='all (AND) or any (OR) / all (Y) o any (O)')
+
 @api.route('/')
 class PlaceList(Resource):
     @jwt_required()
@@ -48,22 +57,180 @@ class PlaceList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.expect(page_parser)
     @api.response(200, 'List of places retrieved successfully / Lista de lugares recuperada con éxito')
+    @api.response(400, 'Invalid pagination parameters / Parámetros de paginación inválidos')
+    @api.response(304, 'Not modified / Sin cambios')
+    def get(self):
+        """Retrieve a page of places / Obtener una página de lugares"""
+        args = page_parser.parse_args()
+
+        try:
+            amenity_ids = [value.strip() for value in (args['amenities'] or '').split(',') if value.strip()]
+            places, next_cursor = facade.get_places_page(args['limit'], args['cursor'], amenity_ids, args['match'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        # ETag de la página devuelta (ids, updated_at y conteos de sus lugares, más el cursor):
+        # el 304 se ahorra la serialización sin agregados sobre tablas enteras
+        # Page ETag built from the returned rows, never from full-table aggregates
+        not_modified, headers = conditional(('places', facade.get_places_page_version(places), next_cursor,
+                                             request.query_string), None, weak=True, etag_only=True)
+        if not_modified:
+            return not_modified
+        return {
+            'items': [place.to_dict() for place in places],  # Ensure each place is serialized / Asegurar que cada lugar se serialice
+            'next_cursor': next_cursor
+        }, 200, headers
+
+batch_result_model = api.model('PlaceBatchResult', {
+    'index': fields.Integer(description='Position of the item in the request / Posición del ítem en la petición'),
+    'id': fields.String(description='ID of the created place / ID del lugar creado'),
+    'error': fields.String(description='Validation error for the item / Error de validación del ítem')
+})
+
+@api.route('/batch')
+class PlaceBatch(Resource):
+    @jwt_required()
+    @api.expect([place_model])
+    @api.response(201, 'Places created; per-item results / Lugares creados; resultado por ítem', [batch_result_model])
+    @api.response(400, 'Invalid batch / Lote inválido')
+    def post(self):
+        """Register many places in one transaction / Registrar muchos lugares en una transacción"""
+        try:
+            results = facade.create_places_batch(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        created = any('id' in result for result in results)
+        return results, 201 if created else 400
+
+# Parámetros de búsqueda geográfica / Geographic search parameters
+near_parser = api.parser()
+near_parser.add_argument('lat', type=float, location='args', help='Latitude of the center / Latitud del centro')
+near_parser.add_argument('lon', type=float, location='args', help='Longitude of the center / Longitud del centro')
+near_parser.add_argument('radius_km', type=float, location='args', help='Search radius in km / Radio de búsqueda en km')
+near_parser.add_argument('bbox', type=str, location='args', help='min_lon,min_lat,max_lon,max_lat')
+near_parser.add_argument('limit', type=int, location='args', help='Maximum places returned / Máximo de lugares devueltos')
+
+@api.route('/near')
+class PlaceNear(Resource):
+    @jwt_required()
+    @api.expect(near_parser)
+    @api.response(200, 'Places sorted by distance / Lugares ordenados por distancia')
+    @api.response(400, 'Invalid search parameters / Parámetros de búsqueda inválidos')
+    def get(self):
+        """Search places by radius or bounding box / Buscar lugares por radio o por caja"""
+        args = near_parser.parse_args()
+        try:
+            if args['bbox']:
+                bbox = tuple(float(value) for value in args['bbox'].split(','))
+                if len(bbox) != 4:
+                    raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat.")
+                results = facade.get_places_in_bbox(bbox, args['limit'])
+            elif None not in (args['lat'], args['lon'], args['radius_km']):
+                results = facade.get_places_near(args['lat'], args['lon'], args['radius_km'], args['limit'])
+            else:
+                raise ValueError("Provide lat, lon and radius_km, or bbox.")
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return [dict(place.to_dict(), distance_km=round(distance, 3)) for place, distance in results], 200
+
+facet_parser = api.parser()
+facet_parser.add_argument('amenities', type=str, location='args', help='Comma-separated amenity IDs / IDs de amenidades separados por comas')
+facet_parser.add_argument('match', type=str, location='args', default='all', help='all (AND) or any (OR) / all (Y) o any (O)')
+facet_parser.add_argument('min_price', type=float, location='args', help='Minimum price per night / Precio mínimo por noche')
+facet_parser.add_argument('max_price', type=float, location='args', help='Maximum price per night / Precio máximo por noche')
+
+@api.route('/facets')
+class PlaceFacets(Resource):
+    @jwt_required()
+    @api.expect(facet_parser)
+    @api.response(200, 'Facet counts for the current filters / Conteos por faceta para los filtros actuales')
+    @api.response(400, 'Invalid filters / Filtros inválidos')
+    @api.response(304, 'Not modified / Sin cambios')
     def get(self):
-        """Retrieve a list of all places / Obtener una lista de todos los lugares"""
-        places = facade.get_all_places()
-        return [place.to_dict() for place in places], 200  # Ensure each place is serialized / Asegurar que cada lugar se serialice
+        """Amenity, price and rating counts / Conteos por amenidad, precio y calificación"""
+        args = facet_parser.parse_args()
+
+        last_modified, counts = facade.get_places_version()
+        not_modified, headers = conditional(('facets', last_modified, counts, request.query_string), last_modified,
+                                            weak=True, etag_only=True)
+        if not_modified:
+            return not_modified
+
+        try:
+            amenity_ids = [value.strip() for value in (args['amenities'] or '').split(',') if value.strip()]
+            facets = facade.get_place_facets(amenity_ids, args['match'], args['min_price'], args['max_price'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return facets, 200, headers
+
+stats_parser = api.parser()
+stats_parser.add_argument('bbox', type=str, location='args', help='min_lon,min_lat,max_lon,max_lat')
+stats_parser.add_argument('amenities', type=str, location='args', help='Comma-separated amenity IDs / IDs de amenidades separados por comas')
+stats_parser.add_argument('match', type=str, location='args', default='all', help='all (AND) or any (OR) / all (Y) o any (O)')
+stats_parser.add_argument('owner_id', type=str, location='args', help='Only places of this owner / Solo lugares de este dueño')
+
+@api.route('/stats')
+class PlaceStats(Resource):
+    @jwt_required()
+    @api.expect(stats_parser)
+    @api.response(200, 'Price and rating summary / Resumen de precios y calificaciones')
+    @api.response(400, 'Invalid filters / Filtros inválidos')
+    def get(self):
+        """Price analytics over the filtered places / Analítica de precios de los lugares filtrados"""
+        args = stats_parser.parse_args()
+        try:
+            bbox = None
+            if args['bbox']:
+                bbox = tuple(float(value) for value in args['bbox'].split(','))
+                if len(bbox) != 4:
+                    raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat.")
+            amenity_ids = [value.strip() for value in (args['amenities'] or '').split(',') if value.strip()]
+            return facade.get_place_stats(bbox, amenity_ids, args['match'], args['owner_id']), 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+search_parser = api.parser()
+search_parser.add_argument('q', type=str, location='args', help='Words to search in title, description and reviews / Palabras a buscar')
+search_parser.add_argument('limit', type=int, location='args', help='Maximum places per page / Máximo de lugares por página')
+search_parser.add_argument('cursor', type=str, location='args', help='Opaque cursor from the previous page / Cursor opaco de la página anterior')
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @jwt_required()
+    @api.expect(search_parser)
+    @api.response(200, 'Places ranked by relevance / Lugares ordenados por relevancia')
+    @api.response(400, 'Invalid search parameters / Parámetros de búsqueda inválidos')
+    def get(self):
+        """Full-text search over places / Búsqueda de texto completo en lugares"""
+        args = search_parser.parse_args()
+        try:
+            return facade.search_places(args['q'], args['limit'], args['cursor']), 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
     @jwt_required()
     @api.response(200, 'Place details retrieved successfully / Detalles del lugar recuperados con éxito')
     @api.response(404, 'Place not found / Lugar no encontrado')
+    @api.response(304, 'Not modified / Sin cambios')
     def get(self, place_id):
         """Get place details by ID / Obtener detalles de un lugar por ID"""
-        place = facade.get_place(place_id)
+        # Consulta solo de metadatos antes de cargar el lugar / Metadata-only query before loading the place
+        version = facade.get_place_version(place_id)
+        if not version:
+            return {'error': 'Place not found / Lugar no encontrado'}, 404
+        # Débil: el detalle incluye datos del dueño / Weak: the detail embeds owner data
+        not_modified, headers = conditional(version, version[1], weak=True, etag_only=True)
+        if not_modified:
+            return not_modified
+
+        place = facade.get_place(place_id)  # Already serialized with owner, amenities and reviews / Ya serializado con dueño, amenidades y reseñas
         if place:
-            return place.to_dict(), 200  # Return place as dictionary / Devolver el lugar como un diccionario
+            return place, 200, headers
         return {'error': 'Place not found / Lugar no encontrado'}, 404
 
     @api.expect(place_model)
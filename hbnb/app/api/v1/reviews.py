@@ -1,6 +1,8 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 from flask_jwt_extended import jwt_required
+from flask import request
+from app.api.conditional import conditional
 
 # Espacio de nombres para las operaciones de reseñas
 # Namespace for review operations
@@ -15,6 +17,12 @@ review_model = api.model('Review', {
     'place_id': fields.String(required=True, description='ID of the place / ID del lugar')
 })
 
+# Parámetros de paginación por cursor
+# Cursor pagination parameters
+page_parser = api.parser()
+page_parser.add_argument('limit', type=int, location='args', help='Maximum reviews per page / Máximo de reseñas por página')
+page_parser.add_argument('cursor', type=str, location='args', help='Opaque cursor from the previous page / Cursor opaco de la página anterior')
+
 @api.route('/')
 class ReviewList(Resource):
     @jwt_required()
@@ -30,21 +38,67 @@ class ReviewList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.expect(page_parser)
     @api.response(200, 'List of reviews retrieved successfully / Lista de reseñas recuperada exitosamente')
+    @api.response(400, 'Invalid pagination parameters / Parámetros de paginación no válidos')
+    @api.response(304, 'Not modified / Sin cambios')
     def get(self):
-        """Obtener todas las reseñas / Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
-        return [review.to_dict() for review in reviews], 200
+        """Obtener una página de reseñas / Retrieve a page of reviews"""
+        args = page_parser.parse_args()
+
+        last_modified, count = facade.get_reviews_version()
+        not_modified, headers = conditional(('reviews', last_modified, count, request.query_string), last_modified,
+                                            weak=True, etag_only=True)
+        if not_modified:
+            return not_modified
+
+        try:
+            reviews, next_cursor = facade.get_reviews_page(args['limit'], args['cursor'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {
+            'items': [review.to_dict() for review in reviews],
+            'next_cursor': next_cursor
+        }, 200, headers
+
+batch_result_model = api.model('ReviewBatchResult', {
+    'index': fields.Integer(description='Position of the item in the request / Posición del ítem en la petición'),
+    'id': fields.String(description='ID of the created review / ID de la reseña creada'),
+    'error': fields.String(description='Validation error for the item / Error de validación del ítem')
+})
+
+@api.route('/batch')
+class ReviewBatch(Resource):
+    @jwt_required()
+    @api.expect([review_model])
+    @api.response(201, 'Reviews created; per-item results / Reseñas creadas; resultado por ítem', [batch_result_model])
+    @api.response(400, 'Invalid batch / Lote no válido')
+    def post(self):
+        """Registrar muchas reseñas en una transacción / Register many reviews in one transaction"""
+        try:
+            results = facade.create_reviews_batch(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        created = any('id' in result for result in results)
+        return results, 201 if created else 400
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     @api.response(200, 'Review details retrieved successfully / Detalles de la reseña recuperados exitosamente')
     @api.response(404, 'Review not found / Reseña no encontrada')
+    @api.response(304, 'Not modified / Sin cambios')
     def get(self, review_id):
         """Obtener detalles de una reseña por ID / Get review details by ID"""
+        version = facade.get_review_version(review_id)
+        if not version:
+            return {'error': 'Review not found'}, 404
+        not_modified, headers = conditional(version, version[1])
+        if not_modified:
+            return not_modified
+
         review = facade.get_review(review_id)
         if review:
-            return review.to_dict(), 200
+            return review.to_dict(), 200, headers
         return {'error': 'Review not found'}, 404
 
     @api.expect(review_model)
@@ -1,5 +1,6 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.permissions import is_admin
 from app.services import facade
 
 
@@ -17,18 +18,16 @@ class UserList(Resource):
     @jwt_required()
     def post(self):
         """Registrar un nuevo usuario (solo administradores)"""
-        current_user = get_jwt_identity()
-        if not current_user.get('is_admin'):
+        # La identidad del token es el id del usuario (texto), no un diccionario
+        if not is_admin():
             return {'error': 'Admin privileges required'}, 403
 
         user_data = api.payload
        
-        existing_user = facade.get_user_by_email(user_data['email'])
+        existing_user = facade.get_user_by_email(user_data.get('email'))
         if existing_user:
             return {'error': 'Correo ya registrado'}, 400
 
-        new_user = facade.create_user(user_data)
-        
         if not user_data.get('email'):
             return {'error': 'El correo electrónico es obligatorio'}, 400
 
@@ -37,7 +36,12 @@ class UserList(Resource):
 
         if not user_data.get('last_name'):
             return {'error': 'El apellido es obligatorio'}, 400
-        
+
+        try:
+            new_user = facade.create_user(user_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
         return new_user.to_dict(), 201
     
 
@@ -46,11 +50,7 @@ class UserResource(Resource):
     @jwt_required()
     def put(self, user_id):
         """Modificar usuario (solo administradores o el mismo usuario)"""
-        current_user = get_jwt_identity()
-        is_admin = current_user.get('is_admin', False)
-        user_id_from_token = current_user.get('id')
-
-        if not is_admin and user_id != user_id_from_token:
+        if user_id != get_jwt_identity() and not is_admin():
             return {'error': 'Unauthorized action'}, 403
 
         user_data = api.payload
@@ -61,5 +61,8 @@ class UserResource(Resource):
             if existing_user and existing_user.id != user_id:
                 return {'error': 'Correo ya en uso'}, 400
 
-        updated_user = facade.update_user(user_id, user_data)
+        try:
+            updated_user = facade.update_user(user_id, user_data)
+        except ValueError as e:
+            return {'error': str(e)}, 404
         return updated_user.to_dict(), 200
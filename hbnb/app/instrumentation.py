@@ -0,0 +1,267 @@
+# app/instrumentation.py
+
+"""
+Instrumentación de SQL por petición y métricas por endpoint
+Per-request SQL instrumentation and per-endpoint metrics
+
+Los eventos del motor de SQLAlchemy (before/after_cursor_execute) miden cada
+sentencia. Durante una petición se acumulan la cantidad de sentencias, el
+tiempo total en la base de datos y las más lentas (con el SQL normalizado:
+literales y listas IN reemplazados por ?). Al responder:
+
+  - se agrega la cabecera Server-Timing (db y app) a la respuesta;
+  - las sentencias que superan SQL_SLOW_QUERY_MS se registran en el logger
+    'hbnb.sql' (también fuera de una petición, por ejemplo en la CLI);
+  - los tiempos se suman a histogramas por endpoint que /api/v1/_metrics
+    expone en formato de texto de Prometheus.
+
+Engine events time every statement. Per request we keep the statement count,
+total DB time and the slowest statements (normalized SQL); responses carry a
+Server-Timing header, statements over SQL_SLOW_QUERY_MS are logged to
+'hbnb.sql', and timings feed per-endpoint histograms exported in Prometheus
+text format.
+"""
+
+import heapq
+import logging
+import re
+import threading
+import time
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('hbnb.sql')
+
+# Límites de los histogramas / Histogram bucket bounds
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Sentencias distintas que se siguen en el ranking global (el resto se descarta)
+MAX_TRACKED_STATEMENTS = 500
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement):
+    """
+    Forma canónica de una sentencia: sin literales, listas IN colapsadas y espacios simples
+    Canonical form of a statement: literals removed, IN lists collapsed, single spaces
+    """
+    statement = _STRING.sub('?', statement)
+    statement = _NUMBER.sub('?', statement)
+    statement = _PARAM_LIST.sub('(?, ...)', statement)
+    return _SPACE.sub(' ', statement).strip()
+
+
+class RequestQueries:
+    """Sentencias de una petición / Statements of a single request"""
+
+    def __init__(self, keep):
+        self.count = 0
+        self.seconds = 0.0
+        self.keep = keep
+        self._slowest = []  # heap de (segundos, orden, sql)
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        entry = (seconds, self.count, statement)
+        if len(self._slowest) < self.keep:
+            heapq.heappush(self._slowest, entry)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self):
+        """[(segundos, sql normalizado)] de la más lenta a la más rápida"""
+        return [(seconds, normalize_sql(statement)) for seconds, _, statement in sorted(self._slowest, reverse=True)]
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # el último es +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        position = len(self.bounds)
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                position = index
+                break
+        self.counts[position] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+
+
+class SQLInstrumentation:
+    DEFAULT_SLOW_QUERY_MS = 100
+    DEFAULT_TOP_STATEMENTS = 5
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.reset()
+        # Se guardan los métodos ligados para poder registrar los listeners una sola vez
+        self._listeners = (('before_cursor_execute', self._on_before), ('after_cursor_execute', self._on_after),
+                           ('handle_error', self._on_error))
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Registrar antes que la unidad de trabajo: los after_request corren en orden
+        inverso, así el COMMIT del final de la petición entra en el tiempo de db
+        """
+        app.extensions['sql_instrumentation'] = self
+        for name, listener in self._listeners:
+            if not event.contains(Engine, name, listener):
+                event.listen(Engine, name, listener)
+        app.before_request(self._begin)
+        app.after_request(self._end)
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}  # (endpoint, método, estado) -> cantidad
+            self.request_seconds = {}  # (endpoint, método) -> Histogram
+            self.db_seconds = {}
+            self.db_queries = {}
+            self.statements = {}  # sql normalizado -> [cantidad, segundos, máximo]
+
+    # Medición de sentencias / Statement timing
+
+    def _on_before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    def _on_error(self, exception_context):
+        # La sentencia falló: no habrá after_cursor_execute para esta marca de inicio
+        connection = exception_context.connection
+        if connection is not None and connection.info.get('query_started'):
+            connection.info['query_started'].pop()
+
+    def _on_after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('query_started')
+        if not started:
+            return
+        seconds = time.perf_counter() - started.pop()
+        if not has_app_context() or not current_app.config.get('SQL_INSTRUMENTATION', True):
+            return
+        queries = g.get('_sql_queries') if has_request_context() else None
+        if queries is not None:
+            queries.record(statement, seconds)
+        threshold = current_app.config.get('SQL_SLOW_QUERY_MS', self.DEFAULT_SLOW_QUERY_MS)
+        if threshold is not None and seconds * 1000 >= threshold:
+            where = f"{request.method} {request.path}" if has_request_context() else "outside a request"
+            logger.warning("Slow query (%.1f ms, %s): %s", seconds * 1000, where, normalize_sql(statement))
+
+    # Peticiones / Requests
+
+    def _begin(self):
+        if not current_app.config.get('SQL_INSTRUMENTATION', True):
+            return
+        g._sql_started = time.perf_counter()
+        g._sql_queries = RequestQueries(current_app.config.get('SQL_TOP_STATEMENTS', self.DEFAULT_TOP_STATEMENTS))
+
+    def _end(self, response):
+        queries = g.pop('_sql_queries', None)
+        if queries is None:
+            return response
+        elapsed = time.perf_counter() - g.pop('_sql_started')
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={queries.seconds * 1000:.2f};desc="{queries.count} queries", app;dur={elapsed * 1000:.2f}'
+        )
+        # El patrón de la ruta (no la URL) mantiene acotada la cantidad de series
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        self._observe(endpoint, request.method, response.status_code, elapsed, queries)
+        return response
+
+    def _observe(self, endpoint, method, status, elapsed, queries):
+        key = (endpoint, method)
+        with self._lock:
+            self.requests[key + (status,)] = self.requests.get(key + (status,), 0) + 1
+            for histograms, value, bounds in ((self.request_seconds, elapsed, DURATION_BUCKETS),
+                                              (self.db_seconds, queries.seconds, DURATION_BUCKETS),
+                                              (self.db_queries, queries.count, QUERY_COUNT_BUCKETS)):
+                if key not in histograms:
+                    histograms[key] = Histogram(bounds)
+                histograms[key].observe(value)
+            for seconds, statement in queries.slowest():
+                stats = self.statements.get(statement)
+                if stats is None:
+                    if len(self.statements) >= MAX_TRACKED_STATEMENTS:
+                        continue
+                    stats = self.statements[statement] = [0, 0.0, 0.0]
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    # Exposición / Exposition
+
+    def render_prometheus(self, extra=()):
+        """
+        Texto en formato de exposición de Prometheus; `extra` son (nombre, tipo, ayuda,
+        [(etiquetas, valor)]) de otras fuentes (caché, unidad de trabajo)
+        """
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def sample(name, labels, value):
+            rendered = ','.join(f'{key}="{_escape(label)}"' for key, label in labels)
+            lines.append(f"{name}{{{rendered}}} {_number(value)}" if rendered else f"{name} {_number(value)}")
+
+        with self._lock:
+            family('hbnb_http_requests_total', 'counter', 'HTTP requests by endpoint, method and status.')
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                sample('hbnb_http_requests_total', (('endpoint', endpoint), ('method', method), ('status', status)), count)
+
+            for name, histograms, help_text in (
+                ('hbnb_http_request_duration_seconds', self.request_seconds, 'Request latency.'),
+                ('hbnb_db_duration_seconds', self.db_seconds, 'Database time per request.'),
+                ('hbnb_db_queries', self.db_queries, 'SQL statements per request.'),
+            ):
+                family(name, 'histogram', help_text)
+                for (endpoint, method), histogram in sorted(histograms.items()):
+                    labels = (('endpoint', endpoint), ('method', method))
+                    for bound, count in histogram.cumulative():
+                        sample(f"{name}_bucket", labels + (('le', '+Inf' if bound == float('inf') else _number(bound)),), count)
+                    sample(f"{name}_sum", labels, histogram.sum)
+                    sample(f"{name}_count", labels, histogram.count)
+
+            top = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:20]
+            family('hbnb_db_slow_statement_seconds_total', 'counter',
+                   'Time spent in the statements that were among the slowest of their request.')
+            for statement, (_, seconds, _) in top:
+                sample('hbnb_db_slow_statement_seconds_total', (('statement', statement),), seconds)
+            family('hbnb_db_slow_statement_seconds_max', 'gauge', 'Slowest single execution of those statements.')
+            for statement, (_, _, slowest) in top:
+                sample('hbnb_db_slow_statement_seconds_max', (('statement', statement),), slowest)
+
+        for name, kind, help_text, samples in extra:
+            family(name, kind, help_text)
+            for labels, value in samples:
+                sample(name, labels, value)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
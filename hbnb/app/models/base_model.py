@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
 from app import db
+from app.persistence import unit_of_work
 
 class BaseModel(db.Model):
     __abstract__ = True  # No se crea como tabla en la base de datos
@@ -13,7 +14,7 @@ class BaseModel(db.Model):
         #Guarda la instancia en la base de datos
         self.updated_at = datetime.utcnow()
         db.session.add(self)
-        db.session.commit()
+        unit_of_work.commit(db.session)
 
     def update(self, data):
         #Actualiza los atributos y guarda cambios
@@ -1,4 +1,6 @@
 import uuid
+from datetime import timedelta
+from sqlalchemy import event, text
 from app import db
 from app.models.base_model import BaseModel
 from app.models.amenity import Amenity
@@ -10,22 +12,87 @@ place_amenity = db.Table(
     'place_amenity',
     db.metadata,
     db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
-    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True)
+    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True),
+    # La PK (place_id, amenity_id) no sirve para buscar por amenidad / The PK can't serve amenity lookups
+    db.Index('ix_place_amenity_amenity_id', 'amenity_id')
 )
 
+# Lápidas de los lugares borrados: las escribe un trigger de la base, así cuenta cualquier DELETE
+# (en cascada o en SQL crudo); el snapshot columnar las lee para quitar filas sin recorrer la tabla.
+# El mismo trigger descarta las de más de PLACE_DELETIONS_RETENTION.
+# Tombstones of deleted places, written by a database trigger for every DELETE
+place_deletions = db.Table(
+    'place_deletions',
+    db.metadata,
+    db.Column('place_id', db.String(36), primary_key=True),
+    db.Column('deleted_at', db.DateTime, nullable=False),
+    db.Index('ix_place_deletions_deleted_at', 'deleted_at')
+)
+PLACE_DELETIONS_RETENTION = timedelta(days=1)
+
+# migrations/0005_place_deletions.sql crea el mismo trigger en SQLite / same trigger as the migration
+PLACE_DELETION_TRIGGERS = {
+    'sqlite': (
+        "CREATE TRIGGER IF NOT EXISTS places_record_deletion AFTER DELETE ON places\n"
+        "BEGIN\n"
+        "    DELETE FROM place_deletions WHERE deleted_at < strftime('%Y-%m-%d %H:%M:%f', 'now', '-1 day');\n"
+        "    INSERT OR REPLACE INTO place_deletions (place_id, deleted_at)\n"
+        "    VALUES (OLD.id, strftime('%Y-%m-%d %H:%M:%f', 'now'));\n"
+        "END",
+    ),
+    'postgresql': (
+        "CREATE OR REPLACE FUNCTION places_record_deletion() RETURNS trigger AS $$\n"
+        "BEGIN\n"
+        "    DELETE FROM place_deletions WHERE deleted_at < (clock_timestamp() AT TIME ZONE 'UTC') - interval '1 day';\n"
+        "    INSERT INTO place_deletions (place_id, deleted_at) VALUES (OLD.id, clock_timestamp() AT TIME ZONE 'UTC')\n"
+        "    ON CONFLICT (place_id) DO UPDATE SET deleted_at = excluded.deleted_at;\n"
+        "    RETURN OLD;\n"
+        "END $$ LANGUAGE plpgsql",
+        "DROP TRIGGER IF EXISTS places_record_deletion ON places",
+        "CREATE TRIGGER places_record_deletion AFTER DELETE ON places "
+        "FOR EACH ROW EXECUTE FUNCTION places_record_deletion()",
+    ),
+}
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_place_deletion_trigger(metadata, connection, tables=(), **kw):
+    # Solo en la base que recibe place_deletions: las particiones (SHARDS) crean places sin lápidas
+    # Only where place_deletions is created: shards create places without the tombstone table
+    if any(table.name == place_deletions.name for table in tables):
+        for statement in PLACE_DELETION_TRIGGERS.get(connection.dialect.name, ()):
+            connection.execute(text(statement))
+
 
 class Place(BaseModel):
     __tablename__ = 'places'
+    # El snapshot columnar se refresca con updated_at >= :marca
+    __table_args__ = (db.Index('ix_places_updated_at', 'updated_at'),)
 
     # Definición de las columnas de la base de datos
     # Database column definitions
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    price = db.Column(db.Float, nullable=False)
-    latitude = db.Column(db.Float, nullable=False)
-    longitude = db.Column(db.Float, nullable=False)
-    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    # Las columnas se mapean con guion bajo para que las propiedades validadas no las oculten
+    # Columns are mapped with an underscore so the validated properties below don't shadow them
+    _price = db.Column('price', db.Float, nullable=False)
+    _latitude = db.Column('latitude', db.Float, nullable=False)
+    _longitude = db.Column('longitude', db.Float, nullable=False)
+    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    # Celda geohash de la ubicación, mantenida por la capa de persistencia
+    # Geohash cell of the location, maintained by the persistence layer
+    geohash = db.Column(db.String(12), index=True)
+
+    # Agregados de calificación desnormalizados, mantenidos por la fachada al crear/editar/borrar reseñas
+    # Denormalized rating aggregates, kept up to date by the facade when reviews change
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_5 = db.Column(db.Integer, nullable=False, default=0)
 
     
     # Relaciones con otras tablas
@@ -67,7 +134,7 @@ class Place(BaseModel):
                 raise ValueError("Owner must be a valid UUID / El propietario debe ser un UUID válido")
         except ValueError:
             raise ValueError("Owner must be a valid UUID / El propietario debe ser un UUID válido")
-        return owner
+        return str(owner)
 
     # Funciones para agregar reseñas y amenidades
     # Functions to add reviews and amenities
@@ -94,6 +161,8 @@ class Place(BaseModel):
             raise ValueError("Price must be a non-negative float / El precio debe ser un número positivo")
         self._price = float(value)
 
+    price = db.synonym('_price', descriptor=price)
+
     @property
     def latitude(self):
         return self._latitude
@@ -104,6 +173,8 @@ class Place(BaseModel):
             raise ValueError("Latitude must be between -90 and 90 / La latitud debe estar entre -90 y 90")
         self._latitude = float(value)
 
+    latitude = db.synonym('_latitude', descriptor=latitude)
+
     @property
     def longitude(self):
         return self._longitude
@@ -114,6 +185,20 @@ class Place(BaseModel):
             raise ValueError("Longitude must be between -180 and 180 / La longitud debe estar entre -180 y 180")
         self._longitude = float(value)
 
+    longitude = db.synonym('_longitude', descriptor=longitude)
+
+    # Calificación promedio en O(1) a partir de los agregados
+    # O(1) average rating from the aggregates
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def rating_histogram(self):
+        return {str(stars): getattr(self, f"rating_count_{stars}") or 0 for stars in range(1, 6)}
+
     # Método para convertir el objeto a diccionario
     # Method to convert the object to a dictionary
     def to_dict(self):
@@ -125,6 +210,9 @@ class Place(BaseModel):
             "latitude": self.latitude,
             "longitude": self.longitude,
             "owner_id": str(self.owner_id),
+            "review_count": self.review_count or 0,
+            "average_rating": self.average_rating,
+            "rating_histogram": self.rating_histogram,
             "reviews": [review.to_dict() for review in self.reviews],
             "amenities": [amenity.to_dict() for amenity in self.amenities]
         }
@@ -6,10 +6,11 @@ class Review(BaseModel):
     __tablename__ = 'reviews'
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    text = db.Column(db.String(1024), nullable=False)
-    rating = db.Column(db.Integer, nullable=False)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False)
+    # Columnas con guion bajo para que las propiedades validadas no las oculten
+    _text = db.Column('text', db.String(1024), nullable=False)
+    _rating = db.Column('rating', db.Integer, nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False, index=True)
 
     def __init__(self, text, rating, place_id, user_id):
         """Inicializa una nueva instancia de Review"""
@@ -29,6 +30,8 @@ class Review(BaseModel):
             raise ValueError("El texto de la reseña no puede estar vacío.")
         self._text = value
 
+    text = db.synonym('_text', descriptor=text)
+
     @property
     def rating(self):
         return self._rating
@@ -39,6 +42,8 @@ class Review(BaseModel):
             raise ValueError("La calificación debe estar entre 1 y 5.")
         self._rating = value
 
+    rating = db.synonym('_rating', descriptor=rating)
+
     def to_dict(self):
         """Convierte la reseña a un diccionario para la API"""
         return {
@@ -6,7 +6,7 @@ import uuid
 from app.models.base_model import BaseModel
 from email_validator import validate_email, EmailNotValidError
 from sqlalchemy.orm import validates
-from app import bcrypt, db
+from app import db, passwords
 
 
 class User(BaseModel):
@@ -32,7 +32,7 @@ class User(BaseModel):
         self.first_name = first_name
         self.last_name = last_name
         self.email = email
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.hash_password(password)  # un solo hash por escritura / a single hash per write
         self.is_admin = is_admin
 
     @validates('first_name')
@@ -66,13 +66,29 @@ class User(BaseModel):
             raise ValueError(f"Invalid email: {e}")
             # Lanza un error si el correo no es válido
     
-    @validates('password')
-    def validate_password(self, key, value):
-        if len(value) < 8:
+    def hash_password(self, password):
+        """Validate and hash the password once with the configured cost
+        Valida y hashea la contraseña una sola vez con el costo configurado"""
+        if not isinstance(password, str) or len(password) < 8:
             raise ValueError("La contraseña debe tener al menos 8 caracteres")
-        return bcrypt.generate_password_hash(value).decode('utf-8')
-    
+        self.password = passwords.hash(password)
+
     def verify_password(self, password):
         """Check if provided password matches stored password
         Verifica si la contraseña proporcionada coincide con la almacenada"""
-        return bcrypt.check_password_hash(self.password, password)
+        return passwords.verify(self.password, password)
+
+    def password_needs_rehash(self):
+        """True when the stored hash was made with a different cost
+        True si el hash almacenado usa un costo distinto al configurado"""
+        return passwords.needs_rehash(self.password)
+
+    def to_dict(self):
+        """Convierte el usuario a un diccionario para la API (sin la contraseña)
+        Converts the user into a dictionary for the API (without the password)"""
+        return {
+            'id': self.id,
+            'first_name': self.first_name,
+            'last_name': self.last_name,
+            'email': self.email
+        }
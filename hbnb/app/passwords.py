@@ -0,0 +1,103 @@
+# app/passwords.py
+
+"""
+Servicio de contraseñas: un solo hash bcrypt por escritura, costo configurable
+por clase de configuración y trabajo ejecutado en un pool acotado de hilos.
+
+Password service: a single bcrypt hash per write, work factor configurable per
+config class, and the work itself runs on a bounded worker pool so request
+threads only wait on a future instead of all burning CPU at once.
+
+hash() y verify() bloquean al hilo que llama hasta que el pool termina: en el
+servidor WSGI el pool solo acota cuántos bcrypt corren a la vez
+(PASSWORD_HASH_WORKERS), no libera el hilo de la petición. El modo ASGI usa
+hash_async() y verify_async(), que esperan el mismo pool sin bloquear el loop.
+
+hash() and verify() block the calling thread: under WSGI the pool only caps
+bcrypt CPU concurrency; the ASGI mode awaits the async variants instead.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt as _bcrypt
+
+
+class PasswordService:
+    DEFAULT_ROUNDS = 12
+    DEFAULT_WORKERS = 4
+
+    def __init__(self, app=None):
+        self.rounds = self.DEFAULT_ROUNDS
+        self.max_workers = self.DEFAULT_WORKERS
+        self._executor = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Lee BCRYPT_LOG_ROUNDS y PASSWORD_HASH_WORKERS de la configuración"""
+        self.rounds = app.config.get("BCRYPT_LOG_ROUNDS", self.DEFAULT_ROUNDS)
+        workers = app.config.get("PASSWORD_HASH_WORKERS", self.DEFAULT_WORKERS)
+        if self._executor is None or workers != self.max_workers:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self.max_workers = workers
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    @staticmethod
+    def _check(password):
+        # Un JSON como {"password": 123} no debe llegar a bcrypt (TypeError, 500): ValueError -> 400
+        # Non-str input from a JSON body is rejected as a ValueError instead of a bcrypt TypeError
+        if not isinstance(password, str):
+            raise ValueError("Password must be a string.")
+
+    def _hash(self, password, rounds):
+        return _bcrypt.hashpw(password.encode("utf-8"), _bcrypt.gensalt(rounds)).decode("utf-8")
+
+    def _verify(self, hashed, password):
+        try:
+            return _bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+        except ValueError:
+            # Hash con formato inválido / Malformed stored hash
+            return False
+
+    def hash(self, password):
+        """Hashea con el costo configurado; bloquea hasta que el pool termina / Blocks until the pool is done"""
+        self._check(password)
+        return self.executor.submit(self._hash, password, self.rounds).result()
+
+    def verify(self, hashed, password):
+        """Compara una contraseña con su hash; bloquea como hash() / Blocking check against a hash"""
+        if not hashed or not password:
+            return False
+        self._check(password)
+        return self.executor.submit(self._verify, hashed, password).result()
+
+    async def hash_async(self, password):
+        """hash() para el modo ASGI: espera en el mismo pool sin bloquear el event loop"""
+        self._check(password)
+        return await asyncio.wrap_future(self.executor.submit(self._hash, password, self.rounds))
+
+    async def verify_async(self, hashed, password):
+        """verify() para el modo ASGI / verify() for the ASGI mode, awaited instead of blocking"""
+        if not hashed or not password:
+            return False
+        self._check(password)
+        return await asyncio.wrap_future(self.executor.submit(self._verify, hashed, password))
+
+    @staticmethod
+    def cost_of(hashed):
+        """Costo (log rounds) de un hash bcrypt: $2b$<costo>$... / Cost of a bcrypt hash"""
+        try:
+            return int(hashed.split("$")[2])
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    def needs_rehash(self, hashed):
+        """True si el hash almacenado no usa el costo configurado / True if the stored cost differs"""
+        return self.cost_of(hashed) != self.rounds
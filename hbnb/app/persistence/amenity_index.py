@@ -0,0 +1,192 @@
+# app/persistence/amenity_index.py
+
+"""
+Índice de bits de amenidades por lugar
+Per-place amenity bitset index
+
+Cada amenidad recibe una posición de bit y cada lugar guarda un entero con los
+bits de sus amenidades, así "lugares con todas/alguna de estas amenidades" se
+resuelve con operaciones AND/OR en lugar de un JOIN por amenidad.
+
+Every amenity gets a bit position and every place keeps one integer with the
+bits of its amenities, so "places with all/any of these amenities" is answered
+with bitwise AND/OR instead of one join per amenity.
+
+El índice se llena desde place_amenity la primera vez que se usa (mientras
+tanto está "frío" y se consulta con SQL) y luego se mantiene con los cambios
+confirmados: los eventos de la sesión anotan qué vínculos cambió cada flush y
+se aplican solo después del commit (un rollback los descarta). Esos eventos
+solo ven las escrituras de este proceso: pasado AMENITY_INDEX_TTL_SECONDS el
+índice se vuelve a cargar para incorporar las de los demás.
+
+Los IDs de lugares se guardan ordenados, así una página recorre el índice
+desde el cursor y se detiene al completar el límite.
+"""
+
+import bisect
+import itertools
+import threading
+import time
+import weakref
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
+from app.models.amenity import Amenity
+from app.models.place import Place
+
+MATCH_MODES = ('all', 'any')
+
+# Cambios pendientes de la transacción actual / Pending changes of the current transaction
+PENDING_KEY = 'amenity_index_pending'
+
+
+class AmenityBitmapIndex:
+    def __init__(self):
+        self.warm = False
+        self.loaded_at = None  # time.monotonic() de la última carga completa
+        self._reloading = False
+        self._bits = {}  # amenity_id -> posición de bit
+        self._next_bit = 0
+        self._places = {}  # place_id -> bits de sus amenidades
+        self._order = []  # place_id ordenados, para recorrer desde el cursor
+        self._lock = threading.Lock()
+
+    def _bit_locked(self, amenity_id):
+        # Las posiciones no se reutilizan: los bits de una amenidad borrada quedan sin nombre
+        # Positions are never reused, so bits left by a deleted amenity are simply unreachable
+        bit = self._bits.get(amenity_id)
+        if bit is None:
+            bit = self._bits[amenity_id] = self._next_bit
+            self._next_bit += 1
+        return bit
+
+    def load(self, links):
+        """Reconstruye el índice desde pares (place_id, amenity_id) / Rebuild from (place_id, amenity_id) pairs"""
+        places = {}
+        with self._lock:
+            for place_id, amenity_id in links:
+                places[place_id] = places.get(place_id, 0) | (1 << self._bit_locked(amenity_id))
+            self._places, self._order = places, sorted(places)
+            self.warm, self.loaded_at, self._reloading = True, time.monotonic(), False
+
+    def claim_reload(self, max_age):
+        """
+        True para un único llamador cuando el índice está frío o tiene más de max_age
+        segundos (None = nunca vence); ese llamador debe llamar a load()
+        """
+        with self._lock:
+            if self._reloading:
+                return False
+            expired = max_age is not None and self.loaded_at is not None and time.monotonic() - self.loaded_at >= max_age
+            if self.warm and not expired:
+                return False
+            self._reloading = True
+            return True
+
+    def release_reload(self):
+        """Libera el reclamo si load() falló / Give up the claim when load() failed"""
+        with self._lock:
+            self._reloading = False
+
+    def apply(self, changes):
+        """Aplica los cambios confirmados registrados por los eventos de la sesión"""
+        with self._lock:
+            for kind, *args in changes:
+                if kind == 'links':
+                    place_id, added, removed = args
+                    bits = self._places.get(place_id, 0)
+                    for amenity_id in added:
+                        bits |= 1 << self._bit_locked(amenity_id)
+                    for amenity_id in removed:
+                        bits &= ~(1 << self._bit_locked(amenity_id))
+                    if place_id not in self._places:
+                        bisect.insort(self._order, place_id)
+                    self._places[place_id] = bits
+                elif kind == 'place_deleted':
+                    if self._places.pop(args[0], None) is not None:
+                        del self._order[bisect.bisect_left(self._order, args[0])]
+                elif kind == 'amenity_deleted':
+                    self._bits.pop(args[0], None)
+
+    def match(self, amenity_ids, mode='all', after=None, limit=None):
+        """
+        IDs de lugares (ordenados) que tienen todas o alguna de las amenidades, a partir
+        del primero mayor que `after` y hasta `limit` resultados (None = todos)
+        """
+        if mode not in MATCH_MODES:
+            raise ValueError(f"match must be one of: {', '.join(MATCH_MODES)}.")
+        with self._lock:
+            bits = [self._bits.get(amenity_id) for amenity_id in amenity_ids]
+            if mode == 'all' and None in bits:
+                return []
+            mask = 0
+            for bit in bits:
+                if bit is not None:
+                    mask |= 1 << bit
+            if not mask:
+                return []
+            wanted = mask if mode == 'all' else None
+            start = bisect.bisect_right(self._order, after) if after is not None else 0
+            found = []
+            for place_id in itertools.islice(self._order, start, None):
+                place_bits = self._places[place_id] & mask
+                if place_bits and (wanted is None or place_bits == wanted):
+                    found.append(place_id)
+                    if limit is not None and len(found) == limit:
+                        break
+        return found
+
+
+# Un índice por motor (cada app de pruebas tiene su propia base) / One index per engine
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_amenity_index(engine):
+    with _indexes_lock:
+        index = _indexes.get(engine)
+        if index is None:
+            index = _indexes[engine] = AmenityBitmapIndex()
+        return index
+
+
+def record_links(session, links):
+    """Anota vínculos insertados con SQL directo (executemany), que no pasan por el ORM"""
+    pending = session.info.setdefault(PENDING_KEY, [])
+    for place_id, amenity_id in links:
+        pending.append(('links', place_id, (amenity_id,), ()))
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    # En after_flush el historial de los atributos todavía refleja lo que se escribió
+    # In after_flush the attribute history still reflects what was just written
+    pending = []
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Place):
+            history = sa_inspect(obj).attrs.amenities.history
+            if history.added or history.deleted:
+                pending.append(('links', obj.id,
+                                [amenity.id for amenity in history.added],
+                                [amenity.id for amenity in history.deleted]))
+    for obj in session.deleted:
+        if isinstance(obj, Place):
+            pending.append(('place_deleted', obj.id))
+        elif isinstance(obj, Amenity):
+            pending.append(('amenity_deleted', obj.id))
+    if pending:
+        session.info.setdefault(PENDING_KEY, []).extend(pending)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_changes(session):
+    changes = session.info.pop(PENDING_KEY, None)
+    if not changes:
+        return
+    index = _indexes.get(session.get_bind())
+    if index is not None:
+        index.apply(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,279 @@
+# app/persistence/async_repository.py
+
+"""
+Repositorios asyncio para el modo ASGI (asgi.py)
+Asyncio repositories for the ASGI serving mode (asgi.py)
+
+La misma interfaz que Repository, con corrutinas, sobre el engine asyncio de
+SQLAlchemy (aiosqlite con SQLite, asyncpg con PostgreSQL) y los mismos
+modelos. En asyncio no hay carga perezosa: tocar una relación sin cargar lanza
+MissingGreenlet, así que cada consulta declara sus cargadores (los mismos
+PLACE_LIST_LOADERS / PLACE_DETAIL_LOADERS del modo WSGI) y la sesión no expira
+los objetos al confirmar.
+
+Las escrituras solo hacen flush; la fachada confirma una vez por operación,
+como la unidad de trabajo por petición del modo WSGI. La sesión es una por
+tarea de asyncio, es decir, una por petición ASGI.
+
+Same interface as Repository but with coroutines, on SQLAlchemy's asyncio
+engine and the same models. Lazy loading does not exist under asyncio, so
+every query declares its loaders and sessions don't expire on commit. Writes
+only flush; the facade commits once per operation. One session per asyncio
+task, i.e. per ASGI request.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker, create_async_engine
+
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import (
+    PLACE_DETAIL_LOADERS, PLACE_LIST_LOADERS, amenity_clause, keyset_clauses, rating_deltas,
+)
+from app.persistence.sqlite_tuning import tune_engine
+
+# Driver asyncio de cada motor / asyncio driver for each backend
+ASYNC_DRIVERS = {'sqlite': 'aiosqlite', 'postgresql': 'asyncpg', 'mysql': 'aiomysql'}
+
+
+def async_database_url(url):
+    """La URL de la base con el driver asyncio del motor / The database URL with its asyncio driver"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver for '{backend}'.")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+class AsyncDatabase:
+    """Engine asyncio de la base principal y una sesión por tarea / Asyncio engine and a session per task"""
+
+    def __init__(self, app=None, db=None):
+        self.engine = None
+        self.session = None
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        """Usa ASYNC_DATABASE_URI o, si no está, la base de Flask-SQLAlchemy con su driver asyncio"""
+        app.extensions['async_db'] = self
+        uri = app.config.get('ASYNC_DATABASE_URI')
+        if not uri:
+            # db.engine.url ya trae resueltas las rutas SQLite relativas a instance/
+            with app.app_context():
+                uri = async_database_url(db.engine.url)
+        self.engine = create_async_engine(uri, **(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}))
+        tune_engine(self.engine.sync_engine, app.config)
+        self.session = async_scoped_session(
+            async_sessionmaker(self.engine, expire_on_commit=False), scopefunc=asyncio.current_task
+        )
+
+    async def remove(self):
+        """Cierra la sesión de la tarea actual (al final de cada petición)"""
+        await self.session.remove()
+
+    async def dispose(self):
+        await self.engine.dispose()
+
+
+class AsyncRepository(ABC):
+    @abstractmethod
+    async def add(self, obj):
+        pass
+
+    @abstractmethod
+    async def get(self, obj_id):
+        pass
+
+    @abstractmethod
+    async def get_many(self, obj_ids):
+        """
+        Devuelve (objetos_encontrados, ids_faltantes) en el orden de obj_ids
+        Returns (found_objects, missing_ids) in the order of obj_ids
+        """
+        pass
+
+    @abstractmethod
+    async def get_all(self):
+        pass
+
+    @abstractmethod
+    async def update(self, obj_id, data):
+        pass
+
+    @abstractmethod
+    async def delete(self, obj_id):
+        pass
+
+    @abstractmethod
+    async def get_by_attribute(self, attr_name, attr_value):
+        pass
+
+    @abstractmethod
+    async def find_all_by_attribute(self, attr_name, attr_value):
+        """Todos los objetos con ese valor / Every object with that value"""
+        pass
+
+    @abstractmethod
+    async def get_page(self, after=None, limit=20, order_by='id'):
+        """
+        Devuelve (objetos, siguiente_clave) ordenados por (order_by, id)
+        empezando después de la clave `after` = (valor, id)
+        Returns (objects, next_key) ordered by (order_by, id), starting
+        right after the `after` = (value, id) key
+        """
+        pass
+
+
+class AsyncSQLAlchemyRepository(AsyncRepository):
+    IN_CHUNK_SIZE = 500
+
+    def __init__(self, model, db_instance):
+        self.model = model
+        self.db = db_instance  # AsyncDatabase
+
+    async def commit(self):
+        await self.db.session.commit()
+
+    async def rollback(self):
+        await self.db.session.rollback()
+
+    async def add(self, obj):
+        # Solo flush: la fachada confirma la operación completa
+        self.db.session.add(obj)
+        await self.db.session.flush()
+        return obj
+
+    async def get(self, obj_id, options=()):
+        return await self.db.session.get(self.model, obj_id, options=options)
+
+    async def get_many(self, obj_ids, options=()):
+        obj_ids = list(dict.fromkeys(obj_ids))
+        by_id = {}
+        for start in range(0, len(obj_ids), self.IN_CHUNK_SIZE):
+            chunk = obj_ids[start:start + self.IN_CHUNK_SIZE]
+            rows = await self.db.session.scalars(select(self.model).options(*options).where(self.model.id.in_(chunk)))
+            by_id.update((obj.id, obj) for obj in rows)
+        found = [by_id[obj_id] for obj_id in obj_ids if obj_id in by_id]
+        missing = [obj_id for obj_id in obj_ids if obj_id not in by_id]
+        return found, missing
+
+    async def get_all(self):
+        return (await self.db.session.scalars(select(self.model))).all()
+
+    async def update(self, obj_id, data):
+        # Vía ORM para pasar por las validaciones de los modelos, sin commit
+        obj = await self.get(obj_id)
+        if obj:
+            for key, value in data.items():
+                setattr(obj, key, value)
+            await self.db.session.flush()
+        return obj
+
+    async def delete(self, obj_id):
+        result = await self.db.session.execute(delete(self.model).where(self.model.id == obj_id))
+        return result.rowcount
+
+    async def get_by_attribute(self, attr_name, attr_value):
+        query = select(self.model).filter_by(**{attr_name: attr_value}).limit(1)
+        return (await self.db.session.scalars(query)).first()
+
+    async def find_all_by_attribute(self, attr_name, attr_value):
+        return (await self.db.session.scalars(select(self.model).filter_by(**{attr_name: attr_value}))).all()
+
+    async def get_version(self, obj_id):
+        """(id, updated_at) de una entidad sin cargarla; None si no existe"""
+        row = (await self.db.session.execute(
+            select(self.model.id, self.model.updated_at).where(self.model.id == obj_id)
+        )).first()
+        return (row.id, row.updated_at) if row else None
+
+    async def get_collection_version(self):
+        """(max(updated_at), count(*)) de la tabla / of the whole table"""
+        row = (await self.db.session.execute(select(func.max(self.model.updated_at), func.count(self.model.id)))).one()
+        return row[0], row[1]
+
+    async def get_page(self, after=None, limit=20, order_by='id', options=(), where=()):
+        conditions, order = keyset_clauses(self.model, order_by, after)
+        query = select(self.model).options(*options).where(*where, *conditions).order_by(*order).limit(limit + 1)
+        rows = (await self.db.session.scalars(query)).all()
+
+        page = rows[:limit]
+        next_key = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_key = (getattr(last, order_by), last.id)
+        return page, next_key
+
+
+class AsyncUserRepository(AsyncSQLAlchemyRepository):
+    def __init__(self, db_instance):
+        super().__init__(User, db_instance)
+
+
+class AsyncPlaceRepository(AsyncSQLAlchemyRepository):
+    def __init__(self, db_instance):
+        super().__init__(Place, db_instance)
+
+    async def get_page(self, after=None, limit=20, order_by='id', options=PLACE_LIST_LOADERS, where=()):
+        return await super().get_page(after, limit, order_by, options, where)
+
+    def amenity_filter(self, amenity_ids, mode='all'):
+        # Sin índice de bits en este modo: el filtro siempre se resuelve en SQL
+        return amenity_clause(amenity_ids, mode)
+
+    async def count(self):
+        return await self.db.session.scalar(select(func.count(self.model.id)))
+
+    async def get_place_details(self, place_id):
+        """Lugar con dueño, amenidades y reseñas ya cargados (ver PlaceRepository.get_place_details)"""
+        query = (
+            select(self.model)
+            .outerjoin(place_amenity, place_amenity.c.place_id == self.model.id)
+            .outerjoin(Amenity, Amenity.id == place_amenity.c.amenity_id)
+            .options(*PLACE_DETAIL_LOADERS)
+            .where(self.model.id == place_id)
+        )
+        places = (await self.db.session.scalars(query)).unique().all()
+        return places[0] if places else None
+
+    async def get_version(self, obj_id):
+        # El detalle incluye las reseñas: la versión es el updated_at más reciente de ambos
+        newest_review = select(func.max(Review.updated_at)).where(Review.place_id == self.model.id).scalar_subquery()
+        row = (await self.db.session.execute(
+            select(self.model.id, self.model.updated_at, newest_review).where(self.model.id == obj_id)
+        )).first()
+        if not row:
+            return None
+        stamps = [value for value in (row[1], row[2]) if value is not None]
+        return row[0], max(stamps) if stamps else None
+
+    async def get_places_by_owner(self, owner_id):
+        return await self.find_all_by_attribute('owner_id', owner_id)
+
+    async def apply_rating_delta(self, place_id, added=None, removed=None):
+        """Agregados de calificación con un único UPDATE atómico, sin commit"""
+        values = {name: getattr(self.model, name) + delta for name, delta in rating_deltas(added, removed).items()}
+        if values:
+            await self.db.session.execute(
+                update(self.model).where(self.model.id == place_id).values(values)
+                .execution_options(synchronize_session=False)
+            )
+
+
+class AsyncReviewRepository(AsyncSQLAlchemyRepository):
+    def __init__(self, db_instance):
+        super().__init__(Review, db_instance)
+
+    async def get_reviews_by_place(self, place_id):
+        return await self.find_all_by_attribute('place_id', place_id)
+
+
+class AsyncAmenityRepository(AsyncSQLAlchemyRepository):
+    def __init__(self, db_instance):
+        super().__init__(Amenity, db_instance)
@@ -0,0 +1,298 @@
+# app/persistence/cache.py
+
+"""
+Caché de entidades de lectura directa (read-through) para los repositorios SQLAlchemy
+Read-through entity cache for the SQLAlchemy repositories
+
+CachedRepository envuelve un SQLAlchemyRepository y guarda los valores de las
+columnas de cada entidad en un LRU con TTL. Se habilita por modelo con
+ENTITY_CACHE en la configuración, por ejemplo:
+
+    ENTITY_CACHE = {'User': {'max_size': 2048, 'ttl': 60}}
+
+Se invalida desde add/update/delete del propio repositorio, desde los eventos
+del mapper (cambios hechos con el ORM fuera del repositorio) y ante UPDATE/DELETE
+masivos sobre la tabla del modelo: si el WHERE fija los ids (id = x, id IN (...))
+solo se descartan esos, si no se vacía la caché del modelo. Los eventos se
+registran una vez por modelo y notifican a las cachés vivas de ese modelo.
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
+from app.persistence.repository import Repository
+from app.persistence import unit_of_work
+
+
+# Cachés vivas por modelo; las referencias débiles no las mantienen en memoria
+# Live caches per model; weak references don't keep them alive
+_caches = {}  # modelo -> WeakSet de CachedRepository
+_registry_lock = threading.Lock()
+
+
+def _register(cache):
+    with _registry_lock:
+        caches = _caches.get(cache.model)
+        if caches is None:
+            caches = _caches[cache.model] = weakref.WeakSet()
+            event.listen(cache.model, 'after_update', _on_change)
+            event.listen(cache.model, 'after_delete', _on_change)
+            event.listen(cache.model, 'after_insert', _on_insert)
+        caches.add(cache)
+
+
+def _caches_for(model):
+    with _registry_lock:
+        return list(_caches.get(model, ()))
+
+
+def _on_change(mapper, connection, target):
+    for cache in _caches_for(mapper.class_):
+        cache.invalidate(target.id)
+
+
+def _on_insert(mapper, connection, target):
+    for cache in _caches_for(mapper.class_):
+        cache.clear_attribute_keys()
+
+
+def _targeted_ids(orm_execute_state, table_name):
+    """
+    IDs que fija el WHERE de un UPDATE/DELETE (id = x o id IN (...) en el nivel AND);
+    None si el WHERE no se limita a ids conocidos
+    """
+    where = orm_execute_state.statement.whereclause
+    if where is None:
+        return None
+    clauses = where.clauses if isinstance(where, BooleanClauseList) and where.operator is operators.and_ else [where]
+    params = orm_execute_state.parameters
+    rows = params if isinstance(params, (list, tuple)) else [params or {}]
+    for clause in clauses:
+        column, bind = getattr(clause, 'left', None), getattr(clause, 'right', None)
+        if not (isinstance(clause, BinaryExpression) and isinstance(bind, BindParameter)
+                and getattr(getattr(column, 'table', None), 'name', None) == table_name
+                and getattr(column, 'key', None) == 'id'):
+            continue
+        if clause.operator not in (operators.eq, operators.in_op):
+            continue
+        values = [row[bind.key] for row in rows if bind.key in row] or [bind.value]
+        ids = set()
+        for value in values:
+            if value is None:
+                return None
+            ids.update(value if isinstance(value, (list, tuple, set)) else (value,))
+        return ids
+    return None
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _on_bulk(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    # Con update(Modelo) la tabla viene anotada: se compara por nombre
+    table_name = getattr(getattr(orm_execute_state.statement, 'table', None), 'name', None)
+    with _registry_lock:
+        models = [model for model in _caches if model.__tablename__ == table_name]
+    if not models:
+        return
+    ids = _targeted_ids(orm_execute_state, table_name)
+    for model in models:
+        for cache in _caches_for(model):
+            if ids is None:
+                cache.clear()
+            else:
+                for obj_id in ids:
+                    cache.invalidate(obj_id)
+
+
+class CachedRepository(Repository):
+    def __init__(self, repository):
+        self.repository = repository
+        self.model = repository.model
+        self.db = repository.db
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # id -> (expira_en, valores de columnas)
+        self._by_attribute = {}  # (atributo, valor) -> id
+        self._lock = threading.Lock()
+        _register(self)
+
+    def __getattr__(self, name):
+        # Consultas específicas (get_places_near, get_reviews_by_place...) van directo al repositorio
+        return getattr(self.repository, name)
+
+    # Configuración / Settings
+
+    def _settings(self):
+        try:
+            settings = current_app.config.get('ENTITY_CACHE') or {}
+        except RuntimeError:
+            return None
+        return settings.get(self.model.__name__)
+
+    # Almacenamiento LRU + TTL / LRU + TTL storage
+
+    def _lookup(self, obj_id, now):
+        entry = self._entries.get(obj_id)
+        if entry is None:
+            return None
+        expires_at, values = entry
+        if expires_at < now:
+            del self._entries[obj_id]
+            return None
+        self._entries.move_to_end(obj_id)
+        return values
+
+    def _store(self, obj, settings):
+        if unit_of_work.has_pending_writes(self.db.session):
+            # Valores todavía sin confirmar: si la unidad de trabajo se revierte no deben quedar en caché
+            return
+        mapper = sa_inspect(self.model)
+        values = {prop.key: getattr(obj, prop.key) for prop in mapper.column_attrs}
+        with self._lock:
+            self._entries[obj.id] = (time.monotonic() + settings.get('ttl', 60), values)
+            self._entries.move_to_end(obj.id)
+            while len(self._entries) > settings.get('max_size', 1024):
+                evicted_id, _ = self._entries.popitem(last=False)
+                self._drop_attribute_keys(evicted_id)
+
+    def _attach(self, values):
+        # Reconstruye la entidad y la une a la sesión actual sin emitir SQL (merge load=False)
+        # Rebuild the entity and attach it to the current session without SQL (merge load=False)
+        obj = self.model.__mapper__.class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        return self.db.session.merge(obj, load=False)
+
+    def _drop_attribute_keys(self, obj_id):
+        for key in [key for key, cached_id in self._by_attribute.items() if cached_id == obj_id]:
+            del self._by_attribute[key]
+
+    def invalidate(self, obj_id):
+        with self._lock:
+            self._entries.pop(obj_id, None)
+            self._drop_attribute_keys(obj_id)
+
+    def clear_attribute_keys(self):
+        # Una fila nueva puede ocupar un valor de atributo que antes no encontró nada
+        with self._lock:
+            self._by_attribute.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_attribute.clear()
+
+    def stats(self):
+        """Contadores para dimensionar la caché / Counters to size the cache"""
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._entries)
+        lookups = hits + misses
+        return {
+            'model': self.model.__name__,
+            'enabled': self._settings() is not None,
+            'size': size,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / lookups, 4) if lookups else None,
+        }
+
+    # Interfaz Repository / Repository interface
+
+    def add(self, obj):
+        self.repository.add(obj)
+        if getattr(obj, 'id', None) is not None:
+            self.invalidate(obj.id)
+
+    def get(self, obj_id):
+        settings = self._settings()
+        if settings is None:
+            return self.repository.get(obj_id)
+
+        with self._lock:
+            values = self._lookup(obj_id, time.monotonic())
+            if values is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if values is not None:
+            return self._attach(values)
+
+        obj = self.repository.get(obj_id)
+        if obj is not None:
+            self._store(obj, settings)
+        return obj
+
+    def get_many(self, obj_ids, **kwargs):
+        settings = self._settings()
+        if settings is None or kwargs:
+            # Con opciones de carga (eager loading) se consulta directo / Loader options bypass the cache
+            return self.repository.get_many(obj_ids, **kwargs)
+
+        obj_ids = list(dict.fromkeys(obj_ids))
+        cached, pending = {}, []
+        now = time.monotonic()
+        with self._lock:
+            for obj_id in obj_ids:
+                values = self._lookup(obj_id, now)
+                if values is None:
+                    pending.append(obj_id)
+                else:
+                    cached[obj_id] = values
+            self.hits += len(cached)
+            self.misses += len(pending)
+
+        found = {obj_id: self._attach(values) for obj_id, values in cached.items()}
+        loaded, missing = self.repository.get_many(pending) if pending else ([], [])
+        for obj in loaded:
+            self._store(obj, settings)
+            found[obj.id] = obj
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found], missing
+
+    def get_all(self):
+        return self.repository.get_all()
+
+    def find_all_by_attribute(self, attr_name, attr_value):
+        return self.repository.find_all_by_attribute(attr_name, attr_value)
+
+    def get_page(self, *args, **kwargs):
+        return self.repository.get_page(*args, **kwargs)
+
+    def update(self, obj_id, data):
+        self.repository.update(obj_id, data)
+        self.invalidate(obj_id)
+
+    def delete(self, obj_id):
+        self.repository.delete(obj_id)
+        self.invalidate(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        settings = self._settings()
+        if settings is None:
+            return self.repository.get_by_attribute(attr_name, attr_value)
+
+        key = (attr_name, attr_value)
+        with self._lock:
+            obj_id = self._by_attribute.get(key)
+            values = self._lookup(obj_id, time.monotonic()) if obj_id is not None else None
+            if values is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if values is not None:
+            return self._attach(values)
+
+        obj = self.repository.get_by_attribute(attr_name, attr_value)
+        if obj is not None:
+            self._store(obj, settings)
+            with self._lock:
+                self._by_attribute[key] = obj.id
+        return obj
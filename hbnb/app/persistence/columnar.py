@@ -0,0 +1,225 @@
+# app/persistence/columnar.py
+
+"""
+Snapshot columnar de solo lectura de los lugares, para analítica
+Read-only columnar snapshot of places, for analytics
+
+Cada columna es un array de numpy con una fila por lugar: precio, latitud,
+longitud, dueño (codificado como índice en una lista de dueños), reseñas y suma
+de calificaciones, más una columna booleana por amenidad. Los filtros y las
+estadísticas son operaciones vectoriales sobre columnas enteras: recorrer un
+millón de filas no crea ningún objeto del ORM ni itera en Python.
+
+Every column is a numpy array with one row per place (plus one boolean column
+per amenity); filters and stats are vectorized over whole columns.
+
+Se llena con una consulta en streaming (yield_per) y se refresca de forma
+incremental con las filas cuyo updated_at es posterior al inicio de la carga
+anterior menos REFRESH_OVERLAP. Los borrados llegan por las lápidas de
+place_deletions (un trigger de la base las escribe) y se quitan del snapshot
+sin recargarlo. Al final se compara COUNT(*) con la cantidad de filas: solo si
+no coinciden (una inserción que confirmó más tarde que el margen, o una lápida
+que se escapó de él) se compara el conjunto completo de IDs.
+
+Refreshes read rows changed since the previous load plus the tombstones of
+deleted places; the full id diff only runs when COUNT(*) disagrees.
+"""
+
+import threading
+from array import array
+from datetime import datetime, timedelta
+import numpy as np
+from app.models.place import PLACE_DELETIONS_RETENTION
+from app.persistence.amenity_index import MATCH_MODES
+
+# Columnas numéricas: (nombre, tipo del array de carga, dtype de numpy)
+NUMERIC_COLUMNS = (
+    ('price', 'd', np.float64),
+    ('latitude', 'd', np.float64),
+    ('longitude', 'd', np.float64),
+    ('owner', 'q', np.int64),  # índice en self.owners
+    ('review_count', 'q', np.int64),
+    ('rating_sum', 'q', np.int64),
+)
+
+
+class PlaceColumns:
+    # Margen para transacciones que escribieron updated_at antes de la carga pero confirmaron después
+    REFRESH_OVERLAP = timedelta(seconds=5)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.ids = []
+        self.row_of = {}  # place_id -> fila
+        for name, _, dtype in NUMERIC_COLUMNS:
+            setattr(self, name, np.empty(0, dtype=dtype))
+        self.owners = []
+        self._owner_code = {}
+        self.amenities = {}  # amenity_id -> columna booleana
+        self.watermark = None  # inicio (UTC) de la última carga
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Carga / Loading
+
+    def _owner_index(self, owner_id):
+        code = self._owner_code.get(owner_id)
+        if code is None:
+            code = self._owner_code[owner_id] = len(self.owners)
+            self.owners.append(owner_id)
+        return code
+
+    def _values(self, row):
+        return (row.price, row.latitude, row.longitude, self._owner_index(row.owner_id),
+                row.review_count or 0, row.rating_sum or 0)
+
+    def _upsert_many(self, rows):
+        """Actualiza las filas existentes en su lugar y agrega las nuevas con un único concatenate"""
+        appended = [array(typecode) for _, typecode, _ in NUMERIC_COLUMNS]
+        for row in rows:
+            values = self._values(row)
+            position = self.row_of.get(row.id)
+            if position is None:
+                self.row_of[row.id] = len(self.ids)
+                self.ids.append(row.id)
+                for column, value in zip(appended, values):
+                    column.append(value)
+            else:
+                for (name, _, _), value in zip(NUMERIC_COLUMNS, values):
+                    getattr(self, name)[position] = value
+        if appended[0]:
+            for (name, _, dtype), column in zip(NUMERIC_COLUMNS, appended):
+                setattr(self, name, np.concatenate([getattr(self, name), np.frombuffer(column, dtype=dtype)]))
+            for amenity_id, column in self.amenities.items():
+                self.amenities[amenity_id] = np.concatenate([column, np.zeros(len(appended[0]), dtype=bool)])
+
+    def _remove_many(self, place_ids):
+        """Quita esas filas de todas las columnas / Drops those rows from every column"""
+        positions = [self.row_of[place_id] for place_id in place_ids if place_id in self.row_of]
+        if not positions:
+            return
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[positions] = False
+        for name, _, _ in NUMERIC_COLUMNS:
+            setattr(self, name, getattr(self, name)[keep])
+        for amenity_id, column in self.amenities.items():
+            self.amenities[amenity_id] = column[keep]
+        self.ids = [place_id for place_id, kept in zip(self.ids, keep) if kept]
+        self.row_of = {place_id: position for position, place_id in enumerate(self.ids)}
+
+    def _load_links(self, links):
+        rows_by_amenity = {}
+        for place_id, amenity_id in links:
+            position = self.row_of.get(place_id)
+            if position is not None:
+                rows_by_amenity.setdefault(amenity_id, []).append(position)
+        for amenity_id, rows in rows_by_amenity.items():
+            column = self.amenities.get(amenity_id)
+            if column is None:
+                column = self.amenities[amenity_id] = np.zeros(len(self.ids), dtype=bool)
+            column[rows] = True
+
+    def rebuild(self, place_repo):
+        """Carga completa en streaming / Full streaming load"""
+        with self._lock:
+            self._reset()
+            self.watermark = datetime.utcnow()
+            self._upsert_many(place_repo.iter_place_columns())
+            self._load_links(place_repo.iter_amenity_links())
+
+    def refresh(self, place_repo):
+        """
+        Aplica solo los lugares modificados o borrados desde la última carga; devuelve cuántas filas leyó
+        Applies only the places changed or deleted since the last load; returns the rows read
+        """
+        # Las lápidas se descartan pasada la retención: un snapshot más viejo se recarga entero
+        oldest = datetime.utcnow() - PLACE_DELETIONS_RETENTION + self.REFRESH_OVERLAP
+        if self.watermark is None or self.watermark < oldest:
+            self.rebuild(place_repo)
+            return len(self)
+        with self._lock:
+            since, self.watermark = self.watermark - self.REFRESH_OVERLAP, datetime.utcnow()
+            # Lápidas antes que filas: un lugar borrado entre ambas lecturas no vuelve a entrar
+            # Tombstones before rows, so a place deleted in between is not added back
+            self._remove_many(list(place_repo.iter_deleted_place_ids(since)))
+            changed = list(place_repo.iter_place_columns(since=since))
+            self._upsert_many(changed)
+            if place_repo.count() != len(self.ids):
+                # Inserción confirmada tarde o lápida fuera del margen: se compara el conjunto de IDs
+                # Late commit or a tombstone outside the overlap: diff the full id set
+                place_ids = set(place_repo.iter_place_ids())
+                late = place_ids.difference(self.row_of)
+                if late:
+                    rows = list(place_repo.iter_place_columns(place_ids=late))
+                    self._upsert_many(rows)
+                    changed.extend(rows)
+                self._remove_many([place_id for place_id in self.row_of if place_id not in place_ids])
+            changed_ids = [row.id for row in changed if row.id in self.row_of]
+            positions = [self.row_of[place_id] for place_id in changed_ids]
+            for column in self.amenities.values():
+                column[positions] = False
+            self._load_links(place_repo.iter_amenity_links(changed_ids) if changed_ids else ())
+        return len(changed)
+
+    # Consultas / Queries
+
+    def select_rows(self, bbox=None, amenity_ids=None, match='all', owner_id=None):
+        """Índices (array de numpy) de las filas que cumplen los filtros / Matching row indices"""
+        if match not in MATCH_MODES:
+            raise ValueError(f"match must be one of: {', '.join(MATCH_MODES)}.")
+        with self._lock:
+            mask = np.ones(len(self.ids), dtype=bool)
+            if owner_id is not None:
+                code = self._owner_code.get(owner_id)
+                if code is None:
+                    return np.empty(0, dtype=np.int64)
+                mask &= self.owner == code
+            if amenity_ids:
+                columns = [self.amenities.get(amenity_id) for amenity_id in set(amenity_ids)]
+                if match == 'all':
+                    if any(column is None for column in columns):
+                        return np.empty(0, dtype=np.int64)
+                    for column in columns:
+                        mask &= column
+                else:
+                    matched = np.zeros(len(self.ids), dtype=bool)
+                    for column in columns:
+                        if column is not None:
+                            matched |= column
+                    mask &= matched
+            if bbox is not None:
+                min_lon, min_lat, max_lon, max_lat = bbox
+                mask &= (self.latitude >= min_lat) & (self.latitude <= max_lat)
+                if min_lon <= max_lon:
+                    mask &= (self.longitude >= min_lon) & (self.longitude <= max_lon)
+                else:  # la caja cruza el antimeridiano / the box crosses the antimeridian
+                    mask &= (self.longitude >= min_lon) | (self.longitude <= max_lon)
+            return np.flatnonzero(mask)
+
+    def price_stats(self, rows):
+        """Cantidad, mínimo, máximo, promedio y percentiles de precio / Price summary"""
+        with self._lock:
+            prices = np.sort(self.price[rows])
+            reviews = int(self.review_count[rows].sum())
+            rating_total = int(self.rating_sum[rows].sum())
+        if not len(prices):
+            return {'count': 0, 'min': None, 'max': None, 'mean': None, 'p50': None, 'p90': None,
+                    'review_count': 0, 'average_rating': None}
+
+        def percentile(fraction):
+            return float(prices[min(len(prices) - 1, int(fraction * len(prices)))])
+
+        return {
+            'count': len(prices),
+            'min': float(prices[0]),
+            'max': float(prices[-1]),
+            'mean': round(float(prices.mean()), 2),
+            'p50': percentile(0.5),
+            'p90': percentile(0.9),
+            'review_count': reviews,
+            'average_rating': round(rating_total / reviews, 2) if reviews else None,
+        }
@@ -0,0 +1,322 @@
+# app/persistence/durable.py
+
+"""
+Persistencia en disco para el repositorio en memoria: snapshot + log de operaciones
+On-disk persistence for the in-memory repository: snapshot + operation log
+
+Log de escritura anticipada: cada add/update/delete arma la nueva versión en un
+borrador, anexa sus líneas al log (con fsync según la política) y recién
+entonces la publica; si escribir el log falla, la versión no se publica y
+ningún lector ve un cambio que no está en disco. Cada `snapshot_every`
+operaciones se escribe un snapshot compacto del estado completo (archivo
+temporal + rename atómico) y el log vuelve a empezar. Al arrancar se lee el
+snapshot con mmap y se reaplica el log encima.
+
+Con fsync='everysec' un hilo de fondo sincroniza el log una vez por segundo si
+hubo escrituras desde la última vez: después de una ráfaga y silencio, lo
+último escrito queda en disco como mucho un segundo después. close() detiene
+el hilo y hace el fsync final.
+
+Write-ahead: every add/update/delete builds the next version in a draft,
+appends its log lines (fsync per policy) and only then publishes it, so a
+failed log write is never visible to readers. Every `snapshot_every`
+operations a compact snapshot of the whole state is written (temp file +
+atomic rename) and the log starts over. On startup the snapshot is read
+through mmap and the log is replayed on top of it.
+
+Es un bloque independiente: HBnBFacade usa los repositorios SQLAlchemy y no lo
+instancia. Sirve para servicios que guardan entidades solo en memoria y
+quieren sobrevivir a un reinicio (ver from_config y MEMORY_STORE_* en config).
+Standalone building block: the facade runs on the SQLAlchemy repositories and
+never instantiates it.
+
+Si anexar al log falla a mitad de camino (p. ej. disco lleno), el archivo se
+trunca al tamaño anterior antes de propagar el error: los bytes cortados nunca
+quedan delante de escrituras posteriores. Si ni siquiera se puede truncar, el
+repositorio queda marcado como fallido y rechaza más escrituras.
+
+Las operaciones del log son idempotentes (put del registro completo, delete por
+id), así que un corte entre el rename del snapshot y el truncado del log solo
+hace que se reapliquen operaciones ya incluidas. Una línea final incompleta o
+con CRC inválido (escritura interrumpida) se descarta al recuperar.
+"""
+
+import json
+import logging
+import mmap
+import os
+import threading
+import weakref
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm.attributes import set_committed_value
+from app.persistence.repository import InMemoryRepository
+
+# always: fsync en cada operación; everysec: un hilo sincroniza cada segundo si hubo escrituras; never: lo decide el SO
+FSYNC_POLICIES = ('always', 'everysec', 'never')
+
+SNAPSHOT_FORMAT = 1
+
+
+# Registros / Records
+
+def _mapper_of(cls):
+    return sa_inspect(cls, raiseerr=False)
+
+
+def to_record(obj):
+    """Valores de las columnas (modelos SQLAlchemy) o atributos de instancia del objeto"""
+    mapper = _mapper_of(type(obj))
+    if mapper is not None:
+        return {prop.key: getattr(obj, prop.key) for prop in mapper.column_attrs}
+    return {key: value for key, value in vars(obj).items() if not key.startswith('_sa_')}
+
+
+def from_record(factory, record):
+    """Reconstruye el objeto sin pasar por __init__ (sin validar ni volver a hashear)"""
+    mapper = _mapper_of(factory)
+    if mapper is not None:
+        obj = mapper.class_manager.new_instance()
+        for key, value in record.items():
+            set_committed_value(obj, key, value)
+        return obj
+    obj = factory.__new__(factory)
+    obj.__dict__.update(record)
+    return obj
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    return str(value)
+
+
+def _object_hook(value):
+    if len(value) == 1 and '$dt' in value:
+        return datetime.fromisoformat(value['$dt'])
+    return value
+
+
+def _dumps(value):
+    return json.dumps(value, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data):
+    return json.loads(data, object_hook=_object_hook)
+
+
+def _log_line(entry):
+    payload = _dumps(entry)
+    return b"%08x " % zlib.crc32(payload) + payload + b"\n"
+
+
+def _parse_log_line(line):
+    # None si la línea está cortada o dañada / None if the line is torn or corrupt
+    if not line.endswith(b"\n") or len(line) < 10:
+        return None
+    checksum, payload = line[:8], line[9:-1]
+    try:
+        if int(checksum, 16) != zlib.crc32(payload):
+            return None
+        return _loads(payload)
+    except ValueError:
+        return None
+
+
+class DurableInMemoryRepository(InMemoryRepository):
+    SNAPSHOT_FILE = 'snapshot.jsonl'
+    LOG_FILE = 'oplog.jsonl'
+
+    def __init__(self, directory, factory, fsync='everysec', snapshot_every=10000, unique_indexes=(), indexes=()):
+        """
+        directory: carpeta propia de este repositorio; factory: clase de las entidades
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of: {', '.join(FSYNC_POLICIES)}.")
+        self.factory = factory
+        self.fsync = fsync
+        self.snapshot_every = snapshot_every
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self._log_path = os.path.join(directory, self.LOG_FILE)
+        self._log_entries = 0
+        self._dirty = False  # everysec: hay escrituras sin fsync / appends not yet fsynced
+        self._stop_flusher = threading.Event()
+        self._flusher = None
+        self._failed = None  # error que dejó el log en un estado desconocido / error that left the log unknown
+        super().__init__(unique_indexes, indexes)
+
+        os.makedirs(directory, exist_ok=True)
+        # Toda la recuperación se arma en un solo borrador y se publica una vez (sin log ni snapshot todavía)
+        with super()._write() as draft:
+            self._load_snapshot(draft)
+            self._replay_log(draft)
+        self._log = self._open_log('ab')
+        if fsync == 'everysec':
+            # Referencia débil: un repositorio sin close() no queda vivo por su hilo
+            self._flusher = threading.Thread(target=self._flush_every_second,
+                                             args=(weakref.ref(self), self._stop_flusher),
+                                             name='oplog-fsync', daemon=True)
+            self._flusher.start()
+
+    @classmethod
+    def from_config(cls, config, name, factory, **kwargs):
+        """Usa MEMORY_STORE_DIR/<name>, MEMORY_STORE_FSYNC y MEMORY_STORE_SNAPSHOT_EVERY"""
+        return cls(
+            os.path.join(config['MEMORY_STORE_DIR'], name), factory,
+            fsync=config['MEMORY_STORE_FSYNC'],
+            snapshot_every=config['MEMORY_STORE_SNAPSHOT_EVERY'],
+            **kwargs
+        )
+
+    # Recuperación / Recovery
+
+    def _load_snapshot(self, draft):
+        if not os.path.exists(self._snapshot_path) or os.path.getsize(self._snapshot_path) == 0:
+            return
+        with open(self._snapshot_path, 'rb') as snapshot, \
+                mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header = _loads(data.readline())
+            if header.get('format') != SNAPSHOT_FORMAT:
+                raise ValueError(f"Unsupported snapshot format: {header.get('format')}")
+            for line in iter(data.readline, b""):
+                self._put(draft, from_record(self.factory, _loads(line)))
+
+    def _replay_log(self, draft):
+        if not os.path.exists(self._log_path):
+            return
+        valid_bytes = 0
+        with open(self._log_path, 'rb') as log:
+            for line in log:
+                entry = _parse_log_line(line)
+                if entry is None:
+                    break
+                self._apply(draft, entry)
+                valid_bytes += len(line)
+                self._log_entries += 1
+        if os.path.getsize(self._log_path) > valid_bytes:
+            # Se descarta la cola interrumpida para seguir anexando sobre líneas válidas
+            logging.warning(f"Discarding torn tail of {self._log_path} after {self._log_entries} entries")
+            with open(self._log_path, 'r+b') as log:
+                log.truncate(valid_bytes)
+
+    def _apply(self, draft, entry):
+        if entry['op'] == 'put':
+            self._put(draft, from_record(self.factory, entry['r']))
+        elif entry['op'] == 'del':
+            self._remove(draft, entry['id'])
+
+    # Log y snapshots / Log and snapshots
+
+    def _open_log(self, mode):
+        # Sin búfer: lo que write() no llegó a escribir no queda pendiente para la próxima escritura
+        # Unbuffered, so a failed append leaves nothing queued behind for the next one
+        return open(self._log_path, mode, buffering=0)
+
+    @contextmanager
+    def _write(self):
+        # La compactación va después de publicar: el snapshot debe incluir la versión que se acaba de loguear
+        with self._write_lock:
+            with super()._write() as draft:
+                yield draft
+            if self.snapshot_every and self._log_entries >= self.snapshot_every:
+                self.snapshot()
+
+    def _journal(self, changes):
+        """Anexa los cambios del borrador al log antes de publicarlo / Write-ahead append before publishing"""
+        if not changes:
+            return
+        if self._failed is not None:
+            raise OSError(f"{self._log_path} is in an unknown state after a failed write") from self._failed
+        data = memoryview(b"".join(
+            _log_line({'op': 'put', 'id': change.id, 'r': to_record(change)} if op == 'put'
+                      else {'op': 'del', 'id': change})
+            for op, change in changes
+        ))
+        offset = self._log.seek(0, os.SEEK_END)
+        try:
+            while data:
+                data = data[self._log.write(data):]
+            if self.fsync == 'always':
+                os.fsync(self._log.fileno())
+        except BaseException:
+            self._truncate_log(offset)
+            raise
+        self._log_entries += len(changes)
+        self._dirty = self.fsync == 'everysec'
+
+    @staticmethod
+    def _flush_every_second(ref, stop):
+        while not stop.wait(1):
+            repo = ref()
+            if repo is None:
+                return
+            repo._sync_log()
+            del repo
+
+    def _sync_log(self):
+        """fsync del log si hubo escrituras desde el último / fsync the log if anything was appended"""
+        with self._write_lock:
+            if not self._dirty or self._log.closed:
+                return
+            try:
+                os.fsync(self._log.fileno())
+                self._dirty = False
+            except OSError as e:
+                logging.error(f"Could not fsync {self._log_path}: {e}")
+
+    def _truncate_log(self, offset):
+        # Quita la escritura parcial: si quedara, el replay cortaría ahí y perdería todo lo posterior
+        # Drop the partial append; left in place, replay would stop there and lose every later write
+        try:
+            os.ftruncate(self._log.fileno(), offset)
+        except Exception as e:
+            self._failed = e
+            logging.error(f"Could not truncate {self._log_path} after a failed write; refusing further writes: {e}")
+
+    def snapshot(self):
+        """Escribe el estado completo y vacía el log / Write the full state and reset the log"""
+        # Bloquea a los escritores (no a los lectores) para que el log no avance mientras tanto
+        with self._write_lock:
+            storage = self._version.storage
+            temp_path = self._snapshot_path + '.tmp'
+            with open(temp_path, 'wb') as snapshot:
+                snapshot.write(_dumps({'format': SNAPSHOT_FORMAT, 'count': len(storage)}) + b"\n")
+                for obj in storage.values():
+                    snapshot.write(_dumps(to_record(obj)) + b"\n")
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(temp_path, self._snapshot_path)
+            self._fsync_directory()
+
+            self._log.close()
+            self._log = self._open_log('wb')
+            os.fsync(self._log.fileno())
+            self._log_entries = 0
+            self._dirty = False
+            self._failed = None  # el snapshot tiene el estado completo: el log vuelve a estar limpio
+
+    def _fsync_directory(self):
+        # El rename solo es durable cuando se sincroniza la carpeta (no disponible en Windows)
+        try:
+            directory = os.open(os.path.dirname(self._snapshot_path) or '.', os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def close(self):
+        self._stop_flusher.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._write_lock:
+            self._close_log()
+
+    def _close_log(self):
+        if not self._log.closed:
+            if self.fsync != 'never':
+                os.fsync(self._log.fileno())
+            self._log.close()
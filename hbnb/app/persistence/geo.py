@@ -0,0 +1,145 @@
+# app/persistence/geo.py
+
+"""
+Índice espacial por geohash para lugares
+Geohash-based spatial index for places
+
+Cada lugar guarda el geohash de su ubicación (columna indexada). Una
+búsqueda por radio o por caja calcula las celdas geohash que cubren la
+zona, lee solo las filas cuyo geohash empieza por alguna de esas celdas
+(rangos sobre el índice) y después filtra con la distancia haversine.
+
+Each place stores the geohash of its location in an indexed column. A
+radius or box search computes the geohash cells covering the area, reads
+only rows whose geohash starts with one of those cells (index range scans)
+and then refines candidates with the haversine distance.
+"""
+
+import math
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precisión almacenada (~5 m) y máximo de celdas por consulta
+# Stored precision (~5 m) and maximum number of cells per query
+GEOHASH_PRECISION = 9
+MAX_QUERY_CELLS = 32
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Codifica (lat, lon) como geohash / Encode (lat, lon) as a geohash"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """Alto y ancho en grados de una celda / Cell height and width in degrees"""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distancia en km sobre la esfera / Great-circle distance in km"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """
+    Caja (min_lon, min_lat, max_lon, max_lat) que contiene el círculo
+    Bounding box (min_lon, min_lat, max_lon, max_lat) containing the circle
+    """
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = max(-90.0, latitude - dlat), min(90.0, latitude + dlat)
+    cos_lat = math.cos(math.radians(latitude))
+    if max_lat >= 90.0 or min_lat <= -90.0 or cos_lat < 1e-9:
+        return -180.0, min_lat, 180.0, max_lat
+    dlon = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    if dlon >= 180.0:
+        return -180.0, min_lat, 180.0, max_lat
+    min_lon, max_lon = longitude - dlon, longitude + dlon
+    # Normaliza cruzando el antimeridiano (min_lon > max_lon)
+    # Wrap around the antimeridian (min_lon > max_lon)
+    if min_lon < -180.0:
+        min_lon += 360.0
+    if max_lon > 180.0:
+        max_lon -= 360.0
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def in_bbox(latitude, longitude, bbox):
+    min_lon, min_lat, max_lon, max_lat = bbox
+    if not (min_lat <= latitude <= max_lat):
+        return False
+    if min_lon <= max_lon:
+        return min_lon <= longitude <= max_lon
+    return longitude >= min_lon or longitude <= max_lon
+
+
+def _split_bbox(bbox):
+    min_lon, min_lat, max_lon, max_lat = bbox
+    if min_lon <= max_lon:
+        return [bbox]
+    return [(min_lon, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lon, max_lat)]
+
+
+def _cells_for(bbox, precision):
+    cells = set()
+    height, width = cell_size(precision)
+    for min_lon, min_lat, max_lon, max_lat in _split_bbox(bbox):
+        lat = min_lat
+        while True:
+            lon = min_lon
+            while True:
+                cells.add(encode_geohash(min(lat, 90.0), min(lon, 180.0), precision))
+                if lon >= max_lon:
+                    break
+                lon = min(lon + width, max_lon)
+            if lat >= max_lat:
+                break
+            lat = min(lat + height, max_lat)
+    return cells
+
+
+def covering_cells(bbox, max_cells=MAX_QUERY_CELLS):
+    """
+    Celdas geohash de mayor precisión que cubren la caja sin superar max_cells
+    Most precise set of geohash cells covering the box within max_cells
+    """
+    best = {""}
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        # Estimación barata antes de enumerar / Cheap estimate before enumerating
+        height, width = cell_size(precision)
+        estimate = sum(
+            (math.ceil((max_lat - min_lat) / height) + 1) * (math.ceil((max_lon - min_lon) / width) + 1)
+            for min_lon, min_lat, max_lon, max_lat in _split_bbox(bbox)
+        )
+        if estimate > 4 * max_cells:
+            return best
+        cells = _cells_for(bbox, precision)
+        if len(cells) > max_cells:
+            return best
+        best = cells
+    return best
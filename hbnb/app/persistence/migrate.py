@@ -0,0 +1,167 @@
+# app/persistence/migrate.py
+
+"""
+Migraciones de esquema versionadas para SQLite
+Versioned SQLite schema migrations
+
+Cada archivo migrations/NNNN_nombre.sql es una migración; se aplican en orden
+de versión, cada una en su propia transacción junto con su registro en la
+tabla schema_migrations (versión, nombre, sha256 del archivo, fecha).
+
+  - Incremental: solo se ejecutan las versiones que faltan.
+  - Con checksum: si un archivo ya aplicado cambió, o una versión aplicada ya
+    no existe en el directorio, se rechaza la corrida (ValueError) en lugar
+    de dejar el esquema en un estado desconocido. Para cambiar el esquema se
+    agrega una migración nueva; nunca se edita una aplicada.
+
+Each migrations/NNNN_name.sql file runs once, in version order, inside its own
+transaction together with its schema_migrations row. A changed or missing
+applied file aborts the run instead of silently diverging.
+"""
+
+import hashlib
+import os
+import re
+from datetime import datetime, timezone
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                              'migrations')
+MIGRATIONS_TABLE = 'schema_migrations'
+_FILENAME = re.compile(r'^(\d{4})_(\w+)\.sql$')
+# Tablas del antiguo generate_tables.sql: SQLite compara nombres sin mayúsculas,
+# así "Users" taparía a "users" y el esquema quedaría mezclado
+LEGACY_TABLES = ('Place', 'Review', 'Amenity', 'Place_Amenity')
+
+
+class Migration:
+    def __init__(self, version, name, sql):
+        self.version = version
+        self.name = name
+        self.sql = sql
+        self.checksum = hashlib.sha256(sql.encode('utf-8')).hexdigest()
+
+    def __repr__(self):
+        return f"<Migration {self.version:04d}_{self.name}>"
+
+
+def discover(directory=MIGRATIONS_DIR):
+    """Migraciones del directorio ordenadas por versión / Migrations in the directory, by version"""
+    migrations = {}
+    for filename in sorted(os.listdir(directory)):
+        match = _FILENAME.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version:04d}.")
+        with open(os.path.join(directory, filename), encoding='utf-8') as sql_file:
+            migrations[version] = Migration(version, match.group(2), sql_file.read())
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def _ensure_table(connection):
+    connection.execute(
+        f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+        "version INTEGER PRIMARY KEY, name TEXT NOT NULL, checksum TEXT NOT NULL, applied_at TEXT NOT NULL)"
+    )
+    connection.commit()
+
+
+def applied(connection):
+    """{versión: (nombre, checksum)} de lo ya aplicado / What has already been applied"""
+    _ensure_table(connection)
+    rows = connection.execute(f"SELECT version, name, checksum FROM {MIGRATIONS_TABLE}").fetchall()
+    return {version: (name, checksum) for version, name, checksum in rows}
+
+
+def verify(connection, migrations):
+    """Rechaza checksums distintos o versiones aplicadas que ya no existen / Rejects drifted history"""
+    done = applied(connection)
+    known = {migration.version: migration for migration in migrations}
+    for version, (name, checksum) in sorted(done.items()):
+        migration = known.get(version)
+        if migration is None:
+            raise ValueError(f"Applied migration {version:04d}_{name} is missing from the migrations directory.")
+        if migration.checksum != checksum:
+            raise ValueError(f"Migration {version:04d}_{name} was modified after being applied (checksum mismatch).")
+    return done
+
+
+def _check_legacy(connection):
+    placeholders = ', '.join('?' * len(LEGACY_TABLES))
+    legacy = connection.execute(
+        f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})", LEGACY_TABLES
+    ).fetchall()
+    if legacy:
+        raise ValueError("Database uses the legacy generate_tables.sql schema "
+                         f"({', '.join(name for (name,) in legacy)}); recreate it and run `flask seed`.")
+
+
+def pending(connection, directory=MIGRATIONS_DIR):
+    """Migraciones sin aplicar, después de verificar las aplicadas / Unapplied migrations"""
+    _check_legacy(connection)
+    migrations = discover(directory)
+    done = verify(connection, migrations)
+    return [migration for migration in migrations if migration.version not in done]
+
+
+def _apply(connection, migration):
+    # executescript confirma lo pendiente y corre en autocommit: la transacción
+    # se abre y se cierra dentro del mismo script, con el registro de la versión
+    stamp = datetime.now(timezone.utc).isoformat()
+    script = (
+        "BEGIN;\n"
+        f"{migration.sql}\n;\n"
+        f"INSERT INTO {MIGRATIONS_TABLE} (version, name, checksum, applied_at) "
+        f"VALUES ({migration.version}, '{migration.name}', '{migration.checksum}', '{stamp}');\n"
+        "COMMIT;"
+    )
+    try:
+        connection.executescript(script)
+    except Exception:
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        raise
+
+
+def migrate(connection, directory=MIGRATIONS_DIR, target=None):
+    """
+    Aplica las migraciones pendientes hasta `target` (inclusive) sobre una conexión sqlite3;
+    devuelve las aplicadas
+    Applies pending migrations up to `target` on a sqlite3 connection; returns the applied ones
+    """
+    done = []
+    for migration in pending(connection, directory):
+        if target is not None and migration.version > target:
+            break
+        _apply(connection, migration)
+        done.append(migration)
+    return done
+
+
+def raw_connection(engine):
+    """Conexión sqlite3 subyacente de un engine de SQLAlchemy (cerrarla la devuelve al pool)"""
+    if engine.dialect.name != 'sqlite':
+        raise ValueError("Migrations are written for SQLite; use db.create_all() on other databases.")
+    return engine.raw_connection()
+
+
+def migrate_database(db_instance, reset=False):
+    """
+    Deja el esquema al día: migraciones pendientes en SQLite (con su historial), db.create_all()
+    en otros motores. reset borra antes las tablas y el historial. Devuelve las migraciones aplicadas.
+    Brings the schema up to date through the migration runner on SQLite, create_all() elsewhere.
+    """
+    if reset:
+        db_instance.drop_all()
+    if db_instance.engine.dialect.name != 'sqlite':
+        db_instance.create_all()
+        return []
+    connection = raw_connection(db_instance.engine)
+    try:
+        if reset:
+            connection.execute(f"DROP TABLE IF EXISTS {MIGRATIONS_TABLE}")
+            connection.commit()
+        return migrate(connection)
+    finally:
+        connection.close()
@@ -0,0 +1,235 @@
+# app/persistence/replicas.py
+
+"""
+Enrutamiento de lecturas a réplicas
+Read-replica routing
+
+Las lecturas marcadas con @replica_read en los repositorios (get, get_all,
+get_by_attribute, get_places_by_owner, get_reviews_by_place) van a una de las
+réplicas de READ_REPLICAS ({nombre: URI}); todo lo demás va al primario:
+
+  - Escrituras: los flush y el DML siempre van al primario (las réplicas además
+    abren sus conexiones con PRAGMA query_only si son SQLite).
+  - Leer lo propio: en cuanto la sesión escribió algo (o tiene cambios sin
+    flush) queda fijada al primario hasta que se descarta, es decir, por el
+    resto de la petición.
+  - Lecturas dentro de una escritura (@on_primary, p. ej. update() que lee el
+    objeto antes de modificarlo) van al primario.
+  - Guardia de lag: cada transacción que escribe actualiza en el primario la
+    fila de replica_heartbeat. Si a la réplica todavía no le llegó el último
+    latido, le falta al menos lo escrito desde entonces: su lag es el tiempo
+    transcurrido desde ese latido, y sigue creciendo aunque el primario no
+    vuelva a escribir. Una réplica con más de
+    REPLICA_MAX_LAG_SECONDS (o que no responde) se saltea hasta la próxima
+    medición; sin réplicas sanas se lee del primario.
+
+Repository reads marked @replica_read go to a healthy read replica; writes,
+reads after the session has written, and reads inside writes stay on the
+primary. Every writing transaction bumps a heartbeat row on the primary; a
+replica that has not received the latest beat is at least as stale as that
+beat's age, which keeps growing even when the primary stops writing.
+"""
+
+import functools
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from flask import current_app
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import Column, Float, Integer, MetaData, Table, event, select, text
+
+from app.persistence import unit_of_work
+from app.persistence.sqlite_tuning import create_tuned_engine
+
+PRIMARY = 'primary'
+REPLICA = 'replica'
+PINNED_KEY = 'read_replicas_pinned'
+
+_route = ContextVar('read_replica_route', default=None)
+
+# Se declara en una MetaData propia del módulo y se copia a la de los modelos en init_app
+heartbeat = Table(
+    'replica_heartbeat', MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('beat_at', Float, nullable=False),
+)
+_UPSERT_HEARTBEAT = text(
+    "INSERT INTO replica_heartbeat (id, beat_at) VALUES (1, :beat_at) "
+    "ON CONFLICT (id) DO UPDATE SET beat_at = excluded.beat_at"
+)
+
+
+def _routed(route):
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if _route.get() is not None:
+                # Anidado: manda la decisión de afuera (un update() que llama a get() sigue en el primario)
+                return method(*args, **kwargs)
+            token = _route.set(route)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                _route.reset(token)
+        return wrapper
+    return decorator
+
+
+# Lecturas que pueden ir a una réplica / Reads that may be served by a replica
+replica_read = _routed(REPLICA)
+# Escrituras que leen antes de escribir: todo en el primario / Writes that read first
+on_primary = _routed(PRIMARY)
+
+
+def _writes_pending(session):
+    return bool(session.new or session.dirty or session.deleted or unit_of_work.has_pending_writes(session))
+
+
+class RoutingSession(FlaskSession):
+    """Sesión de Flask-SQLAlchemy que deriva las lecturas marcadas a una réplica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _route.get() == REPLICA and not self._flushing and not getattr(clause, 'is_dml', False):
+            router = current_app.extensions.get('read_replicas')
+            if router is not None and router.enabled:
+                engine = router.pick(self)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'before_commit')
+def _beat(session):
+    # Mismo commit que las escrituras: la réplica que ve el latido ve también esos datos
+    router = current_app.extensions.get('read_replicas') if current_app else None
+    if router is None or not router.enabled or not _writes_pending(session):
+        return
+    session.info[PINNED_KEY] = True
+    session.execute(_UPSERT_HEARTBEAT, {'beat_at': time.time()})
+
+
+def _query_only(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only = ON")
+    finally:
+        cursor.close()
+
+
+class ReadReplicaRouter:
+    """
+    Los engines de las réplicas son del router y no binds de Flask-SQLAlchemy: la instancia
+    db recuerda cada bind registrado y create_all() los exigiría en todas las apps siguientes
+    Replica engines are owned here rather than being Flask-SQLAlchemy binds
+    """
+
+    def __init__(self, app=None, db=None):
+        self.db = None
+        self.engines = {}  # nombre -> engine
+        self.max_lag = 5.0
+        self.check_interval = 1.0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._health = {}  # bind -> (medido_en, lag en segundos o None si falló)
+        self.reset_stats()
+        if app is not None:
+            self.init_app(app, db)
+
+    @property
+    def enabled(self):
+        return bool(self.engines)
+
+    @property
+    def binds(self):
+        return tuple(self.engines)
+
+    def init_app(self, app, db):
+        """Lee READ_REPLICAS / REPLICA_MAX_LAG_SECONDS / REPLICA_LAG_CHECK_SECONDS y crea los engines"""
+        app.extensions['read_replicas'] = self
+        self.db = db
+        self.max_lag = app.config.get('REPLICA_MAX_LAG_SECONDS', 5.0)
+        self.check_interval = app.config.get('REPLICA_LAG_CHECK_SECONDS', 1.0)
+        with self._lock:
+            self._health = {}
+        if heartbeat.name not in db.metadata.tables:
+            heartbeat.to_metadata(db.metadata)
+        self.dispose()
+        for name, uri in (app.config.get('READ_REPLICAS') or {}).items():
+            engine = create_tuned_engine(uri, app.config)
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _query_only)
+            self.engines[name] = engine
+
+    def dispose(self):
+        for engine in self.engines.values():
+            engine.dispose()
+        self.engines = {}
+
+    def reset_stats(self):
+        with self._lock:
+            self.reads = {PRIMARY: 0}
+            self.pinned = 0
+            self.lagging = 0
+
+    def stats(self):
+        with self._lock:
+            return {'reads': dict(self.reads), 'pinned': self.pinned, 'lagging': self.lagging,
+                    'lag_seconds': {bind: lag for bind, (_, lag) in self._health.items()}}
+
+    def _count(self, key):
+        with self._lock:
+            self.reads[key] = self.reads.get(key, 0) + 1
+
+    # Lag / Replication lag
+
+    def _beat_at(self, engine):
+        with engine.connect() as connection:
+            return connection.execute(select(heartbeat.c.beat_at).where(heartbeat.c.id == 1)).scalar()
+
+    def replica_lag(self, bind):
+        """Segundos que la réplica está atrasada respecto del primario; None si no se pudo medir"""
+        try:
+            primary_beat = self._beat_at(self.db.engine)
+            replica_beat = self._beat_at(self.engines[bind])
+        except Exception:
+            return None
+        if primary_beat is None:
+            return 0.0  # el primario nunca escribió con réplicas configuradas
+        if replica_beat is None:
+            return float('inf')
+        if replica_beat >= primary_beat:
+            return 0.0
+        # Le falta al menos la escritura de primary_beat: cota inferior del atraso
+        return max(0.0, time.time() - primary_beat)
+
+    def _healthy(self, bind):
+        now = time.monotonic()
+        with self._lock:
+            measured = self._health.get(bind)
+        if measured is None or now - measured[0] >= self.check_interval:
+            # La medición consulta las dos bases: fuera del lock
+            measured = (now, self.replica_lag(bind))
+            with self._lock:
+                self._health[bind] = measured
+        lag = measured[1]
+        return lag is not None and lag <= self.max_lag
+
+    def pick(self, session):
+        """Engine de la réplica para esta lectura, o None para leer del primario"""
+        if session.info.get(PINNED_KEY) or _writes_pending(session):
+            session.info[PINNED_KEY] = True
+            with self._lock:
+                self.pinned += 1
+            self._count(PRIMARY)
+            return None
+        start = next(self._counter)
+        for offset in range(len(self.binds)):
+            bind = self.binds[(start + offset) % len(self.binds)]
+            if self._healthy(bind):
+                self._count(bind)
+                return self.engines[bind]
+        with self._lock:
+            self.lagging += 1
+        self._count(PRIMARY)
+        return None
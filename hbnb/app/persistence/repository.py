@@ -1,12 +1,26 @@
 # app/persistence/repository.py
 
+import copy
+import heapq
+import itertools
+import threading
 import uuid
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from app.models.user import User
-from app.models.place import Place
+from app.models.place import Place, place_amenity, place_deletions
 from app.models.review import Review
 from app.models.amenity import Amenity
 from abc import ABC, abstractmethod
+from sqlalchemy import DateTime, and_, bindparam, case, delete, event, func, or_, select
+from sqlalchemy.ext.horizontal_shard import set_shard_id
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.persistence import amenity_index, geo, unit_of_work
+from app.persistence.replicas import on_primary, replica_read
+from app.persistence.sharding import bucket_for, review_bucket
 import logging
 
 # Definir el repositorio base
@@ -19,6 +33,14 @@ class Repository(ABC):
     def get(self, obj_id):
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        """
+        Devuelve (objetos_encontrados, ids_faltantes) en el orden de obj_ids
+        Returns (found_objects, missing_ids) in the order of obj_ids
+        """
+        pass
+
     @abstractmethod
     def get_all(self):
         pass
@@ -35,13 +57,299 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def find_all_by_attribute(self, attr_name, attr_value):
+        """Todos los objetos con ese valor / Every object with that value"""
+        pass
+
+    @abstractmethod
+    def get_page(self, after=None, limit=20, order_by='id'):
+        """
+        Devuelve (objetos, siguiente_clave) ordenados por (order_by, id)
+        empezando después de la clave `after` = (valor, id)
+        Returns (objects, next_key) ordered by (order_by, id), starting
+        right after the `after` = (value, id) key
+        """
+        pass
+
 
 # Repositorio en memoria (para pruebas o almacenamiento temporal)
-class InMemoryRepository(Repository):
-    def __init__(self):
-        self._storage = {}
+class _CowMap:
+    """
+    Diccionario repartido en fragmentos con copia en escritura: un borrador copia solo
+    los fragmentos que modifica, así una escritura cuesta O(n / SHARDS) y no O(n)
+    Sharded copy-on-write dict: a draft copies only the shards it modifies
+    """
+    SHARDS = 64
+    __slots__ = ('shards', 'owned')
 
-    def add(self, obj):
+    def __init__(self, shards=None):
+        self.shards = shards if shards is not None else [{} for _ in range(self.SHARDS)]
+        self.owned = set()  # fragmentos ya copiados por este borrador
+
+    def draft(self):
+        return _CowMap(list(self.shards))
+
+    def publish(self):
+        self.owned = set()
+        return self
+
+    def _writable(self, key):
+        position = hash(key) % self.SHARDS
+        if position not in self.owned:
+            self.shards[position] = dict(self.shards[position])
+            self.owned.add(position)
+        return self.shards[position]
+
+    def get(self, key, default=None):
+        return self.shards[hash(key) % self.SHARDS].get(key, default)
+
+    def __getitem__(self, key):
+        return self.shards[hash(key) % self.SHARDS][key]
+
+    def __contains__(self, key):
+        return key in self.shards[hash(key) % self.SHARDS]
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    def __iter__(self):
+        return iter([key for shard in self.shards for key in shard])
+
+    def __setitem__(self, key, value):
+        self._writable(key)[key] = value
+
+    def __delitem__(self, key):
+        del self._writable(key)[key]
+
+    def pop(self, key, default=None):
+        if key not in self:
+            return default
+        return self._writable(key).pop(key)
+
+    def values(self):
+        return [value for shard in self.shards for value in shard.values()]
+
+
+class _Version:
+    """
+    Estado publicado del repositorio en memoria; nunca se modifica una vez publicado
+    Published state of the in-memory repository; never mutated once published
+    """
+    __slots__ = ('storage', 'unique', 'indexes', 'owned')
+
+    def __init__(self, storage, unique, indexes):
+        self.storage = storage  # _CowMap id -> objeto
+        self.unique = unique  # atributo -> _CowMap {valor: id}
+        self.indexes = indexes  # atributo -> _CowMap {valor: {id: None}} (conjunto ordenado)
+        self.owned = set()  # grupos (atributo, valor) ya copiados por este borrador
+
+
+class _InMemoryReads:
+    """
+    Lecturas sobre una sola versión publicada (self._version)
+    Reads against a single published version (self._version)
+    """
+
+    def get(self, obj_id):
+        return self._version.storage.get(obj_id)
+
+    def get_many(self, obj_ids):
+        storage = self._version.storage
+        found, missing = [], []
+        for obj_id in dict.fromkeys(obj_ids):
+            obj = storage.get(obj_id)
+            if obj is None:
+                missing.append(obj_id)
+            else:
+                found.append(obj)
+        return found, missing
+
+    def get_all(self):
+        return list(self._version.storage.values())
+
+    def get_by_attribute(self, attr_name, attr_value):
+        version = self._version
+        if attr_name in version.unique:
+            obj_id = version.unique[attr_name].get(attr_value)
+            return version.storage.get(obj_id) if obj_id is not None else None
+        if attr_name in version.indexes:
+            ids = version.indexes[attr_name].get(attr_value)
+            return version.storage[next(iter(ids))] if ids else None
+        return next((obj for obj in version.storage.values() if getattr(obj, attr_name, None) == attr_value), None)
+
+    def find_all_by_attribute(self, attr_name, attr_value):
+        version = self._version
+        if attr_name in version.indexes:
+            return [version.storage[obj_id] for obj_id in version.indexes[attr_name].get(attr_value, ())]
+        if attr_name in version.unique:
+            obj = self.get_by_attribute(attr_name, attr_value)
+            return [obj] if obj is not None else []
+        return [obj for obj in version.storage.values() if getattr(obj, attr_name, None) == attr_value]
+
+    def get_page(self, after=None, limit=20, order_by='id'):
+        def sort_key(obj):
+            return (getattr(obj, order_by, None), obj.id)
+
+        items = sorted(self._version.storage.values(), key=sort_key)
+        if after is not None:
+            value, last_id = after
+            if items and isinstance(getattr(items[0], order_by, None), datetime) and isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            items = [obj for obj in items if sort_key(obj) > (value, last_id)]
+
+        page = items[:limit]
+        next_key = sort_key(page[-1]) if len(items) > limit else None
+        return page, next_key
+
+
+class ReadView(_InMemoryReads):
+    """
+    Vista de solo lectura fija en una versión: varias lecturas ven el mismo estado
+    Read-only view pinned to one version, so several reads see the same state
+    """
+
+    def __init__(self, version):
+        self._version = version
+
+
+class InMemoryRepository(_InMemoryReads, Repository):
+    """
+    Seguro con varios hilos: las lecturas toman la versión publicada sin bloquearse
+    y ven un estado consistente (aislamiento por snapshot); las escrituras se
+    serializan, trabajan sobre una copia y la publican con una sola asignación.
+    update() publica una copia de la entidad en lugar de modificarla en el lugar.
+
+    Thread-safe: reads take the published version without locking and see a
+    consistent state (snapshot isolation); writes are serialized, work on a copy
+    and publish it with a single assignment. update() publishes a copy of the
+    entity instead of mutating it in place.
+    """
+
+    def __init__(self, unique_indexes=(), indexes=()):
+        """
+        unique_indexes: atributos con valor único (p. ej. 'email'), indexes: atributos
+        con índice no único (p. ej. 'place_id'). Ambos evitan recorrer todo el almacenamiento.
+        """
+        self._version = _Version(_CowMap(), {}, {})
+        self._write_lock = threading.RLock()
+        for attr_name in unique_indexes:
+            self.create_index(attr_name, unique=True)
+        for attr_name in indexes:
+            self.create_index(attr_name)
+
+    # Versiones / Versions
+
+    @property
+    def _storage(self):
+        return self._version.storage
+
+    def read_view(self):
+        """Snapshot consistente para varias lecturas / Consistent snapshot for several reads"""
+        return ReadView(self._version)
+
+    @contextmanager
+    def _write(self):
+        """
+        Borrador de la próxima versión; se publica al salir sin errores
+        Draft of the next version, published only if the block succeeds
+        """
+        with self._write_lock:
+            current = self._version
+            draft = _Version(
+                current.storage.draft(),
+                {attr_name: index.draft() for attr_name, index in current.unique.items()},
+                {attr_name: index.draft() for attr_name, index in current.indexes.items()},
+            )
+            yield draft
+            draft.storage.publish()
+            for index in list(draft.unique.values()) + list(draft.indexes.values()):
+                index.publish()
+            draft.owned = set()
+            self._version = draft
+
+    @staticmethod
+    def _clone(obj):
+        # Los modelos SQLAlchemy se copian por sus columnas (el estado del ORM no se comparte)
+        # SQLAlchemy models are copied through their columns (ORM state is never shared)
+        mapper = sa_inspect(type(obj), raiseerr=False)
+        if mapper is None:
+            return copy.copy(obj)
+        clone = mapper.class_manager.new_instance()
+        for prop in mapper.column_attrs:
+            set_committed_value(clone, prop.key, getattr(obj, prop.key))
+        return clone
+
+    # Índices secundarios / Secondary indexes
+
+    def create_index(self, attr_name, unique=False):
+        """Declara un índice y lo llena con los objetos existentes"""
+        with self._write() as draft:
+            (draft.unique if unique else draft.indexes)[attr_name] = _CowMap()
+            for obj in draft.storage.values():
+                if unique:
+                    self._check_unique(draft, {attr_name: getattr(obj, attr_name, None)}, obj.id)
+                self._index_value(draft, attr_name, unique, getattr(obj, attr_name, None), obj.id)
+
+    @staticmethod
+    def _check_unique(version, values, obj_id):
+        for attr_name, value in values.items():
+            index = version.unique.get(attr_name)
+            if index is not None and value is not None and index.get(value, obj_id) != obj_id:
+                raise ValueError(f"Duplicate value for '{attr_name}': {value}")
+
+    @staticmethod
+    def _bucket(draft, attr_name, value):
+        # Copia el grupo la primera vez que este borrador lo toca / Copy-on-first-write per bucket
+        index = draft.indexes[attr_name]
+        if (attr_name, value) not in draft.owned:
+            index[value] = dict(index.get(value, ()))
+            draft.owned.add((attr_name, value))
+        return index[value]
+
+    def _index_value(self, draft, attr_name, unique, value, obj_id):
+        if unique:
+            # Igual que UNIQUE en SQL, los None no se indexan
+            if value is not None:
+                draft.unique[attr_name][value] = obj_id
+        else:
+            self._bucket(draft, attr_name, value)[obj_id] = None
+
+    def _put(self, draft, obj):
+        self._check_unique(draft, {attr_name: getattr(obj, attr_name, None) for attr_name in draft.unique}, obj.id)
+        previous = draft.storage.get(obj.id)
+        if previous is not None:
+            self._unindex(draft, previous)
+        draft.storage[obj.id] = obj
+        for attr_name in draft.unique:
+            self._index_value(draft, attr_name, True, getattr(obj, attr_name, None), obj.id)
+        for attr_name in draft.indexes:
+            self._index_value(draft, attr_name, False, getattr(obj, attr_name, None), obj.id)
+
+    def _remove(self, draft, obj_id):
+        obj = draft.storage.pop(obj_id, None)
+        if obj is not None:
+            self._unindex(draft, obj)
+        return obj
+
+    def _unindex(self, draft, obj):
+        for attr_name, index in draft.unique.items():
+            value = getattr(obj, attr_name, None)
+            if index.get(value) == obj.id:
+                del index[value]
+        for attr_name, index in draft.indexes.items():
+            value = getattr(obj, attr_name, None)
+            if value in index:
+                bucket = self._bucket(draft, attr_name, value)
+                bucket.pop(obj.id, None)
+                if not bucket:
+                    del index[value]
+                    draft.owned.discard((attr_name, value))
+
+    # Interfaz Repository / Repository interface
+
+    @staticmethod
+    def _prepare(obj):
         if not hasattr(obj, "id") or obj.id is None:
             obj.id = str(uuid.uuid4())
         if hasattr(obj, "created_at") and obj.created_at is None:
@@ -49,40 +357,108 @@ class InMemoryRepository(Repository):
         if hasattr(obj, "updated_at") and obj.updated_at is None:
             obj.updated_at = datetime.utcnow()
 
-        self._storage[obj.id] = obj
+    def _journal(self, changes):
+        """
+        Se llama con el borrador ya armado y antes de publicarlo; changes es una lista de
+        ('put', objeto) / ('del', id). Si falla, la versión no se publica. Aquí no hace nada.
+        Called with the draft built and before it is published; a failure discards the draft.
+        """
 
-    def get(self, obj_id):
-        return self._storage.get(obj_id)
+    def add(self, obj):
+        self._prepare(obj)
+        with self._write() as draft:
+            self._put(draft, obj)
+            self._journal([('put', obj)])
 
-    def get_all(self):
-        return list(self._storage.values())
+    def add_many(self, objs):
+        """Agrega todos los objetos en una sola versión (todo o nada) / All objects in one version, all or nothing"""
+        objs = list(objs)
+        with self._write() as draft:
+            for obj in objs:
+                self._prepare(obj)
+                self._put(draft, obj)
+            self._journal([('put', obj) for obj in objs])
+        return objs
 
     def update(self, obj_id, data):
-        obj = self.get(obj_id)
-        if obj:
+        with self._write() as draft:
+            current = draft.storage.get(obj_id)
+            if current is None:
+                return None
+            # Los lectores que ya tienen la versión anterior no ven cambios a medias
+            # Readers holding the previous version never see a half-applied update
+            obj = self._clone(current)
             for key, value in data.items():
                 setattr(obj, key, value)
             obj.updated_at = datetime.utcnow()
+            self._put(draft, obj)
+            self._journal([('put', obj)])
+        return obj
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        # Solo memoria: este repositorio no tiene modelo ni sesión de base de datos
+        with self._write() as draft:
+            if self._remove(draft, obj_id) is not None:
+                self._journal([('del', obj_id)])
 
+def _coerce_key_value(model, order_by, value):
+    # Los cursores viajan como JSON: las fechas vuelven como texto ISO
+    # Cursors travel as JSON, so datetimes come back as ISO strings
+    column_type = model.__table__.columns[order_by].type
+    if isinstance(column_type, DateTime) and isinstance(value, str):
         try:
-            deleted = self.model.query.filter_by(id=obj_id).delete()
-            if deleted:
-                self.db.session.commit()
-        except Exception as e:
-            self.db.session.rollback()
-            logging.error(f"Error deleting object: {e}")
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError("Invalid cursor.")
+    return value
 
 
-    def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name, None) == attr_value), None)
+def keyset_clauses(model, order_by, after):
+    """
+    (condiciones, orden) de la paginación por clave: WHERE (col, id) > (:valor, :id) ORDER BY col, id
+    (conditions, ordering) for keyset pagination after the `after` = (value, id) key
+    """
+    if order_by not in model.__table__.columns:
+        raise ValueError(f"Cannot order by '{order_by}'.")
+    column = getattr(model, order_by)
+    conditions = []
+    if after is not None:
+        value, last_id = after
+        value = _coerce_key_value(model, order_by, value)
+        if order_by == 'id':
+            conditions.append(model.id > last_id)
+        else:
+            conditions.append(or_(column > value, and_(column == value, model.id > last_id)))
+    order = [column] if order_by == 'id' else [column, model.id]
+    return conditions, order
+
+
+def rating_deltas(added=None, removed=None):
+    """{columna de agregado: delta} al agregar y/o quitar una calificación"""
+    deltas = {}
+    for rating, sign in ((added, 1), (removed, -1)):
+        if rating is None:
+            continue
+        for name, delta in (('review_count', sign), ('rating_sum', sign * rating), (f'rating_count_{rating}', sign)):
+            deltas[name] = deltas.get(name, 0) + delta
+    return {name: delta for name, delta in deltas.items() if delta}
+
+
+def amenity_clause(amenity_ids, mode='all'):
+    """Lugares con todas (mode='all') o alguna (mode='any') de las amenidades, como condición SQL"""
+    amenity_ids = list(dict.fromkeys(amenity_ids))
+    linked = select(place_amenity.c.place_id).where(place_amenity.c.amenity_id.in_(amenity_ids))
+    if mode == 'all':
+        linked = linked.group_by(place_amenity.c.place_id).having(
+            func.count(place_amenity.c.amenity_id) == len(amenity_ids)
+        )
+    return Place.id.in_(linked)
 
 
 # Repositorio basado en SQLAlchemy
 class SQLAlchemyRepository(Repository):
+    IN_CHUNK_SIZE = 500
+
     def __init__(self, model, db_instance):
         self.model = model
         self.db = db_instance  # Usamos la instancia de db pasada
@@ -90,35 +466,109 @@ class SQLAlchemyRepository(Repository):
     def add(self, obj):
         try: 
             self.db.session.add(obj)
-            self.db.session.commit()
+            unit_of_work.commit(self.db.session)
         except Exception as e:
-            self.db.session.rollback()  # Evita cambios no confirmados
+            unit_of_work.rollback(self.db.session)  # Evita cambios no confirmados
             logging.error(f"Error adding object: {e}")
+            raise
 
+    def add_many(self, objs):
+        """
+        Inserta objetos ya validados con un único INSERT executemany, sin commit
+        (el llamador confirma toda la transacción de una vez)
+        Inserts already validated objects with a single executemany INSERT and no
+        commit (the caller commits the whole transaction once)
+        """
+        mapper = sa_inspect(self.model)
+        rows = []
+        for obj in objs:
+            row = {}
+            for prop in mapper.column_attrs:
+                column = prop.columns[0]
+                value = getattr(obj, prop.key)
+                if value is None and column.default is not None:
+                    # Aplica el default de la columna y lo refleja en el objeto (id, fechas, contadores)
+                    value = column.default.arg(None) if column.default.is_callable else column.default.arg
+                    setattr(obj, prop.key, value)
+                row[column.key] = value
+            rows.append(row)
+        if rows:
+            self.db.session.execute(self.model.__table__.insert(), rows)
+        return objs
+
+    @replica_read
     def get(self, obj_id):
         return self.model.query.get(obj_id)
 
+    def get_many(self, obj_ids, options=()):
+        # Una sola consulta WHERE id IN (...) en lugar de un get() por id
+        # A single WHERE id IN (...) query instead of one get() per id
+        obj_ids = list(dict.fromkeys(obj_ids))
+        by_id = {}
+        query = self.model.query.options(*options)
+        # En bloques para no superar el límite de parámetros de SQLite
+        # In chunks to stay under SQLite's bound-parameter limit
+        for start in range(0, len(obj_ids), self.IN_CHUNK_SIZE):
+            chunk = obj_ids[start:start + self.IN_CHUNK_SIZE]
+            by_id.update((obj.id, obj) for obj in query.filter(self.model.id.in_(chunk)).all())
+        found = [by_id[obj_id] for obj_id in obj_ids if obj_id in by_id]
+        missing = [obj_id for obj_id in obj_ids if obj_id not in by_id]
+        return found, missing
+
+    @replica_read
     def get_all(self):
         return self.model.query.all()
 
+    @on_primary
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             self.model.query.filter_by(id=obj_id).update(data)
-            self.db.session.commit()
+            unit_of_work.commit(self.db.session)
 
     def delete(self, obj_id):
        try:
             deleted = self.model.query.filter_by(id=obj_id).delete()
             if deleted:
-                self.db.session.commit() 
+                unit_of_work.commit(self.db.session) 
        except Exception as e:
-            self.db.session.rollback()
+            unit_of_work.rollback(self.db.session)
             logging.error(f"Error deleting object: {e}")
 
+    @replica_read
     def get_by_attribute(self, attr_name, attr_value):
         return self.model.query.filter_by(**{attr_name: attr_value}).first()
 
+    def find_all_by_attribute(self, attr_name, attr_value):
+        return self.model.query.filter_by(**{attr_name: attr_value}).all()
+
+    def get_version(self, obj_id):
+        """
+        Solo (id, updated_at) de una entidad, sin cargarla; None si no existe
+        Just the (id, updated_at) of an entity, without loading it; None if missing
+        """
+        row = self.db.session.query(self.model.id, self.model.updated_at).filter(self.model.id == obj_id).first()
+        return (row.id, row.updated_at) if row else None
+
+    def get_collection_version(self):
+        """(max(updated_at), count(*)) de la tabla / of the whole table"""
+        row = self.db.session.query(func.max(self.model.updated_at), func.count(self.model.id)).one()
+        return row[0], row[1]
+
+    def get_page(self, after=None, limit=20, order_by='id', options=(), where=()):
+        # Paginación por clave (keyset): WHERE (col, id) > (:valor, :id) ORDER BY col, id LIMIT n+1
+        # Keyset pagination: only the requested page is read, whatever the table size
+        conditions, order = keyset_clauses(self.model, order_by, after)
+        query = self.model.query.options(*options).filter(*where, *conditions)
+        rows = query.order_by(*order).limit(limit + 1).all()
+
+        page = rows[:limit]
+        next_key = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_key = (getattr(last, order_by), last.id)
+        return page, next_key
+
 
 # Repositorio específico para el modelo de usuario
 class UserRepository(SQLAlchemyRepository):
@@ -147,7 +597,7 @@ class UserRepository(SQLAlchemyRepository):
                 user.email = email
             if is_admin is not None:
                 user.is_admin = is_admin
-            self.db.session.commit()
+            unit_of_work.commit(self.db.session)
             
 
         return user
@@ -156,27 +606,364 @@ class UserRepository(SQLAlchemyRepository):
         try:
             deleted = self.model.query.filter_by(id=user_id).delete()
             if deleted:
-                self.db.session.commit()
+                unit_of_work.commit(self.db.session)
         except Exception as e:
-            self.db.session.rollback()
+            unit_of_work.rollback(self.db.session)
             logging.error(f"Error deleting user: {e}")
 
 
 
+# Índice espacial: recalcula el geohash de un lugar cada vez que se inserta o actualiza
+# Spatial index: recompute a place's geohash whenever it is inserted or updated
+@event.listens_for(Place, 'before_insert')
+@event.listens_for(Place, 'before_update')
+def _index_place_location(mapper, connection, place):
+    if place.latitude is not None and place.longitude is not None:
+        place.geohash = geo.encode_geohash(place.latitude, place.longitude)
+
+
+# Estrategias de carga por endpoint para evitar consultas N+1 en Place.to_dict
+# Per-endpoint loading strategies that avoid N+1 queries in Place.to_dict
+#  - listados: selectinload lanza una sola consulta IN (...) por relación para toda la página
+#    lists: selectinload issues one IN (...) query per relationship for the whole page
+#  - detalle: joinedload para el dueño, amenidades con LEFT JOIN planos + contains_eager (ver
+#    get_place_details) y selectinload para las reseñas para no multiplicar filas reseñas x amenidades
+#    detail: joinedload for the owner, flat LEFT JOINs + contains_eager for amenities, and
+#    selectinload for reviews so the join doesn't multiply reviews x amenities
+PLACE_LIST_LOADERS = (selectinload(Place.reviews), selectinload(Place.amenities))
+PLACE_DETAIL_LOADERS = (joinedload(Place.user), contains_eager(Place.amenities), selectinload(Place.reviews))
+
+
+def _latest(*stamps):
+    """El updated_at más reciente, ignorando tablas vacías (None)"""
+    return max((stamp for stamp in stamps if stamp is not None), default=None)
+
+
 # Repositorio específico para el modelo de lugar
 class PlaceRepository(SQLAlchemyRepository):
     def __init__(self, db_instance):
         super().__init__(Place, db_instance)
 
+    def get_page(self, after=None, limit=20, order_by='id', options=PLACE_LIST_LOADERS, where=()):
+        return super().get_page(after, limit, order_by, options, where)
+
+    def get_collection_version(self):
+        """
+        (max(updated_at), conteos) de la lista de lugares. to_dict incluye reseñas y
+        amenidades: entran el último updated_at de las tres tablas y los conteos de
+        cada una y de place_amenity / The places list embeds reviews and amenities
+        """
+        stamps = [select(func.max(model.updated_at)).scalar_subquery() for model in (Review, Amenity)]
+        counts = [select(func.count()).select_from(table).scalar_subquery()
+                  for table in (Review.__table__, Amenity.__table__, place_amenity)]
+        row = self.db.session.query(func.max(Place.updated_at), func.count(Place.id), *stamps, *counts).one()
+        return _latest(*row[:1], *row[2:4]), (row[1], *row[4:])
+
+    def add_many(self, places):
+        # El INSERT masivo no dispara los eventos del mapper: se calcula aquí el geohash
+        # Bulk INSERT bypasses mapper events, so the geohash is computed here
+        for place in places:
+            place.geohash = geo.encode_geohash(place.latitude, place.longitude)
+        return super().add_many(places)
+
+    def add_amenity_links(self, links):
+        """Inserta pares (place_id, amenity_id) con un executemany, sin commit"""
+        if links:
+            self.db.session.execute(place_amenity.insert(), [
+                {'place_id': place_id, 'amenity_id': amenity_id} for place_id, amenity_id in links
+            ])
+            # El índice de amenidades no ve este INSERT directo: se le avisa aquí
+            amenity_index.record_links(self.db.session, links)
+
+    def iter_amenity_links(self, place_ids=None):
+        """Pares (place_id, amenity_id), de todos los lugares o solo de place_ids"""
+        query = select(place_amenity.c.place_id, place_amenity.c.amenity_id)
+        if place_ids is None:
+            yield from self.db.session.execute(query.execution_options(yield_per=5000))
+            return
+        place_ids = list(place_ids)
+        for start in range(0, len(place_ids), self.IN_CHUNK_SIZE):
+            chunk = place_ids[start:start + self.IN_CHUNK_SIZE]
+            yield from self.db.session.execute(query.where(place_amenity.c.place_id.in_(chunk)))
+
+    def iter_place_columns(self, since=None, place_ids=None):
+        """
+        Filas con las columnas numéricas de cada lugar, en streaming y sin crear entidades;
+        con `since`, solo las modificadas desde ese updated_at (inclusive); con `place_ids`,
+        solo esos lugares
+        """
+        table = self.model.__table__
+        query = select(
+            table.c.id, table.c.price, table.c.latitude, table.c.longitude, table.c.owner_id,
+            table.c.review_count, table.c.rating_sum, table.c.updated_at
+        )
+        if since is not None:
+            query = query.where(table.c.updated_at >= since)
+        if place_ids is None:
+            yield from self.db.session.execute(query.execution_options(yield_per=10000))
+            return
+        place_ids = list(place_ids)
+        for start in range(0, len(place_ids), self.IN_CHUNK_SIZE):
+            yield from self.db.session.execute(query.where(table.c.id.in_(place_ids[start:start + self.IN_CHUNK_SIZE])))
+
+    def iter_place_ids(self):
+        """Todos los IDs de lugares, en streaming (recorre solo el índice de la clave primaria)"""
+        table = self.model.__table__
+        yield from self.db.session.execute(select(table.c.id).execution_options(yield_per=10000)).scalars()
+
+    def iter_deleted_place_ids(self, since):
+        """IDs de los lugares borrados desde `since` (inclusive), según las lápidas del trigger"""
+        query = select(place_deletions.c.place_id).where(place_deletions.c.deleted_at >= since)
+        yield from self.db.session.execute(query).scalars()
+
+    def count(self):
+        return self.db.session.query(func.count(self.model.id)).scalar()
+
+    def amenity_filter(self, amenity_ids, mode='all'):
+        """Condición SQL equivalente a AmenityBitmapIndex.match (para cuando el índice está frío)"""
+        return amenity_clause(amenity_ids, mode)
+
+    def get_version(self, obj_id):
+        # El detalle del lugar incluye reseñas, dueño y amenidades: la versión es el updated_at más
+        # reciente de todos más los conteos de reseñas y de amenidades (quitar una no sube ningún updated_at)
+        # The place detail embeds reviews, owner and amenities: newest updated_at of all plus both counts
+        place_id = self.model.id
+        links = place_amenity.join(Amenity, Amenity.id == place_amenity.c.amenity_id)
+        row = (
+            self.db.session.query(
+                place_id,
+                self.model.updated_at,
+                select(func.max(Review.updated_at)).where(Review.place_id == place_id).scalar_subquery(),
+                select(func.count(Review.id)).where(Review.place_id == place_id).scalar_subquery(),
+                select(User.updated_at).where(User.id == self.model.owner_id).scalar_subquery(),
+                select(func.max(Amenity.updated_at)).select_from(links)
+                .where(place_amenity.c.place_id == place_id).scalar_subquery(),
+                select(func.count()).select_from(place_amenity)
+                .where(place_amenity.c.place_id == place_id).scalar_subquery(),
+            )
+            .filter(place_id == obj_id)
+            .first()
+        )
+        if not row:
+            return None
+        place_id, updated_at, newest_review, review_count, owner_updated, newest_amenity, amenity_count = row
+        return place_id, _latest(updated_at, newest_review, owner_updated, newest_amenity), review_count, amenity_count
+
+    def get_search_document(self, place_id):
+        """(id, título, descripción, texto de reseñas) para el índice de búsqueda; None si no existe"""
+        row = self.db.session.query(self.model.id, self.model.title, self.model.description).filter_by(id=place_id).first()
+        if not row:
+            return None
+        texts = [text for (text,) in self.db.session.query(Review.text).filter(Review.place_id == place_id)]
+        return row.id, row.title, row.description, " ".join(texts)
+
+    def iter_search_documents(self):
+        """Todos los documentos de búsqueda, leyendo solo las columnas necesarias"""
+        reviews = defaultdict(list)
+        for place_id, text in self.db.session.query(Review.place_id, Review.text).yield_per(1000):
+            reviews[place_id].append(text)
+        query = self.db.session.query(self.model.id, self.model.title, self.model.description).yield_per(1000)
+        for row in query:
+            yield row.id, row.title, row.description, " ".join(reviews.pop(row.id, ()))
+
+    def get_place_details(self, place_id):
+        """Lugar con dueño, amenidades y reseñas ya cargados / Place with owner, amenities and reviews loaded"""
+        # joinedload(Place.amenities) genera LEFT JOIN (place_amenity JOIN amenities), que SQLite
+        # materializa recorriendo toda place_amenity; con dos LEFT JOIN planos ambos son búsquedas
+        # por índice. Sin LIMIT (first() lo aplicaría a las filas unidas y cortaría las amenidades).
+        # joinedload's nested secondary join makes SQLite scan all of place_amenity; two flat LEFT
+        # JOINs are index searches. No LIMIT: it would truncate the joined amenity rows.
+        places = (
+            self.model.query
+            .outerjoin(place_amenity, place_amenity.c.place_id == self.model.id)
+            .outerjoin(Amenity, Amenity.id == place_amenity.c.amenity_id)
+            .options(*PLACE_DETAIL_LOADERS)
+            .filter(self.model.id == place_id)
+            .all()
+        )
+        return places[0] if places else None
+
+    @on_primary
+    def update(self, obj_id, data):
+        # Se actualiza vía ORM (no UPDATE masivo) para pasar por las validaciones
+        # y mantener el geohash al día
+        # Update through the ORM (not a bulk UPDATE) so validations run and the geohash stays current
+        obj = self.get(obj_id)
+        if obj:
+            for key, value in data.items():
+                setattr(obj, key, value)
+            unit_of_work.commit(self.db.session)
+
+    @replica_read
     def get_places_by_owner(self, owner_id):
         return self.model.query.filter_by(owner_id=owner_id).all()
 
+    def apply_rating_delta(self, place_id, added=None, removed=None):
+        """
+        Ajusta los agregados de calificación con un único UPDATE atómico (sin commit:
+        se confirma junto con el cambio de la reseña)
+        Adjusts the rating aggregates with a single atomic UPDATE (no commit: it is
+        committed together with the review change)
+        """
+        values = {getattr(self.model, name): getattr(self.model, name) + delta
+                  for name, delta in rating_deltas(added, removed).items()}
+        if values:
+            self.model.query.filter_by(id=place_id).update(values, synchronize_session=False)
+
+    def apply_rating_deltas(self, ratings_by_place):
+        """
+        Versión por lotes de apply_rating_delta: {place_id: [calificaciones añadidas]}
+        aplicado con un solo UPDATE executemany, sin commit
+        Batch version of apply_rating_delta: {place_id: [added ratings]} applied with
+        a single executemany UPDATE and no commit
+        """
+        if not ratings_by_place:
+            return
+        table = self.model.__table__
+        columns = ['review_count', 'rating_sum'] + [f'rating_count_{stars}' for stars in range(1, 6)]
+        stmt = (
+            table.update()
+            .where(table.c.id == bindparam('b_place_id'))
+            .values(**{column: table.c[column] + bindparam(f'b_{column}') for column in columns})
+        )
+        params = []
+        for place_id, ratings in ratings_by_place.items():
+            row = {'b_place_id': place_id, 'b_review_count': len(ratings), 'b_rating_sum': sum(ratings)}
+            for stars in range(1, 6):
+                row[f'b_rating_count_{stars}'] = ratings.count(stars)
+            params.append(row)
+        self.db.session.execute(stmt, params)
+
+    def get_facets(self, where=(), price_edges=(50, 100, 200, 500)):
+        """
+        Conteos por faceta para los lugares que cumplen `where`, con dos consultas agrupadas:
+        una sobre places (precio x calificación) y otra sobre place_amenity.
+        Facet counts for the places matching `where`, with two grouped queries.
+
+        Devuelve (conteos por (índice de precio, estrellas), [(amenity_id, nombre, conteo)]);
+        estrellas = floor(promedio), 0 si no tiene reseñas.
+        """
+        table = self.model.__table__
+        price_bucket = case(
+            *[(table.c.price < edge, position) for position, edge in enumerate(price_edges)],
+            else_=len(price_edges)
+        )
+        stars = case(
+            (table.c.review_count == 0, 0),
+            else_=table.c.rating_sum // table.c.review_count
+        )
+        matching = select(self.model.id).where(*where)
+        rows = self.db.session.execute(
+            select(price_bucket.label('price'), stars.label('stars'), func.count().label('count'))
+            .where(self.model.id.in_(matching))
+            .group_by('price', 'stars')
+        ).all()
+
+        link = place_amenity.alias('link')
+        amenity_rows = self.db.session.execute(
+            select(Amenity.id, Amenity.name, func.count(link.c.place_id))
+            .outerjoin(link, and_(link.c.amenity_id == Amenity.id, link.c.place_id.in_(matching)))
+            .group_by(Amenity.id, Amenity.name)
+            .order_by(func.count(link.c.place_id).desc(), Amenity.name)
+        ).all()
+        return {(row.price, int(row.stars)): row.count for row in rows}, [tuple(row) for row in amenity_rows]
+
+    def price_filter(self, min_price=None, max_price=None):
+        """Condiciones de rango de precio / Price range conditions"""
+        conditions = []
+        if min_price is not None:
+            conditions.append(self.model.__table__.c.price >= min_price)
+        if max_price is not None:
+            conditions.append(self.model.__table__.c.price <= max_price)
+        return conditions
+
+    def recompute_rating_aggregates(self):
+        """
+        Recalcula en bloque los agregados de todos los lugares a partir de las reseñas
+        Bulk-recomputes every place's aggregates from the reviews table
+        """
+        table = self.model.__table__
+        aggregates = [
+            func.count(Review.id).label('review_count'),
+            func.sum(Review.rating).label('rating_sum'),
+        ] + [
+            func.sum(case((Review.rating == stars, 1), else_=0)).label(f'rating_count_{stars}')
+            for stars in range(1, 6)
+        ]
+        rows = self.db.session.query(Review.place_id, *aggregates).group_by(Review.place_id).all()
+
+        try:
+            columns = ['review_count', 'rating_sum'] + [f'rating_count_{stars}' for stars in range(1, 6)]
+            self.db.session.execute(table.update().values(**{column: 0 for column in columns}))
+            if rows:
+                stmt = (
+                    table.update()
+                    .where(table.c.id == bindparam('b_place_id'))
+                    .values(**{column: bindparam(f'b_{column}') for column in columns})
+                )
+                self.db.session.execute(stmt, [
+                    dict({'b_place_id': row.place_id}, **{f'b_{column}': getattr(row, column) for column in columns})
+                    for row in rows
+                ])
+            unit_of_work.commit(self.db.session)
+        except Exception as e:
+            unit_of_work.rollback(self.db.session)
+            logging.error(f"Error recomputing rating aggregates: {e}")
+            raise
+        return len(rows)
+
+    def get_places_in_cells(self, cells):
+        """
+        Lugares cuyo geohash empieza por alguna de las celdas dadas
+        Places whose geohash starts with any of the given cells
+        """
+        # Un rango [celda, celda + '{') por celda usa el índice de geohash ('{' va justo después de 'z')
+        # One [cell, cell + '{') range per cell uses the geohash index ('{' sorts right after 'z')
+        ranges = [and_(self.model.geohash >= cell, self.model.geohash < cell + '{') for cell in sorted(cells)]
+        return self.model.query.options(*PLACE_LIST_LOADERS).filter(or_(*ranges)).all()
+
+    def get_places_near(self, latitude, longitude, radius_km, limit=None):
+        """
+        Lugares dentro del radio, ordenados por distancia: [(lugar, distancia_km)]
+        Places within the radius, sorted by distance: [(place, distance_km)]
+        """
+        bbox = geo.radius_bbox(latitude, longitude, radius_km)
+        results = []
+        for place in self.get_places_in_cells(geo.covering_cells(bbox)):
+            distance = geo.haversine_km(latitude, longitude, place.latitude, place.longitude)
+            if distance <= radius_km:
+                results.append((place, distance))
+        results.sort(key=lambda item: item[1])
+        return results[:limit] if limit else results
+
+    def get_places_in_bbox(self, bbox, limit=None):
+        """
+        Lugares dentro de la caja (min_lon, min_lat, max_lon, max_lat),
+        ordenados por distancia al centro: [(lugar, distancia_km)]
+        Places inside the (min_lon, min_lat, max_lon, max_lat) box,
+        sorted by distance to its center: [(place, distance_km)]
+        """
+        min_lon, min_lat, max_lon, max_lat = bbox
+        center_lat = (min_lat + max_lat) / 2
+        center_lon = (min_lon + max_lon) / 2
+        if min_lon > max_lon:
+            center_lon = center_lon + 180.0 if center_lon <= 0 else center_lon - 180.0
+
+        results = []
+        for place in self.get_places_in_cells(geo.covering_cells(bbox)):
+            if geo.in_bbox(place.latitude, place.longitude, bbox):
+                distance = geo.haversine_km(center_lat, center_lon, place.latitude, place.longitude)
+                results.append((place, distance))
+        results.sort(key=lambda item: item[1])
+        return results[:limit] if limit else results
+
 
 # Repositorio específico para el modelo de reseña
 class ReviewRepository(SQLAlchemyRepository):
     def __init__(self, db_instance):
         super().__init__(Review, db_instance)
 
+    @replica_read
     def get_reviews_by_place(self, place_id):
         return self.model.query.filter_by(place_id=place_id).all()
 
@@ -185,3 +972,291 @@ class ReviewRepository(SQLAlchemyRepository):
 class AmenityRepository(SQLAlchemyRepository):
     def __init__(self, db_instance):
         super().__init__(Amenity, db_instance)
+
+
+# Repositorios particionados (ver app/persistence/sharding.py)
+# Sharded repositories: places, their amenity links and their reviews live on the place's shard
+class ShardedRepository(Repository):
+    """
+    Repository sobre las particiones de un ShardSet. Las operaciones que llevan la clave de
+    partición (el id del lugar) van a una sola partición; el resto se reparte entre todas y
+    los resultados se combinan (scatter-gather). Las escrituras se confirman en la sesión
+    particionada: commit()/rollback() para las que no confirman solas (add_many, links).
+    Each shard holds whole places; lookups by place id hit one shard, anything else
+    is scattered to every shard and merged.
+    """
+    IN_CHUNK_SIZE = 500
+
+    def __init__(self, model, shards, shard_key):
+        self.model = model
+        self.shards = shards
+        self.shard_key = shard_key  # atributo con el id del lugar
+
+    @property
+    def session(self):
+        return self.shards.session
+
+    def _targets(self, attr_name=None, attr_value=None):
+        if attr_name == self.shard_key:
+            return [self.shards.shard_for(attr_value)]
+        if attr_name == 'id':
+            shard = self._shard_of_id(attr_value)
+            if shard is not None:
+                return [shard]
+        return list(self.shards.names)
+
+    def _shard_of_id(self, obj_id):
+        """Partición que guarda ese id, o None si el id no la dice / Shard implied by the id, if any"""
+        return self.shards.shard_for(obj_id) if self.shard_key == 'id' else None
+
+    def _scatter(self, statement, shards=None):
+        """Ejecuta el SELECT en cada partición: {partición: [objetos]}"""
+        return {shard: self.session.execute(statement.options(set_shard_id(shard))).scalars().all()
+                for shard in (shards if shards is not None else self.shards.names)}
+
+    @staticmethod
+    def _merge(results, key):
+        # Cada partición ya viene ordenada: merge k-way sin reordenar todo
+        return heapq.merge(*results.values(), key=key)
+
+    def commit(self):
+        unit_of_work.commit(self.session)
+
+    def rollback(self):
+        unit_of_work.rollback(self.session)
+
+    def add(self, obj):
+        if getattr(obj, 'id', None) is None:
+            obj.id = str(uuid.uuid4())  # la partición de un lugar sale de su id
+        try:
+            self.session.add(obj)
+            unit_of_work.commit(self.session)
+        except Exception as e:
+            unit_of_work.rollback(self.session)
+            logging.error(f"Error adding object: {e}")
+            raise
+
+    def add_many(self, objs):
+        """Agrega los objetos sin confirmar; cada partición recibe solo sus filas"""
+        objs = list(objs)
+        for obj in objs:
+            if getattr(obj, 'id', None) is None:
+                obj.id = str(uuid.uuid4())
+        self.session.add_all(objs)
+        self.session.flush()
+        return objs
+
+    def get(self, obj_id):
+        # identity_chooser solo acota el mapa de identidad: sin identity_token el SELECT iría a todas
+        targets = self._targets('id', obj_id)
+        if len(targets) == 1:
+            return self.session.get(self.model, obj_id, identity_token=targets[0])
+        return self.session.get(self.model, obj_id)
+
+    def get_many(self, obj_ids):
+        obj_ids = list(dict.fromkeys(obj_ids))
+        by_shard = defaultdict(list)
+        for obj_id in obj_ids:
+            for shard in self._targets('id', obj_id):
+                by_shard[shard].append(obj_id)
+        by_id = {}
+        for shard, ids in by_shard.items():
+            for start in range(0, len(ids), self.IN_CHUNK_SIZE):
+                chunk = ids[start:start + self.IN_CHUNK_SIZE]
+                statement = select(self.model).where(self.model.id.in_(chunk))
+                by_id.update((obj.id, obj) for obj in self._scatter(statement, [shard])[shard])
+        found = [by_id[obj_id] for obj_id in obj_ids if obj_id in by_id]
+        missing = [obj_id for obj_id in obj_ids if obj_id not in by_id]
+        return found, missing
+
+    def get_all(self):
+        results = self._scatter(select(self.model).order_by(self.model.id))
+        return list(self._merge(results, key=lambda obj: obj.id))
+
+    def get_collection_version(self):
+        """(max(updated_at), count(*)) sumando todas las particiones / across every shard"""
+        table = self.model.__table__
+        rows = [self.session.execute(select(func.max(table.c.updated_at), func.count()).select_from(table),
+                                     bind_arguments={'shard_id': shard}).one()
+                for shard in self.shards.names]
+        return _latest(*(row[0] for row in rows)), sum(row[1] for row in rows)
+
+    def update(self, obj_id, data):
+        obj = self.get(obj_id)
+        if obj:
+            for key, value in data.items():
+                setattr(obj, key, value)
+            unit_of_work.commit(self.session)
+        return obj
+
+    def delete(self, obj_id):
+        try:
+            for shard in self._targets('id', obj_id):
+                self.session.execute(delete(self.model).where(self.model.id == obj_id),
+                                     bind_arguments={'shard_id': shard})
+            unit_of_work.commit(self.session)
+        except Exception as e:
+            unit_of_work.rollback(self.session)
+            logging.error(f"Error deleting object: {e}")
+
+    def get_by_attribute(self, attr_name, attr_value):
+        statement = select(self.model).filter_by(**{attr_name: attr_value}).limit(1)
+        for shard in self._targets(attr_name, attr_value):
+            found = self._scatter(statement, [shard])[shard]
+            if found:
+                return found[0]
+        return None
+
+    def find_all_by_attribute(self, attr_name, attr_value):
+        statement = select(self.model).filter_by(**{attr_name: attr_value}).order_by(self.model.id)
+        results = self._scatter(statement, self._targets(attr_name, attr_value))
+        return list(self._merge(results, key=lambda obj: obj.id))
+
+    def get_page(self, after=None, limit=20, order_by='id', options=(), where=()):
+        # Cada partición devuelve su propia página de limit+1 filas con el mismo keyset; las
+        # primeras limit+1 del total están entre ellas, así que alcanza con mezclarlas
+        # Each shard returns its own limit+1 keyset page; the global page is their k-way merge
+        conditions, order = keyset_clauses(self.model, order_by, after)
+        statement = select(self.model).options(*options).where(*where, *conditions).order_by(*order).limit(limit + 1)
+
+        def sort_key(obj):
+            value = getattr(obj, order_by)
+            return (value is not None, value), obj.id  # NULL primero, como SQLite
+
+        rows = list(itertools.islice(self._merge(self._scatter(statement), key=sort_key), limit + 1))
+        page = rows[:limit]
+        next_key = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_key = (getattr(last, order_by), last.id)
+        return page, next_key
+
+
+class ShardedPlaceRepository(ShardedRepository):
+    """
+    Lugares particionados. Las amenidades y el dueño viven en la base principal: se cargan
+    aparte y se asignan a la relación (Place.amenities, Place.user) como ya cargadas.
+    """
+
+    def __init__(self, shards, db_instance):
+        super().__init__(Place, shards, 'id')
+        self.db = db_instance  # base principal: dueños y amenidades
+
+    def _attach_amenities(self, places):
+        """Carga las amenidades de los lugares (links en su partición, amenidades en la principal)"""
+        if not places:
+            return places
+        by_shard = defaultdict(list)
+        for place in places:
+            by_shard[sa_inspect(place).identity_token or self.shards.shard_for(place.id)].append(place.id)
+        links = defaultdict(list)
+        for shard, place_ids in by_shard.items():
+            for start in range(0, len(place_ids), self.IN_CHUNK_SIZE):
+                chunk = place_ids[start:start + self.IN_CHUNK_SIZE]
+                rows = self.session.execute(
+                    select(place_amenity.c.place_id, place_amenity.c.amenity_id)
+                    .where(place_amenity.c.place_id.in_(chunk)).order_by(place_amenity.c.amenity_id),
+                    bind_arguments={'shard_id': shard},
+                )
+                for place_id, amenity_id in rows:
+                    links[place_id].append(amenity_id)
+        amenity_ids = list(dict.fromkeys(amenity_id for ids in links.values() for amenity_id in ids))
+        amenities = {}
+        for start in range(0, len(amenity_ids), self.IN_CHUNK_SIZE):
+            chunk = amenity_ids[start:start + self.IN_CHUNK_SIZE]
+            amenities.update((amenity.id, amenity) for amenity in Amenity.query.filter(Amenity.id.in_(chunk)))
+        for place in places:
+            set_committed_value(place, 'amenities',
+                                [amenities[amenity_id] for amenity_id in links[place.id] if amenity_id in amenities])
+        return places
+
+    def get_page(self, after=None, limit=20, order_by='id', options=(selectinload(Place.reviews),), where=()):
+        page, next_key = super().get_page(after, limit, order_by, options, where)
+        return self._attach_amenities(page), next_key
+
+    def get_place_details(self, place_id):
+        """Lugar con dueño, amenidades y reseñas ya cargados (lugar y reseñas de una sola partición)"""
+        shard = self.shards.shard_for(place_id)
+        statement = select(self.model).options(selectinload(Place.reviews)).where(self.model.id == place_id)
+        found = self._scatter(statement, [shard])[shard]
+        if not found:
+            return None
+        place = found[0]
+        self._attach_amenities([place])
+        set_committed_value(place, 'user', self.db.session.get(User, place.owner_id))
+        return place
+
+    def get_places_by_owner(self, owner_id):
+        return self._attach_amenities(self.find_all_by_attribute('owner_id', owner_id))
+
+    def add_amenity_links(self, links):
+        """Inserta pares (place_id, amenity_id) en la partición de cada lugar, sin commit"""
+        by_shard = defaultdict(list)
+        for place_id, amenity_id in links:
+            by_shard[self.shards.shard_for(place_id)].append({'place_id': place_id, 'amenity_id': amenity_id})
+        for shard, rows in by_shard.items():
+            self.session.execute(place_amenity.insert(), rows, bind_arguments={'shard_id': shard})
+
+    def apply_rating_delta(self, place_id, added=None, removed=None):
+        """Igual que PlaceRepository.apply_rating_delta, en la partición del lugar (sin commit)"""
+        table = self.model.__table__
+        values = {name: table.c[name] + delta for name, delta in rating_deltas(added, removed).items()}
+        if values:
+            self.session.execute(table.update().where(table.c.id == place_id).values(values),
+                                 bind_arguments={'shard_id': self.shards.shard_for(place_id)})
+
+    def count(self):
+        return sum(self.session.execute(select(func.count()).select_from(self.model.__table__),
+                                        bind_arguments={'shard_id': shard}).scalar()
+                   for shard in self.shards.names)
+
+    def get_collection_version(self):
+        """
+        Igual que PlaceRepository.get_collection_version: lugares, reseñas y links de cada
+        partición, amenidades de la base principal / Same shape as the unsharded version
+        """
+        places, reviews = self.model.__table__, Review.__table__
+        statement = select(
+            select(func.max(places.c.updated_at)).scalar_subquery(),
+            select(func.max(reviews.c.updated_at)).scalar_subquery(),
+            *(select(func.count()).select_from(table).scalar_subquery() for table in (places, reviews, place_amenity)),
+        )
+        rows = [self.session.execute(statement, bind_arguments={'shard_id': shard}).one()
+                for shard in self.shards.names]
+        amenity_max, amenity_count = self.db.session.query(func.max(Amenity.updated_at), func.count(Amenity.id)).one()
+        latest = _latest(amenity_max, *(stamp for row in rows for stamp in row[:2]))
+        place_count, review_count, link_count = (sum(row[column] for row in rows) for column in (2, 3, 4))
+        return latest, (place_count, review_count, amenity_count, link_count)
+
+
+class ShardedReviewRepository(ShardedRepository):
+    """
+    Reseñas guardadas en la partición de su lugar. El id de cada reseña lleva la cubeta
+    de su lugar (ShardSet.review_id), así get/update/delete por id van a una sola partición.
+    Reviews live on their place's shard; their id encodes the place's bucket.
+    """
+
+    def __init__(self, shards):
+        super().__init__(Review, shards, 'place_id')
+
+    def _shard_of_id(self, obj_id):
+        return self.shards.shard_for_review(obj_id)
+
+    def _assign_id(self, review):
+        if getattr(review, 'id', None) is None:
+            review.id = self.shards.review_id(review.place_id)
+        elif review_bucket(review.id, self.shards.buckets) != bucket_for(review.place_id, self.shards.buckets):
+            raise ValueError("A sharded review id must start with its place's bucket; leave id unset.")
+
+    def add(self, obj):
+        self._assign_id(obj)
+        super().add(obj)
+
+    def add_many(self, objs):
+        objs = list(objs)
+        for obj in objs:
+            self._assign_id(obj)
+        return super().add_many(objs)
+
+    def get_reviews_by_place(self, place_id):
+        return self.find_all_by_attribute('place_id', place_id)
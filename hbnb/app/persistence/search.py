@@ -0,0 +1,351 @@
+# app/persistence/search.py
+
+"""
+Búsqueda de texto completo sobre lugares (título, descripción y texto de sus reseñas)
+Full-text search over places (title, description and the text of their reviews)
+
+Cada lugar es un documento con tres campos. En SQLite se usa una tabla virtual
+FTS5 ordenada con bm25(); en PostgreSQL, una columna tsvector con índice GIN
+ordenada con ts_rank(). Con cualquier otro motor, o con un SQLite sin FTS5, se
+usa el índice invertido en memoria (BM25 por campo): se elige una vez por motor
+y se registra una advertencia, así las escrituras nunca dependen de que haya
+búsqueda en la base.
+
+Each place is one document with three fields. SQLite uses a FTS5 virtual table
+ranked with bm25(); PostgreSQL a GIN-indexed tsvector ranked with ts_rank().
+Any other engine (or SQLite without FTS5) falls back to the in-memory inverted
+index, so writes never depend on the database offering full-text search.
+"""
+
+import logging
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.persistence.repository import PlaceRepository
+
+FIELDS = ('title', 'description', 'reviews')
+
+# Peso de cada campo en la puntuación / Weight of each field in the score
+FIELD_WEIGHTS = {'title': 10.0, 'description': 4.0, 'reviews': 1.0}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(value):
+    """Minúsculas, sin acentos, palabras alfanuméricas / Lowercase, accent-free word tokens"""
+    if not value:
+        return []
+    value = unicodedata.normalize('NFKD', value.lower())
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return _TOKEN_RE.findall(value)
+
+
+class InvertedIndex:
+    """Índice invertido en memoria con BM25 por campo / In-memory inverted index with per-field BM25"""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings = {field: defaultdict(dict) for field in FIELDS}  # campo -> término -> {doc: tf}
+        self._lengths = {field: {} for field in FIELDS}  # campo -> doc -> cantidad de términos
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lengths['title'])
+
+    def clear(self):
+        with self._lock:
+            for field in FIELDS:
+                self._postings[field].clear()
+                self._lengths[field].clear()
+
+    def _remove_locked(self, place_id):
+        for field in FIELDS:
+            postings = self._postings[field]
+            for term in [term for term, docs in postings.items() if place_id in docs]:
+                del postings[term][place_id]
+                if not postings[term]:
+                    del postings[term]
+            self._lengths[field].pop(place_id, None)
+
+    def index_place(self, place_id, title, description, reviews):
+        with self._lock:
+            self._remove_locked(place_id)
+            for field, value in zip(FIELDS, (title, description, reviews)):
+                counts = Counter(tokenize(value))
+                for term, tf in counts.items():
+                    self._postings[field][term][place_id] = tf
+                self._lengths[field][place_id] = sum(counts.values())
+
+    def index_many(self, documents):
+        for document in documents:
+            self.index_place(*document)
+
+    def remove_place(self, place_id):
+        with self._lock:
+            self._remove_locked(place_id)
+
+    def search(self, query, limit, offset=0):
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+        with self._lock:
+            total_docs = len(self._lengths['title'])
+            # Todos los términos deben aparecer en algún campo (igual que MATCH de FTS5)
+            # Every term must appear in some field (same as FTS5 MATCH)
+            candidates = None
+            for term in terms:
+                docs = set()
+                for field in FIELDS:
+                    docs.update(self._postings[field].get(term, ()))
+                candidates = docs if candidates is None else candidates & docs
+                if not candidates:
+                    return [], 0
+
+            scores = dict.fromkeys(candidates, 0.0)
+            for field in FIELDS:
+                lengths = self._lengths[field]
+                avg_length = (sum(lengths.values()) / len(lengths)) if lengths else 0.0
+                for term in terms:
+                    docs = self._postings[field].get(term)
+                    if not docs:
+                        continue
+                    idf = math.log(1 + (total_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for place_id in candidates.intersection(docs):
+                        tf = docs[place_id]
+                        norm = 1 - self.B + self.B * (lengths[place_id] / avg_length if avg_length else 0)
+                        scores[place_id] += FIELD_WEIGHTS[field] * idf * tf * (self.K1 + 1) / (tf + self.K1 * norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[offset:offset + limit], len(ranked)
+
+
+class InMemorySearchIndex(InvertedIndex):
+    """
+    Respaldo para motores sin búsqueda en la base: un InvertedIndex por proceso que se
+    carga desde la base en la primera búsqueda. Hasta entonces las escrituras no lo
+    tocan (la carga las lee); después se aplican al instante, sin esperar al commit, y
+    los cambios de otros procesos aparecen al reconstruirlo (rebuild_search_index).
+    Fallback for engines without database search: one per-process InvertedIndex,
+    loaded from the database on the first search.
+    """
+
+    def __init__(self, db_instance):
+        super().__init__()
+        self.db = db_instance
+        self.loaded = False
+        self._load_lock = threading.Lock()
+
+    def create(self):
+        pass  # nada que crear en la base / nothing to create in the database
+
+    def _ensure_loaded(self):
+        if self.loaded:
+            return
+        with self._load_lock:
+            if not self.loaded:
+                for document in PlaceRepository(self.db).iter_search_documents():
+                    InvertedIndex.index_place(self, *document)
+                self.loaded = True
+
+    def clear(self):
+        # Quien vacía el índice lo vuelve a llenar entero (rebuild_search_index)
+        super().clear()
+        self.loaded = True
+
+    def index_place(self, place_id, title, description, reviews):
+        if self.loaded:
+            super().index_place(place_id, title, description, reviews)
+
+    def remove_place(self, place_id):
+        if self.loaded:
+            super().remove_place(place_id)
+
+    def search(self, query, limit, offset=0):
+        self._ensure_loaded()
+        return super().search(query, limit, offset)
+
+
+class FTS5SearchIndex:
+    """Índice en una tabla virtual FTS5 de SQLite / Index stored in a SQLite FTS5 virtual table"""
+
+    TABLE = 'place_search'
+
+    def __init__(self, db_instance):
+        self.db = db_instance
+
+    def create(self):
+        # Sin commit: la tabla se confirma con la transacción en curso
+        # No commit: the table is committed with the ongoing transaction
+        self.db.session.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.TABLE} USING fts5("
+            "place_id UNINDEXED, title, description, reviews, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+
+    def _execute(self, statement, params=None):
+        # Si un rollback deshizo el CREATE, la tabla se vuelve a crear una vez
+        # If a rollback undid the CREATE, the table is created again once
+        try:
+            return self.db.session.execute(statement, params)
+        except OperationalError as e:
+            if 'no such table' not in str(e):
+                raise
+            self.create()
+            return self.db.session.execute(statement, params)
+
+    def index_place(self, place_id, title, description, reviews):
+        self.index_many([(place_id, title, description, reviews)])
+
+    def index_many(self, documents):
+        # Sin commit: se confirma junto con el cambio de la entidad
+        # No commit: it is committed together with the entity change
+        documents = list(documents)
+        if not documents:
+            return
+        self._execute(
+            text(f"DELETE FROM {self.TABLE} WHERE place_id = :place_id"),
+            [{'place_id': document[0]} for document in documents]
+        )
+        self._execute(
+            text(f"INSERT INTO {self.TABLE} (place_id, title, description, reviews) "
+                 "VALUES (:place_id, :title, :description, :reviews)"),
+            [dict(zip(('place_id',) + FIELDS, (document[0], *(value or '' for value in document[1:]))))
+             for document in documents]
+        )
+
+    def clear(self):
+        self._execute(text(f"DELETE FROM {self.TABLE}"))
+
+    def remove_place(self, place_id):
+        self._execute(text(f"DELETE FROM {self.TABLE} WHERE place_id = :place_id"), {'place_id': place_id})
+
+    def search(self, query, limit, offset=0):
+        # Cada término se cita para que la entrada del usuario no se interprete como sintaxis FTS5
+        # Every term is quoted so user input is never parsed as FTS5 syntax
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+        match = " ".join(f'"{term}"' for term in terms)
+        weights = ", ".join(str(FIELD_WEIGHTS[field]) for field in FIELDS)
+        total = self._execute(
+            text(f"SELECT count(*) FROM {self.TABLE} WHERE {self.TABLE} MATCH :match"), {'match': match}
+        ).scalar()
+        rows = self._execute(
+            text(f"SELECT place_id, -bm25({self.TABLE}, 0, {weights}) AS score FROM {self.TABLE} "
+                 f"WHERE {self.TABLE} MATCH :match ORDER BY bm25({self.TABLE}, 0, {weights}), place_id "
+                 "LIMIT :limit OFFSET :offset"),
+            {'match': match, 'limit': limit, 'offset': offset}
+        ).all()
+        return [(row.place_id, row.score) for row in rows], total
+
+
+class PostgresSearchIndex:
+    """Índice en una columna tsvector con GIN de PostgreSQL / Index stored in a GIN-indexed tsvector"""
+
+    TABLE = 'place_search'
+    # Etiqueta de peso de tsvector por campo; ts_rank recibe los pesos en orden {D, C, B, A}
+    LABELS = {'title': 'A', 'description': 'B', 'reviews': 'C'}
+    RANK_WEIGHTS = "{0.0, %s}" % ", ".join(
+        str(FIELD_WEIGHTS[field] / max(FIELD_WEIGHTS.values())) for field in reversed(FIELDS)
+    )
+
+    def __init__(self, db_instance):
+        self.db = db_instance
+
+    def create(self):
+        # Sin commit: la tabla se confirma con la transacción en curso
+        # No commit: the table is committed with the ongoing transaction
+        self.db.session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} (place_id VARCHAR(36) PRIMARY KEY, document tsvector NOT NULL)"
+        ))
+        self.db.session.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{self.TABLE}_document ON {self.TABLE} USING GIN (document)"
+        ))
+
+    @staticmethod
+    def _normalize(value):
+        # Los mismos términos que tokenize() (sin acentos): la configuración 'simple' no necesita unaccent
+        return " ".join(tokenize(value))
+
+    def index_place(self, place_id, title, description, reviews):
+        self.index_many([(place_id, title, description, reviews)])
+
+    def index_many(self, documents):
+        # Sin commit: se confirma junto con el cambio de la entidad
+        # No commit: it is committed together with the entity change
+        documents = list(documents)
+        if not documents:
+            return
+        vector = " || ".join(
+            f"setweight(to_tsvector('simple', :{field}), '{self.LABELS[field]}')" for field in FIELDS
+        )
+        self.db.session.execute(
+            text(f"INSERT INTO {self.TABLE} (place_id, document) VALUES (:place_id, {vector}) "
+                 "ON CONFLICT (place_id) DO UPDATE SET document = excluded.document"),
+            [dict(zip(('place_id',) + FIELDS, (document[0], *(self._normalize(value) for value in document[1:]))))
+             for document in documents]
+        )
+
+    def clear(self):
+        self.db.session.execute(text(f"DELETE FROM {self.TABLE}"))
+
+    def remove_place(self, place_id):
+        self.db.session.execute(text(f"DELETE FROM {self.TABLE} WHERE place_id = :place_id"), {'place_id': place_id})
+
+    def search(self, query, limit, offset=0):
+        # plainto_tsquery une los términos con AND y no interpreta sintaxis de la entrada
+        # plainto_tsquery ANDs the terms and never parses user input as tsquery syntax
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+        params = {'query': " ".join(terms), 'limit': limit, 'offset': offset}
+        total = self.db.session.execute(
+            text(f"SELECT count(*) FROM {self.TABLE} WHERE document @@ plainto_tsquery('simple', :query)"), params
+        ).scalar()
+        rows = self.db.session.execute(
+            text(f"SELECT place_id, ts_rank('{self.RANK_WEIGHTS}', document, query) AS score "
+                 f"FROM {self.TABLE}, plainto_tsquery('simple', :query) AS query WHERE document @@ query "
+                 "ORDER BY score DESC, place_id LIMIT :limit OFFSET :offset"),
+            params
+        ).all()
+        return [(row.place_id, row.score) for row in rows], total
+
+
+def fts5_available(db_instance):
+    """True si el motor es SQLite y fue compilado con FTS5 / True on SQLite built with FTS5"""
+    if db_instance.engine.dialect.name != 'sqlite':
+        return False
+    # Dentro de un SAVEPOINT de la sesión: no abre otra conexión ni toca la transacción en curso
+    # Inside a session SAVEPOINT: no second connection and the ongoing transaction is untouched
+    try:
+        with db_instance.session.begin_nested():
+            db_instance.session.execute(text("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)"))
+            db_instance.session.execute(text("DROP TABLE temp._fts5_probe"))
+        return True
+    except OperationalError:
+        return False
+
+
+def search_index_class(db_instance):
+    """FTS5SearchIndex o PostgresSearchIndex según el motor; InMemorySearchIndex si la base no tiene búsqueda"""
+    dialect = db_instance.engine.dialect.name
+    if dialect == 'postgresql':
+        return PostgresSearchIndex
+    if fts5_available(db_instance):
+        return FTS5SearchIndex
+    reason = "SQLite without FTS5" if dialect == 'sqlite' else dialect
+    logging.warning(f"Full-text search is not supported on {reason}: using the per-process in-memory index")
+    return InMemorySearchIndex
+
+
+def create_search_index(db_instance):
+    """Índice de búsqueda del motor, con su tabla creada si vive en la base / Search index, table created"""
+    index = search_index_class(db_instance)(db_instance)
+    index.create()
+    return index
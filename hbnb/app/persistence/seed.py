@@ -0,0 +1,280 @@
+# app/persistence/seed.py
+
+"""
+Generador de datos sintéticos a escala de producción
+Production-scale synthetic data generator
+
+Genera usuarios, amenidades, lugares, links place_amenity y reseñas con un
+generador pseudoaleatorio con semilla: la misma semilla produce siempre las
+mismas filas (ids, textos, precios, coordenadas, calificaciones).
+
+  - Las filas se insertan con INSERT executemany por lotes (batch_size) sin
+    pasar por el ORM, y se confirma cada commit_every filas (transacciones
+    grandes en lugar de una por fila).
+  - bcrypt se ejecuta una sola vez por contraseña de un pool pequeño
+    (password_pool) y los usuarios reutilizan esos hashes: el usuario n
+    tiene la contraseña seed_password(n, password_pool).
+  - Incluye los datos iniciales del antiguo init_data.sql (admin y amenidades),
+    así `flask seed` reemplaza a run_sql.py para cargar datos.
+  - Los agregados de calificación y el geohash se calculan al generar, así
+    los lugares quedan consistentes sin recalcular nada después.
+
+Rows are generated from a seeded PRNG (same seed, same rows), written with
+batched executemany INSERTs inside large transactions, and bcrypt runs once
+per password in a small pool instead of once per user.
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.persistence import geo
+
+# Datos iniciales que antes cargaba init_data.sql (eliminado) (mismos ids y mismo hash)
+# Initial data formerly loaded by init_data.sql (same ids and hash)
+ADMIN_FIXTURE = {
+    'id': '36c9057e-ddd3-4c3b-9731-9f487208bbc1',
+    'email': 'Aylin@hbnb.io',
+    'first_name': 'Aylin',
+    'last_name': 'Pintos',
+    'password': '$2b$12$RStd6NU.fBlTsVZlWU7cvujN3Pl3aA21mpyWqpVn9dno6g0lnGHGu',
+    'is_admin': True,
+}
+AMENITY_FIXTURES = {
+    'WiFi': 'b65a4b5d-8e4e-4970-92e4-94592f0d84e9',
+    'Swimming Pool': '7f647ee9-fb46-4f2b-babc-4087ae893a91',
+    'Air Conditioning': '2f5cfa41-41c9-4ce2-b5a2-c2748a6b42e0',
+}
+# Catálogo de amenidades compartido por todas las semillas / Amenity catalog shared by every seed
+AMENITY_NAMES = (
+    'WiFi', 'Swimming Pool', 'Air Conditioning', 'Parking', 'Kitchen', 'Heating', 'Washer', 'Dryer', 'Gym',
+    'Hot tub', 'Breakfast', 'Pets allowed', 'Fireplace', 'Workspace', 'TV', 'Balcony', 'Garden',
+    'Sea view', 'Elevator', 'EV charger',
+)
+WORDS = (
+    'bright', 'quiet', 'cozy', 'modern', 'rustic', 'spacious', 'central', 'charming', 'sunny', 'lake',
+    'beach', 'mountain', 'forest', 'loft', 'studio', 'cabin', 'villa', 'apartment', 'garden', 'terrace',
+    'view', 'river', 'old', 'town', 'harbor', 'family', 'design', 'historic', 'minimal', 'hidden',
+)
+# Centros urbanos (lat, lon) alrededor de los que se reparten los lugares
+CITIES = (
+    (40.4168, -3.7038), (48.8566, 2.3522), (-34.6037, -58.3816), (4.7110, -74.0721), (19.4326, -99.1332),
+    (35.6762, 139.6503), (-33.8688, 151.2093), (51.5074, -0.1278), (40.7128, -74.0060), (-22.9068, -43.1729),
+)
+BASE_TIME = datetime(2025, 1, 1)
+
+
+def seed_email(number, seed):
+    """Email del usuario sintético n (incluye la semilla: dos semillas no chocan)"""
+    return f"user{number}.s{seed}@example.com"
+
+
+def seed_password(number, password_pool):
+    """Contraseña en claro del usuario sintético n / Plain password of synthetic user n"""
+    return f"seed-password-{number % password_pool}"
+
+
+def amenity_id(name):
+    """Id estable de una amenidad del catálogo / Stable id of a catalog amenity"""
+    return AMENITY_FIXTURES.get(name) or str(uuid.uuid5(uuid.NAMESPACE_URL, f"hbnb:amenity:{name}"))
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _sentence(rng, low, high):
+    # choices(k=n) es una sola llamada: generar el texto domina el costo de sembrar
+    return ' '.join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+class SeedReport:
+    def __init__(self):
+        self.rows = {}  # tabla -> filas insertadas
+        self.seconds = 0.0
+        self.hash_seconds = 0.0
+
+    @property
+    def total_rows(self):
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_second(self):
+        # Solo la fase de inserción: el bcrypt del pool se informa aparte
+        insert_seconds = self.seconds - self.hash_seconds
+        return self.total_rows / insert_seconds if insert_seconds > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            'rows': dict(self.rows),
+            'total_rows': self.total_rows,
+            'seconds': round(self.seconds, 2),
+            'hash_seconds': round(self.hash_seconds, 2),
+            'rows_per_second': round(self.rows_per_second),
+        }
+
+
+class _BatchWriter:
+    """
+    Acumula filas por tabla y las inserta con executemany; confirma cada commit_every filas
+    Buffers rows per table, inserts them with executemany and commits every commit_every rows
+    """
+
+    def __init__(self, session, report, batch_size, commit_every):
+        self.session = session
+        self.report = report
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self.pending = {}
+        self.uncommitted = 0
+        self.commits = 0
+
+    def add(self, table, row):
+        rows = self.pending.setdefault(table, [])
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            # Todas las tablas, en orden de dependencia (usuarios y lugares antes que reseñas)
+            self.flush()
+
+    def flush(self):
+        for table, rows in self.pending.items():
+            if rows:
+                self.session.execute(table.insert(), rows)
+                self.report.rows[table.name] = self.report.rows.get(table.name, 0) + len(rows)
+                self.uncommitted += len(rows)
+                self.pending[table] = []
+        if self.uncommitted >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        self.session.commit()
+        self.uncommitted = 0
+        self.commits += 1
+
+    def close(self):
+        self.flush()
+        self.commit()
+
+
+class Seeder:
+    def __init__(self, db, password_service, seed=42, batch_size=10_000, commit_every=200_000, password_pool=16):
+        if batch_size <= 0 or commit_every <= 0 or password_pool <= 0:
+            raise ValueError("batch_size, commit_every and password_pool must be positive.")
+        self.db = db
+        self.passwords = password_service
+        self.seed = seed
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self.password_pool = password_pool
+
+    def already_seeded(self):
+        """True si esta semilla ya se cargó (su primer usuario existe)"""
+        return self.db.session.execute(
+            select(func.count()).select_from(User).where(User.email == seed_email(0, self.seed))
+        ).scalar() > 0
+
+    def load_fixtures(self):
+        """
+        Inserta el admin inicial y el catálogo de amenidades si faltan (idempotente);
+        devuelve {tabla: filas insertadas}
+        Inserts the initial admin and the amenity catalog when missing (idempotent)
+        """
+        session = self.db.session
+        inserted = {}
+        if not session.execute(select(User.id).where(User.email == ADMIN_FIXTURE['email'])).first():
+            session.execute(User.__table__.insert(), [dict(ADMIN_FIXTURE, created_at=BASE_TIME, updated_at=BASE_TIME)])
+            inserted[User.__tablename__] = 1
+        existing = set(session.execute(select(Amenity.id)).scalars())
+        missing = [{'id': amenity_id(name), 'name': name, 'description': None,
+                    'created_at': BASE_TIME, 'updated_at': BASE_TIME}
+                   for name in AMENITY_NAMES if amenity_id(name) not in existing]
+        if missing:
+            session.execute(Amenity.__table__.insert(), missing)
+            inserted[Amenity.__tablename__] = len(missing)
+        session.commit()
+        return inserted
+
+    def _hash_pool(self, report):
+        # bcrypt una vez por contraseña del pool, en paralelo en el pool de hilos del servicio
+        started = time.perf_counter()
+        futures = [self.passwords.executor.submit(self.passwords._hash, seed_password(number, self.password_pool),
+                                                  self.passwords.rounds)
+                   for number in range(self.password_pool)]
+        hashes = [future.result() for future in futures]
+        report.hash_seconds = time.perf_counter() - started
+        return hashes
+
+    def run(self, users, places, reviews_per_place=3, amenities_per_place=3, progress=None):
+        """
+        Inserta `users` usuarios y `places` lugares con en promedio reviews_per_place
+        reseñas y amenities_per_place amenidades cada uno; devuelve un SeedReport.
+        progress(report, lugares_generados) se llama en cada commit.
+        """
+        if users <= 0 or places < 0:
+            raise ValueError("At least one user is required and places cannot be negative.")
+        if self.already_seeded():
+            raise ValueError(f"Seed {self.seed} is already loaded; reset the database or use another seed.")
+
+        report = SeedReport()
+        started = time.perf_counter()
+        report.rows.update(self.load_fixtures())
+        rng = random.Random(self.seed)
+        password_hashes = self._hash_pool(report)
+        writer = _BatchWriter(self.db.session, report, self.batch_size, self.commit_every)
+        amenity_ids = [amenity_id(name) for name in AMENITY_NAMES]
+
+        user_ids = []
+        for number in range(users):
+            user_id = _uuid(rng)
+            user_ids.append(user_id)
+            stamp = BASE_TIME + timedelta(seconds=number)
+            writer.add(User.__table__, {
+                'id': user_id, 'first_name': f"User{number}", 'last_name': rng.choice(WORDS).title(),
+                'email': seed_email(number, self.seed),
+                'password': password_hashes[number % self.password_pool],
+                'is_admin': False, 'created_at': stamp, 'updated_at': stamp,
+            })
+
+        places_table, reviews_table = Place.__table__, Review.__table__
+        reported = writer.commits
+        links_per_place = max(1, 2 * amenities_per_place - 1)
+        for number in range(places):
+            place_id = _uuid(rng)
+            latitude, longitude = rng.choice(CITIES)
+            latitude = max(-90.0, min(90.0, latitude + rng.uniform(-0.5, 0.5)))
+            longitude = max(-180.0, min(180.0, longitude + rng.uniform(-0.5, 0.5)))
+            ratings = [rng.randint(1, 5) for _ in range(rng.randint(0, 2 * reviews_per_place))]
+            stamp = BASE_TIME + timedelta(seconds=number)
+            row = {
+                'id': place_id, 'title': _sentence(rng, 2, 5).title(), 'description': _sentence(rng, 8, 20),
+                'price': round(rng.uniform(20, 900), 2), 'latitude': latitude, 'longitude': longitude,
+                'owner_id': rng.choice(user_ids), 'geohash': geo.encode_geohash(latitude, longitude),
+                'review_count': len(ratings), 'rating_sum': sum(ratings),
+                'created_at': stamp, 'updated_at': stamp,
+            }
+            for stars in range(1, 6):
+                row[f'rating_count_{stars}'] = ratings.count(stars)
+            writer.add(places_table, row)
+
+            for linked in rng.sample(amenity_ids, rng.randint(1, min(links_per_place, len(amenity_ids)))):
+                writer.add(place_amenity, {'place_id': place_id, 'amenity_id': linked})
+            for rating in ratings:
+                writer.add(reviews_table, {
+                    'id': _uuid(rng), 'text': _sentence(rng, 5, 15), 'rating': rating,
+                    'user_id': rng.choice(user_ids), 'place_id': place_id,
+                    'created_at': stamp, 'updated_at': stamp,
+                })
+            if progress is not None and writer.commits != reported:
+                reported = writer.commits
+                report.seconds = time.perf_counter() - started
+                progress(report, number + 1)
+
+        writer.close()
+        report.seconds = time.perf_counter() - started
+        return report
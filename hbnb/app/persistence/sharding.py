@@ -0,0 +1,378 @@
+# app/persistence/sharding.py
+
+"""
+Particionado horizontal de lugares y reseñas
+Horizontal sharding of places and reviews
+
+Las tablas places, place_amenity y reviews se reparten entre las bases de
+SHARDS ({nombre: URI}) según el id del lugar: una reseña y los links de
+amenidades viven siempre en la partición de su lugar, así crear una reseña y
+actualizar los agregados del lugar sigue siendo una sola transacción local.
+users, amenities y el mapa de particiones quedan en la base principal.
+
+  - Cubetas: bucket_for(place_id) es un hash estable (blake2b) módulo
+    SHARD_BUCKETS; la tabla shard_buckets de la base principal dice en qué
+    partición vive cada cubeta. Agregar una partición mueve cubetas enteras,
+    no vuelve a repartir todos los lugares como haría hash % N.
+  - Sesión: ShardedSession de SQLAlchemy (horizontal_shard), una por contexto
+    de aplicación como db.session. Las cargas perezosas y los selectinload
+    van a la partición del objeto padre.
+  - Rebalanceo (flask shards rebalance): copia los lugares de las cubetas
+    que cambian de partición, cambia el mapa y recién entonces borra el
+    origen. Es reanudable (la copia reemplaza lo que ya estaba y los restos
+    de una corrida cortada se borran en la siguiente), pero es una operación
+    de mantenimiento: las escrituras a una cubeta que se mueve entre la copia
+    y el cambio de mapa se pierden, así que se corre con las escrituras en pausa.
+
+  - Ids de reseñas: los primeros 4 dígitos hex del id son la cubeta de su
+    lugar (review_id()), así un get por id de reseña va a una sola partición
+    sin conocer el lugar; el resto del id es el de un uuid4. Como el rebalanceo
+    mueve cubetas enteras, la cubeta de una reseña nunca cambia.
+
+places, place_amenity and reviews are partitioned by a stable hash of the
+place id into buckets; the bucket -> shard map lives in the main database.
+Users, amenities and the map itself are not sharded. A review id starts with
+its place's bucket in hex, so a lookup by review id hits a single shard.
+
+Solo capa de repositorios: ShardedPlaceRepository y ShardedReviewRepository
+(app/persistence/repository.py) se usan directamente; HBnBFacade sigue sobre la
+base principal aunque SHARDS esté configurado, porque depende de consultas que
+esos repositorios no particionan (facetas, búsqueda, índices en memoria).
+Repository layer only: the facade keeps using the main database.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from collections import Counter
+from flask_sqlalchemy.session import _app_ctx_id
+from sqlalchemy import Column, Integer, MetaData, String, Table, delete, event, func, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from app.persistence.sqlite_tuning import create_tuned_engine
+
+# Tabla particionada -> columna con el id del lugar / Sharded table -> column holding the place id
+SHARD_KEYS = {'places': 'id', 'place_amenity': 'place_id', 'reviews': 'place_id'}
+# Orden de inserción (los lugares antes que sus links y reseñas) / Insert order
+SHARDED_TABLES = ('places', 'place_amenity', 'reviews')
+
+# Se declara en una MetaData propia del módulo y se copia a la de los modelos en init_app
+shard_buckets = Table(
+    'shard_buckets', MetaData(),
+    Column('bucket', Integer, primary_key=True),
+    Column('shard', String(64), nullable=False),
+)
+
+
+# La cubeta va en hex en los primeros 4 caracteres del id de la reseña / Bucket prefix of review ids
+REVIEW_BUCKET_DIGITS = 4
+MAX_BUCKETS = 16 ** REVIEW_BUCKET_DIGITS
+
+
+def bucket_for(place_id, buckets):
+    """Cubeta estable del lugar (igual en todos los procesos, a diferencia de hash())"""
+    digest = hashlib.blake2b(str(place_id).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % buckets
+
+
+def review_bucket(review_id, buckets):
+    """Cubeta codificada en el id de una reseña; None si el id no trae una válida"""
+    try:
+        bucket = int(str(review_id)[:REVIEW_BUCKET_DIGITS], 16)
+    except ValueError:
+        return None
+    return bucket if bucket < buckets else None
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class PlaceShardSession(ShardedSession):
+    """Sesión particionada / Sharded session"""
+
+
+@event.listens_for(PlaceShardSession, 'before_flush')
+def _reject_link_changes(session, flush_context, instances):
+    # Los links se escriben con add_amenity_links(): desde el ORM la fila de place_amenity
+    # no tendría partición (el flush la pide sin el lugar al que pertenece)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        state = sa_inspect(obj)
+        if state.mapper.local_table.name == 'places' and state.attrs.amenities.history.has_changes():
+            raise ValueError("Amenity links of sharded places must be written with add_amenity_links().")
+
+
+class RebalanceReport:
+    def __init__(self):
+        self.moved = {}  # cubeta -> (origen, destino)
+        self.copied = Counter()  # tabla -> filas copiadas
+        self.deleted = Counter()  # tabla -> filas borradas de su partición anterior
+
+    def to_dict(self):
+        return {
+            'buckets_moved': len(self.moved),
+            'copied': dict(self.copied),
+            'deleted': dict(self.deleted),
+        }
+
+
+class ShardSet:
+    """
+    Engines de las particiones, mapa de cubetas y sesión particionada
+    Shard engines, the bucket map and the sharded session
+    """
+
+    def __init__(self, app=None, db=None):
+        self.db = None
+        self.engines = {}  # nombre -> engine
+        self.buckets = 256
+        self.refresh_interval = 5.0
+        self.session = None
+        self._map = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, db)
+
+    @property
+    def enabled(self):
+        return bool(self.engines)
+
+    @property
+    def names(self):
+        return tuple(sorted(self.engines))
+
+    def init_app(self, app, db):
+        """Lee SHARDS / SHARD_BUCKETS / SHARD_MAP_REFRESH_SECONDS y crea los engines"""
+        app.extensions['sharding'] = self
+        self.db = db
+        self.buckets = app.config.get('SHARD_BUCKETS', 256)
+        if not 0 < self.buckets <= MAX_BUCKETS:
+            raise ValueError(f"SHARD_BUCKETS must be between 1 and {MAX_BUCKETS}.")
+        self.refresh_interval = app.config.get('SHARD_MAP_REFRESH_SECONDS', 5.0)
+        if shard_buckets.name not in db.metadata.tables:
+            shard_buckets.to_metadata(db.metadata)
+        self.dispose()
+        for name, uri in (app.config.get('SHARDS') or {}).items():
+            self.engines[name] = create_tuned_engine(uri, app.config)
+        if self.engines:
+            self.session = scoped_session(sessionmaker(
+                class_=PlaceShardSession, shards=dict(self.engines), shard_chooser=self._shard_chooser,
+                identity_chooser=self._identity_chooser, execute_chooser=self._execute_chooser,
+            ), scopefunc=_app_ctx_id)
+            app.teardown_appcontext(self._remove_session)
+
+    def dispose(self):
+        if self.session is not None:
+            self.session.remove()
+            self.session = None
+        for engine in self.engines.values():
+            engine.dispose()
+        self.engines = {}
+        self._map = None
+
+    def _remove_session(self, exc):
+        if self.session is not None:
+            self.session.remove()
+
+    def create_all(self):
+        """Crea las tablas particionadas en cada partición / Creates the sharded tables on every shard"""
+        # Solo esas tablas: una consulta que se escape a users o amenities falla en lugar de leer vacío
+        tables = [self.db.metadata.tables[name] for name in SHARDED_TABLES]
+        for engine in self.engines.values():
+            self.db.metadata.create_all(engine, tables=tables)
+
+    # Mapa de cubetas / Bucket map
+
+    def _read_map(self, connection):
+        rows = dict(connection.execute(select(shard_buckets.c.bucket, shard_buckets.c.shard)).all())
+        if not rows:
+            return None
+        if sorted(rows) != list(range(self.buckets)):
+            raise ValueError(f"The shard map has {len(rows)} buckets but SHARD_BUCKETS is {self.buckets}.")
+        unknown = sorted(set(rows.values()) - set(self.engines))
+        if unknown:
+            raise ValueError(f"The shard map uses shards missing from SHARDS: {', '.join(unknown)}.")
+        return [rows[bucket] for bucket in range(self.buckets)]
+
+    def load_map(self):
+        """Mapa cubeta -> partición leído de la base principal; la primera vez lo crea"""
+        if not self.enabled:
+            raise ValueError("No shards configured (SHARDS is empty).")
+        with self.db.engine.begin() as connection:
+            current = self._read_map(connection)
+            if current is None:
+                names = self.names
+                current = [names[bucket % len(names)] for bucket in range(self.buckets)]
+                connection.execute(shard_buckets.insert(),
+                                   [{'bucket': bucket, 'shard': shard} for bucket, shard in enumerate(current)])
+        return current
+
+    def bucket_map(self):
+        # Cacheado SHARD_MAP_REFRESH_SECONDS: otro proceso puede haber rebalanceado
+        with self._lock:
+            now = time.monotonic()
+            if self._map is None or now - self._loaded_at >= self.refresh_interval:
+                self._map = self.load_map()
+                self._loaded_at = now
+            return self._map
+
+    def shard_for(self, place_id):
+        """Partición del lugar / Shard holding the place"""
+        return self.bucket_map()[bucket_for(place_id, self.buckets)]
+
+    def review_id(self, place_id):
+        """Id nuevo para una reseña del lugar: un uuid4 cuyos primeros 4 dígitos hex son su cubeta"""
+        prefix = f"{bucket_for(place_id, self.buckets):0{REVIEW_BUCKET_DIGITS}x}"
+        return prefix + str(uuid.uuid4())[REVIEW_BUCKET_DIGITS:]
+
+    def shard_for_review(self, review_id):
+        """Partición de la reseña según la cubeta de su id; None si el id no la trae"""
+        bucket = review_bucket(review_id, self.buckets)
+        return None if bucket is None else self.bucket_map()[bucket]
+
+    # Elección de partición para la sesión / Shard choosers for the session
+
+    def _shard_chooser(self, mapper, instance, clause=None, **kw):
+        table = mapper.local_table.name if mapper is not None else None
+        if instance is None and table == 'amenities':
+            # El flush de un lugar pide una conexión para place_amenity aunque no haya links que
+            # escribir; _reject_link_changes garantiza que no los hay, así que cualquiera sirve
+            return self.names[0]
+        if instance is None or table not in SHARD_KEYS:
+            raise ValueError(f"Cannot choose a shard for {table or 'this statement'}; pass an explicit shard id.")
+        return self.shard_for(getattr(instance, SHARD_KEYS[table]))
+
+    def _identity_chooser(self, mapper, primary_key, *, lazy_loaded_from, **kw):
+        if lazy_loaded_from is not None:
+            return [lazy_loaded_from.identity_token]
+        if mapper.local_table.name == 'places':
+            return [self.shard_for(primary_key[0])]
+        return list(self.names)
+
+    def _execute_chooser(self, orm_context):
+        if orm_context.lazy_loaded_from is not None:
+            return [orm_context.lazy_loaded_from.identity_token]
+        return list(self.names)
+
+    # Rebalanceo / Rebalancing
+
+    def plan(self, current, exclude=()):
+        """
+        Nuevo mapa con las cubetas repartidas en partes iguales entre las particiones
+        (menos `exclude`), moviendo la menor cantidad posible de cubetas
+        New map spreading buckets evenly over the shards, moving as few buckets as possible
+        """
+        unknown = sorted(set(exclude) - set(self.engines))
+        if unknown:
+            raise ValueError(f"Unknown shards: {', '.join(unknown)}.")
+        targets = [name for name in self.names if name not in exclude]
+        if not targets:
+            raise ValueError("At least one shard must remain.")
+        counts = Counter(current)
+        # El resto de la división va a las que ya tienen más cubetas: así se mueven menos
+        base, extra = divmod(self.buckets, len(targets))
+        ranked = sorted(targets, key=lambda name: (-counts[name], name))
+        quota = {name: base + (1 if position < extra else 0) for position, name in enumerate(ranked)}
+
+        kept = Counter()
+        orphans = []
+        for bucket, shard in enumerate(current):
+            if kept[shard] < quota.get(shard, 0):
+                kept[shard] += 1
+            else:
+                orphans.append(bucket)
+        free = [name for name in targets for _ in range(quota[name] - kept[name])]
+        planned = list(current)
+        for bucket, name in zip(orphans, free):
+            planned[bucket] = name
+        return planned
+
+    def _place_ids(self, engine):
+        places = self.db.metadata.tables['places']
+        with engine.connect() as connection:
+            return list(connection.execute(select(places.c.id).order_by(places.c.id)).scalars())
+
+    def _copy(self, source, target, place_ids, report):
+        # Reemplaza lo que el destino ya tenga de esos lugares: copiar dos veces da lo mismo
+        tables = self.db.metadata.tables
+        with self.engines[source].connect() as reader:
+            rows = {name: [dict(row._mapping) for row in reader.execute(
+                select(tables[name]).where(tables[name].c[SHARD_KEYS[name]].in_(place_ids)))]
+                for name in SHARDED_TABLES}
+        with self.engines[target].begin() as writer:
+            for name in reversed(SHARDED_TABLES):
+                writer.execute(delete(tables[name]).where(tables[name].c[SHARD_KEYS[name]].in_(place_ids)))
+            for name in SHARDED_TABLES:
+                if rows[name]:
+                    writer.execute(tables[name].insert(), rows[name])
+                    report.copied[name] += len(rows[name])
+
+    def _delete(self, shard, place_ids, report):
+        tables = self.db.metadata.tables
+        with self.engines[shard].begin() as writer:
+            for name in reversed(SHARDED_TABLES):
+                result = writer.execute(delete(tables[name]).where(tables[name].c[SHARD_KEYS[name]].in_(place_ids)))
+                report.deleted[name] += result.rowcount
+
+    def rebalance(self, exclude=(), batch_size=500, dry_run=False):
+        """
+        Reparte las cubetas según plan() y mueve los lugares (con sus links y reseñas):
+        1) copia a la nueva partición, 2) cambia el mapa, 3) borra del origen.
+        Devuelve un RebalanceReport.
+        Moves places with their links and reviews: copy, switch the map, then delete.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive.")
+        report = RebalanceReport()
+        current = self.load_map()
+        planned = self.plan(current, exclude)
+        report.moved = {bucket: (old, new) for bucket, (old, new) in enumerate(zip(current, planned)) if old != new}
+        if dry_run:
+            return report
+
+        self.create_all()  # una partición recién agregada todavía no tiene las tablas
+        leaving = {}  # partición -> lugares que ya no le corresponden
+        for shard in self.names:
+            ids = [place_id for place_id in self._place_ids(self.engines[shard])
+                   if planned[bucket_for(place_id, self.buckets)] != shard]
+            leaving[shard] = ids
+            # Solo se copian los lugares vivos; el resto son restos de una corrida interrumpida
+            by_target = {}
+            for place_id in ids:
+                bucket = bucket_for(place_id, self.buckets)
+                if current[bucket] == shard:
+                    by_target.setdefault(planned[bucket], []).append(place_id)
+            for target, place_ids in by_target.items():
+                for chunk in _chunks(place_ids, batch_size):
+                    self._copy(shard, target, chunk, report)
+
+        if report.moved:
+            with self.db.engine.begin() as connection:
+                for bucket, (_, new) in report.moved.items():
+                    connection.execute(shard_buckets.update().where(shard_buckets.c.bucket == bucket)
+                                       .values(shard=new))
+        with self._lock:
+            self._map = None
+
+        for shard, ids in leaving.items():
+            for chunk in _chunks(ids, batch_size):
+                self._delete(shard, chunk, report)
+        return report
+
+    def status(self):
+        """{partición: {'buckets', 'places', 'reviews'}} según el mapa actual"""
+        current = self.load_map()
+        counts = Counter(current)
+        tables = self.db.metadata.tables
+        result = {}
+        for name in self.names:
+            with self.engines[name].connect() as connection:
+                result[name] = {'buckets': counts[name]}
+                for table in ('places', 'reviews'):
+                    result[name][table] = connection.scalar(select(func.count()).select_from(tables[table]))
+        return result
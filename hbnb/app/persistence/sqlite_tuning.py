@@ -0,0 +1,76 @@
+# app/persistence/sqlite_tuning.py
+
+"""
+PRAGMA de SQLite por conexión, según el perfil de la configuración
+Per-connection SQLite PRAGMAs from the configured profile
+
+SQLite olvida casi todos los PRAGMA al cerrar la conexión (journal_mode=WAL
+es la excepción: queda guardado en el archivo), así que se aplican en el
+evento 'connect' del engine, una vez por cada conexión nueva del pool y en el
+orden del diccionario: busy_timeout va primero para que el cambio de
+journal_mode espere a otro proceso en lugar de fallar.
+
+SQLite forgets most PRAGMAs when a connection closes, so SQLITE_PRAGMAS is
+applied from the engine's 'connect' event to every new pooled connection, in
+dictionary order. Non-SQLite engines are left untouched.
+"""
+
+import re
+from functools import partial
+from sqlalchemy import create_engine, event
+
+_NAME = re.compile(r'^[a-z_]+$')
+_VALUE = re.compile(r'^-?\w+$')
+
+
+def _validate(pragmas):
+    for name, value in pragmas.items():
+        if not _NAME.match(name) or not _VALUE.match(str(value)):
+            raise ValueError(f"Invalid SQLite pragma {name}={value!r}.")
+    return dict(pragmas)
+
+
+def apply_pragmas(dbapi_connection, connection_record, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def read_pragmas(engine, names):
+    """Valor efectivo de cada PRAGMA en una conexión del engine / Effective value of each pragma"""
+    with engine.connect() as connection:
+        return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
+
+
+def tune_engine(engine, config):
+    """
+    Registra los PRAGMA de SQLITE_PRAGMAS en un engine síncrono (o el sync_engine de uno asyncio)
+    Registers the SQLITE_PRAGMAS listener on a sync engine (or an asyncio engine's sync_engine)
+    """
+    pragmas = _validate(config.get('SQLITE_PRAGMAS') or {})
+    if engine.dialect.name == 'sqlite' and pragmas:
+        event.listen(engine, 'connect', partial(apply_pragmas, pragmas=pragmas))
+    return engine
+
+
+def create_tuned_engine(uri, config):
+    """
+    Engine adicional (réplica, partición) con las mismas opciones y PRAGMA que el principal
+    Extra engine (replica, shard) with the same engine options and pragmas as the main one
+    """
+    return tune_engine(create_engine(uri, **(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})), config)
+
+
+class SQLiteTuning:
+    def __init__(self, app=None, db=None):
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        """Registra el listener de PRAGMA en el engine de la app (antes de la primera conexión)"""
+        app.extensions['sqlite_tuning'] = self
+        with app.app_context():
+            tune_engine(db.engine, app.config)
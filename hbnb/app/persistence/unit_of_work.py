@@ -0,0 +1,211 @@
+# app/persistence/unit_of_work.py
+
+"""
+Unidad de trabajo: una sola transacción por petición (o por comando de CLI)
+Unit of work: a single transaction per request (or per CLI command)
+
+Dentro de una unidad de trabajo los repositorios y la fachada llaman a
+commit(session), que solo hace flush (el SQL se envía y los errores aparecen
+en el mismo lugar), y la transacción se confirma una única vez al final.
+Fuera de una unidad de trabajo commit(session) confirma como siempre, así que
+las pruebas y scripts que usan los repositorios directamente no cambian.
+
+Inside a unit of work, repositories and the facade call commit(session), which
+only flushes; the transaction is committed exactly once at the end. Outside a
+unit of work commit(session) commits right away, as before.
+
+Uso / Usage:
+
+    with transaction(db.session):   # CLI, scripts
+        repo.add(obj)
+        repo.update(obj.id, {...})
+
+    RequestUnitOfWork().init_app(app, db)   # una transacción por petición HTTP
+
+Un rollback dentro de la unidad de trabajo deja toda la transacción marcada
+para revertirse: al final se hace rollback aunque la petición haya seguido.
+"""
+
+import threading
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+SCOPE_KEY = 'unit_of_work'
+PENDING_WRITES_KEY = 'unit_of_work_pending_writes'
+
+
+class _Scope:
+    def __init__(self):
+        self.rollback_only = False
+
+
+def is_active(session):
+    """True si hay una unidad de trabajo abierta sobre la sesión"""
+    return SCOPE_KEY in session.info
+
+
+def has_pending_writes(session):
+    """True si la transacción actual ya envió escrituras que todavía no se confirmaron"""
+    return bool(session.info.get(PENDING_WRITES_KEY))
+
+
+def commit(session):
+    """Confirma, o solo hace flush si hay una unidad de trabajo abierta / Commit, or just flush inside a unit of work"""
+    if is_active(session):
+        session.flush()
+    else:
+        session.commit()
+
+
+def rollback(session):
+    """
+    Revierte la sesión; dentro de una unidad de trabajo además la marca para
+    que el final sea un rollback / Inside a unit of work the end becomes a rollback too
+    """
+    scope = session.info.get(SCOPE_KEY)
+    if scope is not None:
+        scope.rollback_only = True
+    session.rollback()
+
+
+def _finish(session, scope, success):
+    if success and not scope.rollback_only and (session.new or session.dirty or session.deleted
+                                                  or has_pending_writes(session)):
+        session.commit()
+    else:
+        # Sin escrituras no hay nada que confirmar: un rollback libera la conexión igual
+        session.rollback()
+
+
+@contextmanager
+def transaction(session):
+    """
+    Abre una unidad de trabajo; si ya hay una abierta se une a ella (no confirma)
+    Opens a unit of work; nested calls join the outer one (and don't commit)
+    """
+    if is_active(session):
+        yield session
+        return
+    scope = session.info[SCOPE_KEY] = _Scope()
+    try:
+        yield session
+        _finish(session, scope, success=True)
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        session.info.pop(SCOPE_KEY, None)
+
+
+# Escrituras pendientes / Pending writes
+
+@event.listens_for(Session, 'after_flush')
+def _mark_flush(session, flush_context):
+    session.info[PENDING_WRITES_KEY] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_execute(orm_execute_state):
+    # INSERT/UPDATE/DELETE ejecutados directamente (lotes, agregados, índice FTS5)
+    if orm_execute_state.is_select:
+        return
+    statement = orm_execute_state.statement
+    text = getattr(statement, 'text', None)
+    if text is not None and text.lstrip()[:6].upper() == 'SELECT':
+        return
+    orm_execute_state.session.info[PENDING_WRITES_KEY] = True
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _clear_writes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(PENDING_WRITES_KEY, None)
+
+
+# Una transacción por petición / One transaction per request
+
+@event.listens_for(Engine, 'commit')
+def _count_commit(connection):
+    if has_request_context() and '_db_commits' in g:
+        g._db_commits += 1
+
+
+class RequestUnitOfWork:
+    """
+    Abre una unidad de trabajo al inicio de cada petición y la cierra al final:
+    commit si la respuesta es < 400, rollback si no (o si hubo una excepción).
+    Con UNIT_OF_WORK = False se conserva el comportamiento anterior (un commit
+    por llamada), útil para comparar commits por petición antes/después.
+    """
+
+    def __init__(self, app=None, db=None):
+        self.db = db
+        self._lock = threading.Lock()
+        self.reset_stats()
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        self.db = db
+        app.extensions['unit_of_work'] = self
+        app.before_request(self._begin)
+        app.after_request(self._end)
+        app.teardown_request(self._teardown)
+
+    def _begin(self):
+        g._db_commits = 0
+        if current_app.config.get('UNIT_OF_WORK', True):
+            session = self.db.session
+            if not is_active(session):
+                session.info[SCOPE_KEY] = _Scope()
+                g._unit_of_work = True
+
+    def _end(self, response):
+        if g.pop('_unit_of_work', False):
+            session = self.db.session
+            scope = session.info.pop(SCOPE_KEY, None)
+            if scope is not None:
+                try:
+                    _finish(session, scope, success=response.status_code < 400)
+                except Exception:
+                    # La excepción llega a Flask y la respuesta pasa a ser un 500
+                    session.rollback()
+                    raise
+        return response
+
+    def _teardown(self, exc):
+        if g.pop('_unit_of_work', False):
+            # La petición terminó con una excepción antes de after_request
+            session = self.db.session
+            session.info.pop(SCOPE_KEY, None)
+            session.rollback()
+        commits = g.pop('_db_commits', None)
+        if commits is not None:
+            self._record(commits)
+
+    # Medición / Measurement
+
+    def _record(self, commits):
+        with self._lock:
+            self.requests += 1
+            self.commits += commits
+            self.histogram[commits] = self.histogram.get(commits, 0) + 1
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = 0
+            self.commits = 0
+            self.histogram = {}  # commits por petición -> cantidad de peticiones
+
+    def stats(self):
+        """Commits reales (COMMIT enviados al motor) por petición / Real commits per request"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'commits': self.commits,
+                'commits_per_request': round(self.commits / self.requests, 4) if self.requests else None,
+                'histogram': dict(sorted(self.histogram.items())),
+            }
@@ -0,0 +1,151 @@
+# app/services/async_facade.py
+
+"""
+Versión asyncio de las operaciones de HBnBFacade que usan las rutas v1 servidas por ASGI
+Asyncio version of the HBnBFacade operations behind the ASGI-served v1 routes
+
+Misma validación, mismos errores (ValueError) y mismas respuestas que la
+fachada síncrona. Diferencias del modo:
+  - bcrypt corre en el pool de PasswordService y se espera con await, así el
+    event loop sigue atendiendo otras peticiones mientras tanto;
+  - el filtro por amenidades siempre se resuelve en SQL (el índice de bits se
+    carga con el engine síncrono y vive en el proceso WSGI);
+  - sin caché de entidades: CachedRepository envuelve repositorios síncronos.
+"""
+
+from types import SimpleNamespace
+
+from app.models.review import Review
+from app.persistence.amenity_index import MATCH_MODES
+from app.persistence.async_repository import (
+    AsyncAmenityRepository, AsyncPlaceRepository, AsyncReviewRepository, AsyncUserRepository,
+)
+from app.persistence.repository import PlaceRepository
+from app.persistence.search import InMemorySearchIndex, search_index_class
+from app.services.facade import place_details
+from app.services.pagination import clamp_limit, decode_cursor, encode_cursor
+
+
+class AsyncHBnBFacade:
+    def __init__(self, db_instance, password_service):
+        self.db = db_instance  # AsyncDatabase
+        self.passwords = password_service
+        self.user_repo = AsyncUserRepository(db_instance)
+        self.amenity_repo = AsyncAmenityRepository(db_instance)
+        self.place_repo = AsyncPlaceRepository(db_instance)
+        self.review_repo = AsyncReviewRepository(db_instance)
+        self._search_index_class = None  # se averigua en la primera reseña / probed on the first review
+
+    async def _get_page(self, repo, limit=None, cursor=None, order_by='id', where=()):
+        limit = clamp_limit(limit)
+        after = decode_cursor(cursor, order_by)
+        items, next_key = await repo.get_page(after=after, limit=limit, order_by=order_by, where=where)
+        return items, encode_cursor(order_by, next_key)
+
+# 👨 users
+
+    async def get_user(self, user_id):
+        return await self.user_repo.get(user_id)
+
+    async def get_user_by_email(self, email):
+        return await self.user_repo.get_by_attribute('email', email)
+
+    async def authenticate_user(self, email, password):
+        """
+        Devuelve el usuario si las credenciales son válidas; rehashea si el costo cambió.
+        Returns the user when the credentials are valid; rehashes when the cost changed.
+        """
+        user = await self.get_user_by_email(email)
+        if not user or not await self.passwords.verify_async(user.password, password):
+            return None
+        if self.passwords.needs_rehash(user.password):
+            try:
+                user.password = await self.passwords.hash_async(password)
+                await self.user_repo.commit()
+            except Exception as e:
+                await self.user_repo.rollback()
+                print(f"Error al volver a hashear la contraseña: {e}")
+        return user
+
+# 🏨 Amenities
+
+    async def get_amenity(self, amenity_id):
+        amenity = await self.amenity_repo.get(amenity_id)
+        if not amenity:
+            raise ValueError("Amenity not found.")
+        return amenity
+
+    async def get_amenities_page(self, limit=None, cursor=None):
+        return await self._get_page(self.amenity_repo, limit, cursor)
+
+# 🏠 Places
+
+    async def get_place(self, place_id):
+        """Detalle del lugar (mismo formato que HBnBFacade.get_place); None si no existe"""
+        place = await self.place_repo.get_place_details(place_id)
+        return place_details(place) if place else None
+
+    async def get_places_page(self, limit=None, cursor=None, amenity_ids=None, match='all'):
+        if not amenity_ids:
+            return await self._get_page(self.place_repo, limit, cursor)
+        if match not in MATCH_MODES:
+            raise ValueError(f"match must be one of: {', '.join(MATCH_MODES)}.")
+        where = (self.place_repo.amenity_filter(amenity_ids, match),)
+        return await self._get_page(self.place_repo, limit, cursor, where=where)
+
+# 📝 Review
+
+    async def create_review(self, review_data):
+        """Reseña y agregados del lugar en una sola transacción; ValueError si los datos no son válidos"""
+        if not review_data.get('text'):
+            raise ValueError("Review text is required.")
+        if not isinstance(review_data.get('rating'), (int, float)):
+            raise ValueError("Valid rating is required.")
+        if not isinstance(review_data.get('user_id'), str) or not isinstance(review_data.get('place_id'), str):
+            raise ValueError("Invalid user_id or place_id.")
+
+        user = await self.user_repo.get(review_data['user_id'])
+        place = await self.place_repo.get(review_data['place_id'])
+        if not user or not place:
+            raise ValueError("Invalid user_id or place_id.")
+
+        try:
+            review = Review(text=review_data['text'], rating=review_data['rating'], user_id=user.id, place_id=place.id)
+            await self.place_repo.apply_rating_delta(place.id, added=review.rating)
+            await self.review_repo.add(review)
+            # async_scoped_session no delega run_sync: se llama sobre la AsyncSession de la tarea
+            await self.db.session().run_sync(self._index_search_document, place.id)
+            await self.review_repo.commit()
+        except Exception:
+            await self.review_repo.rollback()
+            raise
+        return review.to_dict()
+
+    def _index_search_document(self, session, place_id):
+        # Corre dentro de run_sync con la sesión síncrona de la transacción: se reutilizan
+        # PlaceRepository y el índice de la base (FTS5 o tsvector) tal cual.
+        # Runs inside run_sync, reusing the sync repository and search index on this transaction.
+        holder = SimpleNamespace(session=session, engine=session.get_bind())
+        if self._search_index_class is None:
+            index_class = search_index_class(holder)
+            index_class(holder).create()
+            self._search_index_class = index_class
+        if self._search_index_class is InMemorySearchIndex:
+            # El índice en memoria vive en el proceso que busca (Flask): no hay nada que sincronizar aquí
+            # The in-memory index lives in the process serving searches: nothing to sync from here
+            return
+        document = PlaceRepository(holder).get_search_document(place_id)
+        if document:
+            self._search_index_class(holder).index_place(*document)
+
+    async def get_review(self, review_id):
+        review = await self.review_repo.get(review_id)
+        if not review:
+            raise ValueError("Review not found.")
+        return review
+
+    async def get_reviews_page(self, limit=None, cursor=None):
+        return await self._get_page(self.review_repo, limit, cursor)
+
+    async def get_reviews_by_place(self, place_id):
+        return await self.review_repo.get_reviews_by_place(place_id)
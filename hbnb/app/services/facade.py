@@ -1,28 +1,73 @@
 import re
+import uuid
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
 from app.persistence.repository import UserRepository
+from app.persistence.repository import PlaceRepository
+from app.persistence.repository import ReviewRepository
 from app.persistence.repository import SQLAlchemyRepository
 from app.persistence.repository import InMemoryRepository
+from app.persistence.cache import CachedRepository
+from app.persistence.repository import PLACE_LIST_LOADERS
+from app.persistence.search import create_search_index
+from app.persistence.amenity_index import MATCH_MODES, get_amenity_index
+from app.persistence.columnar import PlaceColumns
+from app.persistence import unit_of_work
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
+from app.services.pagination import clamp_limit, decode_cursor, encode_cursor
 from datetime import datetime
 
+# Máximo de ítems aceptados por los endpoints /batch
+MAX_BATCH_SIZE = 10000
+
+# Límites de los rangos de precio de /places/facets
+PRICE_FACET_EDGES = (50, 100, 200, 500)
+
+def place_details(place):
+    """Detalle de un lugar con dueño, amenidades y reseñas (ya cargados) / Place detail payload"""
+    owner = place.user
+    return {
+        'id': place.id,
+        'title': place.title,
+        'description': place.description,
+        'price': place.price,
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'owner': {
+            'id': owner.id,
+            'first_name': owner.first_name,
+            'last_name': owner.last_name,
+            'email': owner.email
+        },
+        'review_count': place.review_count,
+        'average_rating': place.average_rating,
+        'rating_histogram': place.rating_histogram,
+        'amenities': [{'id': amenity.id, 'name': amenity.name} for amenity in place.amenities],
+        'reviews': [review.to_dict() for review in place.reviews]
+    }
+
+
 class HBnBFacade:
     def __init__(self, db_instance):
        self.db = db_instance
-       self.user_repo = UserRepository(db_instance)
-       self.amenity_repo = SQLAlchemyRepository(Amenity, db_instance)
-       self.place_repo = SQLAlchemyRepository(Place, db_instance)
-       self.review_repo = SQLAlchemyRepository(Review, db_instance)
-
-    
+       # Cada repositorio pasa por la caché de entidades (se habilita por modelo con ENTITY_CACHE)
+       self.user_repo = CachedRepository(UserRepository(db_instance))
+       self.amenity_repo = CachedRepository(SQLAlchemyRepository(Amenity, db_instance))
+       self.place_repo = CachedRepository(PlaceRepository(db_instance))
+       self.review_repo = CachedRepository(ReviewRepository(db_instance))
+       # Índice de búsqueda por motor (se crea al primer uso) / Search index per engine, created lazily
+       self._search_indexes = {}
+       # Snapshot columnar de lugares por motor, para analítica / Columnar place snapshot per engine
+       self._place_columns = {}
+
+    def get_cache_stats(self):
+        """Aciertos/fallos de la caché de entidades por modelo"""
+        return [repo.stats() for repo in (self.user_repo, self.amenity_repo, self.place_repo, self.review_repo)]
 
 # 👨 users
-class UserService:
-    
-    def __init__(self, user_repo):
-        self.user_repo = user_repo  # Aquí inyectamos el repositorio de usuarios
 
     def create_user(self, user_data):
         # Validar que first_name y last_name no estén vacíos
@@ -39,20 +84,18 @@ class UserService:
         if existing_user:
             raise ValueError("Email already registered")
 
-        # Crear usuario solo si las validaciones pasan
+        password = user_data.get("password")
+        if not password:
+            raise ValueError("Password is required")
+
+        # Crear usuario solo si las validaciones pasan (el constructor hashea la contraseña una sola vez)
         new_user = User(
             first_name=user_data.get("first_name"),
             last_name=user_data.get("last_name"),
             email=user_data.get("email"),
+            password=password,
             is_admin=user_data.get("is_admin", False)
         )
-        
-        # Hashear la contraseña antes de almacenarla
-        password = user_data.get("password")
-        if not password:
-            raise ValueError("Password is required")
-        
-        new_user.hash_password(password)
 
         # Almacenar el nuevo usuario en la base de datos
         self.user_repo.add(new_user)
@@ -60,14 +103,54 @@ class UserService:
         # Retornar el nuevo usuario creado
         return new_user
 
+    def get_user(self, user_id):
+        return self.user_repo.get(user_id)
+
     def get_user_by_email(self, email):
         # Buscar un usuario por su correo electrónico
         return self.user_repo.get_by_attribute('email', email)
 
+    def update_user(self, user_id, user_data):
+        user = self.user_repo.get(user_id)
+        if not user:
+            raise ValueError("User not found.")
+        for key in ('first_name', 'last_name', 'email'):
+            if key in user_data:
+                setattr(user, key, user_data[key])
+        unit_of_work.commit(self.db.session)
+        return user
+
+    def authenticate_user(self, email, password):
+        """
+        Devuelve el usuario si las credenciales son válidas. Si el hash guardado usa
+        un costo distinto al configurado, se vuelve a hashear de forma transparente.
+        """
+        user = self.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        if user.password_needs_rehash():
+            try:
+                user.hash_password(password)
+                unit_of_work.commit(self.db.session)
+            except Exception as e:
+                unit_of_work.rollback(self.db.session)
+                print(f"Error al volver a hashear la contraseña: {e}")
+        return user
+
     def get_all_users(self):
         # Obtener todos los usuarios
         return self.user_repo.get_all()
 
+    def _get_page(self, repo, limit=None, cursor=None, order_by='id'):
+        """
+        Devuelve (objetos, next_cursor) usando paginación por cursor
+        Returns (objects, next_cursor) using cursor pagination
+        """
+        limit = clamp_limit(limit)
+        after = decode_cursor(cursor, order_by)
+        items, next_key = repo.get_page(after=after, limit=limit, order_by=order_by)
+        return items, encode_cursor(order_by, next_key)
+
     def save(self, user):
         # Método para guardar el usuario en la base de datos
         existing_user = self.user_repo.get_by_attribute("email", user.email)
@@ -99,6 +182,15 @@ class UserService:
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
 
+    def get_amenities_page(self, limit=None, cursor=None):
+        return self._get_page(self.amenity_repo, limit, cursor)
+
+    def get_amenity_version(self, amenity_id):
+        return self.amenity_repo.get_version(amenity_id)
+
+    def get_amenities_version(self):
+        return self.amenity_repo.get_collection_version()
+
     def update_amenity(self, amenity_id, amenity_data):
         amenity = self.get_amenity(amenity_id)
 
@@ -119,13 +211,31 @@ class UserService:
         try:
             # Eliminar la amenidad
             self.db.session.delete(amenity)
-            self.db.session.commit()
+            unit_of_work.commit(self.db.session)
             return {"message": "Amenity deleted successfully"}
         except Exception as e:
-            self.db.session.rollback()
+            unit_of_work.rollback(self.db.session)
             raise ValueError(f"Error deleting amenity: {str(e)}")
 
 
+    def create_amenities_batch(self, amenities_data):
+        """Crea muchas amenidades en una sola transacción, con un resultado por ítem."""
+        self._check_batch(amenities_data)
+        results, amenities = [], []
+        for index, amenity_data in enumerate(amenities_data):
+            try:
+                if not isinstance(amenity_data, dict) or not amenity_data.get("name"):
+                    raise ValueError("Amenity name is required")
+                amenity = Amenity(name=amenity_data["name"], description=amenity_data.get("description"))
+                amenity.id = str(uuid.uuid4())
+                amenities.append(amenity)
+                results.append({'index': index, 'id': amenity.id})
+            except ValueError as e:
+                results.append({'index': index, 'error': str(e)})
+
+        self._commit_batch(lambda: self.amenity_repo.add_many(amenities), results)
+        return results
+
     def delete_all_amenities(self):
         print("Borrando todos los amenities...")
         self.amenity_repo.delete_all()  
@@ -146,33 +256,12 @@ class UserService:
         if not owner:
             raise ValueError("Owner not found.")
 
-        # Validar datos de lugar
-        required_fields = ['title', 'price', 'latitude', 'longitude']
-        for field in required_fields:
-            if field not in place_data:
-                raise ValueError(f"{field} is required.")
+        self._check_place_fields(place_data)
 
-        # Validar precio
-        price = place_data['price']
-        if not isinstance(price, (int, float)) or price <= 0:
-            raise ValueError("Price must be a positive number.")
-
-        # Validar latitud y longitud
-        latitude, longitude = place_data['latitude'], place_data['longitude']
-        if not (-90 <= latitude <= 90):
-            raise ValueError("Latitude must be between -90 and 90.")
-        if not (-180 <= longitude <= 180):
-            raise ValueError("Longitude must be between -180 and 180.")
-
-        # Validar amenities
-        if 'amenities' not in place_data or not isinstance(place_data['amenities'], list) or len(place_data['amenities']) == 0:
-            raise ValueError("At least one amenity is required for the place.")
-
-        # Validar que las amenities existan
-        amenities = [self.amenity_repo.get(amenity_id) for amenity_id in place_data['amenities'] if self.amenity_repo.get(amenity_id)]
+        # Validar que las amenities existan (una sola consulta para todos los IDs)
+        amenities, missing_ids = self.amenity_repo.get_many(place_data['amenities'])
 
         # Si algún ID no se encontró, lanzar un error
-        missing_ids = [amenity_id for amenity_id in place_data['amenities'] if not self.amenity_repo.get(amenity_id)]
         if missing_ids:
             raise ValueError(f"Amenities not found for IDs: {missing_ids}")
 
@@ -196,6 +285,8 @@ class UserService:
 
         # Guardar el lugar en la base de datos/repositorio
         self.place_repo.add(place)
+        self._sync_search(place.id)
+        unit_of_work.commit(self.db.session)
 
         # **Asegurar que place tiene ID antes de retornarlo**
         return {
@@ -209,32 +300,211 @@ class UserService:
             "amenities": [str(amenity.id) for amenity in place.amenities]
                          }, 201
     
+    def _check_place_fields(self, place_data):
+        """Valida los campos propios del lugar (sin consultar la base de datos)."""
+
+        # Validar datos de lugar
+        required_fields = ['title', 'price', 'latitude', 'longitude']
+        for field in required_fields:
+            if field not in place_data:
+                raise ValueError(f"{field} is required.")
+
+        # Validar precio
+        price = place_data['price']
+        if not isinstance(price, (int, float)) or price <= 0:
+            raise ValueError("Price must be a positive number.")
+
+        # Validar latitud y longitud
+        latitude, longitude = place_data['latitude'], place_data['longitude']
+        if not isinstance(latitude, (int, float)) or not (-90 <= latitude <= 90):
+            raise ValueError("Latitude must be between -90 and 90.")
+        if not isinstance(longitude, (int, float)) or not (-180 <= longitude <= 180):
+            raise ValueError("Longitude must be between -180 and 180.")
+
+        # Validar amenities
+        if 'amenities' not in place_data or not isinstance(place_data['amenities'], list) or len(place_data['amenities']) == 0:
+            raise ValueError("At least one amenity is required for the place.")
+
+    def create_places_batch(self, places_data):
+        """
+        Crea muchos lugares en una sola transacción.
+        Valida todo el lote primero, resuelve dueños y amenidades con consultas por
+        conjuntos y luego inserta con executemany. Devuelve un resultado por ítem.
+        """
+        self._check_batch(places_data)
+        results = [None] * len(places_data)
+        pending = []
+
+        # 1) Validación de campos, sin tocar la base de datos
+        for index, place_data in enumerate(places_data):
+            try:
+                if not isinstance(place_data, dict):
+                    raise ValueError("Each item must be an object.")
+                if not isinstance(place_data.get('owner_id'), str):
+                    raise ValueError("'owner_id' is required in place_data.")
+                self._check_place_fields(place_data)
+                if not all(isinstance(amenity_id, str) for amenity_id in place_data['amenities']):
+                    raise ValueError("Amenity IDs must be strings.")
+                pending.append((index, place_data))
+            except (ValueError, TypeError) as e:
+                results[index] = {'index': index, 'error': str(e)}
+
+        # 2) Resolver referencias con una consulta IN (...) por tabla
+        _, missing_owners = self.user_repo.get_many(data['owner_id'] for _, data in pending)
+        _, missing_amenities = self.amenity_repo.get_many(
+            amenity_id for _, data in pending for amenity_id in data['amenities']
+        )
+        missing_owners, missing_amenities = set(missing_owners), set(missing_amenities)
+
+        # 3) Construir los objetos válidos
+        places, links = [], []
+        for index, place_data in pending:
+            try:
+                if place_data['owner_id'] in missing_owners:
+                    raise ValueError("Owner not found.")
+                missing_ids = [amenity_id for amenity_id in place_data['amenities'] if amenity_id in missing_amenities]
+                if missing_ids:
+                    raise ValueError(f"Amenities not found for IDs: {missing_ids}")
+                place = Place(
+                    title=place_data['title'],
+                    description=place_data.get('description', ''),
+                    price=place_data['price'],
+                    latitude=place_data['latitude'],
+                    longitude=place_data['longitude'],
+                    owner_id=place_data['owner_id']
+                )
+                place.id = str(uuid.uuid4())
+                places.append(place)
+                links.extend((place.id, amenity_id) for amenity_id in dict.fromkeys(place_data['amenities']))
+                results[index] = {'index': index, 'id': place.id}
+            except ValueError as e:
+                results[index] = {'index': index, 'error': str(e)}
+
+        # 4) Insertar todo en una transacción
+        def insert():
+            self.place_repo.add_many(places)
+            self.place_repo.add_amenity_links(links)
+            self._get_search_index().index_many(
+                (place.id, place.title, place.description, '') for place in places
+            )
+
+        self._commit_batch(insert, results)
+        return results
+
     def get_place(self, place_id):
         """Recupera un lugar por su ID desde el repositorio."""
 
-        # Buscar el lugar directamente usando el ID
-        place = self.place_repo.get(place_id)
-        if place:
-            owner = self.user_repo.get(place.owner_id)
-            amenities = self.amenity_repo.get_by_place_id(place_id)
-            return {
-                'id': place.id,
-                'title': place.title,
-                'description': place.description,
-                'price': place.price,
-                'latitude': place.latitude,
-                'longitude': place.longitude,
-                'owner': {
-                    'id': owner.id,
-                    'first_name': owner.first_name,
-                    'last_name': owner.last_name,
-                    'email': owner.email
-                },
-                'amenities': [{'id': amenity.id, 'name': amenity.name} for amenity in amenities]
-            }
-        return None
+        # Dueño, amenidades y reseñas se cargan junto con el lugar (sin consultas extra)
+        place = self.place_repo.get_place_details(place_id)
+        return place_details(place) if place else None
+
+    def get_place_facets(self, amenity_ids=None, match='all', min_price=None, max_price=None):
+        """
+        Conteos de amenidades, rangos de precio y calificación para el filtro actual,
+        calculados con agregados SQL agrupados (sin cargar los lugares).
+        """
+        if min_price is not None and min_price < 0 or max_price is not None and max_price < 0:
+            raise ValueError("Prices must be non-negative numbers.")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("min_price cannot be greater than max_price.")
+        where = self.place_repo.price_filter(min_price, max_price)
+        if amenity_ids:
+            if match not in MATCH_MODES:
+                raise ValueError(f"match must be one of: {', '.join(MATCH_MODES)}.")
+            where.append(self.place_repo.amenity_filter(amenity_ids, match))
+
+        counts, amenity_counts = self.place_repo.get_facets(where, PRICE_FACET_EDGES)
+        bounds = [0, *PRICE_FACET_EDGES, None]
+        price = [{
+            'label': f"{low}-{high}" if high is not None else f"{low}+",
+            'min': low,
+            'max': high,
+            'count': sum(count for (bucket, _), count in counts.items() if bucket == position)
+        } for position, (low, high) in enumerate(zip(bounds, bounds[1:]))]
+        rating = {
+            ('unrated' if stars == 0 else str(stars)): sum(
+                count for (_, bucket_stars), count in counts.items() if bucket_stars == stars
+            ) for stars in range(6)
+        }
+        return {
+            'total': sum(counts.values()),
+            'amenities': [{'id': amenity_id, 'name': name, 'count': count} for amenity_id, name, count in amenity_counts],
+            'price': price,
+            'rating': rating
+        }
+
+    def get_place_stats(self, bbox=None, amenity_ids=None, match='all', owner_id=None):
+        """
+        Resumen de precios y calificaciones sobre el snapshot columnar (sin crear
+        entidades); antes de leer se aplican solo los lugares modificados.
+        """
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            if not (-90 <= min_lat <= max_lat <= 90):
+                raise ValueError("Bounding box latitudes must satisfy -90 <= min_lat <= max_lat <= 90.")
+            if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+                raise ValueError("Bounding box longitudes must be between -180 and 180.")
+        columns = self._place_columns.get(self.db.engine)
+        if columns is None:
+            columns = self._place_columns[self.db.engine] = PlaceColumns()
+        columns.refresh(self.place_repo)
+        rows = columns.select_rows(bbox, amenity_ids, match, owner_id)
+        return columns.price_stats(rows)
+
+    def get_places_page(self, limit=None, cursor=None, amenity_ids=None, match='all'):
+        """
+        Página de lugares, opcionalmente filtrada por amenidades (todas o alguna).
+        El filtro se resuelve con el índice de bits; si está frío o venció su
+        AMENITY_INDEX_TTL_SECONDS se usa SQL para esta petición y se (re)carga el
+        índice para las siguientes.
+        """
+        if not amenity_ids:
+            return self._get_page(self.place_repo, limit, cursor)
+        if match not in MATCH_MODES:
+            raise ValueError(f"match must be one of: {', '.join(MATCH_MODES)}.")
+        limit = clamp_limit(limit)
+        after = decode_cursor(cursor, 'id')
+
+        index = get_amenity_index(self.db.engine)
+        reload = index.claim_reload(current_app.config.get('AMENITY_INDEX_TTL_SECONDS'))
+        if reload or not index.warm:
+            places, next_key = self.place_repo.get_page(
+                after=after, limit=limit, where=(self.place_repo.amenity_filter(amenity_ids, match),)
+            )
+            if reload:
+                try:
+                    index.load(self.place_repo.iter_amenity_links())
+                except Exception:
+                    index.release_reload()
+                    raise
+            return places, encode_cursor('id', next_key)
+
+        # Un resultado de más indica si hay página siguiente / One extra id tells whether a next page exists
+        page_ids = index.match(amenity_ids, match, after=after[1] if after else None, limit=limit + 1)
+        places, _ = self.place_repo.get_many(page_ids[:limit], options=PLACE_LIST_LOADERS)
+        next_key = (page_ids[limit - 1],) * 2 if len(page_ids) > limit else None
+        return places, encode_cursor('id', next_key)
+
+    def get_place_version(self, place_id):
+        """(id, updated_at, conteo de reseñas) del lugar y sus reseñas, sin cargarlos"""
+        return self.place_repo.get_version(place_id)
+
+    def get_places_version(self):
+        """(último updated_at, conteos) de lugares, reseñas y amenidades, sin cargarlos"""
+        return self.place_repo.get_collection_version()
+
+    def get_places_page_version(self, places):
+        """
+        Versión de una página ya cargada (con reseñas y amenidades): por lugar, id, updated_at
+        más reciente y conteos. O(página), sin consultas / Version of an already loaded page
+        """
+        return tuple(
+            (place.id,
+             max([place.updated_at, *(child.updated_at for child in (*place.reviews, *place.amenities))]),
+             len(place.reviews), len(place.amenities))
+            for place in places
+        )
 
-    
     def get_all_places(self):
         places = self.place_repo.get_all()
         return [{
@@ -244,6 +514,25 @@ class UserService:
             'longitude': place.longitude
         } for place in places]
 
+    def get_places_near(self, latitude, longitude, radius_km, limit=None):
+        """Lugares dentro de un radio, ordenados por distancia / Places within a radius, nearest first"""
+        if not (-90 <= latitude <= 90):
+            raise ValueError("Latitude must be between -90 and 90.")
+        if not (-180 <= longitude <= 180):
+            raise ValueError("Longitude must be between -180 and 180.")
+        if radius_km <= 0:
+            raise ValueError("Radius must be a positive number.")
+        return self.place_repo.get_places_near(latitude, longitude, radius_km, clamp_limit(limit))
+
+    def get_places_in_bbox(self, bbox, limit=None):
+        """Lugares dentro de una caja min_lon,min_lat,max_lon,max_lat / Places inside a bounding box"""
+        min_lon, min_lat, max_lon, max_lat = bbox
+        if not (-90 <= min_lat <= max_lat <= 90):
+            raise ValueError("Bounding box latitudes must satisfy -90 <= min_lat <= max_lat <= 90.")
+        if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+            raise ValueError("Bounding box longitudes must be between -180 and 180.")
+        return self.place_repo.get_places_in_bbox(bbox, clamp_limit(limit))
+
     def update_place(self, place_id, place_data):
         place = self.place_repo.get(place_id)
         if not place:
@@ -255,43 +544,177 @@ class UserService:
         place.latitude = place_data.get('latitude', place.latitude)
         place.longitude = place_data.get('longitude', place.longitude)
 
-        self.place_repo.update(place)
-        self.db.session.commit()
+        self._sync_search(place.id)
+        unit_of_work.commit(self.db.session)
         return place
+
+    def search_places(self, query, limit=None, cursor=None):
+        """
+        Búsqueda de texto completo ordenada por relevancia (BM25).
+        El cursor guarda el desplazamiento y la consulta que lo generó.
+        """
+        query = (query or '').strip()
+        if not query:
+            raise ValueError("A search query is required.")
+        limit = clamp_limit(limit)
+        offset = 0
+        if cursor:
+            offset, cursor_query = decode_cursor(cursor, 'search')
+            if cursor_query != query or not isinstance(offset, int) or offset < 0:
+                raise ValueError("Cursor does not match this search.")
+
+        ranked, total = self._get_search_index().search(query, limit, offset)
+        places, _ = self.place_repo.get_many([place_id for place_id, _ in ranked], options=PLACE_LIST_LOADERS)
+        by_id = {place.id: place for place in places}
+        items = [dict(by_id[place_id].to_dict(), score=round(score, 4))
+                 for place_id, score in ranked if place_id in by_id]
+        next_offset = offset + len(ranked)
+        return {
+            'items': items,
+            'total': total,
+            'next_cursor': encode_cursor('search', (next_offset, query)) if next_offset < total else None
+        }
+
+    def rebuild_search_index(self):
+        """Reconstruye el índice completo desde la base de datos; devuelve la cantidad de lugares"""
+        index = self._get_search_index()
+        count = 0
+        index.clear()
+        for count, document in enumerate(self.place_repo.iter_search_documents(), start=1):
+            index.index_place(*document)
+        unit_of_work.commit(self.db.session)
+        return count
+
+    def _get_search_index(self):
+        engine = self.db.engine
+        index = self._search_indexes.get(engine)
+        if index is None:
+            index = create_search_index(self.db)
+            self._search_indexes[engine] = index
+        return index
+
+    def _sync_search(self, place_id):
+        # Sin commit: el documento se confirma junto con el cambio que lo originó
+        document = self.place_repo.get_search_document(place_id)
+        if document:
+            self._get_search_index().index_place(*document)
+        else:
+            self._get_search_index().remove_place(place_id)
     
 # 📝 Review
 
     def create_review(self, review_data):
-        try:
-            # Verificar que los datos de review sean correctos
-            if 'text' not in review_data or not review_data['text']:
-                raise ValueError("Review text is required.")
-            if 'rating' not in review_data or not isinstance(review_data['rating'], (int, float)):
-                raise ValueError("Valid rating is required.")
-
-            user = self.user_repo.get(review_data['user_id'])
-            place = self.place_repo.get(review_data['place_id'])
-
-            # Validar si los objetos existen
-            if not user or not place:
-                raise ValueError("Invalid user_id or place_id.")
-
-            # Crear la review
-            review = Review(
-                text=review_data['text'],
-                rating=review_data['rating'],
-                user_id=user.id,
-                place_id=place.id
-            )
+        # Verificar que los datos de review sean correctos
+        if 'text' not in review_data or not review_data['text']:
+            raise ValueError("Review text is required.")
+        if 'rating' not in review_data or not isinstance(review_data['rating'], (int, float)):
+            raise ValueError("Valid rating is required.")
+        if not isinstance(review_data.get('user_id'), str) or not isinstance(review_data.get('place_id'), str):
+            raise ValueError("Invalid user_id or place_id.")
+
+        user = self.user_repo.get(review_data['user_id'])
+        place = self.place_repo.get(review_data['place_id'])
+
+        # Validar si los objetos existen
+        if not user or not place:
+            raise ValueError("Invalid user_id or place_id.")
+
+        # Crear la review
+        review = Review(
+            text=review_data['text'],
+            rating=review_data['rating'],
+            user_id=user.id,
+            place_id=place.id
+        )
 
+        # Agregados del lugar y reseña en la misma transacción (dentro de una
+        # petición add solo hace flush y se confirma todo al final); si la base
+        # rechaza algo se revierte todo, agregados incluidos
+        # Place aggregates and the review go in the same transaction
+        try:
+            self.place_repo.apply_rating_delta(place.id, added=review.rating)
             self.review_repo.add(review)
-            return review.to_dict()
-    
-        except Exception as e:
-            print(f"Error al crear la review: {e}")
-            return {"error": str(e)}
-
-
+            self._sync_search(place.id)
+            unit_of_work.commit(self.db.session)
+        except SQLAlchemyError as e:
+            unit_of_work.rollback(self.db.session)
+            raise ValueError(f"Error saving review: {getattr(e, 'orig', None) or e}")
+        return review.to_dict()
+
+    def create_reviews_batch(self, reviews_data):
+        """
+        Crea muchas reseñas en una sola transacción, actualizando los agregados
+        de cada lugar con un único UPDATE por lotes.
+        """
+        self._check_batch(reviews_data)
+        results = [None] * len(reviews_data)
+        pending = []
+        for index, review_data in enumerate(reviews_data):
+            try:
+                if not isinstance(review_data, dict):
+                    raise ValueError("Each item must be an object.")
+                if 'text' not in review_data or not review_data['text']:
+                    raise ValueError("Review text is required.")
+                if 'rating' not in review_data or not isinstance(review_data['rating'], (int, float)):
+                    raise ValueError("Valid rating is required.")
+                if not isinstance(review_data.get('user_id'), str) or not isinstance(review_data.get('place_id'), str):
+                    raise ValueError("Invalid user_id or place_id.")
+                pending.append((index, review_data))
+            except ValueError as e:
+                results[index] = {'index': index, 'error': str(e)}
+
+        _, missing_users = self.user_repo.get_many(data['user_id'] for _, data in pending)
+        _, missing_places = self.place_repo.get_many(data['place_id'] for _, data in pending)
+        missing = set(missing_users) | set(missing_places)
+
+        reviews, ratings_by_place = [], {}
+        for index, review_data in pending:
+            try:
+                if review_data['user_id'] in missing or review_data['place_id'] in missing:
+                    raise ValueError("Invalid user_id or place_id.")
+                review = Review(
+                    text=review_data['text'],
+                    rating=review_data['rating'],
+                    user_id=review_data['user_id'],
+                    place_id=review_data['place_id']
+                )
+                review.id = str(uuid.uuid4())
+                reviews.append(review)
+                ratings_by_place.setdefault(review.place_id, []).append(review.rating)
+                results[index] = {'index': index, 'id': review.id}
+            except ValueError as e:
+                results[index] = {'index': index, 'error': str(e)}
+
+        def insert():
+            self.review_repo.add_many(reviews)
+            self.place_repo.apply_rating_deltas(ratings_by_place)
+            for place_id in ratings_by_place:
+                self._sync_search(place_id)
+
+        self._commit_batch(insert, results)
+        return results
+
+    def _check_batch(self, items):
+        if not isinstance(items, list) or not items:
+            raise ValueError("A non-empty list of items is required.")
+        if len(items) > MAX_BATCH_SIZE:
+            raise ValueError(f"A batch can contain at most {MAX_BATCH_SIZE} items.")
+
+    def _commit_batch(self, insert, results):
+        """
+        Todo el lote se confirma (o se revierte) de una sola vez. Si la base rechaza el
+        executemany no se sabe qué fila falló: se revierte y cada ítem que iba a guardarse
+        recibe el error en su resultado (los que no pasaron la validación conservan el suyo)
+        """
+        try:
+            insert()
+            unit_of_work.commit(self.db.session)
+        except SQLAlchemyError as e:
+            unit_of_work.rollback(self.db.session)
+            error = f"Error saving batch: {getattr(e, 'orig', None) or e}"
+            for position, result in enumerate(results):
+                if 'id' in result:
+                    results[position] = {'index': result['index'], 'error': error}
 
     def get_review(self, review_id):
         review = self.review_repo.get(review_id)
@@ -302,12 +725,21 @@ class UserService:
     def get_all_reviews(self):
         reviews = self.review_repo.get_all()
         return [review.to_dict() for review in reviews]
+
+    def get_reviews_page(self, limit=None, cursor=None):
+        return self._get_page(self.review_repo, limit, cursor)
+
+    def get_review_version(self, review_id):
+        return self.review_repo.get_version(review_id)
+
+    def get_reviews_version(self):
+        return self.review_repo.get_collection_version()
      
 
     def get_reviews_by_place(self, place_id):
         try:
-            reviews = self.review_repo.get_reviews_by_place(place_id)
-            return [review.to_dict() for review in reviews] if reviews else []
+            # Modelos, como el resto de los getters; la ruta los serializa
+            return self.review_repo.get_reviews_by_place(place_id) or []
         except Exception as e:
             print(f"Error fetching reviews: {e}")
             return []
@@ -316,19 +748,30 @@ class UserService:
         review = self.get_review(review_id)
         if not review:
             raise ValueError("Review not found.")
+        old_rating = review.rating
         if 'text' in review_data:
             review.text = review_data['text']
         if 'rating' in review_data:
             review.rating = review_data['rating']
 
-        self.review_repo.update(review)
-        self.db.session.commit()
+        try:
+            if review.rating != old_rating:
+                self.place_repo.apply_rating_delta(review.place_id, added=review.rating, removed=old_rating)
+            if 'text' in review_data:
+                self._sync_search(review.place_id)
+            unit_of_work.commit(self.db.session)
+        except Exception as e:
+            unit_of_work.rollback(self.db.session)
+            raise ValueError(f"Error updating review: {str(e)}")
         return review
 
     def delete_review(self, review_id):
         review = self.get_review(review_id)
         if not review:
             raise ValueError("Review not found.")
+        # El ajuste de agregados se confirma junto con el borrado (un solo commit por petición)
+        self.place_repo.apply_rating_delta(review.place_id, removed=review.rating)
         self.review_repo.delete(review_id)
-        self.db.session.commit()
+        self._sync_search(review.place_id)
+        unit_of_work.commit(self.db.session)
         return {"message": "Review deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,51 @@
+# app/services/pagination.py
+
+import base64
+import json
+from datetime import datetime
+
+# Tamaño de página por defecto y máximo permitido
+# Default and maximum page size
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def clamp_limit(limit):
+    """Normaliza el parámetro limit / Normalize the limit parameter"""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    if not isinstance(limit, int) or limit < 1:
+        raise ValueError("Limit must be a positive integer.")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def encode_cursor(order_by, key):
+    """
+    Convierte la clave (valor, id) del último elemento en un token opaco
+    Turns the (value, id) key of the last item into an opaque token
+    """
+    if key is None:
+        return None
+    value, obj_id = key
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"o": order_by, "k": [value, obj_id]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, order_by):
+    """
+    Recupera la clave (valor, id) desde un token generado por encode_cursor
+    Recovers the (value, id) key from a token produced by encode_cursor
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, obj_id = payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if payload.get("o") != order_by:
+        raise ValueError("Cursor does not match the requested ordering.")
+    return value, obj_id
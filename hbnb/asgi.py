@@ -0,0 +1,16 @@
+"""
+Punto de entrada ASGI: las rutas v1 más usadas con repositorios asyncio
+ASGI entry point: the busiest v1 routes on asyncio repositories
+
+Alternativa a run.py (WSGI con hilos): un event loop por proceso atiende
+muchas peticiones a la vez mientras esperan a la base de datos o a bcrypt.
+Las demás rutas y los comandos de la CLI siguen en run.py.
+
+Uso / Usage (desde hbnb/):
+    uvicorn asgi:app --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+from app import create_app
+from app.api.async_v1 import create_asgi_app
+
+app = create_asgi_app(create_app())
@@ -0,0 +1,556 @@
+"""
+Benchmark reproducible de todos los endpoints de la API v1
+Reproducible benchmark for every v1 API endpoint
+
+1. Genera (una vez, y se reutiliza) un dataset determinista en un archivo
+   SQLite: 1k / 100k / 1M lugares con reseñas y amenidades. Cada corrida
+   trabaja sobre una copia, así las escrituras no cambian la corrida siguiente.
+2. Recorre cada ruta de app/api/v1 (un escenario por ruta y método, más
+   algunas variantes de filtros) con dos clientes:
+     - testclient: el cliente de pruebas de Flask, en el mismo proceso y en serie;
+     - http: N hilos con conexiones keep-alive contra un servidor local con hilos.
+3. Guarda p50/p95/p99, throughput, estados HTTP y RSS máximo en un JSON y,
+   con --baseline, lo compara contra una corrida anterior: sale con código 1
+   si algún endpoint empeoró más que la tolerancia.
+4. Si la tasa de errores (5xx o de conexión) de algún escenario supera
+   --max-error-rate, el JSON queda marcado "valid": false y sale con código 1
+   sin comparar: esas latencias miden errores, no el endpoint.
+
+Las rutas de /api/v1 sin escenario se informan como "uncovered" para que un
+endpoint nuevo no quede fuera del benchmark sin que nadie lo note.
+
+Seeds a deterministic SQLite dataset (reused between runs; each run works on a
+copy), drives every v1 route through the Flask test client and a threaded HTTP
+client, writes p50/p95/p99, throughput, status codes and peak RSS to JSON, and
+compares against a stored baseline to flag regressions.
+
+Uso / Usage (desde hbnb/):
+    python -m benchmarks.api_endpoints --size 1k
+    python -m benchmarks.api_endpoints --size 100k --requests 500 --threads 16 --output results.json
+    python -m benchmarks.api_endpoints --size 100k --baseline benchmarks/baseline-100k.json
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+
+import sqlalchemy
+from flask_jwt_extended import create_access_token
+from sqlalchemy import select
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import create_app, db, passwords
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import PlaceRepository
+from app.persistence.search import create_search_index
+from benchmarks.datasets import CITIES, PASSWORD, WORDS, member_credentials, parse_size, seed_dataset
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCHMARK_DIR, 'data')
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+DRIVERS = ('testclient', 'http')
+# Ids de cada tipo que se toman del dataset para armar las peticiones
+SAMPLE_IDS = 500
+# Se incrementa cuando cambia el generador o el esquema: los archivos cacheados viejos no se reutilizan
+DATASET_VERSION = 4
+
+
+# Dataset / Dataset
+
+def dataset_path(size, seed):
+    return os.path.join(DATA_DIR, f"hbnb-{size}-seed{seed}-v{DATASET_VERSION}.db")
+
+
+def prepare_database(size, seed, reseed=False):
+    """Archivo SQLite sembrado (se crea una sola vez por tamaño y semilla); devuelve (ruta, info)"""
+    path = dataset_path(size, seed)
+    info_path = path + '.json'
+    if os.path.exists(path) and os.path.exists(info_path) and not reseed:
+        with open(info_path) as info_file:
+            return path, json.load(info_file)
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    for stale in (path, info_path):
+        if os.path.exists(stale):
+            os.remove(stale)
+    app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{path}", 'SQL_SLOW_QUERY_MS': None})
+    with app.app_context():
+        db.create_all()
+        print(f"Seeding {size} places (seed {seed}) into {path} ...", file=sys.stderr)
+        counts, seconds = seed_dataset(db, passwords, parse_size(size), seed)
+        create_search_index(db).index_many(PlaceRepository(db).iter_search_documents())
+        db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+    info = {'size': size, 'seed': seed, 'rows': counts, 'seed_seconds': round(seconds, 2)}
+    with open(info_path, 'w') as info_file:
+        json.dump(info, info_file)
+    return path, info
+
+
+# Escenarios / Scenarios
+
+class Fixtures:
+    """Ids del dataset, tokens y recursos creados durante la corrida / Dataset ids, tokens and created resources"""
+
+    def __init__(self, seed):
+        self.run = uuid.uuid4().hex[:8]  # sufijo para emails y nombres únicos dentro de la copia
+        self.place_ids = self._ids(Place)
+        self.review_ids = self._ids(Review)
+        self.amenity_ids = self._ids(Amenity)
+        self.user_ids = self._ids(User)
+        admin = db.session.execute(select(User.id, User.email).where(User.is_admin.is_(True)).limit(1)).first()
+        self.member_email, self.member_password = member_credentials(seed)
+        member = db.session.execute(select(User.id).where(User.email == self.member_email)).first()
+        self.admin_id, self.member_id = admin.id, member.id
+        self.admin_headers = {'Authorization': f"Bearer {create_access_token(identity=admin.id)}"}
+        self.member_headers = {'Authorization': f"Bearer {create_access_token(identity=member.id)}"}
+        self._lock = threading.Lock()
+        self.created = {}  # tipo -> deque de ids creados por los escenarios POST
+        # Las reseñas que borra DELETE salen de una cola: cada id se borra una sola vez
+        self._deletable = deque(self.review_ids[len(self.review_ids) // 2:])
+
+    def _ids(self, model):
+        return [row[0] for row in db.session.execute(select(model.id).order_by(model.id).limit(SAMPLE_IDS))]
+
+    def pick(self, ids, number):
+        return ids[number % len(ids)] if ids else 'missing'
+
+    def remember(self, kind, object_id):
+        if object_id:
+            with self._lock:
+                self.created.setdefault(kind, deque()).append(object_id)
+
+    def take_review(self):
+        with self._lock:
+            created = self.created.get('review')
+            if created:
+                return created.popleft()
+            return self._deletable.popleft() if self._deletable else 'missing'
+
+
+class Scenario:
+    def __init__(self, name, method, rule, build, admin=False, creates=None):
+        self.name = name
+        self.method = method
+        self.rule = rule
+        self.build = build  # (fixtures, número) -> (ruta, cuerpo JSON o None)
+        self.admin = admin
+        self.creates = creates  # tipo de recurso cuyo id devuelve la respuesta
+
+
+def _bbox(fx, number):
+    latitude, longitude = CITIES[number % len(CITIES)]
+    return f"{longitude - 0.2},{latitude - 0.2},{longitude + 0.2},{latitude + 0.2}"
+
+
+def _place_body(fx, number):
+    latitude, longitude = CITIES[number % len(CITIES)]
+    return {
+        'title': f"Bench place {fx.run} {number}", 'description': 'Benchmark place', 'price': 50.0 + number % 400,
+        'latitude': latitude, 'longitude': longitude, 'owner_id': fx.pick(fx.user_ids, number),
+        'amenities': [fx.pick(fx.amenity_ids, number), fx.pick(fx.amenity_ids, number + 1)],
+    }
+
+
+def _review_body(fx, number):
+    return {'text': f"{WORDS[number % len(WORDS)]} stay", 'rating': 1 + number % 5,
+            'user_id': fx.pick(fx.user_ids, number), 'place_id': fx.pick(fx.place_ids, number)}
+
+
+def build_scenarios():
+    """Un escenario por ruta y método (los POST antes que los PUT/DELETE que usan sus ids)"""
+    amenities = lambda fx, n: f"{fx.pick(fx.amenity_ids, n)},{fx.pick(fx.amenity_ids, n + 3)}"
+    return [
+        # Amenidades / Amenities
+        Scenario('amenities.list', 'GET', '/api/v1/amenities/', lambda fx, n: ('/api/v1/amenities/?limit=20', None)),
+        Scenario('amenities.create', 'POST', '/api/v1/amenities/',
+                 lambda fx, n: ('/api/v1/amenities/', {'name': f"Bench {fx.run} {n}"}), admin=True, creates='amenity'),
+        Scenario('amenities.get', 'GET', '/api/v1/amenities/<string:amenity_id>',
+                 lambda fx, n: (f"/api/v1/amenities/{fx.pick(fx.amenity_ids, n)}", None)),
+        Scenario('amenities.update', 'PUT', '/api/v1/amenities/<string:amenity_id>',
+                 lambda fx, n: (f"/api/v1/amenities/{fx.pick(fx.amenity_ids, n)}", {'name': f"Renamed {n}"})),
+        Scenario('amenities.batch', 'POST', '/api/v1/amenities/batch',
+                 lambda fx, n: ('/api/v1/amenities/batch', [{'name': f"Batch {fx.run} {n} {i}"} for i in range(10)]),
+                 admin=True),
+        # Autenticación / Auth
+        Scenario('auth.login', 'POST', '/api/v1/auth/login',
+                 lambda fx, n: ('/api/v1/auth/login', {'email': fx.member_email, 'password': fx.member_password})),
+        Scenario('auth.register', 'POST', '/api/v1/auth/', lambda fx, n: ('/api/v1/auth/', {
+            'first_name': 'Bench', 'last_name': 'User', 'email': f"bench-{fx.run}-{n}@example.com",
+            'password': PASSWORD})),
+        Scenario('auth.get_user', 'GET', '/api/v1/auth/<user_id>',
+                 lambda fx, n: (f"/api/v1/auth/{fx.pick(fx.user_ids, n)}", None)),
+        # Usuarios / Users
+        Scenario('users.create', 'POST', '/api/v1/users/', lambda fx, n: ('/api/v1/users/', {
+            'first_name': 'Bench', 'last_name': 'Admin', 'email': f"admin-{fx.run}-{n}@example.com",
+            'password': PASSWORD}), admin=True),
+        Scenario('users.update', 'PUT', '/api/v1/users/<user_id>',
+                 lambda fx, n: (f"/api/v1/users/{fx.pick(fx.user_ids, n)}", {'last_name': f"Updated{n}"}), admin=True),
+        # Lugares / Places
+        Scenario('places.list', 'GET', '/api/v1/places/', lambda fx, n: ('/api/v1/places/?limit=20', None)),
+        Scenario('places.list_by_amenities', 'GET', '/api/v1/places/',
+                 lambda fx, n: (f"/api/v1/places/?limit=20&match=all&amenities={amenities(fx, n)}", None)),
+        Scenario('places.create', 'POST', '/api/v1/places/',
+                 lambda fx, n: ('/api/v1/places/', _place_body(fx, n)), creates='place'),
+        Scenario('places.batch', 'POST', '/api/v1/places/batch',
+                 lambda fx, n: ('/api/v1/places/batch', [_place_body(fx, n * 10 + i) for i in range(10)])),
+        Scenario('places.get', 'GET', '/api/v1/places/<place_id>',
+                 lambda fx, n: (f"/api/v1/places/{fx.pick(fx.place_ids, n)}", None)),
+        Scenario('places.update', 'PUT', '/api/v1/places/<place_id>',
+                 lambda fx, n: (f"/api/v1/places/{fx.pick(fx.place_ids, n)}", {'price': 75.0 + n % 100})),
+        Scenario('places.near', 'GET', '/api/v1/places/near', lambda fx, n: (
+            "/api/v1/places/near?lat={}&lon={}&radius_km=5&limit=20".format(*CITIES[n % len(CITIES)]), None)),
+        Scenario('places.near_bbox', 'GET', '/api/v1/places/near',
+                 lambda fx, n: (f"/api/v1/places/near?bbox={_bbox(fx, n)}&limit=20", None)),
+        Scenario('places.facets', 'GET', '/api/v1/places/facets',
+                 lambda fx, n: (f"/api/v1/places/facets?amenities={amenities(fx, n)}&max_price=300", None)),
+        Scenario('places.stats', 'GET', '/api/v1/places/stats',
+                 lambda fx, n: (f"/api/v1/places/stats?bbox={_bbox(fx, n)}", None)),
+        Scenario('places.search', 'GET', '/api/v1/places/search',
+                 lambda fx, n: (f"/api/v1/places/search?q={WORDS[n % len(WORDS)]}&limit=20", None)),
+        # Reseñas / Reviews
+        Scenario('reviews.list', 'GET', '/api/v1/reviews/', lambda fx, n: ('/api/v1/reviews/?limit=20', None)),
+        Scenario('reviews.create', 'POST', '/api/v1/reviews/',
+                 lambda fx, n: ('/api/v1/reviews/', _review_body(fx, n)), creates='review'),
+        Scenario('reviews.batch', 'POST', '/api/v1/reviews/batch',
+                 lambda fx, n: ('/api/v1/reviews/batch', [_review_body(fx, n * 10 + i) for i in range(10)])),
+        Scenario('reviews.get', 'GET', '/api/v1/reviews/<review_id>',
+                 lambda fx, n: (f"/api/v1/reviews/{fx.pick(fx.review_ids, n)}", None)),
+        Scenario('reviews.update', 'PUT', '/api/v1/reviews/<review_id>',
+                 lambda fx, n: (f"/api/v1/reviews/{fx.pick(fx.review_ids, n)}", {'text': 'Updated', 'rating': 4})),
+        Scenario('reviews.delete', 'DELETE', '/api/v1/reviews/<review_id>',
+                 lambda fx, n: (f"/api/v1/reviews/{fx.take_review()}", None)),
+        Scenario('reviews.by_place', 'GET', '/api/v1/reviews/places/<place_id>/reviews',
+                 lambda fx, n: (f"/api/v1/reviews/places/{fx.pick(fx.place_ids, n)}/reviews", None)),
+        # Operación / Operations
+        Scenario('metrics', 'GET', '/api/v1/_metrics', lambda fx, n: ('/api/v1/_metrics', None), admin=True),
+    ]
+
+
+def uncovered_routes(app, scenarios):
+    """(método, ruta) de /api/v1 sin ningún escenario / v1 routes with no scenario"""
+    covered = {(scenario.method, scenario.rule) for scenario in scenarios}
+    routes = set()
+    for rule in app.url_map.iter_rules():
+        if rule.rule.startswith('/api/v1'):
+            routes.update((method, rule.rule) for method in rule.methods - {'HEAD', 'OPTIONS'})
+    return sorted(routes - covered)
+
+
+# Medición / Measurement
+
+def percentile(ordered, fraction):
+    """Percentil por rango más cercano sobre una lista ordenada / Nearest-rank percentile"""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def summarize(latencies, statuses, elapsed):
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if status >= 500 or status == 0)
+    return {
+        'requests': len(ordered),
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3) if ordered else None,
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3) if ordered else None,
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3) if ordered else None,
+        'max_ms': round(ordered[-1] * 1000, 3) if ordered else None,
+        'throughput_rps': round(len(ordered) / elapsed, 2) if elapsed > 0 else None,
+        'error_rate': round(errors / len(ordered), 4) if ordered else None,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def peak_rss_mb():
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _created_id(body):
+    if isinstance(body, dict):
+        return body.get('id')
+    return None
+
+
+def run_testclient(app, fx, scenario, requests, warmup):
+    client = app.test_client()
+    headers = fx.admin_headers if scenario.admin else fx.member_headers
+    latencies, statuses = [], {}
+    for number in range(warmup):
+        path, body = scenario.build(fx, number)
+        client.open(path, method=scenario.method, json=body, headers=headers)
+    started = time.perf_counter()
+    for number in range(warmup, warmup + requests):
+        path, body = scenario.build(fx, number)
+        begin = time.perf_counter()
+        response = client.open(path, method=scenario.method, json=body, headers=headers)
+        latencies.append(time.perf_counter() - begin)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if scenario.creates:
+            fx.remember(scenario.creates, _created_id(response.get_json(silent=True)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+class _KeepAliveHandler(WSGIRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class LocalServer:
+    """Servidor WSGI con hilos en un puerto libre / Threaded WSGI server on a free port"""
+
+    def __init__(self, app):
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=_KeepAliveHandler)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def run_http(port, fx, scenario, requests, warmup, threads):
+    headers = dict(fx.admin_headers if scenario.admin else fx.member_headers, **{'Content-Type': 'application/json'})
+    numbers = itertools.count()
+    lock = threading.Lock()
+    latencies, statuses = [], {}
+    per_thread = max(1, requests // threads)
+
+    def send(connection, number):
+        path, body = scenario.build(fx, number)
+        payload = json.dumps(body) if body is not None else None
+        connection.request(scenario.method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        data = response.read()
+        if scenario.creates and response.status < 300:
+            try:
+                fx.remember(scenario.creates, _created_id(json.loads(data)))
+            except ValueError:
+                pass
+        return response.status
+
+    def worker(count, record):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        for _ in range(count):
+            number = next(numbers)
+            begin = time.perf_counter()
+            try:
+                status = send(connection, number)
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                status = 0  # error de conexión / connection error
+            elapsed = time.perf_counter() - begin
+            if record:
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[status] = statuses.get(status, 0) + 1
+        connection.close()
+
+    worker(warmup, record=False)
+    pool = [threading.Thread(target=worker, args=(per_thread, True)) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+# Comparación / Comparison
+
+def compare(results, baseline, tolerance=0.2, min_delta_ms=1.0):
+    """
+    Regresiones respecto de la línea base: p95 más lento (y al menos min_delta_ms)
+    o throughput más bajo que la tolerancia; devuelve una lista de dicts
+    """
+    regressions = []
+    for driver, scenarios in results['results'].items():
+        for name, current in scenarios.items():
+            previous = baseline.get('results', {}).get(driver, {}).get(name)
+            if not previous or not previous.get('requests') or not current.get('requests'):
+                continue
+            p95, old_p95 = current['p95_ms'], previous['p95_ms']
+            if p95 > old_p95 * (1 + tolerance) and p95 - old_p95 >= min_delta_ms:
+                regressions.append({'driver': driver, 'scenario': name, 'metric': 'p95_ms',
+                                    'baseline': old_p95, 'current': p95})
+            rps, old_rps = current['throughput_rps'], previous['throughput_rps']
+            if rps < old_rps * (1 - tolerance):
+                regressions.append({'driver': driver, 'scenario': name, 'metric': 'throughput_rps',
+                                    'baseline': old_rps, 'current': rps})
+            error_rate, old_error_rate = current.get('error_rate') or 0, previous.get('error_rate') or 0
+            if error_rate > old_error_rate + 0.01:
+                regressions.append({'driver': driver, 'scenario': name, 'metric': 'error_rate',
+                                    'baseline': old_error_rate, 'current': error_rate})
+    return regressions
+
+
+def invalid_scenarios(results, max_error_rate=0.01):
+    """
+    Escenarios cuya tasa de errores (5xx o de conexión) supera max_error_rate: sus latencias
+    miden respuestas de error rápidas, no el endpoint, así que la corrida no vale
+    Scenarios whose error rate exceeds the threshold; their timings are not meaningful
+    """
+    return [{'driver': driver, 'scenario': name, 'error_rate': entry['error_rate']}
+            for driver, scenarios in results['results'].items()
+            for name, entry in scenarios.items()
+            if (entry.get('error_rate') or 0) > max_error_rate]
+
+
+# Programa / Program
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_benchmark(size='1k', seed=42, requests=200, warmup=10, threads=8, drivers=DRIVERS,
+                  only=None, config='development', reseed=False):
+    """Corre el benchmark completo y devuelve el diccionario de resultados / Runs everything, returns results"""
+    seeded_path, dataset = prepare_database(size, seed, reseed)
+    work_path = seeded_path.replace('.db', f'.run-{os.getpid()}.db')
+    shutil.copyfile(seeded_path, work_path)
+    rss = {'after_seed': peak_rss_mb()}
+    app = create_app(config, {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{work_path}",
+        'PROPAGATE_EXCEPTIONS': False,  # un 500 se mide como respuesta, no corta el benchmark
+        'SQL_SLOW_QUERY_MS': None,
+    })
+    scenarios = [scenario for scenario in build_scenarios() if not only or scenario.name in only]
+    results = {driver: {} for driver in drivers}
+    try:
+        with app.app_context():
+            fx = Fixtures(seed)
+            uncovered = uncovered_routes(app, build_scenarios())
+            if 'testclient' in drivers:
+                for scenario in scenarios:
+                    results['testclient'][scenario.name] = run_testclient(app, fx, scenario, requests, warmup)
+                    print(f"testclient {scenario.name:<28} {results['testclient'][scenario.name]['p95_ms']} ms p95",
+                          file=sys.stderr)
+                rss['after_testclient'] = peak_rss_mb()
+            db.session.remove()
+        if 'http' in drivers:
+            # Sufijo nuevo: el testclient ya creó emails y nombres con los mismos números de petición
+            fx.run = uuid.uuid4().hex[:8]
+            with LocalServer(app) as server:
+                for scenario in scenarios:
+                    results['http'][scenario.name] = run_http(server.port, fx, scenario, requests, warmup, threads)
+                    print(f"http       {scenario.name:<28} {results['http'][scenario.name]['throughput_rps']} req/s",
+                          file=sys.stderr)
+            rss['after_http'] = peak_rss_mb()
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.remove(work_path)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'platform': platform.platform(),
+            'config': config,
+            'dataset': dataset,
+            'requests_per_scenario': requests,
+            'warmup': warmup,
+            'http_threads': threads,
+        },
+        'uncovered_routes': [f"{method} {rule}" for method, rule in uncovered],
+        'peak_rss_mb': rss,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='1k', help="Lugares: 1k, 10k, 100k, 1M o un número / Places")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla del dataset / Dataset seed")
+    parser.add_argument('--requests', type=int, default=200, help="Peticiones medidas por escenario y cliente")
+    parser.add_argument('--warmup', type=int, default=10, help="Peticiones de calentamiento (no se miden)")
+    parser.add_argument('--threads', type=int, default=8, help="Hilos del cliente HTTP / HTTP client threads")
+    parser.add_argument('--drivers', default=','.join(DRIVERS), help="testclient,http")
+    parser.add_argument('--only', help="Escenarios separados por comas / Comma-separated scenario names")
+    parser.add_argument('--config', default='development', help="Clase de configuración / Config class")
+    parser.add_argument('--reseed', action='store_true', help="Regenera el dataset aunque exista")
+    parser.add_argument('--output', help="Archivo JSON de resultados (por defecto benchmarks/results/)")
+    parser.add_argument('--baseline', help="JSON de una corrida anterior para comparar")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Empeoramiento tolerado (0.2 = 20%%)")
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help="Tasa de errores por escenario que invalida la corrida (0.01 = 1%%)")
+    args = parser.parse_args(argv)
+
+    parse_size(args.size)
+    drivers = tuple(driver for driver in args.drivers.split(',') if driver)
+    unknown = set(drivers) - set(DRIVERS)
+    if unknown:
+        parser.error(f"unknown drivers: {', '.join(sorted(unknown))}")
+    results = run_benchmark(args.size, args.seed, args.requests, args.warmup, args.threads, drivers,
+                            set(args.only.split(',')) if args.only else None, args.config, args.reseed)
+    invalid = invalid_scenarios(results, args.max_error_rate)
+    results['valid'] = not invalid
+    results['invalid_scenarios'] = invalid
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"api-{args.size}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Results written to {output}")
+    if results['uncovered_routes']:
+        print(f"Routes without a scenario: {', '.join(results['uncovered_routes'])}")
+
+    print(f"{'driver':<11}{'scenario':<28}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>10}  statuses")
+    for driver, scenarios in results['results'].items():
+        for name, entry in scenarios.items():
+            print(f"{driver:<11}{name:<28}{entry['p50_ms']:>9}{entry['p95_ms']:>9}{entry['p99_ms']:>9}"
+                  f"{entry['throughput_rps']:>10}  {entry['statuses']}")
+    print(f"Peak RSS (MB): {results['peak_rss_mb']}")
+
+    for entry in invalid:
+        print("INVALID {driver} {scenario}: error rate {error_rate}".format(**entry))
+    if invalid:
+        # Sin comparar: una línea base contra respuestas de error no dice nada
+        print(f"Results are invalid: {len(invalid)} scenarios above {args.max_error_rate} error rate.")
+        sys.exit(1)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print("REGRESSION {driver} {scenario} {metric}: {baseline} -> {current}".format(**regression))
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == '__main__':
+    main()
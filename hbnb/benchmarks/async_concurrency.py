@@ -0,0 +1,190 @@
+"""
+Escala con la concurrencia: servidor Flask con hilos contra el modo ASGI
+Concurrency scaling: the threaded Flask server versus the ASGI mode
+
+Sobre una copia del dataset de benchmarks.api_endpoints se levanta cada
+servidor en un proceso aparte (así los hilos del cliente no le disputan el GIL):
+  - threaded: la app Flask de run.py en el servidor WSGI con hilos de Werkzeug,
+    un hilo por conexión que se bloquea en SQLAlchemy y en bcrypt;
+  - asgi: la app de asgi.py en uvicorn, un event loop con repositorios asyncio.
+Para cada nivel de concurrencia (clientes keep-alive simultáneos) y cada
+escenario se mide throughput y p50/p95/p99, y la escala del throughput
+respecto del nivel más bajo. Los escenarios son los de api_endpoints que
+sirve el modo ASGI, con las mismas rutas y cuerpos.
+
+Runs each server in its own process against a copy of the api_endpoints
+dataset and, for every concurrency level (simultaneous keep-alive clients)
+and scenario, reports throughput, latency percentiles and throughput scaling
+relative to the lowest level.
+
+Uso / Usage (desde hbnb/):
+    python -m benchmarks.async_concurrency --size 10k --concurrency 1,8,32,128
+    python -m benchmarks.async_concurrency --servers asgi --only places.get,auth.login --output results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import sys
+from datetime import datetime, timezone
+
+from app import create_app, db
+from benchmarks.api_endpoints import (
+    RESULTS_DIR, Fixtures, _KeepAliveHandler, build_scenarios, prepare_database, run_http,
+)
+from benchmarks.datasets import parse_size
+
+SERVERS = ('threaded', 'asgi')
+# Escenarios de api_endpoints que también sirve app/api/async_v1.py
+SCENARIOS = (
+    'places.list', 'places.list_by_amenities', 'places.get',
+    'amenities.list', 'amenities.get',
+    'reviews.list', 'reviews.get', 'reviews.by_place', 'reviews.create',
+    'auth.login',
+)
+
+
+def _overrides(path):
+    return {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{path}",
+        'PROPAGATE_EXCEPTIONS': False,  # un 500 se mide como respuesta, no corta el benchmark
+        'SQL_SLOW_QUERY_MS': None,
+    }
+
+
+def serve(kind, path, config, ready):
+    """Proceso servidor: avisa el puerto por `ready` y atiende hasta que lo terminan"""
+    app = create_app(config, _overrides(path))
+    if kind == 'threaded':
+        from werkzeug.serving import make_server
+        server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=_KeepAliveHandler)
+        ready.put(server.server_port)
+        server.serve_forever()
+        return
+    import uvicorn
+    from app.api.async_v1 import create_asgi_app
+    sock = socket.create_server(('127.0.0.1', 0), backlog=2048)
+    # create_server deja proto=0 y asyncio solo pone TCP_NODELAY si proto es IPPROTO_TCP: sin esto
+    # Nagle + ACK retrasado suman ~40 ms a cada respuesta keep-alive. Las conexiones lo heredan.
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    ready.put(sock.getsockname()[1])  # las conexiones esperan en el backlog hasta que uvicorn arranca
+    uvicorn.Server(uvicorn.Config(create_asgi_app(app), log_level='warning', access_log=False)).run(sockets=[sock])
+
+
+class ServerProcess:
+    """Servidor en un proceso hijo (spawn) en un puerto libre / Server in a child process on a free port"""
+
+    def __init__(self, kind, path, config):
+        context = multiprocessing.get_context('spawn')
+        self.ready = context.Queue()
+        self.process = context.Process(target=serve, args=(kind, path, config, self.ready), daemon=True)
+        self.port = None
+
+    def __enter__(self):
+        self.process.start()
+        self.port = self.ready.get(timeout=60)
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
+
+
+def add_scaling(results):
+    """Agrega a cada medición su throughput relativo al nivel de concurrencia más bajo"""
+    for scenarios in results.values():
+        for levels in scenarios.values():
+            base = levels[min(levels, key=int)].get('throughput_rps')
+            for entry in levels.values():
+                rps = entry.get('throughput_rps')
+                entry['scaling'] = round(rps / base, 2) if base and rps is not None else None
+    return results
+
+
+def run_benchmark(size='1k', seed=42, concurrency=(1, 4, 16, 64), requests_per_client=20, warmup=10,
+                  servers=SERVERS, only=None, config='development', reseed=False):
+    """Corre todos los servidores y niveles; devuelve el diccionario de resultados"""
+    seeded_path, dataset = prepare_database(size, seed, reseed)
+    scenarios = [scenario for scenario in build_scenarios()
+                 if scenario.name in SCENARIOS and (not only or scenario.name in only)]
+    results = {server: {scenario.name: {} for scenario in scenarios} for server in servers}
+
+    for server in servers:
+        # Copia nueva por servidor: las reseñas que crea uno no cambian la corrida del otro
+        work_path = seeded_path.replace('.db', f'.{server}-{os.getpid()}.db')
+        shutil.copyfile(seeded_path, work_path)
+        app = create_app(config, _overrides(work_path))
+        try:
+            with app.app_context():
+                fx = Fixtures(seed)
+                db.session.remove()
+            with ServerProcess(server, work_path, config) as process:
+                for scenario in scenarios:
+                    for clients in concurrency:
+                        entry = run_http(process.port, fx, scenario, clients * requests_per_client, warmup, clients)
+                        results[server][scenario.name][str(clients)] = entry
+                        print(f"{server:<9}{scenario.name:<28}{clients:>5} clients {entry['throughput_rps']} req/s",
+                              file=sys.stderr)
+        finally:
+            with app.app_context():
+                db.engine.dispose()
+            os.remove(work_path)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'config': config,
+            'dataset': dataset,
+            'concurrency': list(concurrency),
+            'requests_per_client': requests_per_client,
+            'warmup': warmup,
+        },
+        'results': add_scaling(results),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='1k', help="Lugares: 1k, 10k, 100k, 1M o un número / Places")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla del dataset / Dataset seed")
+    parser.add_argument('--concurrency', default='1,4,16,64', help="Clientes simultáneos por nivel / Clients per level")
+    parser.add_argument('--requests-per-client', type=int, default=20, help="Peticiones medidas por cliente y nivel")
+    parser.add_argument('--warmup', type=int, default=10, help="Peticiones de calentamiento (no se miden)")
+    parser.add_argument('--servers', default=','.join(SERVERS), help="threaded,asgi")
+    parser.add_argument('--only', help="Escenarios separados por comas / Comma-separated scenario names")
+    parser.add_argument('--config', default='development', help="Clase de configuración / Config class")
+    parser.add_argument('--reseed', action='store_true', help="Regenera el dataset aunque exista")
+    parser.add_argument('--output', help="Archivo JSON de resultados (por defecto benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    parse_size(args.size)
+    servers = tuple(server for server in args.servers.split(',') if server)
+    unknown = set(servers) - set(SERVERS)
+    if unknown:
+        parser.error(f"unknown servers: {', '.join(sorted(unknown))}")
+    concurrency = sorted({int(value) for value in args.concurrency.split(',') if value})
+    results = run_benchmark(args.size, args.seed, concurrency, args.requests_per_client, args.warmup, servers,
+                            set(args.only.split(',')) if args.only else None, args.config, args.reseed)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"async-{args.size}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Results written to {output}")
+
+    print(f"{'server':<9}{'scenario':<28}{'clients':>8}{'req/s':>10}{'scaling':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+          f"{'errors':>8}")
+    for server, scenarios in results['results'].items():
+        for name, levels in scenarios.items():
+            for clients, entry in levels.items():
+                print(f"{server:<9}{name:<28}{clients:>8}{entry['throughput_rps']:>10}{entry['scaling']:>9}"
+                      f"{entry['p50_ms']:>9}{entry['p95_ms']:>9}{entry['p99_ms']:>9}{entry['error_rate']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Commits por petición con y sin unidad de trabajo
+Commits per request with and without the request unit of work
+
+Recorre un flujo típico de escritura de la API v1 (amenidad, lugar, reseña,
+edición y borrado de la reseña, listado) con el cliente de pruebas de Flask,
+una vez con UNIT_OF_WORK = False (commit por llamada al repositorio) y otra
+con UNIT_OF_WORK = True, y compara los COMMIT reales enviados al motor.
+
+Walks a typical v1 write flow through the Flask test client, once with the
+unit of work disabled and once enabled, and compares the real COMMITs sent
+to the engine per route.
+
+Uso / Usage (desde hbnb/):
+    python -m benchmarks.commits_per_request --rounds 20
+"""
+
+import argparse
+import json
+import sys
+from sqlalchemy import event
+
+from app import create_app, db, unit_of_work
+from app.models.user import User
+
+
+def run(enabled, rounds):
+    app = create_app("testing")
+    app.config["UNIT_OF_WORK"] = enabled
+    app.config["PROPAGATE_EXCEPTIONS"] = False  # un 500 se cuenta como respuesta, no corta la corrida
+    per_route = {}
+
+    with app.app_context():
+        db.create_all()
+        # Administrador: crear amenidades requiere privilegios de administrador
+        owner = User(first_name="Bench", last_name="Owner", email="owner@example.com", password="benchmark-secret",
+                     is_admin=True)
+        db.session.add(owner)
+        db.session.commit()
+        owner_id = owner.id
+
+        from flask_jwt_extended import create_access_token
+        headers = {"Authorization": f"Bearer {create_access_token(identity=owner_id)}"}
+        client = app.test_client()
+        commits = [0]
+
+        def on_commit(conn):
+            commits[0] += 1
+
+        def call(route, method, url, **kwargs):
+            before = commits[0]
+            response = client.open(url, method=method, headers=headers, **kwargs)
+            entry = per_route.setdefault(route, {"requests": 0, "commits": 0, "statuses": {}})
+            entry["requests"] += 1
+            entry["commits"] += commits[0] - before
+            entry["statuses"][response.status_code] = entry["statuses"].get(response.status_code, 0) + 1
+            return response.get_json(silent=True) or {}
+
+        event.listen(db.engine, "commit", on_commit)
+        unit_of_work.reset_stats()
+        try:
+            for number in range(rounds):
+                amenity = call("POST /amenities", "POST", "/api/v1/amenities/", json={"name": f"Amenity {number}"})
+                place = call("POST /places", "POST", "/api/v1/places/", json={
+                    "title": f"Place {number}", "description": "Benchmark place", "price": 100.0,
+                    "latitude": 10.0, "longitude": 20.0, "owner_id": owner_id,
+                    "amenities": [amenity.get("id", "missing")]
+                })
+                review = call("POST /reviews", "POST", "/api/v1/reviews/", json={
+                    "text": "Great", "rating": 5, "user_id": owner_id, "place_id": place.get("id", "missing")
+                })
+                review_id = review.get("id", "missing")
+                call("PUT /reviews/<id>", "PUT", f"/api/v1/reviews/{review_id}", json={"text": "Good", "rating": 4})
+                call("DELETE /reviews/<id>", "DELETE", f"/api/v1/reviews/{review_id}")
+                call("GET /places", "GET", "/api/v1/places/?limit=20")
+        finally:
+            event.remove(db.engine, "commit", on_commit)
+            db.session.remove()
+            db.drop_all()
+
+    for entry in per_route.values():
+        entry["commits_per_request"] = round(entry["commits"] / entry["requests"], 3)
+    return {"unit_of_work": enabled, "routes": per_route, "total": unit_of_work.stats()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20, help="Repeticiones del flujo / Flow repetitions")
+    parser.add_argument("--json", action="store_true", help="Salida JSON / JSON output")
+    args = parser.parse_args(argv)
+
+    results = [run(False, args.rounds), run(True, args.rounds)]
+    if args.json:
+        json.dump(results, sys.stdout, indent=2, default=str)
+        print()
+        return
+
+    print(f"{'route':<24}{'before':>10}{'after':>10}  statuses (after)")
+    before, after = results
+    for route, entry in after["routes"].items():
+        old = before["routes"].get(route, {}).get("commits_per_request")
+        print(f"{route:<24}{old:>10}{entry['commits_per_request']:>10}  {entry['statuses']}")
+    print(f"{'all requests':<24}{before['total']['commits_per_request']:>10}{after['total']['commits_per_request']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Datasets deterministas para los benchmarks
+Deterministic datasets for the benchmarks
+
+Con el mismo tamaño y semilla se generan exactamente las mismas filas (ids,
+textos, precios, coordenadas, reseñas y amenidades), así dos corridas del
+benchmark miden lo mismo. La generación la hace app.persistence.seed (el
+mismo generador que `flask seed`); aquí solo se fijan los tamaños.
+
+The same size and seed always produce the same rows; generation is delegated
+to app.persistence.seed, the generator behind `flask seed`.
+"""
+
+from app.persistence.seed import CITIES, WORDS, Seeder, seed_email, seed_password
+
+# Nombres de tamaño aceptados por --size / Size names accepted by --size
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1M': 1_000_000}
+
+# Contraseña de los usuarios que registran los escenarios POST
+PASSWORD = 'benchmark-password'
+
+BATCH_ROWS = 20_000
+PASSWORD_POOL = 4
+
+
+def parse_size(value):
+    """'1k' / '100k' / '1M' o un número / or a plain number"""
+    if value in SIZES:
+        return SIZES[value]
+    try:
+        count = int(value)
+    except ValueError:
+        raise ValueError(f"Unknown size '{value}': use one of {', '.join(SIZES)} or a number")
+    if count <= 0:
+        raise ValueError("Size must be positive")
+    return count
+
+
+def member_credentials(seed):
+    """Email y contraseña de un usuario sintético sin privilegios / A plain synthetic user's login"""
+    return seed_email(1, seed), seed_password(1, PASSWORD_POOL)
+
+
+def seed_dataset(db, password_service, places, seed=42, reviews_per_place=3, amenities_per_place=3):
+    """
+    Genera e inserta el dataset (un usuario cada diez lugares); devuelve {tabla: filas}
+    y los segundos empleados.
+    """
+    seeder = Seeder(db, password_service, seed=seed, batch_size=BATCH_ROWS, password_pool=PASSWORD_POOL)
+    report = seeder.run(max(10, places // 10), places, reviews_per_place, amenities_per_place)
+    return report.rows, report.seconds
@@ -0,0 +1,113 @@
+"""
+Benchmark de concurrencia del repositorio en memoria
+Concurrency stress benchmark for the in-memory repository
+
+Mide el throughput de lecturas (get por id + búsqueda por índice) con 1..N
+hilos lectores mientras un hilo escritor actualiza entidades sin pausa, y
+verifica que ningún lector vea una entidad a medio actualizar.
+
+Measures read throughput (get by id + indexed lookup) with 1..N reader
+threads while one writer thread keeps updating entities, and checks that no
+reader ever observes a half-updated entity.
+
+Uso / Usage (desde hbnb/):
+    python -m benchmarks.inmemory_concurrency --entities 100000 --threads 1,2,4,8 --seconds 3
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+
+from app.persistence.repository import InMemoryRepository
+
+
+class Entity:
+    def __init__(self, owner_id, version=0):
+        self.id = None
+        self.created_at = self.updated_at = None
+        self.owner_id = owner_id
+        # El escritor siempre deja low == high; un lector que vea lo contrario leyó una escritura a medias
+        self.low = self.high = version
+
+
+def populate(count, owners):
+    repo = InMemoryRepository(indexes=("owner_id",))
+    entities = repo.add_many(Entity(owner_id=f"owner-{number % owners}") for number in range(count))
+    return repo, [entity.id for entity in entities]
+
+
+def run(repo, ids, owners, reader_count, seconds, seed):
+    stop = threading.Event()
+    reads = [0] * reader_count
+    torn = [0] * reader_count
+    writes = [0]
+
+    def reader(slot):
+        rng = random.Random(seed + slot)
+        count = bad = 0
+        while not stop.is_set():
+            entity = repo.get(rng.choice(ids))
+            if entity.low != entity.high:
+                bad += 1
+            repo.find_all_by_attribute("owner_id", f"owner-{rng.randrange(owners)}")
+            count += 2
+        reads[slot], torn[slot] = count, bad
+
+    def writer():
+        rng = random.Random(seed)
+        version = 0
+        while not stop.is_set():
+            version += 1
+            repo.update(rng.choice(ids), {"low": version, "high": version})
+            writes[0] += 1
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(reader_count)]
+    threads.append(threading.Thread(target=writer))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "threads": reader_count,
+        "reads_per_second": round(sum(reads) / elapsed),
+        "writes_per_second": round(writes[0] / elapsed),
+        "torn_reads": sum(torn),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entities", type=int, default=100000)
+    parser.add_argument("--owners", type=int, default=1000)
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    repo, ids = populate(args.entities, args.owners)
+    results = [
+        run(repo, ids, args.owners, int(count), args.seconds, args.seed)
+        for count in args.threads.split(",")
+    ]
+    baseline = results[0]["reads_per_second"] or 1
+    for result in results:
+        result["scaling"] = round(result["reads_per_second"] / baseline, 2)
+    print(json.dumps({
+        "python": sys.version.split()[0],
+        "gil_enabled": getattr(sys, "_is_gil_enabled", lambda: True)(),
+        "entities": args.entities,
+        "results": results,
+    }, indent=2))
+    return 1 if any(result["torn_reads"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Benchmark de lecturas y escrituras concurrentes por perfil de SQLite
+Concurrent read/write benchmark per SQLite profile
+
+Para cada perfil de config.SQLITE_PROFILES (journal de rollback, WAL con
+synchronous=NORMAL, WAL con synchronous=FULL) se copia un archivo sembrado una
+sola vez y, durante --seconds, corren a la vez:
+  - N hilos lectores: detalle de un lugar (dueño, amenidades, reseñas) y sus reseñas;
+  - M hilos escritores: una reseña nueva + el UPDATE de los agregados del lugar,
+    confirmados en una transacción.
+Se informa throughput, p50/p95 de cada lado y los errores "database is locked".
+
+For each SQLite profile, N reader threads and M writer threads run against a
+copy of the same seeded file; reports throughput, latency percentiles and
+lock errors for both sides.
+
+Uso / Usage (desde hbnb/):
+    python -m benchmarks.sqlite_profiles --places 10000 --readers 4 --writers 2 --seconds 5
+    python -m benchmarks.sqlite_profiles --config production --profiles wal,wal_durable --output results.json
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db, passwords
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import PlaceRepository, ReviewRepository
+from app.persistence.seed import Seeder
+from app.persistence.sqlite_tuning import read_pragmas
+from benchmarks.api_endpoints import percentile
+from hbnb.config import SQLITE_PROFILES
+
+SAMPLE_IDS = 1000
+
+
+def _app(config, path, profile):
+    return create_app(config, {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{path}",
+        'SQLITE_PRAGMAS': SQLITE_PROFILES[profile],
+        'SQL_SLOW_QUERY_MS': None,
+    })
+
+
+def seed_template(path, places, seed):
+    """Archivo sembrado con el perfil de fábrica; cada perfil trabaja sobre una copia"""
+    app = _app('testing', path, 'default')
+    with app.app_context():
+        db.create_all()
+        Seeder(db, passwords, seed=seed, password_pool=1).run(max(10, places // 10), places)
+        place_ids = list(db.session.execute(select(Place.id).order_by(Place.id).limit(SAMPLE_IDS)).scalars())
+        user_ids = list(db.session.execute(select(User.id).order_by(User.id).limit(SAMPLE_IDS)).scalars())
+        db.session.remove()
+        db.engine.dispose()
+    return place_ids, user_ids
+
+
+def run_profile(config, path, profile, place_ids, user_ids, readers, writers, seconds, seed):
+    app = _app(config, path, profile)
+    stop = threading.Event()
+    start = threading.Barrier(readers + writers + 1)
+    results = {'read': [], 'write': []}  # por hilo: (latencias, errores)
+    lock = threading.Lock()
+
+    def reader(slot):
+        rng = random.Random(seed + slot)
+        latencies, errors = [], 0
+        with app.app_context():
+            places, reviews = PlaceRepository(db), ReviewRepository(db)
+            start.wait()
+            while not stop.is_set():
+                place_id = rng.choice(place_ids)
+                started = time.perf_counter()
+                try:
+                    places.get_place_details(place_id)
+                    reviews.get_reviews_by_place(place_id)
+                    latencies.append(time.perf_counter() - started)
+                except OperationalError:
+                    errors += 1
+                # Suelta la conexión y el identity map: cada lectura va a la base
+                db.session.rollback()
+                db.session.expunge_all()
+        with lock:
+            results['read'].append((latencies, errors))
+
+    def writer(slot):
+        rng = random.Random(seed + 1000 + slot)
+        latencies, errors = [], 0
+        with app.app_context():
+            places = PlaceRepository(db)
+            start.wait()
+            while not stop.is_set():
+                place_id, rating = rng.choice(place_ids), rng.randint(1, 5)
+                started = time.perf_counter()
+                try:
+                    db.session.add(Review(text="benchmark review", rating=rating, place_id=place_id,
+                                          user_id=rng.choice(user_ids)))
+                    places.apply_rating_delta(place_id, added=rating)
+                    db.session.commit()
+                    latencies.append(time.perf_counter() - started)
+                except OperationalError:
+                    db.session.rollback()
+                    errors += 1
+        with lock:
+            results['write'].append((latencies, errors))
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    threads += [threading.Thread(target=writer, args=(slot,)) for slot in range(writers)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    with app.app_context():
+        effective = read_pragmas(db.engine, ('journal_mode', 'synchronous', 'mmap_size', 'busy_timeout'))
+        db.session.remove()
+        db.engine.dispose()
+
+    summary = {'pragmas': effective}
+    for side, per_thread in results.items():
+        latencies = sorted(value for values, _ in per_thread for value in values)
+        summary[side] = {
+            'ops': len(latencies),
+            'ops_per_second': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3) if latencies else None,
+            'errors': sum(errors for _, errors in per_thread),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--places', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--profiles', default=','.join(SQLITE_PROFILES),
+                        help="Perfiles de config.SQLITE_PROFILES separados por comas")
+    parser.add_argument('--config', default='development',
+                        help="Clase de configuración (opciones del engine y del pool)")
+    parser.add_argument('--output', help="Archivo JSON con los resultados")
+    args = parser.parse_args()
+
+    profiles = args.profiles.split(',')
+    unknown = [name for name in profiles if name not in SQLITE_PROFILES]
+    if unknown:
+        parser.error(f"Unknown profiles: {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix='hbnb-sqlite-')
+    try:
+        template = os.path.join(workdir, 'template.db')
+        print(f"Seeding {args.places} places ...", file=sys.stderr)
+        place_ids, user_ids = seed_template(template, args.places, args.seed)
+
+        results = {}
+        for profile in profiles:
+            path = os.path.join(workdir, f"{profile}.db")
+            shutil.copyfile(template, path)
+            print(f"Running profile {profile} ...", file=sys.stderr)
+            results[profile] = run_profile(args.config, path, profile, place_ids, user_ids,
+                                           args.readers, args.writers, args.seconds, args.seed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {'places': args.places, 'readers': args.readers, 'writers': args.writers,
+              'seconds': args.seconds, 'config': args.config, 'results': results}
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    print(f"{'profile':<12} {'journal':<8} {'reads/s':>9} {'read p95':>9} {'writes/s':>9} {'write p95':>10} {'errors':>7}")
+    for profile, summary in results.items():
+        read, write = summary['read'], summary['write']
+        print(f"{profile:<12} {summary['pragmas']['journal_mode']:<8} {read['ops_per_second']:>9} "
+              f"{read['p95_ms'] or '-':>9} {write['ops_per_second']:>9} {write['p95_ms'] or '-':>10} "
+              f"{read['errors'] + write['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
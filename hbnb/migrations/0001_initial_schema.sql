@@ -0,0 +1,72 @@
+-- Esquema de los modelos (mismos nombres de tabla que el ORM)
+-- Model schema (same table names as the ORM)
+-- IF NOT EXISTS: adopta las bases creadas antes con db.create_all()
+
+CREATE TABLE IF NOT EXISTS users (
+    id VARCHAR(36) NOT NULL,
+    first_name VARCHAR(50) NOT NULL,
+    last_name VARCHAR(50) NOT NULL,
+    email VARCHAR(120) NOT NULL,
+    password VARCHAR(128) NOT NULL,
+    is_admin BOOLEAN,
+    created_at DATETIME,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    UNIQUE (email)
+);
+
+CREATE TABLE IF NOT EXISTS amenities (
+    id VARCHAR(36) NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    description TEXT,
+    created_at DATETIME,
+    updated_at DATETIME,
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE IF NOT EXISTS places (
+    id VARCHAR(36) NOT NULL,
+    title VARCHAR(100) NOT NULL,
+    description TEXT NOT NULL,
+    price FLOAT NOT NULL,
+    latitude FLOAT NOT NULL,
+    longitude FLOAT NOT NULL,
+    owner_id VARCHAR(36) NOT NULL,
+    geohash VARCHAR(12),
+    review_count INTEGER NOT NULL,
+    rating_sum INTEGER NOT NULL,
+    rating_count_1 INTEGER NOT NULL,
+    rating_count_2 INTEGER NOT NULL,
+    rating_count_3 INTEGER NOT NULL,
+    rating_count_4 INTEGER NOT NULL,
+    rating_count_5 INTEGER NOT NULL,
+    created_at DATETIME,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY (owner_id) REFERENCES users (id)
+);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    id VARCHAR(36) NOT NULL,
+    text VARCHAR(1024) NOT NULL,
+    rating INTEGER NOT NULL,
+    user_id VARCHAR(36) NOT NULL,
+    place_id VARCHAR(36) NOT NULL,
+    created_at DATETIME,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    FOREIGN KEY (place_id) REFERENCES places (id)
+);
+
+CREATE TABLE IF NOT EXISTS place_amenity (
+    place_id VARCHAR(36) NOT NULL,
+    amenity_id VARCHAR(36) NOT NULL,
+    PRIMARY KEY (place_id, amenity_id),
+    FOREIGN KEY (place_id) REFERENCES places (id),
+    FOREIGN KEY (amenity_id) REFERENCES amenities (id)
+);
+
+-- Búsqueda por celdas geohash y refresco incremental del snapshot columnar
+CREATE INDEX IF NOT EXISTS ix_places_geohash ON places (geohash);
+CREATE INDEX IF NOT EXISTS ix_places_updated_at ON places (updated_at);
@@ -0,0 +1,11 @@
+-- Índices de las búsquedas por clave foránea (sin ellos son recorridos completos)
+-- Foreign-key lookup indexes (without them these are full table scans)
+
+-- get_places_by_owner
+CREATE INDEX IF NOT EXISTS ix_places_owner_id ON places (owner_id);
+-- get_reviews_by_place, carga de reseñas de un lugar
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id ON reviews (place_id);
+-- reseñas de un usuario y borrado de usuarios
+CREATE INDEX IF NOT EXISTS ix_reviews_user_id ON reviews (user_id);
+-- filtro por amenidades: la PK (place_id, amenity_id) no sirve para buscar por amenity_id
+CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id ON place_amenity (amenity_id);
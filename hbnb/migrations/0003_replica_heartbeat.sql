@@ -0,0 +1,9 @@
+-- Latido de replicación: cada transacción que escribe actualiza la fila 1 en el
+-- primario; una réplica está tan atrasada como su copia de beat_at
+-- Replication heartbeat: row 1 is bumped by every writing transaction on the primary
+
+CREATE TABLE IF NOT EXISTS replica_heartbeat (
+    id INTEGER NOT NULL,
+    beat_at FLOAT NOT NULL,
+    PRIMARY KEY (id)
+);
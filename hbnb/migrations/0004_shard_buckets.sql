@@ -0,0 +1,9 @@
+-- Mapa de particiones: en qué partición (SHARDS) vive cada cubeta de lugares;
+-- lo crea la aplicación la primera vez y lo modifica `flask shards rebalance`
+-- Shard map: which shard holds each bucket of places
+
+CREATE TABLE IF NOT EXISTS shard_buckets (
+    bucket INTEGER NOT NULL,
+    shard VARCHAR(64) NOT NULL,
+    PRIMARY KEY (bucket)
+);
@@ -0,0 +1,19 @@
+-- Lápidas de lugares borrados: las escribe el trigger en cada DELETE de places y
+-- el snapshot columnar las lee en lugar de comparar todos los IDs; el trigger
+-- descarta las de más de un día (PLACE_DELETIONS_RETENTION)
+-- Tombstones of deleted places, written by a trigger on every DELETE
+
+CREATE TABLE IF NOT EXISTS place_deletions (
+    place_id VARCHAR(36) NOT NULL,
+    deleted_at DATETIME NOT NULL,
+    PRIMARY KEY (place_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_place_deletions_deleted_at ON place_deletions (deleted_at);
+
+CREATE TRIGGER IF NOT EXISTS places_record_deletion AFTER DELETE ON places
+BEGIN
+    DELETE FROM place_deletions WHERE deleted_at < strftime('%Y-%m-%d %H:%M:%f', 'now', '-1 day');
+    INSERT OR REPLACE INTO place_deletions (place_id, deleted_at)
+    VALUES (OLD.id, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+END;
@@ -1,4 +1,5 @@
-from hbnb.app import create_app, db
+import click
+from app import create_app, db, passwords, sharding
 
 app = create_app()
 
@@ -11,5 +12,138 @@ def create_database():
     except Exception as e:
         print(f"Error al crear la base de datos: {e}")
 
+@app.cli.command("migrate")
+@click.option("--status", is_flag=True, help="Solo lista las migraciones pendientes")
+def migrate(status):
+    """Aplica las migraciones de esquema pendientes (migrations/*.sql)."""
+    from app.persistence.migrate import migrate as apply_migrations, pending, raw_connection
+    try:
+        connection = raw_connection(db.engine)
+        try:
+            if status:
+                names = [f"{m.version:04d}_{m.name}" for m in pending(connection)]
+                print("Pendientes: " + (", ".join(names) if names else "ninguna"))
+                return
+            applied = apply_migrations(connection)
+        finally:
+            connection.close()
+        for migration in applied:
+            print(f"Aplicada {migration.version:04d}_{migration.name}")
+        print("Esquema al día." if not applied else f"{len(applied)} migraciones aplicadas.")
+    except Exception as e:
+        print(f"Error al migrar la base de datos: {e}")
+
+@app.cli.command("seed")
+@click.option("--users", default=1000, show_default=True, help="Usuarios sintéticos / Synthetic users")
+@click.option("--places", default=10000, show_default=True, help="Lugares sintéticos / Synthetic places")
+@click.option("--reviews-per-place", default=3, show_default=True, help="Reseñas promedio por lugar")
+@click.option("--amenities-per-place", default=3, show_default=True, help="Amenidades promedio por lugar")
+@click.option("--seed", default=42, show_default=True, help="Semilla: misma semilla, mismas filas")
+@click.option("--batch-size", default=10000, show_default=True, help="Filas por executemany")
+@click.option("--commit-every", default=200000, show_default=True, help="Filas por transacción")
+@click.option("--password-pool", default=16, show_default=True, help="Contraseñas distintas (un bcrypt cada una)")
+@click.option("--reset", is_flag=True, help="Borra las tablas y el historial de migraciones antes de sembrar")
+@click.option("--skip-search-index", is_flag=True, help="No reconstruye el índice FTS5 al terminar")
+def seed(users, places, reviews_per_place, amenities_per_place, seed, batch_size, commit_every, password_pool,
+         reset, skip_search_index):
+    """Carga los datos iniciales y genera un dataset sintético determinista."""
+    from app.persistence.migrate import migrate_database
+    from app.persistence.seed import Seeder, seed_email, seed_password
+    try:
+        # Mismo esquema e historial que `flask migrate`: la próxima corrida no la ve como esquema heredado
+        for migration in migrate_database(db, reset=reset):
+            print(f"Aplicada {migration.version:04d}_{migration.name}")
+        seeder = Seeder(db, passwords, seed=seed, batch_size=batch_size, commit_every=commit_every,
+                        password_pool=password_pool)
+
+        def progress(report, generated):
+            print(f"  {generated} lugares, {report.total_rows} filas, {report.rows_per_second:,.0f} filas/s")
+
+        report = seeder.run(users, places, reviews_per_place, amenities_per_place, progress=progress)
+        for table, rows in sorted(report.rows.items()):
+            print(f"  {table}: {rows}")
+        print(f"{report.total_rows} filas en {report.seconds:.1f} s ({report.rows_per_second:,.0f} filas/s, "
+              f"bcrypt {report.hash_seconds:.2f} s).")
+        print(f"Usuario de ejemplo: {seed_email(1, seed)} / {seed_password(1, password_pool)}")
+        if not skip_search_index:
+            reindex_search.callback()
+    except Exception as e:
+        print(f"Error al sembrar la base de datos: {e}")
+
+@app.cli.command("repair_ratings")
+def repair_ratings():
+    """Recalcula los agregados de calificación de todos los lugares."""
+    from app.persistence.repository import PlaceRepository
+    from app.persistence.unit_of_work import transaction
+    try:
+        with transaction(db.session):
+            updated = PlaceRepository(db).recompute_rating_aggregates()
+        print(f"Agregados recalculados para {updated} lugares con reseñas.")
+    except Exception as e:
+        print(f"Error al recalcular los agregados: {e}")
+
+@app.cli.command("reindex_search")
+def reindex_search():
+    """Reconstruye el índice de búsqueda de los lugares (FTS5 o tsvector)."""
+    from app.persistence.repository import PlaceRepository
+    from app.persistence.search import InMemorySearchIndex, create_search_index
+    from app.persistence.unit_of_work import transaction
+    try:
+        # Borrado y reindexado en una sola transacción: se confirma al salir o se revierte entero
+        with transaction(db.session):
+            index = create_search_index(db)
+            if isinstance(index, InMemorySearchIndex):
+                print("Este motor no tiene búsqueda en la base: cada proceso carga su índice en memoria.")
+                return
+            index.clear()
+            index.index_many(PlaceRepository(db).iter_search_documents())
+        print("Índice de búsqueda reconstruido.")
+    except Exception as e:
+        print(f"Error al reconstruir el índice de búsqueda: {e}")
+
+@app.cli.group("shards")
+def shards():
+    """Particiones de lugares y reseñas (SHARDS)."""
+
+@shards.command("init")
+def shards_init():
+    """Crea las tablas particionadas en cada partición y el mapa de cubetas."""
+    try:
+        sharding.create_all()
+        sharding.load_map()
+        print(f"{len(sharding.names)} particiones listas ({sharding.buckets} cubetas).")
+    except Exception as e:
+        print(f"Error al crear las particiones: {e}")
+
+@shards.command("status")
+def shards_status():
+    """Cubetas, lugares y reseñas de cada partición."""
+    try:
+        for name, entry in sharding.status().items():
+            print(f"  {name}: {entry['buckets']} cubetas, {entry['places']} lugares, {entry['reviews']} reseñas")
+    except Exception as e:
+        print(f"Error al leer las particiones: {e}")
+
+@shards.command("rebalance")
+@click.option("--exclude", multiple=True, help="Partición a vaciar antes de quitarla de SHARDS (repetible)")
+@click.option("--batch-size", default=500, show_default=True, help="Lugares copiados por transacción")
+@click.option("--dry-run", is_flag=True, help="Solo muestra las cubetas que se moverían")
+def shards_rebalance(exclude, batch_size, dry_run):
+    """Reparte las cubetas en partes iguales y mueve sus lugares (con las escrituras en pausa)."""
+    try:
+        report = sharding.rebalance(exclude=exclude, batch_size=batch_size, dry_run=dry_run)
+        moves = {}
+        for old, new in report.moved.values():
+            moves[(old, new)] = moves.get((old, new), 0) + 1
+        for (old, new), count in sorted(moves.items()):
+            print(f"  {old} -> {new}: {count} cubetas")
+        if dry_run:
+            print(f"{len(report.moved)} cubetas se moverían.")
+            return
+        summary = report.to_dict()
+        print(f"{summary['buckets_moved']} cubetas movidas; copiadas {summary['copied']}, borradas {summary['deleted']}.")
+    except Exception as e:
+        print(f"Error al rebalancear las particiones: {e}")
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -1,18 +1,32 @@
+# Aplica las migraciones pendientes de migrations/ sobre un archivo SQLite
+# Applies the pending migrations in migrations/ to a SQLite file
+# Uso / Usage: python run_sql.py [development.db] [--status]
+# Los datos iniciales (admin y amenidades) los carga `flask seed`
 import sqlite3
+import sys
 
-def run_sql_script(db_path, script_path):
+from app.persistence.migrate import migrate, pending
+
+
+def run_migrations(db_path, status_only=False):
     conn = sqlite3.connect(db_path)
-    with open(script_path, 'r') as file:
-        sql_script = file.read()
     try:
-        conn.executescript(sql_script)
-        print(f'Executed {script_path} successfully.')
+        if status_only:
+            for migration in pending(conn):
+                print(f'Pending {migration.version:04d}_{migration.name}')
+            return
+        applied = migrate(conn)
+        for migration in applied:
+            print(f'Applied {migration.version:04d}_{migration.name} successfully.')
+        if not applied:
+            print(f'{db_path} is up to date.')
     except Exception as exception:
-        print(f'Error executting {script_path}: {exception}')
+        print(f'Error migrating {db_path}: {exception}')
+        sys.exit(1)
     finally:
         conn.close()
 
+
 if __name__ == '__main__':
-    db_file = 'development.db'
-    run_sql_script(db_file, 'generate_tables.sql')
-    run_sql_script(db_file, 'init_data.sql')
\ No newline at end of file
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    run_migrations(args[0] if args else 'development.db', '--status' in sys.argv)
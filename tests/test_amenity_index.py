@@ -0,0 +1,121 @@
+import unittest
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.user import User
+from app.persistence.amenity_index import AmenityBitmapIndex, get_amenity_index
+from app.persistence.repository import PlaceRepository
+from app.services import facade
+
+
+class AmenityBitmapIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.index = AmenityBitmapIndex()
+        self.index.load([("p1", "wifi"), ("p1", "pool"), ("p2", "wifi"), ("p3", "ac")])
+
+    def test_all_and_any(self):
+        self.assertEqual(self.index.match(["wifi", "pool"], "all"), ["p1"])
+        self.assertEqual(self.index.match(["pool", "ac"], "any"), ["p1", "p3"])
+        self.assertEqual(self.index.match(["wifi", "missing"], "all"), [])
+        self.assertEqual(self.index.match(["wifi", "missing"], "any"), ["p1", "p2"])
+
+    def test_apply_changes(self):
+        self.index.apply([("links", "p2", ["pool"], ["wifi"]), ("place_deleted", "p1"), ("amenity_deleted", "ac")])
+        self.assertEqual(self.index.match(["pool"]), ["p2"])
+        self.assertEqual(self.index.match(["wifi"]), [])
+        self.assertEqual(self.index.match(["ac"], "any"), [])
+
+    def test_match_scans_from_the_cursor(self):
+        self.index.apply([("links", "p0", ["wifi"], [])])
+        self.assertEqual(self.index.match(["wifi"]), ["p0", "p1", "p2"])
+        self.assertEqual(self.index.match(["wifi"], after="p0", limit=1), ["p1"])
+        self.assertEqual(self.index.match(["wifi", "ac"], "any", after="p1"), ["p2", "p3"])
+
+    def test_only_one_caller_reloads_an_expired_index(self):
+        self.assertFalse(self.index.claim_reload(None))
+        self.assertTrue(self.index.claim_reload(0))
+        self.assertFalse(self.index.claim_reload(0))
+        self.index.load([("p1", "wifi")])
+        self.assertTrue(self.index.claim_reload(0))
+        self.index.release_reload()
+        self.assertTrue(AmenityBitmapIndex().claim_reload(None))
+
+
+class AmenityIndexMaintenanceTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        self.wifi, self.pool = Amenity(name="WiFi"), Amenity(name="Pool")
+        db.session.add_all([self.user, self.wifi, self.pool])
+        db.session.commit()
+        self.repo = PlaceRepository(db)
+        self.index = get_amenity_index(db.engine)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _place(self, title, *amenities):
+        place = Place(title=title, description="Linda", price=50, latitude=0, longitude=0, owner_id=self.user.id)
+        for amenity in amenities:
+            place.add_amenity(amenity)
+        db.session.add(place)
+        db.session.commit()
+        return place.id
+
+    def _sql_match(self, amenity_ids, mode):
+        places, _ = self.repo.get_page(limit=100, where=(self.repo.amenity_filter(amenity_ids, mode),))
+        return [place.id for place in places]
+
+    def test_index_follows_commits_and_agrees_with_sql(self):
+        both = self._place("Casa", self.wifi, self.pool)
+        self.index.load(self.repo.iter_amenity_links())
+        wifi_only = self._place("Depto", self.wifi)
+
+        for mode in ("all", "any"):
+            self.assertEqual(self.index.match([self.wifi.id, self.pool.id], mode),
+                             sorted(self._sql_match([self.wifi.id, self.pool.id], mode)))
+        self.assertEqual(self.index.match([self.wifi.id]), sorted([both, wifi_only]))
+
+        # Un rollback no llega al índice
+        place = db.session.get(Place, wifi_only)
+        place.add_amenity(self.pool)
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual(self.index.match([self.pool.id]), [both])
+
+    def test_bulk_links_are_recorded(self):
+        self.index.load([])
+        place_id = self._place("Casa")
+        self.repo.add_amenity_links([(place_id, self.pool.id)])
+        db.session.commit()
+        self.assertEqual(self.index.match([self.pool.id]), [place_id])
+
+    def test_expired_index_picks_up_links_from_other_processes(self):
+        place_id = self._place("Casa")
+        self.index.load(self.repo.iter_amenity_links())
+        # Vínculo escrito por otro proceso: ningún evento de esta sesión lo anota
+        db.session.execute(place_amenity.insert(), {"place_id": place_id, "amenity_id": self.pool.id})
+        db.session.commit()
+
+        def page():
+            return [place.id for place in facade.get_places_page(10, None, [self.pool.id])[0]]
+
+        self.app.config["AMENITY_INDEX_TTL_SECONDS"] = 3600
+        self.assertEqual(page(), [])
+        self.app.config["AMENITY_INDEX_TTL_SECONDS"] = 0
+        self.assertEqual(page(), [place_id])  # SQL en esta petición, recarga para las siguientes
+        self.app.config["AMENITY_INDEX_TTL_SECONDS"] = 3600
+        self.assertEqual(page(), [place_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
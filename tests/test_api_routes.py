@@ -0,0 +1,253 @@
+import unittest
+from unittest.mock import patch
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import PlaceRepository
+
+
+class ApiRoutesTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User(first_name="Ana", last_name="Sosa", email="ana@example.com", password="secret-password",
+                     is_admin=True)
+        guest = User(first_name="Luis", last_name="Paz", email="luis@example.com", password="secret-password")
+        amenities = [Amenity(name=f"Amenity {number}") for number in range(5)]
+        db.session.add_all([owner, guest, *amenities])
+        db.session.flush()
+        places = [Place(title=f"Place {number}", description="A place", price=float(10 * number + 10),
+                        latitude=-34.6 + number * 0.01, longitude=-58.4, owner_id=owner.id) for number in range(5)]
+        places[0].amenities.extend(amenities[:2])
+        db.session.add_all(places)
+        db.session.flush()
+        reviews = [Review(text=f"Review {number}", rating=number % 5 + 1, place_id=places[number].id,
+                          user_id=guest.id) for number in range(5)]
+        db.session.add_all(reviews)
+        db.session.commit()
+        self.owner_id, self.guest_id = owner.id, guest.id
+        self.amenity_ids = sorted(amenity.id for amenity in amenities)
+        self.first_place_amenities = [amenity.id for amenity in amenities[:2]]
+        self.first_place_id = places[0].id
+        self.place_ids = sorted(place.id for place in places)
+        self.review_ids = sorted(review.id for review in reviews)
+        self.headers = {"Authorization": f"Bearer {create_access_token(identity=self.guest_id)}"}
+        self.admin_headers = {"Authorization": f"Bearer {create_access_token(identity=self.owner_id)}"}
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _walk(self, path, limit, headers=None):
+        # Sigue next_cursor hasta la última página, como haría un cliente
+        seen, cursor = [], None
+        while True:
+            query = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get(path, query_string=query, headers=headers)
+            self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+            body = response.get_json()
+            self.assertLessEqual(len(body["items"]), limit)
+            seen.extend(item["id"] for item in body["items"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return seen
+
+    def test_places_list_pages_with_next_cursor(self):
+        response = self.client.get("/api/v1/places/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(item["id"] for item in response.get_json()["items"]), self.place_ids)
+        self.assertEqual(self._walk("/api/v1/places/", 2), self.place_ids)
+
+        response = self.client.get("/api/v1/places/", query_string={"amenities": ",".join(self.first_place_amenities)})
+        self.assertEqual(len(response.get_json()["items"]), 1)
+        self.assertEqual(self.client.get("/api/v1/places/", query_string={"cursor": "garbage"}).status_code, 400)
+
+    def test_amenities_list_requires_a_token_and_pages(self):
+        self.assertEqual(self.client.get("/api/v1/amenities/").status_code, 401)
+        self.assertEqual(self._walk("/api/v1/amenities/", 2, self.headers), self.amenity_ids)
+
+    def test_reviews_list_pages_with_next_cursor(self):
+        response = self.client.get("/api/v1/reviews/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["items"]), 5)
+        self.assertEqual(self._walk("/api/v1/reviews/", 3), self.review_ids)
+
+    def test_reviews_by_place(self):
+        response = self.client.get(f"/api/v1/reviews/places/{self.place_ids[0]}/reviews")
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        self.assertEqual([review["place_id"] for review in response.get_json()], [self.place_ids[0]])
+
+    def _revalidate(self, path, etag):
+        return self.client.get(path, headers={**self.headers, "If-None-Match": etag})
+
+    def test_places_list_etag_follows_review_edits_and_deletes(self):
+        first = self.client.get("/api/v1/places/")
+        etag = first.headers["ETag"]
+        self.assertNotIn("Last-Modified", first.headers)
+        self.assertEqual(self._revalidate("/api/v1/places/", etag).status_code, 304)
+        # Sin Last-Modified en colecciones: If-Modified-Since no alcanza para un 304
+        since = self.client.get("/api/v1/places/", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        self.assertEqual(since.status_code, 200)
+
+        review = first.get_json()["items"][0]["reviews"][0]
+        self.assertEqual(self.client.put(f"/api/v1/reviews/{review['id']}", json={"text": "Edited"}).status_code, 200)
+        edited = self._revalidate("/api/v1/places/", etag)
+        self.assertEqual(edited.status_code, 200)
+        self.assertEqual(edited.get_json()["items"][0]["reviews"][0]["text"], "Edited")
+
+        self.assertEqual(self.client.delete(f"/api/v1/reviews/{review['id']}").status_code, 200)
+        deleted = self._revalidate("/api/v1/places/", edited.headers["ETag"])
+        self.assertEqual(deleted.status_code, 200)
+        self.assertEqual(deleted.get_json()["items"][0]["reviews"], [])
+
+    def test_places_list_etag_uses_only_the_page(self):
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement.lower())
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            first = self.client.get("/api/v1/places/", query_string={"limit": 2})
+            self.assertEqual(self._revalidate("/api/v1/places/?limit=2", first.headers["ETag"]).status_code, 304)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+        self.assertFalse([statement for statement in statements if "count(" in statement or "max(" in statement])
+
+    def test_place_detail_etag_follows_review_deletes(self):
+        path = f"/api/v1/places/{self.place_ids[0]}"
+        first = self.client.get(path, headers=self.headers)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self._revalidate(path, first.headers["ETag"]).status_code, 304)
+
+        review_id = first.get_json()["reviews"][0]["id"]
+        self.assertEqual(self.client.delete(f"/api/v1/reviews/{review_id}").status_code, 200)
+        deleted = self._revalidate(path, first.headers["ETag"])
+        self.assertEqual(deleted.status_code, 200)
+        self.assertEqual(deleted.get_json()["reviews"], [])
+
+    def test_place_detail_etag_follows_owner_and_amenity_edits(self):
+        path = f"/api/v1/places/{self.first_place_id}"
+        first = self.client.get(path, headers=self.headers)
+        put_user = self.client.put(f"/api/v1/users/{self.owner_id}", json={"first_name": "Anita"},
+                                   headers=self.admin_headers)
+        self.assertEqual(put_user.status_code, 200, put_user.get_data(as_text=True))
+        edited = self._revalidate(path, first.headers["ETag"])
+        self.assertEqual(edited.status_code, 200)
+        self.assertEqual(edited.get_json()["owner"]["first_name"], "Anita")
+
+        amenity_id = edited.get_json()["amenities"][0]["id"]
+        put_amenity = self.client.put(f"/api/v1/amenities/{amenity_id}", json={"name": "Sauna"},
+                                      headers=self.admin_headers)
+        self.assertEqual(put_amenity.status_code, 200, put_amenity.get_data(as_text=True))
+        renamed = self._revalidate(path, edited.headers["ETag"])
+        self.assertEqual(renamed.status_code, 200)
+        self.assertIn("Sauna", [amenity["name"] for amenity in renamed.get_json()["amenities"]])
+        self.assertEqual(self._revalidate(path, renamed.headers["ETag"]).status_code, 304)
+
+    def test_places_near_radius_and_bbox(self):
+        # Lugares cada 0.01° de latitud (~1.11 km): un radio de 2.5 km desde el primero toma tres
+        response = self.client.get("/api/v1/places/near", headers=self.headers,
+                                   query_string={"lat": -34.6, "lon": -58.4, "radius_km": 2.5})
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        body = response.get_json()
+        self.assertEqual([item["title"] for item in body], ["Place 0", "Place 1", "Place 2"])
+        self.assertEqual([item["distance_km"] for item in body], sorted(item["distance_km"] for item in body))
+
+        response = self.client.get("/api/v1/places/near", headers=self.headers,
+                                   query_string={"bbox": "-58.5,-34.585,-58.3,-34.555", "limit": 10})
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        self.assertEqual(sorted(item["title"] for item in response.get_json()), ["Place 2", "Place 3", "Place 4"])
+
+    def test_places_near_rejects_bad_parameters(self):
+        for query in ({"lat": -34.6, "lon": -58.4}, {"lat": 91, "lon": -58.4, "radius_km": 1},
+                      {"lat": -34.6, "lon": -58.4, "radius_km": -1}, {"bbox": "-58.5,-34.6,-58.3"},
+                      {"bbox": "-58.5,-34.5,-58.3,-34.6"}, {"bbox": "a,b,c,d"}):
+            response = self.client.get("/api/v1/places/near", headers=self.headers, query_string=query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn("error", response.get_json())
+        self.assertEqual(self.client.get("/api/v1/places/near", query_string={"bbox": "0,0,1,1"}).status_code, 401)
+
+    def test_amenity_creation_requires_an_admin(self):
+        for path, body in (("/api/v1/amenities/", {"name": "Sauna"}), ("/api/v1/amenities/batch", [{"name": "Gym"}])):
+            self.assertEqual(self.client.post(path, json=body).status_code, 401)
+            self.assertEqual(self.client.post(path, json=body, headers=self.headers).status_code, 403)
+            self.assertEqual(self.client.post(path, json=body, headers=self.admin_headers).status_code, 201)
+        self.assertEqual(db.session.query(Amenity).count(), 7)
+
+    def test_users_routes_read_the_token_identity(self):
+        body = {"first_name": "Eva", "last_name": "Ruiz", "email": "eva@example.com", "password": "secret-password"}
+        self.assertEqual(self.client.post("/api/v1/users/", json=body, headers=self.headers).status_code, 403)
+        response = self.client.post("/api/v1/users/", json=body, headers=self.admin_headers)
+        self.assertEqual(response.status_code, 201, response.get_data(as_text=True))
+        self.assertEqual(self.client.post("/api/v1/users/", json=dict(body, email="bad"),
+                                          headers=self.admin_headers).status_code, 400)
+
+        own = self.client.put(f"/api/v1/users/{self.guest_id}", json={"last_name": "Nuevo"}, headers=self.headers)
+        self.assertEqual((own.status_code, own.get_json()["last_name"]), (200, "Nuevo"))
+        other = self.client.put(f"/api/v1/users/{self.owner_id}", json={"last_name": "X"}, headers=self.headers)
+        self.assertEqual(other.status_code, 403)
+        self.assertEqual(self.client.put("/api/v1/users/missing", json={"last_name": "X"},
+                                         headers=self.admin_headers).status_code, 404)
+
+    def test_register_returns_a_token_for_the_new_user(self):
+        body = {"first_name": "Eva", "last_name": "Ruiz", "email": "eva@example.com", "password": "secret-password"}
+        response = self.client.post("/api/v1/auth/", json=body, headers=self.headers)
+        self.assertEqual(response.status_code, 201, response.get_data(as_text=True))
+        token = response.get_json()["access_token"]
+        user_id = response.get_json()["user"]["id"]
+        me = self.client.get(f"/api/v1/auth/{user_id}", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(me.get_json()["email"], "eva@example.com")
+        self.assertEqual(self.client.post("/api/v1/auth/", json=dict(body, email="eva@other.com"),
+                                          headers=self.headers).status_code, 400)
+
+    def test_places_batch_reports_database_errors_per_item(self):
+        item = {"title": "Nuevo", "description": "Nuevo lugar", "price": 10.0, "latitude": 0.0, "longitude": 0.0,
+                "owner_id": self.owner_id, "amenities": [self.amenity_ids[0]]}
+        failure = IntegrityError("INSERT INTO place_amenity", {}, Exception("UNIQUE constraint failed"))
+        with patch.object(PlaceRepository, "add_amenity_links", side_effect=failure):
+            response = self.client.post("/api/v1/places/batch", headers=self.headers,
+                                        json=[item, dict(item, price=-1), dict(item, title="Otro")])
+
+        self.assertEqual(response.status_code, 400)
+        results = response.get_json()
+        self.assertEqual([result["index"] for result in results], [0, 1, 2])
+        self.assertTrue(all("id" not in result for result in results))
+        self.assertIn("UNIQUE constraint failed", results[0]["error"])
+        self.assertNotIn("UNIQUE", results[1]["error"])  # conserva su error de validación
+        db.session.expire_all()
+        self.assertEqual(db.session.query(Place).count(), 5)
+
+
+    def test_failed_review_create_rolls_back_the_aggregates(self):
+        place_id = self.place_ids[0]
+        before = self.client.get(f"/api/v1/places/{place_id}", headers=self.headers).get_json()
+        # La base rechaza el INSERT después de que ya corrió el UPDATE de los agregados
+        db.session.execute(text("CREATE TRIGGER reject_reviews BEFORE INSERT ON reviews "
+                                "BEGIN SELECT RAISE(ABORT, 'reviews are read-only'); END"))
+        db.session.commit()
+
+        response = self.client.post("/api/v1/reviews/", headers=self.headers, json={
+            "text": "Great", "rating": 5, "user_id": self.owner_id, "place_id": place_id})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("reviews are read-only", response.get_json()["error"])
+
+        db.session.expire_all()
+        after = self.client.get(f"/api/v1/places/{place_id}", headers=self.headers).get_json()
+        self.assertEqual((after["review_count"], after["average_rating"]),
+                         (before["review_count"], before["average_rating"]))
+        self.assertEqual(db.session.query(Review).count(), 5)
+        self.assertEqual(self.client.post("/api/v1/reviews/", headers=self.headers,
+                                          json={"text": "Great", "rating": 5}).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
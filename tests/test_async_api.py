@@ -0,0 +1,102 @@
+import importlib.util
+import shutil
+import tempfile
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+# Las rutas ASGI necesitan starlette, greenlet y aiosqlite; TestClient además necesita httpx
+ASGI_STACK = all(importlib.util.find_spec(name) for name in ("starlette", "greenlet", "aiosqlite", "httpx"))
+if ASGI_STACK:
+    from starlette.testclient import TestClient
+    from app.api.async_v1 import create_asgi_app
+
+
+@unittest.skipUnless(ASGI_STACK, "starlette, greenlet, aiosqlite and httpx are required for the ASGI routes")
+class AsyncApiTestCase(unittest.TestCase):
+    """Rutas de app/api/async_v1.py a través de Starlette, sobre una base en un archivo"""
+
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.directory = tempfile.mkdtemp()
+        self.app = create_app("testing", {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{self.directory}/hbnb.db"})
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User(first_name="Ana", last_name="Sosa", email="ana@example.com", password="secret-password")
+        wifi = Amenity(name="WiFi")
+        db.session.add_all([owner, wifi])
+        db.session.flush()
+        places = [Place(title=f"Place {number}", description="A place", price=float(10 * number + 10),
+                        latitude=10.0, longitude=20.0, owner_id=owner.id) for number in range(3)]
+        places[0].amenities.append(wifi)
+        db.session.add_all(places)
+        db.session.commit()
+        self.owner_id, self.wifi_id = owner.id, wifi.id
+        self.place_ids = sorted(place.id for place in places)
+        self.headers = {"Authorization": f"Bearer {create_access_token(identity=owner.id)}"}
+        self.client = TestClient(create_asgi_app(self.app)).__enter__()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        self.client.__exit__(None, None, None)
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        shutil.rmtree(self.directory)
+
+    def test_places_list_pages_and_filters(self):
+        first = self.client.get("/api/v1/places/", params={"limit": 2})
+        self.assertEqual(first.status_code, 200)
+        body = first.json()
+        second = self.client.get("/api/v1/places/", params={"limit": 2, "cursor": body["next_cursor"]}).json()
+        self.assertIsNone(second["next_cursor"])
+        self.assertEqual([item["id"] for item in body["items"] + second["items"]], self.place_ids)
+
+        filtered = self.client.get("/api/v1/places/", params={"amenities": self.wifi_id}).json()
+        self.assertEqual(len(filtered["items"]), 1)
+        self.assertEqual(self.client.get("/api/v1/places/", params={"cursor": "garbage"}).status_code, 400)
+
+    def test_place_detail_requires_a_token(self):
+        path = f"/api/v1/places/{self.place_ids[0]}"
+        self.assertEqual(self.client.get(path).status_code, 401)
+        response = self.client.get(path, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], self.place_ids[0])
+        self.assertEqual(self.client.get("/api/v1/places/missing", headers=self.headers).status_code, 404)
+
+    def test_login_issues_a_token_the_flask_app_accepts(self):
+        response = self.client.post("/api/v1/auth/login", json={"email": "ana@example.com",
+                                                                 "password": "secret-password"})
+        self.assertEqual(response.status_code, 200)
+        token = response.json()["access_token"]
+        flask_response = self.app.test_client().get("/api/v1/amenities/", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(flask_response.status_code, 200)
+
+        wrong = self.client.post("/api/v1/auth/login", json={"email": "ana@example.com", "password": "nope"})
+        self.assertEqual(wrong.status_code, 401)
+        self.assertEqual(self.client.post("/api/v1/auth/login", content=b"[]").status_code, 400)
+        numeric = self.client.post("/api/v1/auth/login", json={"email": "ana@example.com", "password": 12345678})
+        self.assertEqual(numeric.status_code, 400)
+
+    def test_create_review_updates_the_place_aggregates(self):
+        place_id = self.place_ids[1]
+        review = {"text": "Great", "rating": 4, "user_id": self.owner_id, "place_id": place_id}
+        self.assertEqual(self.client.post("/api/v1/reviews/", json=review).status_code, 401)
+        response = self.client.post("/api/v1/reviews/", json=review, headers=self.headers)
+        self.assertEqual(response.status_code, 201, response.text)
+        self.assertEqual(response.json()["place_id"], place_id)
+
+        bad = self.client.post("/api/v1/reviews/", json=dict(review, rating="x"), headers=self.headers)
+        self.assertEqual(bad.status_code, 400)
+        detail = self.client.get(f"/api/v1/places/{place_id}", headers=self.headers).json()
+        self.assertEqual((detail["review_count"], detail["average_rating"]), (1, 4.0))
+        self.assertEqual(db.session.query(Review).count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import importlib.util
+import shutil
+import tempfile
+import unittest
+from app import create_app, db, passwords
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import PlaceRepository
+from app.services.facade import place_details
+
+# El modo ASGI necesita greenlet y aiosqlite (requirements.txt); sin ellos estas pruebas se saltean
+ASYNC_STACK = all(importlib.util.find_spec(name) for name in ("greenlet", "aiosqlite"))
+if ASYNC_STACK:
+    from app.persistence.async_repository import AsyncDatabase, async_database_url
+    from app.services.async_facade import AsyncHBnBFacade
+
+
+@unittest.skipUnless(ASYNC_STACK, "greenlet and aiosqlite are required for the ASGI mode")
+class AsyncRepositoryTestCase(unittest.IsolatedAsyncioTestCase):
+    """Base en un archivo: con :memory: cada conexión de aiosqlite vería otra base vacía"""
+
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.directory = tempfile.mkdtemp()
+        self.app = create_app("testing", {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{self.directory}/hbnb.db"})
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User(first_name="Ana", last_name="Sosa", email="ana@example.com", password="secret-password")
+        wifi, pool = Amenity(name="WiFi"), Amenity(name="Pool")
+        db.session.add_all([owner, wifi, pool])
+        db.session.flush()
+        places = [Place(title=f"Place {number}", description="A place", price=float(10 * number + 10),
+                        latitude=10.0, longitude=20.0, owner_id=owner.id) for number in range(5)]
+        places[0].amenities.extend([wifi, pool])
+        places[1].amenities.append(wifi)
+        db.session.add_all(places)
+        db.session.commit()
+        self.owner_id, self.wifi_id, self.pool_id = owner.id, wifi.id, pool.id
+        self.place_ids = [place.id for place in places]
+        self.async_db = AsyncDatabase(self.app, db)
+        self.facade = AsyncHBnBFacade(self.async_db, passwords)
+
+    async def asyncTearDown(self):
+        await self.async_db.dispose()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        shutil.rmtree(self.directory)
+
+    async def _in_request(self, operation, *args):
+        # Cada petición ASGI es una tarea con su propia sesión, descartada al terminar
+        async def request():
+            try:
+                return await operation(*args)
+            finally:
+                await self.async_db.remove()
+        return await asyncio.create_task(request())
+
+    def test_async_url_keeps_the_database_and_swaps_the_driver(self):
+        self.assertEqual(self.async_db.engine.url.database, db.engine.url.database)
+        self.assertEqual(async_database_url("sqlite:////tmp/hbnb.db").drivername, "sqlite+aiosqlite")
+        self.assertEqual(async_database_url("postgresql+psycopg2://u:p@db/hbnb").drivername, "postgresql+asyncpg")
+        with self.assertRaises(ValueError):
+            async_database_url("oracle://u:p@db/hbnb")
+
+    async def test_pages_and_details_match_the_sync_repository(self):
+        seen, cursor = [], None
+        while True:
+            places, cursor = await self._in_request(self.facade.get_places_page, 2, cursor)
+            seen.extend(place.id for place in places)
+            if cursor is None:
+                break
+        self.assertEqual(seen, sorted(self.place_ids))
+
+        places, _ = await self._in_request(self.facade.get_places_page, 10, None, [self.wifi_id, self.pool_id])
+        self.assertEqual([place.id for place in places], [self.place_ids[0]])
+        places, _ = await self._in_request(self.facade.get_places_page, 10, None, [self.wifi_id, self.pool_id], "any")
+        self.assertEqual(sorted(place.id for place in places), sorted(self.place_ids[:2]))
+        self.assertEqual(len(places[0].to_dict()["amenities"]) + len(places[1].to_dict()["amenities"]), 3)
+
+        detail = await self._in_request(self.facade.get_place, self.place_ids[0])
+        self.assertEqual(detail, place_details(PlaceRepository(db).get_place_details(self.place_ids[0])))
+        self.assertIsNone(await self._in_request(self.facade.get_place, "missing"))
+
+    async def test_concurrent_requests_get_their_own_sessions(self):
+        details = await asyncio.gather(*(
+            self._in_request(self.facade.get_place, self.place_ids[number % 5]) for number in range(20)
+        ))
+        self.assertEqual([detail["id"] for detail in details], [self.place_ids[number % 5] for number in range(20)])
+
+    async def test_review_and_rating_aggregates_commit_together(self):
+        place_id = self.place_ids[2]
+        review = await self._in_request(self.facade.create_review, {
+            "text": "Great", "rating": 4, "user_id": self.owner_id, "place_id": place_id,
+        })
+        self.assertEqual((review["rating"], review["place_id"]), (4, place_id))
+
+        with self.assertRaises(ValueError):
+            await self._in_request(self.facade.create_review, {
+                "text": "Bad", "rating": 9, "user_id": self.owner_id, "place_id": place_id,
+            })
+        detail = await self._in_request(self.facade.get_place, place_id)
+        self.assertEqual((detail["review_count"], detail["average_rating"]), (1, 4.0))
+        self.assertEqual([item["id"] for item in detail["reviews"]], [review["id"]])
+        self.assertEqual(db.session.query(Review).count(), 1)
+
+    async def test_authenticate_user_awaits_bcrypt(self):
+        user = await self._in_request(self.facade.authenticate_user, "ana@example.com", "secret-password")
+        self.assertEqual(user.id, self.owner_id)
+        self.assertIsNone(await self._in_request(self.facade.authenticate_user, "ana@example.com", "wrong-password"))
+        self.assertIsNone(await self._in_request(self.facade.authenticate_user, "nobody@example.com", "secret-password"))
+
+
+if __name__ == "__main__":
+    unittest.main()
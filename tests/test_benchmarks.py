@@ -0,0 +1,50 @@
+import unittest
+from app import create_app
+from benchmarks.api_endpoints import build_scenarios, compare, invalid_scenarios, percentile, uncovered_routes
+from benchmarks.async_concurrency import SCENARIOS, add_scaling
+
+
+class ApiBenchmarkTestCase(unittest.TestCase):
+    def test_every_v1_route_has_a_scenario(self):
+        # Un endpoint nuevo tiene que agregar su escenario al benchmark
+        self.assertEqual(uncovered_routes(create_app("testing"), build_scenarios()), [])
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_compare_flags_only_real_regressions(self):
+        entry = {"requests": 100, "p95_ms": 10.0, "throughput_rps": 500.0, "error_rate": 0.0}
+        baseline = {"results": {"http": {"places.list": entry, "places.get": entry}}}
+        current = {"results": {"http": {
+            "places.list": dict(entry, p95_ms=11.5, throughput_rps=450.0),  # dentro del 20 %
+            "places.get": dict(entry, p95_ms=14.0, throughput_rps=300.0),
+            "places.new": entry,  # sin línea base: no se compara
+        }}}
+        regressions = compare(current, baseline, tolerance=0.2)
+        self.assertEqual(sorted((item["scenario"], item["metric"]) for item in regressions),
+                         [("places.get", "p95_ms"), ("places.get", "throughput_rps")])
+
+    def test_scenarios_above_the_error_threshold_invalidate_the_run(self):
+        entry = {"requests": 100, "error_rate": 0.0}
+        results = {"results": {"http": {"places.list": entry, "places.get": dict(entry, error_rate=0.25)},
+                               "testclient": {"places.get": dict(entry, error_rate=0.01)}}}
+        self.assertEqual(invalid_scenarios(results, max_error_rate=0.01),
+                         [{"driver": "http", "scenario": "places.get", "error_rate": 0.25}])
+        self.assertEqual(len(invalid_scenarios(results, max_error_rate=0.0)), 2)
+
+    def test_async_scenarios_come_from_the_api_benchmark(self):
+        self.assertLessEqual(set(SCENARIOS), {scenario.name for scenario in build_scenarios()})
+
+    def test_scaling_is_relative_to_the_lowest_concurrency(self):
+        results = add_scaling({"asgi": {"places.get": {
+            "1": {"throughput_rps": 200.0}, "16": {"throughput_rps": 900.0}, "4": {"throughput_rps": 500.0},
+        }}})
+        levels = results["asgi"]["places.get"]
+        self.assertEqual([levels[key]["scaling"] for key in ("1", "4", "16")], [1.0, 2.5, 4.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
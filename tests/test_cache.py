@@ -0,0 +1,106 @@
+import gc
+import unittest
+from sqlalchemy import bindparam, update
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.persistence import cache
+from app.persistence.cache import CachedRepository
+from app.persistence.repository import SQLAlchemyRepository
+
+
+class EntityCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app.config["ENTITY_CACHE"] = {"Amenity": {"max_size": 2, "ttl": 60}}
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.repo = CachedRepository(SQLAlchemyRepository(Amenity, db))
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _amenity(self, name):
+        amenity = Amenity(name=name)
+        self.repo.add(amenity)
+        return amenity.id
+
+    def test_hit_is_attached_to_the_new_session(self):
+        amenity_id = self._amenity("WiFi")
+        self.repo.get(amenity_id)
+        db.session.remove()
+
+        amenity = self.repo.get(amenity_id)
+        self.assertEqual(amenity.name, "WiFi")
+        self.assertIn(amenity, db.session)
+        self.assertEqual((self.repo.hits, self.repo.misses), (1, 1))
+
+    def test_update_and_orm_changes_invalidate(self):
+        amenity_id = self._amenity("WiFi")
+        self.repo.get(amenity_id)
+
+        self.repo.update(amenity_id, {"name": "Fast WiFi"})
+        self.assertEqual(self.repo.get(amenity_id).name, "Fast WiFi")
+
+        # Cambio hecho por el ORM fuera del repositorio
+        amenity = self.repo.get(amenity_id)
+        amenity.name = "Fiber"
+        db.session.commit()
+        db.session.remove()
+        self.assertEqual(self.repo.get(amenity_id).name, "Fiber")
+
+    def test_lru_eviction_and_attribute_lookup(self):
+        ids = [self._amenity(name) for name in ("WiFi", "Pool", "A/C")]
+        for amenity_id in ids:
+            self.repo.get(amenity_id)
+        self.assertEqual(self.repo.stats()["size"], 2)
+
+        self.repo.get_by_attribute("name", "Pool")
+        self.repo.get_by_attribute("name", "Pool")
+        self.assertEqual(self.repo.hits, 1)
+
+    def _cached_ids(self):
+        return set(self.repo._entries)
+
+    def test_bulk_update_evicts_only_the_targeted_ids(self):
+        wifi, pool = self._amenity("WiFi"), self._amenity("Pool")
+        self.repo.get_many([wifi, pool])
+
+        db.session.execute(update(Amenity).where(Amenity.id == wifi).values(name="Fast WiFi"))
+        self.assertEqual(self._cached_ids(), {pool})
+        db.session.commit()
+
+        self.repo.get(wifi)
+        table = Amenity.__table__
+        db.session.execute(table.update().where(table.c.id == bindparam("b_id")).values(name=bindparam("b_name")),
+                           [{"b_id": pool, "b_name": "Big pool"}])
+        self.assertEqual(self._cached_ids(), {wifi})
+        db.session.commit()
+
+        # Sin ids en el WHERE no se sabe qué filas cambian: se vacía la caché del modelo
+        self.repo.get(pool)
+        db.session.execute(update(Amenity).where(Amenity.name.like("%pool")).values(name="Pool"))
+        self.assertEqual(self._cached_ids(), set())
+
+    def test_listeners_are_shared_by_every_cache_of_a_model(self):
+        gc.collect()
+        before = len(cache._caches[Amenity])
+        others = [CachedRepository(SQLAlchemyRepository(Amenity, db)) for _ in range(3)]
+        self.assertEqual(len(cache._caches[Amenity]), before + 3)
+        amenity_id = self._amenity("WiFi")
+        for repo in others:
+            repo.get(amenity_id)
+
+        self.repo.update(amenity_id, {"name": "Fast WiFi"})
+        self.assertEqual([len(repo._entries) for repo in others], [0, 0, 0])
+        del others, repo
+        gc.collect()
+        self.assertEqual(len(cache._caches[Amenity]), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
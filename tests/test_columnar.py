@@ -0,0 +1,133 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import delete, update
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.columnar import PlaceColumns
+from app.persistence.repository import PlaceRepository
+
+
+class PlaceColumnsTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        self.wifi = Amenity(name="WiFi")
+        db.session.add_all([self.user, self.wifi])
+        db.session.commit()
+        self.repo = PlaceRepository(db)
+        self.columns = PlaceColumns()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _place(self, price, latitude=0, amenities=()):
+        place = Place(title="Casa", description="Linda", price=price, latitude=latitude, longitude=0, owner_id=self.user.id)
+        place.amenities.extend(amenities)
+        db.session.add(place)
+        db.session.commit()
+        return place
+
+    def test_stats_and_filters(self):
+        self._place(50, latitude=10, amenities=[self.wifi])
+        self._place(100, latitude=10)
+        self._place(300, latitude=-40, amenities=[self.wifi])
+        self.columns.rebuild(self.repo)
+
+        stats = self.columns.price_stats(self.columns.select_rows())
+        self.assertEqual((stats["count"], stats["min"], stats["max"], stats["p50"]), (3, 50, 300, 100))
+        rows = self.columns.select_rows(bbox=(-10, 0, 10, 20), amenity_ids=[self.wifi.id])
+        self.assertEqual(self.columns.price_stats(rows)["mean"], 50)
+        self.assertEqual(len(self.columns.select_rows(owner_id="nobody")), 0)
+        # Caja que cruza el antimeridiano / Box across the antimeridian
+        self.assertEqual(len(self.columns.select_rows(bbox=(10, -50, 5, 50))), 3)
+        self.assertEqual(len(self.columns.select_rows(bbox=(170, -50, -170, 50))), 0)
+
+    def test_incremental_refresh(self):
+        place = self._place(50)
+        self.assertEqual(self.columns.refresh(self.repo), 1)
+
+        place.price = 70
+        db.session.commit()
+        self._place(90, amenities=[self.wifi])
+        # Solo se leen las filas nuevas o modificadas (más las que comparten la marca de tiempo)
+        self.assertLessEqual(self.columns.refresh(self.repo), 3)
+        self.assertEqual(sorted(self.columns.price), [70, 90])
+        self.assertEqual(len(self.columns.select_rows(amenity_ids=[self.wifi.id])), 1)
+
+        db.session.delete(place)
+        db.session.commit()
+        self.columns.refresh(self.repo)
+        self.assertEqual(list(self.columns.price), [90])
+
+    def test_refresh_sees_a_delete_hidden_by_a_late_insert(self):
+        gone = self._place(50)
+        kept = self._place(70)
+        self.columns.refresh(self.repo)
+
+        # Un borrado y una inserción que confirmó tarde (updated_at anterior al margen): la
+        # cantidad de filas no cambia y la fila nueva no entra por updated_at
+        db.session.delete(gone)
+        late = self._place(90, amenities=[self.wifi])
+        stale = datetime.utcnow() - timedelta(hours=1)
+        db.session.execute(update(Place).where(Place.id == late.id).values(created_at=stale, updated_at=stale))
+        db.session.commit()
+        self.assertEqual(self.repo.count(), len(self.columns))
+
+        self.columns.refresh(self.repo)
+        self.assertEqual(sorted(self.columns.ids), sorted([kept.id, late.id]))
+        self.assertEqual(sorted(self.columns.price), [70, 90])
+        self.assertEqual(len(self.columns.select_rows(amenity_ids=[self.wifi.id])), 1)
+
+    def test_refresh_adds_late_inserts_without_rebuilding(self):
+        self._place(50)
+        self.columns.refresh(self.repo)
+        late = self._place(90)
+        stale = datetime.utcnow() - timedelta(hours=1)
+        db.session.execute(update(Place).where(Place.id == late.id).values(updated_at=stale))
+        db.session.commit()
+
+        def rebuild(place_repo):
+            raise AssertionError("a late insert must not rebuild the snapshot")
+
+        self.columns.rebuild = rebuild
+        self.columns.refresh(self.repo)
+        self.assertEqual(sorted(self.columns.price), [50, 90])
+
+    def test_deletes_come_from_tombstones(self):
+        gone = self._place(50, amenities=[self.wifi])
+        self._place(70)
+        self.columns.refresh(self.repo)
+        # Borrado en SQL crudo: el trigger escribe la lápida igual / Raw SQL delete still leaves a tombstone
+        db.session.execute(delete(Place).where(Place.id == gone.id))
+        db.session.commit()
+
+        def fail(*args):
+            raise AssertionError("a tombstoned delete must not rebuild nor diff every id")
+
+        self.columns.rebuild = fail
+        self.repo.iter_place_ids = fail
+        self.columns.refresh(self.repo)
+        self.assertEqual(list(self.columns.price), [70])
+        self.assertEqual(len(self.columns.select_rows(amenity_ids=[self.wifi.id])), 0)
+
+    def test_stale_snapshot_is_rebuilt(self):
+        self._place(50)
+        self.columns.refresh(self.repo)
+        # Más viejo que la retención de las lápidas / Older than the tombstone retention
+        self.columns.watermark -= timedelta(days=2)
+        self._place(70)
+        self.assertEqual(self.columns.refresh(self.repo), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
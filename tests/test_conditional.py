@@ -0,0 +1,49 @@
+import unittest
+from datetime import datetime
+from app import create_app
+from app.api.conditional import conditional
+
+
+class ConditionalGetTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.version = ("abc", datetime(2025, 1, 2, 3, 4, 5, 678000))
+
+    def test_first_request_gets_validators(self):
+        with self.app.test_request_context("/"):
+            not_modified, headers = conditional(self.version, self.version[1])
+        self.assertIsNone(not_modified)
+        self.assertTrue(headers["ETag"].startswith('"'))
+        self.assertEqual(headers["Last-Modified"], "Thu, 02 Jan 2025 03:04:05 GMT")
+
+    def test_matching_etag_short_circuits(self):
+        with self.app.test_request_context("/"):
+            _, headers = conditional(self.version, self.version[1], weak=True)
+        with self.app.test_request_context("/", headers={"If-None-Match": headers["ETag"]}):
+            not_modified, _ = conditional(self.version, self.version[1], weak=True)
+        self.assertEqual(not_modified.status_code, 304)
+
+        newer = (self.version[0], datetime(2025, 1, 2, 3, 4, 6))
+        with self.app.test_request_context("/", headers={"If-None-Match": headers["ETag"]}):
+            not_modified, _ = conditional(newer, newer[1], weak=True)
+        self.assertIsNone(not_modified)
+
+    def test_if_modified_since(self):
+        with self.app.test_request_context("/", headers={"If-Modified-Since": "Thu, 02 Jan 2025 03:04:05 GMT"}):
+            not_modified, _ = conditional(self.version, self.version[1])
+        self.assertIsNotNone(not_modified)
+
+        with self.app.test_request_context("/", headers={"If-Modified-Since": "Thu, 02 Jan 2025 03:04:04 GMT"}):
+            not_modified, _ = conditional(self.version, self.version[1])
+        self.assertIsNone(not_modified)
+
+    def test_etag_only_ignores_if_modified_since(self):
+        with self.app.test_request_context("/", headers={"If-Modified-Since": "Thu, 02 Jan 2025 03:04:05 GMT"}):
+            not_modified, headers = conditional(self.version, self.version[1], etag_only=True)
+        self.assertIsNone(not_modified)
+        self.assertNotIn("Last-Modified", headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import errno
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from app.models.amenity import Amenity
+from app.persistence.durable import DurableInMemoryRepository
+
+
+class Record:
+    def __init__(self, **attrs):
+        self.id = None
+        self.created_at = self.updated_at = None
+        self.__dict__.update(attrs)
+
+
+class TornLog:
+    """Log que escribe la mitad de los bytes y falla, como un disco lleno / Writes half, then fails"""
+
+    def __init__(self, log):
+        self.log = log
+
+    def write(self, data):
+        self.log.write(data[:len(data) // 2])
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self.log, name)
+
+
+class DurableRepositoryTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        self.tmp.cleanup()
+
+    def _open(self, factory=Record, **kwargs):
+        return DurableInMemoryRepository(self.directory, factory, fsync="always", **kwargs)
+
+    def test_log_replay_restores_state_and_indexes(self):
+        repo = self._open(unique_indexes=("email",))
+        ana, luis = Record(email="ana@example.com"), Record(email="luis@example.com")
+        repo.add(ana)
+        repo.add(luis)
+        repo.update(ana.id, {"email": "ana@new.com"})
+        repo.delete(luis.id)
+        repo.close()
+
+        repo = self._open(unique_indexes=("email",))
+        restored = repo.get_by_attribute("email", "ana@new.com")
+        self.assertEqual(restored.id, ana.id)
+        self.assertIsInstance(restored.updated_at, datetime)
+        self.assertIsNone(repo.get(luis.id))
+        repo.close()
+
+    def test_snapshot_compacts_the_log(self):
+        repo = self._open(Amenity, snapshot_every=3)
+        amenities = [Amenity(name=name) for name in ("WiFi", "Pool", "A/C", "Gym")]
+        for amenity in amenities:
+            repo.add(amenity)
+        repo.close()
+        # 3 operaciones en el snapshot, 1 en el log
+        with open(os.path.join(self.directory, "oplog.jsonl"), "rb") as log:
+            self.assertEqual(len(log.readlines()), 1)
+
+        repo = self._open(Amenity, snapshot_every=3)
+        self.assertEqual(sorted(amenity.name for amenity in repo.get_all()), ["A/C", "Gym", "Pool", "WiFi"])
+        repo.close()
+
+    def test_torn_tail_is_discarded(self):
+        repo = self._open()
+        repo.add(Record(name="ok"))
+        repo.close()
+        with open(os.path.join(self.directory, "oplog.jsonl"), "ab") as log:
+            log.write(b'0000abcd {"op":"put"')
+
+        repo = self._open()
+        self.assertEqual(len(repo.get_all()), 1)
+        repo.add(Record(name="after"))
+        repo.close()
+        self.assertEqual(len(self._open().get_all()), 2)
+
+    def test_failed_log_write_is_not_published(self):
+        repo = self._open(unique_indexes=("email",))
+        ana = Record(email="ana@example.com")
+        repo.add(ana)
+        repo._log.close()  # simula un disco que rechaza la escritura
+
+        with self.assertRaises(ValueError):
+            repo.add(Record(email="luis@example.com"))
+        with self.assertRaises(ValueError):
+            repo.update(ana.id, {"email": "ana@new.com"})
+        with self.assertRaises(ValueError):
+            repo.delete(ana.id)
+        self.assertEqual([record.email for record in repo.get_all()], ["ana@example.com"])
+        self.assertIsNone(repo.get_by_attribute("email", "luis@example.com"))
+
+        repo = self._open(unique_indexes=("email",))
+        self.assertEqual([record.email for record in repo.get_all()], ["ana@example.com"])
+        repo.close()
+
+    def test_partial_log_write_is_rolled_back(self):
+        repo = self._open()
+        repo.add(Record(name="before"))
+        log = repo._log
+        repo._log = TornLog(log)
+        with self.assertRaises(OSError):
+            repo.add(Record(name="torn"))
+        repo._log = log
+        repo.add(Record(name="after"))
+        repo.close()
+
+        # Sin la escritura cortada en el medio, la que vino después sobrevive al replay
+        repo = self._open()
+        self.assertEqual(sorted(record.name for record in repo.get_all()), ["after", "before"])
+        repo.close()
+
+    def test_log_that_cannot_be_truncated_refuses_writes(self):
+        repo = self._open()
+        log = repo._log
+        repo._log = TornLog(log)
+        with patch("app.persistence.durable.os.ftruncate", side_effect=OSError(errno.EIO, "I/O error")):
+            with self.assertRaises(OSError):
+                repo.add(Record(name="torn"))
+        repo._log = log
+        with self.assertRaises(OSError):
+            repo.add(Record(name="after"))
+        self.assertEqual(repo.get_all(), [])
+        repo.close()
+
+    def test_everysec_syncs_the_last_writes_without_further_traffic(self):
+        repo = DurableInMemoryRepository(self.directory, Record, fsync="everysec")
+        synced = threading.Event()
+        real_fsync = os.fsync
+
+        def fsync(fd):
+            real_fsync(fd)
+            if fd == repo._log.fileno():
+                synced.set()
+
+        with patch("app.persistence.durable.os.fsync", side_effect=fsync):
+            repo.add(Record(name="burst"))
+            # Ninguna escritura más: el hilo de fondo tiene que sincronizar igual
+            self.assertTrue(synced.wait(3))
+        self.assertFalse(repo._dirty)
+        repo.close()
+        self.assertFalse(repo._flusher.is_alive())
+
+    def test_invalid_fsync_policy(self):
+        with self.assertRaises(ValueError):
+            DurableInMemoryRepository(self.directory, Record, fsync="sometimes")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.repository import PlaceRepository
+
+
+class PlaceFacetsTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        self.wifi, self.pool = Amenity(name="WiFi"), Amenity(name="Pool")
+        db.session.add_all([user, self.wifi, self.pool])
+        db.session.commit()
+
+        # (precio, suma de calificaciones, cantidad de reseñas, amenidades)
+        for price, rating_sum, review_count, amenities in [
+            (40, 0, 0, [self.wifi]),
+            (80, 9, 2, [self.wifi, self.pool]),
+            (90, 5, 1, [self.pool]),
+            (800, 7, 2, []),
+        ]:
+            place = Place(title="Casa", description="Linda", price=price, latitude=0, longitude=0, owner_id=user.id)
+            place.rating_sum, place.review_count = rating_sum, review_count
+            place.amenities.extend(amenities)
+            db.session.add(place)
+        db.session.commit()
+        self.repo = PlaceRepository(db)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_grouped_counts(self):
+        counts, amenities = self.repo.get_facets(price_edges=(50, 100))
+        # precio 40 -> rango 0, 80 y 90 -> rango 1, 800 -> rango 2; estrellas = floor(promedio)
+        self.assertEqual(counts, {(0, 0): 1, (1, 4): 1, (1, 5): 1, (2, 3): 1})
+        self.assertEqual(sorted((name, count) for _, name, count in amenities), [("Pool", 2), ("WiFi", 2)])
+
+    def test_filters_narrow_every_facet(self):
+        where = self.repo.price_filter(min_price=50, max_price=100)
+        where.append(self.repo.amenity_filter([self.wifi.id], "all"))
+        counts, amenities = self.repo.get_facets(where, price_edges=(50, 100))
+        self.assertEqual(counts, {(1, 4): 1})
+        self.assertEqual(sorted((name, count) for _, name, count in amenities), [("Pool", 1), ("WiFi", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from app import create_app, db
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import geo
+from app.persistence.repository import PlaceRepository
+
+
+class GeoSearchTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        db.session.add(self.owner)
+        db.session.commit()
+        self.repo = PlaceRepository(db)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _place(self, latitude, longitude):
+        place = Place(title="Casa", description="Linda", price=50, latitude=latitude, longitude=longitude, owner_id=self.owner.id)
+        self.repo.add(place)
+        return place
+
+    def test_geohash_is_maintained_on_insert_and_update(self):
+        place = self._place(-34.9, -56.16)
+        self.assertEqual(place.geohash, geo.encode_geohash(-34.9, -56.16))
+
+        self.repo.update(place.id, {"latitude": -34.5})
+        self.assertEqual(place.geohash, geo.encode_geohash(-34.5, -56.16))
+
+    def test_near_returns_places_within_radius_sorted_by_distance(self):
+        montevideo = self._place(-34.90, -56.16)
+        piriapolis = self._place(-34.86, -55.27)
+        self._place(-34.60, -58.38)  # Buenos Aires, ~200 km
+
+        results = self.repo.get_places_near(-34.90, -56.10, 100)
+        self.assertEqual([place.id for place, _ in results], [montevideo.id, piriapolis.id])
+
+    def test_bbox_across_antimeridian(self):
+        east = self._place(-17.7, 179.9)
+        west = self._place(-17.7, -179.9)
+        self._place(-17.7, 170.0)
+
+        found = {place.id for place, _ in self.repo.get_places_in_bbox((179.0, -18.0, -179.0, -17.0))}
+        self.assertEqual(found, {east.id, west.id})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db, sql_instrumentation
+from app.instrumentation import normalize_sql
+from app.models.amenity import Amenity
+from app.models.user import User
+
+
+class NormalizeSqlTestCase(unittest.TestCase):
+    def test_literals_and_in_lists_collapse(self):
+        self.assertEqual(
+            normalize_sql("SELECT a.id\n  FROM amenities a WHERE a.name = 'Wi''Fi' AND a.id IN (?, ?, ?) LIMIT 20"),
+            "SELECT a.id FROM amenities a WHERE a.name = ? AND a.id IN (?, ...) LIMIT ?"
+        )
+        # Los números dentro de identificadores no se tocan
+        self.assertEqual(normalize_sql("SELECT rating_count_5, anon_1.x FROM t"), "SELECT rating_count_5, anon_1.x FROM t")
+
+
+class SQLInstrumentationTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app.add_url_rule("/_probe", "probe", self._probe)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        sql_instrumentation.reset()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _probe(self):
+        for name in ("WiFi", "Pool", "Gym"):
+            db.session.query(Amenity).filter_by(name=name).first()
+        return {"ok": True}
+
+    def _token(self, is_admin):
+        user = User(first_name="Ana", last_name="Admin" if is_admin else "User",
+                    email=f"ana{int(is_admin)}@example.com", password="password123", is_admin=is_admin)
+        db.session.add(user)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+    def test_server_timing_reports_request_queries(self):
+        response = self.client.get("/_probe")
+        timing = response.headers["Server-Timing"]
+        self.assertIn('desc="3 queries"', timing)
+        self.assertIn("app;dur=", timing)
+
+        # Las tres consultas tienen la misma forma normalizada
+        self.assertEqual(len(sql_instrumentation.statements), 1)
+        statement, (count, _, _) = next(iter(sql_instrumentation.statements.items()))
+        self.assertIn("WHERE amenities.name = ?", statement)
+        self.assertEqual(count, 3)
+
+    def test_slow_queries_are_logged(self):
+        self.app.config["SQL_SLOW_QUERY_MS"] = 0
+        with self.assertLogs("hbnb.sql", level="WARNING") as logs:
+            self.client.get("/_probe")
+        self.assertEqual(len(logs.output), 3)
+        self.assertIn("GET /_probe", logs.output[0])
+
+    def test_metrics_endpoint_is_admin_only_prometheus_text(self):
+        user_headers, admin_headers = self._token(False), self._token(True)
+        self.client.get("/_probe")
+        self.client.get("/_probe")
+
+        self.assertEqual(self.client.get("/api/v1/_metrics").status_code, 401)
+        self.assertEqual(self.client.get("/api/v1/_metrics", headers=user_headers).status_code, 403)
+
+        response = self.client.get("/api/v1/_metrics", headers=admin_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+        body = response.get_data(as_text=True)
+        self.assertIn("# TYPE hbnb_db_queries histogram", body)
+        self.assertIn('hbnb_db_queries_bucket{endpoint="/_probe",method="GET",le="2"} 0', body)
+        self.assertIn('hbnb_db_queries_bucket{endpoint="/_probe",method="GET",le="5"} 2', body)
+        self.assertIn('hbnb_http_requests_total{endpoint="/_probe",method="GET",status="200"} 2', body)
+        self.assertIn('hbnb_entity_cache_hits_total{model="User"}', body)
+
+
+if __name__ == "__main__":
+    unittest.main()
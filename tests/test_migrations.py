@@ -0,0 +1,128 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from app import create_app, db, passwords
+from app.models.place import Place
+from app.persistence.migrate import MIGRATIONS_DIR, migrate, migrate_database, pending
+from app.persistence.seed import Seeder
+
+
+def _schema(connection):
+    """Columnas, índices y claves foráneas de cada tabla, más los triggers / Per-table schema plus triggers"""
+    tables = [name for (name,) in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
+        "AND name != 'schema_migrations' ORDER BY name")]
+    schema = {}
+    for table in tables:
+        columns = [(row[1], row[2].upper(), row[3], row[5]) for row in connection.execute(f"PRAGMA table_info({table})")]
+        indexes = {}
+        for row in connection.execute(f"PRAGMA index_list({table})"):
+            if not row[1].startswith("sqlite_autoindex"):
+                indexes[row[1]] = [info[2] for info in connection.execute(f"PRAGMA index_info({row[1]})")]
+        foreign_keys = sorted((row[2], row[3], row[4]) for row in connection.execute(f"PRAGMA foreign_key_list({table})"))
+        schema[table] = (columns, indexes, foreign_keys)
+    schema["triggers"] = [name for (name,) in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' ORDER BY name")]
+    return schema
+
+
+class MigrationRunnerTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.directory = tempfile.mkdtemp()
+        self.connection = sqlite3.connect(os.path.join(self.directory, "test.db"))
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        self.connection.close()
+        shutil.rmtree(self.directory)
+
+    def test_migrations_match_the_models(self):
+        # El esquema de las migraciones y el de db.create_all() no pueden divergir
+        self.assertEqual([m.version for m in migrate(self.connection)], [1, 2, 3, 4, 5])
+        app = create_app("testing")
+        with app.app_context():
+            db.create_all()
+            connection = db.engine.raw_connection()
+            try:
+                models = _schema(connection)
+            finally:
+                connection.close()
+            db.drop_all()
+        self.assertEqual(_schema(self.connection), models)
+
+    def test_runs_are_incremental(self):
+        migrate(self.connection, target=1)
+        self.assertEqual([m.version for m in pending(self.connection)], [2, 3, 4, 5])
+        self.assertEqual([m.version for m in migrate(self.connection)], [2, 3, 4, 5])
+        self.assertEqual(migrate(self.connection), [])
+
+    def test_existing_database_gets_the_indexes(self):
+        # Una base creada con create_all() antes de los índices de búsqueda
+        app = create_app("testing", {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{self.directory}/old.db"})
+        with app.app_context():
+            db.create_all()
+            for index in ("ix_places_owner_id", "ix_reviews_place_id", "ix_reviews_user_id",
+                          "ix_place_amenity_amenity_id"):
+                db.session.execute(db.text(f"DROP INDEX {index}"))
+            db.session.commit()
+            db.engine.dispose()
+
+        connection = sqlite3.connect(os.path.join(self.directory, "old.db"))
+        try:
+            migrate(connection)
+            indexes = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        finally:
+            connection.close()
+        self.assertTrue({"ix_places_owner_id", "ix_place_amenity_amenity_id"} <= indexes)
+
+    def test_seeded_database_keeps_the_migration_history(self):
+        # Como `flask seed`: migraciones y después datos / Like `flask seed`: migrations, then rows
+        app = create_app("testing", {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{self.directory}/seeded.db"})
+        with app.app_context():
+            self.assertEqual([m.version for m in migrate_database(db)], [1, 2, 3, 4, 5])
+            Seeder(db, passwords, seed=1).run(users=3, places=5)
+            self.assertEqual(migrate_database(db), [])
+            self.assertEqual([m.version for m in migrate_database(db, reset=True)], [1, 2, 3, 4, 5])
+            self.assertEqual(db.session.query(Place).count(), 0)
+            db.session.remove()
+            db.engine.dispose()
+
+        connection = sqlite3.connect(os.path.join(self.directory, "seeded.db"))
+        try:
+            self.assertEqual(pending(connection), [])
+        finally:
+            connection.close()
+
+    def test_modified_migration_is_rejected(self):
+        directory = os.path.join(self.directory, "migrations")
+        shutil.copytree(MIGRATIONS_DIR, directory)
+        migrate(self.connection, directory)
+
+        with open(os.path.join(directory, "0002_lookup_indexes.sql"), "a") as sql_file:
+            sql_file.write("\nCREATE INDEX ix_users_last_name ON users (last_name);\n")
+        with self.assertRaises(ValueError):
+            migrate(self.connection, directory)
+
+    def test_failed_migration_rolls_back(self):
+        directory = os.path.join(self.directory, "migrations")
+        shutil.copytree(MIGRATIONS_DIR, directory)
+        with open(os.path.join(directory, "9999_broken.sql"), "w") as sql_file:
+            sql_file.write("CREATE TABLE partial (id INTEGER);\nINSERT INTO missing VALUES (1);\n")
+
+        with self.assertRaises(sqlite3.OperationalError):
+            migrate(self.connection, directory)
+        tables = {name for (name,) in self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertNotIn("partial", tables)
+        self.assertEqual([m.version for m in pending(self.connection, directory)], [9999])
+
+    def test_legacy_schema_is_refused(self):
+        self.connection.execute("CREATE TABLE Place (id CHAR(36) PRIMARY KEY)")
+        with self.assertRaises(ValueError):
+            migrate(self.connection)
+
+
+if __name__ == "__main__":
+    unittest.main()
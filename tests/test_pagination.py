@@ -0,0 +1,60 @@
+import unittest
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.persistence.repository import SQLAlchemyRepository, InMemoryRepository
+from app.services.pagination import decode_cursor, encode_cursor
+
+
+class PaginationTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _walk(self, repo, limit, order_by='id'):
+        # Recorre todas las páginas pasando por el cursor opaco
+        seen, cursor = [], None
+        while True:
+            items, next_key = repo.get_page(after=decode_cursor(cursor, order_by), limit=limit, order_by=order_by)
+            seen.extend(item.id for item in items)
+            cursor = encode_cursor(order_by, next_key)
+            if cursor is None:
+                return seen
+
+    def test_sqlalchemy_pages_cover_table_once(self):
+        repo = SQLAlchemyRepository(Amenity, db)
+        for i in range(7):
+            repo.add(Amenity(name=f"Amenity {i}"))
+
+        ids = self._walk(repo, limit=3)
+        self.assertEqual(ids, sorted(a.id for a in repo.get_all()))
+
+        ids = self._walk(repo, limit=2, order_by='created_at')
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(len(set(ids)), 7)
+
+    def test_in_memory_pages_cover_storage_once(self):
+        repo = InMemoryRepository()
+        for i in range(5):
+            repo.add(Amenity(name=f"Amenity {i}"))
+
+        self.assertEqual(self._walk(repo, limit=2), sorted(repo._storage))
+
+    def test_cursor_is_bound_to_ordering(self):
+        cursor = encode_cursor('id', ('abc', 'abc'))
+        with self.assertRaises(ValueError):
+            decode_cursor(cursor, 'created_at')
+        with self.assertRaises(ValueError):
+            decode_cursor('not-a-cursor', 'id')
+
+
+if __name__ == "__main__":
+    unittest.main()
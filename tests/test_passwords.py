@@ -0,0 +1,89 @@
+import asyncio
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db, passwords
+from app.models.user import User
+from app.services import facade
+
+
+class PasswordServiceTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_user_password_is_hashed_once_with_configured_cost(self):
+        user = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        self.assertEqual(passwords.cost_of(user.password), self.app.config["BCRYPT_LOG_ROUNDS"])
+        self.assertTrue(user.verify_password("password123"))
+        self.assertFalse(user.verify_password("wrong-password"))
+
+    def test_needs_rehash_when_cost_changes(self):
+        user = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        self.assertFalse(user.password_needs_rehash())
+
+        passwords.rounds += 1
+        try:
+            self.assertTrue(user.password_needs_rehash())
+            user.hash_password("password123")
+            self.assertFalse(user.password_needs_rehash())
+        finally:
+            passwords.rounds -= 1
+
+    def test_async_hash_and_verify_run_on_the_pool(self):
+        async def check():
+            hashed = await passwords.hash_async("password123")
+            return hashed, await passwords.verify_async(hashed, "password123"), await passwords.verify_async(hashed, "nope")
+
+        hashed, valid, invalid = asyncio.run(check())
+        self.assertEqual(passwords.cost_of(hashed), self.app.config["BCRYPT_LOG_ROUNDS"])
+        self.assertEqual((valid, invalid), (True, False))
+        self.assertTrue(passwords.verify(hashed, "password123"))
+
+    def test_authenticate_user_rehashes_with_the_configured_cost(self):
+        user = facade.create_user({"first_name": "Ana", "last_name": "Diaz", "email": "ana@example.com",
+                                   "password": "password123"})
+        self.assertIsNone(facade.authenticate_user("ana@example.com", "wrong-password"))
+
+        passwords.rounds += 1
+        try:
+            self.assertEqual(facade.authenticate_user("ana@example.com", "password123").id, user.id)
+            self.assertEqual(passwords.cost_of(facade.get_user(user.id).password), passwords.rounds)
+        finally:
+            passwords.rounds -= 1
+
+    def test_short_password_is_rejected(self):
+        with self.assertRaises(ValueError):
+            User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="short")
+
+    def test_non_string_password_is_a_validation_error(self):
+        with self.assertRaises(ValueError):
+            passwords.hash(12345678)
+        with self.assertRaises(ValueError):
+            passwords.verify(passwords.hash("password123"), 12345678)
+        with self.assertRaises(ValueError):
+            asyncio.run(passwords.verify_async(passwords.hash("password123"), ["password123"]))
+        with self.assertRaises(ValueError):
+            User(first_name="Ana", last_name="Diaz", email="ana@example.com", password=123456789)
+
+        client = self.app.test_client()
+        user = facade.create_user({"first_name": "Ana", "last_name": "Diaz", "email": "ana@example.com",
+                                   "password": "password123"})
+        login = client.post("/api/v1/auth/login", json={"email": "ana@example.com", "password": 12345678})
+        self.assertEqual(login.status_code, 400, login.get_data(as_text=True))
+        headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+        register = client.post("/api/v1/auth/", headers=headers, json={
+            "first_name": "Luis", "last_name": "Paz", "email": "luis@example.com", "password": 123456789})
+        self.assertEqual(register.status_code, 400, register.get_data(as_text=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import uuid
+from sqlalchemy import event
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import PlaceRepository
+
+
+class StatementCounter:
+    """Cuenta las sentencias SQL enviadas al motor / Counts SQL statements sent to the engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+class PlaceQueryCountTestCase(unittest.TestCase):
+    """
+    El número de sentencias por endpoint no debe crecer con el tamaño de los datos
+    The statement count per endpoint must not grow with the dataset
+    """
+
+    def setUp(self):
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.repo = PlaceRepository(db)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _seed_catalog(self):
+        # Un dueño y tres amenidades compartidas por todos los lugares
+        self.user_id = str(uuid.uuid4())
+        db.session.execute(User.__table__.insert(), [{
+            "id": self.user_id, "first_name": "Seed", "last_name": "User",
+            "email": "seed@example.com", "password": "x" * 60, "is_admin": False
+        }])
+        self.amenity_ids = [str(uuid.uuid4()) for _ in range(3)]
+        db.session.execute(Amenity.__table__.insert(), [
+            {"id": amenity_id, "name": f"Amenity {i}"} for i, amenity_id in enumerate(self.amenity_ids)
+        ])
+
+    def _seed_places(self, n_places):
+        # Inserciones masivas por Core para que sembrar 10k lugares sea rápido
+        place_ids = [str(uuid.uuid4()) for _ in range(n_places)]
+        db.session.execute(Place.__table__.insert(), [{
+            "id": place_id, "title": "Place", "description": "Seeded", "price": 10.0,
+            "latitude": 0.0, "longitude": 0.0, "owner_id": self.user_id
+        } for place_id in place_ids])
+        db.session.execute(place_amenity.insert(), [
+            {"place_id": place_id, "amenity_id": amenity_id}
+            for place_id in place_ids for amenity_id in self.amenity_ids[:2]
+        ])
+        db.session.execute(Review.__table__.insert(), [{
+            "id": str(uuid.uuid4()), "text": "Nice", "rating": 4, "user_id": self.user_id, "place_id": place_id
+        } for place_id in place_ids for _ in range(2)])
+        db.session.commit()
+        return place_ids
+
+    def _count_list(self):
+        db.session.expunge_all()
+        with StatementCounter(db.engine) as counter:
+            places, _ = self.repo.get_page(limit=100)
+            [place.to_dict() for place in places]
+        return counter.count
+
+    def _count_detail(self, place_id):
+        db.session.expunge_all()
+        with StatementCounter(db.engine) as counter:
+            place = self.repo.get_place_details(place_id)
+            place.to_dict()
+            place.user.email
+        return counter.count
+
+    def test_statement_count_is_constant(self):
+        self._seed_catalog()
+        counts, seeded = [], 0
+        for size in (10, 10000):
+            place_ids = self._seed_places(size - seeded)
+            seeded = size
+            counts.append((self._count_list(), self._count_detail(place_ids[-1])))
+
+        self.assertEqual(counts[0], counts[1])
+        self.assertLessEqual(counts[0][0], 3)  # lugares + reseñas + amenidades
+        self.assertLessEqual(counts[0][1], 2)  # lugar con dueño y amenidades + reseñas
+
+
+if __name__ == "__main__":
+    unittest.main()
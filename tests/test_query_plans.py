@@ -0,0 +1,105 @@
+import re
+import unittest
+from sqlalchemy import event
+from app import create_app, db, passwords
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence import geo
+from app.persistence.repository import AmenityRepository, PlaceRepository, ReviewRepository, UserRepository
+from app.persistence.seed import Seeder, amenity_id, seed_email
+
+# SQLite muestra el alias del ORM (place_amenity_1) en lugar del nombre de la tabla
+SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+?)(?:_\d+)?(?: |$)")
+
+
+class QueryPlanTestCase(unittest.TestCase):
+    """
+    Cada consulta de los repositorios debe buscar por índice: EXPLAIN QUERY PLAN
+    no puede mostrar un SCAN completo de una tabla del modelo.
+    Every repository query must be an index search, never a full table scan.
+    """
+
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        Seeder(db, passwords, seed=5, password_pool=1).run(users=10, places=30)
+        self.places, self.reviews = PlaceRepository(db), ReviewRepository(db)
+        self.users, self.amenities = UserRepository(db), AmenityRepository(db)
+        self.place = db.session.query(Place).order_by(Place.id).first()
+        self.review = db.session.query(Review).order_by(Review.id).first()
+        self.tables = set(db.metadata.tables)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _plans(self, call):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                statements.append((statement, parameters))
+
+        db.session.expunge_all()  # sin identity map: cada get() llega a la base
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            result = call()
+            if hasattr(result, "__next__"):
+                list(result)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+        self.assertTrue(statements, "the call issued no SELECT")
+        connection = db.session.connection()
+        return [(statement, [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}",
+                                                                           parameters)])
+                for statement, parameters in statements]
+
+    def assertNoTableScan(self, call):
+        for statement, details in self._plans(call):
+            for detail in details:
+                match = SCAN.match(detail)
+                if match and match.group(1) in self.tables:
+                    self.fail(f"{detail}\n{statement}")
+
+    def test_lookups_by_primary_key(self):
+        self.assertNoTableScan(lambda: self.places.get(self.place.id))
+        self.assertNoTableScan(lambda: self.places.get_many([self.place.id, "missing"]))
+        self.assertNoTableScan(lambda: self.places.get_version(self.place.id))
+        self.assertNoTableScan(lambda: self.places.get_search_document(self.place.id))
+        self.assertNoTableScan(lambda: self.reviews.get(self.review.id))
+        self.assertNoTableScan(lambda: self.amenities.get(amenity_id("WiFi")))
+
+    def test_user_lookups(self):
+        self.assertNoTableScan(lambda: self.users.get_user_by_email(seed_email(1, 5)))
+        self.assertNoTableScan(lambda: self.users.get_by_attribute("email", seed_email(1, 5)))
+        self.assertNoTableScan(lambda: self.users.get_user_by_id(self.place.owner_id))
+
+    def test_foreign_key_lookups(self):
+        self.assertNoTableScan(lambda: self.places.get_places_by_owner(self.place.owner_id))
+        self.assertNoTableScan(lambda: self.reviews.get_reviews_by_place(self.place.id))
+        self.assertNoTableScan(lambda: self.reviews.find_all_by_attribute("user_id", self.review.user_id))
+        self.assertNoTableScan(lambda: self.places.iter_amenity_links([self.place.id]))
+
+    def test_place_detail_and_list_loaders(self):
+        self.assertNoTableScan(lambda: self.places.get_place_details(self.place.id))
+        self.assertNoTableScan(lambda: self.places.get_page(after=(self.place.id, self.place.id), limit=5))
+
+    def test_amenity_filter(self):
+        for mode in ("all", "any"):
+            where = [self.places.amenity_filter([amenity_id("WiFi"), amenity_id("Gym")], mode)]
+            self.assertNoTableScan(lambda: db.session.query(Place.id).filter(*where).all())
+
+    def test_geo_and_incremental_queries(self):
+        self.assertNoTableScan(lambda: self.places.get_places_in_cells(
+            geo.covering_cells(geo.radius_bbox(40.4, -3.7, 5))))
+        self.assertNoTableScan(lambda: self.places.iter_place_columns(since=self.place.updated_at))
+        self.assertNoTableScan(lambda: list(self.places.iter_deleted_place_ids(self.place.updated_at)))
+
+
+if __name__ == "__main__":
+    unittest.main()
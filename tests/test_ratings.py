@@ -0,0 +1,56 @@
+import unittest
+from app import create_app, db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import PlaceRepository
+
+
+class RatingAggregatesTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        db.session.add(self.user)
+        db.session.commit()
+        self.place = Place(title="Casa", description="Linda", price=50, latitude=0, longitude=0, owner_id=self.user.id)
+        db.session.add(self.place)
+        db.session.commit()
+        self.repo = PlaceRepository(db)
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_delta_updates_counts_sum_and_histogram(self):
+        self.repo.apply_rating_delta(self.place.id, added=5)
+        self.repo.apply_rating_delta(self.place.id, added=3)
+        self.repo.apply_rating_delta(self.place.id, added=4, removed=3)
+        db.session.commit()
+
+        place = self.repo.get(self.place.id)
+        self.assertEqual(place.review_count, 2)
+        self.assertEqual(place.rating_sum, 9)
+        self.assertEqual(place.average_rating, 4.5)
+        self.assertEqual(place.rating_histogram, {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1})
+
+    def test_recompute_repairs_drifted_aggregates(self):
+        for rating in (1, 5, 5):
+            db.session.add(Review(text="Ok", rating=rating, place_id=self.place.id, user_id=self.user.id))
+        self.place.review_count = 42
+        db.session.commit()
+
+        self.assertEqual(self.repo.recompute_rating_aggregates(), 1)
+        place = self.repo.get(self.place.id)
+        self.assertEqual((place.review_count, place.rating_sum), (3, 11))
+        self.assertEqual(place.rating_histogram["5"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from app import create_app, db, read_replicas
+from app.models.amenity import Amenity
+from app.persistence.repository import SQLAlchemyRepository
+
+
+class ReadReplicaTestCase(unittest.TestCase):
+    """Primario y réplica son dos archivos SQLite: la réplica es una copia del primario"""
+
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.directory = tempfile.mkdtemp()
+        self.primary = os.path.join(self.directory, "primary.db")
+        self.replica = os.path.join(self.directory, "replica.db")
+        self.app = create_app("testing", {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{self.primary}",
+            "READ_REPLICAS": {"replica": f"sqlite:///{self.replica}"},
+            "REPLICA_MAX_LAG_SECONDS": 5,
+            "REPLICA_LAG_CHECK_SECONDS": 0,
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.repo = SQLAlchemyRepository(Amenity, db)
+        self.repo.add(Amenity(name="WiFi"))
+        self._replicate()
+        read_replicas.reset_stats()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.engine.dispose()
+        read_replicas.dispose()
+        self.app_context.pop()
+        shutil.rmtree(self.directory)
+
+    def _replicate(self):
+        db.session.remove()
+        db.engine.dispose()
+        for engine in read_replicas.engines.values():
+            engine.dispose()
+        shutil.copyfile(self.primary, self.replica)
+
+    def _write_behind_the_replica(self, name):
+        # Escritura en el primario que la réplica todavía no recibió
+        amenity = Amenity(name=name)
+        self.repo.add(amenity)
+        amenity_id = amenity.id
+        db.session.remove()
+        return amenity_id
+
+    def test_reads_go_to_the_replica(self):
+        missing_id = self._write_behind_the_replica("Pool")
+
+        self.assertIsNone(self.repo.get(missing_id))
+        self.assertEqual([amenity.name for amenity in self.repo.get_all()], ["WiFi"])
+        self.assertEqual(read_replicas.stats()["reads"].get("replica"), 2)
+
+    def test_session_that_wrote_reads_from_the_primary(self):
+        amenity = Amenity(name="Pool")
+        self.repo.add(amenity)  # commit fuera de una petición: la sesión queda fijada al primario
+        amenity_id = amenity.id
+        db.session.expunge_all()
+
+        self.assertEqual(self.repo.get_by_attribute("name", "Pool").id, amenity_id)
+        self.assertEqual(read_replicas.stats()["pinned"], 1)
+
+    def test_request_reads_its_own_writes(self):
+        @self.app.route("/_probe", methods=["POST"])
+        def probe():
+            before = self.repo.get_by_attribute("name", "Gym")
+            self.repo.add(Amenity(name="Gym"))
+            db.session.expunge_all()
+            after = self.repo.get_by_attribute("name", "Gym")
+            return {"before": before is not None, "after": after is not None}
+
+        self.assertEqual(self.app.test_client().post("/_probe").get_json(), {"before": False, "after": True})
+        stats = read_replicas.stats()
+        self.assertEqual((stats["reads"].get("replica"), stats["pinned"]), (1, 1))
+
+    def test_lagging_replica_is_skipped(self):
+        missing_id = self._write_behind_the_replica("Pool")
+        # El primario escribió hace 60 s y a la réplica todavía no le llegó ese latido
+        for path, age in ((self.primary, 60), (self.replica, 120)):
+            connection = sqlite3.connect(path)
+            with connection:
+                connection.execute("UPDATE replica_heartbeat SET beat_at = ?", (time.time() - age,))
+            connection.close()
+
+        self.assertIsNotNone(self.repo.get(missing_id))
+        stats = read_replicas.stats()
+        self.assertEqual(stats["lagging"], 1)
+        self.assertGreater(stats["lag_seconds"]["replica"], 59)
+
+    def test_lag_grows_while_the_primary_is_idle(self):
+        # Una sola escritura sin replicar y ninguna más: el lag sigue creciendo
+        read_replicas.max_lag = 0.2
+        missing_id = self._write_behind_the_replica("Pool")
+        self.assertIsNone(self.repo.get(missing_id))
+        time.sleep(0.3)
+
+        self.assertIsNotNone(self.repo.get(missing_id))
+        stats = read_replicas.stats()
+        self.assertEqual((stats["reads"].get("replica"), stats["lagging"]), (1, 1))
+        self.assertGreater(stats["lag_seconds"]["replica"], 0.2)
+
+    def test_replica_connections_are_read_only(self):
+        with read_replicas.engines["replica"].connect() as connection:
+            with self.assertRaises(Exception):
+                connection.exec_driver_sql("DELETE FROM amenities")
+
+
+if __name__ == "__main__":
+    unittest.main()
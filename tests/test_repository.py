@@ -0,0 +1,125 @@
+import threading
+import unittest
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.persistence.repository import SQLAlchemyRepository, InMemoryRepository
+
+
+class RepositoryTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_get_many_reports_found_and_missing(self):
+        for repo in (SQLAlchemyRepository(Amenity, db), InMemoryRepository()):
+            wifi, pool = Amenity(name="WiFi"), Amenity(name="Pool")
+            repo.add(wifi)
+            repo.add(pool)
+
+            found, missing = repo.get_many([pool.id, "nope", wifi.id, pool.id])
+            self.assertEqual([amenity.id for amenity in found], [pool.id, wifi.id])
+            self.assertEqual(missing, ["nope"])
+            self.assertEqual(repo.get_many([]), ([], []))
+
+
+class Record:
+    def __init__(self, **attrs):
+        self.id = None
+        self.created_at = self.updated_at = None
+        self.__dict__.update(attrs)
+
+
+class InMemoryIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.repo = InMemoryRepository(unique_indexes=("email",), indexes=("place_id",))
+
+    def test_unique_index_lookup_and_conflicts(self):
+        ana = Record(email="ana@example.com")
+        self.repo.add(ana)
+        self.assertIs(self.repo.get_by_attribute("email", "ana@example.com"), ana)
+        with self.assertRaises(ValueError):
+            self.repo.add(Record(email="ana@example.com"))
+
+        self.repo.update(ana.id, {"email": "ana@new.com"})
+        self.assertIsNone(self.repo.get_by_attribute("email", "ana@example.com"))
+        self.assertEqual(self.repo.get_by_attribute("email", "ana@new.com").id, ana.id)
+        # update publica una copia: quien ya tenía el objeto no lo ve cambiar
+        self.assertEqual(ana.email, "ana@example.com")
+
+        self.repo.delete(ana.id)
+        self.assertIsNone(self.repo.get_by_attribute("email", "ana@new.com"))
+
+    def test_non_unique_index_follows_updates(self):
+        reviews = [Record(place_id=place_id) for place_id in ("p1", "p1", "p2")]
+        for review in reviews:
+            self.repo.add(review)
+        self.assertEqual(self.repo.find_all_by_attribute("place_id", "p1"), reviews[:2])
+
+        self.repo.update(reviews[0].id, {"place_id": "p2"})
+        self.repo.delete(reviews[2].id)
+        self.assertEqual(self.repo.find_all_by_attribute("place_id", "p1"), [reviews[1]])
+        self.assertEqual([review.id for review in self.repo.find_all_by_attribute("place_id", "p2")], [reviews[0].id])
+        # Un atributo sin índice se resuelve recorriendo todo el almacenamiento
+        self.assertEqual(self.repo.find_all_by_attribute("created_at", reviews[1].created_at), [reviews[1]])
+
+
+class InMemoryConcurrencyTestCase(unittest.TestCase):
+    def test_readers_never_see_half_applied_updates(self):
+        repo = InMemoryRepository(indexes=("bucket",))
+        record = Record(low=0, high=0, bucket="a")
+        repo.add(record)
+        stop = threading.Event()
+        torn = []
+
+        def writer():
+            for value in range(1, 2000):
+                repo.update(record.id, {"low": value, "high": value, "bucket": "ab"[value % 2]})
+            stop.set()
+
+        def reader():
+            while not stop.is_set():
+                current = repo.get(record.id)
+                if current.low != current.high:
+                    torn.append(current)
+                # Dos lecturas sobre la misma versión ven el registro en un solo grupo
+                view = repo.read_view()
+                found = view.find_all_by_attribute("bucket", "a") + view.find_all_by_attribute("bucket", "b")
+                if len(found) != 1:
+                    torn.append(found)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)] + [threading.Thread(target=writer)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(torn, [])
+        self.assertEqual(repo.get(record.id).low, 1999)
+
+    def test_failed_write_is_not_published(self):
+        repo = InMemoryRepository(unique_indexes=("email",))
+        repo.add(Record(email="ana@example.com"))
+        luis = Record(email="luis@example.com")
+        repo.add(luis)
+        with self.assertRaises(ValueError):
+            repo.update(luis.id, {"email": "ana@example.com"})
+        self.assertEqual(repo.get(luis.id).email, "luis@example.com")
+
+        # add_many publica todo el lote o nada
+        with self.assertRaises(ValueError):
+            repo.add_many([Record(email="eva@example.com"), Record(email="ana@example.com")])
+        self.assertIsNone(repo.get_by_attribute("email", "eva@example.com"))
+        self.assertEqual(len(repo.get_all()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
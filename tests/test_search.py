@@ -0,0 +1,166 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy import text
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import PlaceRepository
+from app.persistence.search import (
+    FTS5SearchIndex, InMemorySearchIndex, InvertedIndex, PostgresSearchIndex, fts5_available, search_index_class,
+    tokenize,
+)
+from app.services import facade
+
+DOCUMENTS = [
+    ("p1", "Cabaña junto al lago", "Tranquila y con muelle", "Ideal para pescar"),
+    ("p2", "Departamento céntrico", "Cerca del lago y del centro", ""),
+    ("p3", "Casa de campo", "Amplia", "Vimos el lago desde la ventana, cabaña preciosa"),
+]
+
+
+class InvertedIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.index = InvertedIndex()
+        self.index.index_many(DOCUMENTS)
+
+    def test_tokenize_strips_accents_and_case(self):
+        self.assertEqual(tokenize("Cabaña CÉNTRICA, 2 baños"), ["cabana", "centrica", "2", "banos"])
+
+    def test_title_matches_rank_first_and_terms_are_anded(self):
+        ranked, total = self.index.search("cabana lago", limit=10)
+        self.assertEqual(total, 2)
+        self.assertEqual([place_id for place_id, _ in ranked], ["p1", "p3"])
+
+    def test_reindex_and_remove(self):
+        self.index.index_place("p2", "Loft", "Sin vista", "")
+        self.assertEqual(self.index.search("centrico", limit=10), ([], 0))
+        self.index.remove_place("p1")
+        ranked, total = self.index.search("lago", limit=1, offset=0)
+        self.assertEqual((total, ranked[0][0]), (1, "p3"))
+
+
+class FTS5SearchTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        if not fts5_available(db):
+            self.skipTest("SQLite sin FTS5")
+        self.index = FTS5SearchIndex(db)
+        self.index.create()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_ranks_like_the_in_memory_index(self):
+        self.index.index_many(DOCUMENTS)
+        db.session.commit()
+        ranked, total = self.index.search("Cabaña lago", limit=10)
+        self.assertEqual(total, 2)
+        self.assertEqual([place_id for place_id, _ in ranked], ["p1", "p3"])
+
+    def test_user_input_is_not_fts_syntax(self):
+        self.index.index_many(DOCUMENTS)
+        self.assertEqual(self.index.search('lago" *', limit=10)[1], 3)
+        self.assertEqual(self.index.search('lago OR NEAR(', limit=10), ([], 0))
+
+    def test_probe_keeps_pending_writes_and_rollback_recreates_table(self):
+        user = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        db.session.add(user)
+        self.assertTrue(fts5_available(db))
+        db.session.commit()
+        self.assertEqual(db.session.query(User).count(), 1)
+
+        db.session.rollback()
+        db.session.execute(text("DROP TABLE place_search"))
+        self.index.index_many(DOCUMENTS)
+        self.assertEqual(self.index.search("lago", limit=10)[1], 3)
+
+    def test_search_documents_include_review_text(self):
+        user = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        db.session.add(user)
+        db.session.commit()
+        place = Place(title="Casa", description="Linda", price=50, latitude=0, longitude=0, owner_id=user.id)
+        db.session.add(place)
+        db.session.commit()
+        db.session.add(Review(text="Excelente desayuno", rating=5, place_id=place.id, user_id=user.id))
+        db.session.commit()
+
+        repo = PlaceRepository(db)
+        self.index.index_many(repo.iter_search_documents())
+        self.assertEqual(repo.get_search_document(place.id)[3], "Excelente desayuno")
+        self.assertEqual(self.index.search("desayuno", limit=5)[0][0][0], place.id)
+
+
+class SearchIndexSelectionTestCase(unittest.TestCase):
+    @staticmethod
+    def _database(dialect):
+        return SimpleNamespace(engine=SimpleNamespace(dialect=SimpleNamespace(name=dialect)))
+
+    def test_each_engine_gets_its_own_index(self):
+        self.assertIs(search_index_class(self._database("postgresql")), PostgresSearchIndex)
+        self.assertEqual(PostgresSearchIndex.RANK_WEIGHTS, "{0.0, 0.1, 0.4, 1.0}")
+
+    def test_engines_without_full_text_search_fall_back_to_memory(self):
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertIs(search_index_class(self._database("mysql")), InMemorySearchIndex)
+        self.assertIn("mysql", logs.output[0])
+
+
+class SearchFallbackTestCase(unittest.TestCase):
+    """Escrituras y búsqueda con un motor sin búsqueda en la base / Writes with search unavailable"""
+
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        unavailable = patch("app.persistence.search.fts5_available", return_value=False)
+        unavailable.start()
+        self.addCleanup(unavailable.stop)
+        user = User(first_name="Ana", last_name="Diaz", email="ana@example.com", password="password123")
+        wifi = Amenity(name="WiFi")
+        db.session.add_all([user, wifi])
+        db.session.commit()
+        self.user_id, self.wifi_id = user.id, wifi.id
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _search(self, query):
+        return [item["id"] for item in facade.search_places(query)["items"]]
+
+    def test_writes_succeed_and_search_uses_the_in_memory_index(self):
+        with self.assertLogs(level="WARNING"):
+            place, _ = facade.create_place({"title": "Cabaña junto al lago", "description": "Con muelle", "price": 80,
+                                         "latitude": 1.0, "longitude": 2.0, "owner_id": self.user_id,
+                                         "amenities": [self.wifi_id]})
+        self.assertIsInstance(facade._get_search_index(), InMemorySearchIndex)
+        facade.update_place(place["id"], {"title": "Cabaña del bosque"})
+        review = facade.create_review({"text": "Desayuno excelente", "rating": 5, "user_id": self.user_id,
+                                       "place_id": place["id"]})
+        self.assertEqual(self._search("bosque desayuno"), [place["id"]])
+
+        facade.update_review(review["id"], {"text": "Cena excelente"})
+        self.assertEqual(self._search("desayuno"), [])
+        self.assertEqual(self._search("cena"), [place["id"]])
+        facade.delete_review(review["id"])
+        self.assertEqual(self._search("cena"), [])
+        self.assertEqual(self._search("muelle"), [place["id"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
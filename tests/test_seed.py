@@ -0,0 +1,71 @@
+import unittest
+from sqlalchemy import func, select
+from app import create_app, db, passwords
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.seed import ADMIN_FIXTURE, AMENITY_NAMES, Seeder, seed_email, seed_password
+
+
+class SeederTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _count(self, table):
+        return db.session.execute(select(func.count()).select_from(table)).scalar()
+
+    def _snapshot(self):
+        return (db.session.execute(select(Place.id, Place.title, Place.price, Place.owner_id).order_by(Place.id)).all(),
+                db.session.execute(select(Review.id, Review.rating).order_by(Review.id)).all())
+
+    def test_seed_is_deterministic_and_reports_rows(self):
+        report = Seeder(db, passwords, seed=7, batch_size=50, commit_every=120).run(users=20, places=100)
+        first = self._snapshot()
+
+        self.assertEqual(report.rows["places"], 100)
+        self.assertEqual(report.rows["users"], 21)  # 20 sintéticos + admin inicial
+        self.assertEqual(report.rows["reviews"], self._count(Review))
+        self.assertEqual(report.rows["place_amenity"], self._count(place_amenity))
+        self.assertGreater(report.rows_per_second, 0)
+        # Los agregados de calificación quedan consistentes con las reseñas
+        self.assertEqual(db.session.execute(select(func.sum(Place.review_count))).scalar(), self._count(Review))
+
+        db.drop_all()
+        db.create_all()
+        Seeder(db, passwords, seed=7, batch_size=1000, commit_every=10_000).run(users=20, places=100)
+        self.assertEqual(self._snapshot(), first)
+
+    def test_fixtures_are_loaded_once(self):
+        Seeder(db, passwords, seed=1).run(users=5, places=10)
+        Seeder(db, passwords, seed=2).run(users=5, places=10)
+
+        self.assertEqual(self._count(Amenity), len(AMENITY_NAMES))
+        admin = db.session.execute(select(User).where(User.email == ADMIN_FIXTURE["email"])).scalar_one()
+        self.assertTrue(admin.is_admin)
+        self.assertEqual(self._count(User), 11)
+
+        with self.assertRaises(ValueError):
+            Seeder(db, passwords, seed=1).run(users=5, places=10)
+
+    def test_users_share_a_pool_of_hashes(self):
+        Seeder(db, passwords, seed=3, password_pool=2).run(users=6, places=0)
+        hashes = set(db.session.execute(select(User.password).where(User.email.like("%.s3@example.com"))).scalars())
+        self.assertEqual(len(hashes), 2)
+
+        user = db.session.execute(select(User).where(User.email == seed_email(5, 3))).scalar_one()
+        self.assertTrue(passwords.verify(user.password, seed_password(5, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
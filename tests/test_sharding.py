@@ -0,0 +1,183 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import uuid
+from sqlalchemy import event
+from app import create_app, db, sharding
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import ShardedPlaceRepository, ShardedReviewRepository
+from app.persistence.sharding import bucket_for
+
+
+class ShardingTestCase(unittest.TestCase):
+    """La base principal y cada partición son archivos SQLite distintos"""
+
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.directory = tempfile.mkdtemp()
+        self._start(["shard_a", "shard_b", "shard_c"])
+        db.create_all()
+        sharding.create_all()
+        self.owner = User(first_name="Ana", last_name="Sosa", email="ana@example.com", password="secret-password")
+        self.wifi, self.pool = Amenity(name="WiFi"), Amenity(name="Pool")
+        db.session.add_all([self.owner, self.wifi, self.pool])
+        db.session.commit()
+        self.owner_id = self.owner.id
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        self._stop()
+        shutil.rmtree(self.directory)
+
+    def _start(self, names):
+        self.app = create_app("testing", {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{self.directory}/main.db",
+            "SHARDS": {name: f"sqlite:///{self.directory}/{name}.db" for name in names},
+            "SHARD_BUCKETS": 16,
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.places = ShardedPlaceRepository(sharding, db)
+        self.reviews = ShardedReviewRepository(sharding)
+
+    def _stop(self):
+        sharding.dispose()
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+
+    def _ids_in(self, name, table):
+        with sqlite3.connect(os.path.join(self.directory, f"{name}.db")) as connection:
+            column = "id" if table == "places" else "place_id"
+            return {row[0] for row in connection.execute(f"SELECT {column} FROM {table}")}
+
+    def _add_places(self, count):
+        places = []
+        for number in range(count):
+            place = Place(title=f"Place {number}", description="A place", price=float(number % 7 * 10),
+                          latitude=10.0, longitude=20.0, owner_id=self.owner_id)
+            place.id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"place-{number}"))  # mismas cubetas en cada corrida
+            self.places.add(place)
+            self.reviews.add(Review(text="Nice", rating=number % 5 + 1, place_id=place.id, user_id=self.owner_id))
+            places.append(place.id)
+        return places
+
+    def test_place_and_its_reviews_live_on_one_shard(self):
+        place_ids = self._add_places(12)
+
+        for place_id in place_ids:
+            shard = sharding.shard_for(place_id)
+            holders = [name for name in sharding.names if place_id in self._ids_in(name, "places")]
+            self.assertEqual(holders, [shard])
+            self.assertIn(place_id, self._ids_in(shard, "reviews"))
+        self.assertEqual(len({sharding.shard_for(place_id) for place_id in place_ids}), 3)
+        self.assertEqual(bucket_for(place_ids[0], 16), bucket_for(place_ids[0], 16))
+
+        db.session.remove()
+        sharding.session.remove()
+        self.assertEqual(self.places.get(place_ids[0]).title, "Place 0")
+        self.assertEqual(len(self.reviews.get_reviews_by_place(place_ids[3])), 1)
+        self.assertEqual(self.places.count(), 12)
+
+    def test_pages_are_merged_across_shards(self):
+        self._add_places(25)
+        expected = sorted(self.places.get_all(), key=lambda place: (place.price, place.id))
+
+        for order_by, key in (("id", lambda place: place.id), ("price", lambda place: (place.price, place.id))):
+            seen, after = [], None
+            while True:
+                page, after = self.places.get_page(after=after, limit=7, order_by=order_by)
+                seen.extend(page)
+                if after is None:
+                    break
+            self.assertEqual([place.id for place in seen], [place.id for place in sorted(expected, key=key)])
+        self.assertTrue(all(len(place.reviews) == 1 for place in seen))
+
+    def test_place_details_load_owner_and_amenities_from_the_main_database(self):
+        place_id = self._add_places(1)[0]
+        self.places.add_amenity_links([(place_id, self.wifi.id), (place_id, self.pool.id)])
+        self.places.apply_rating_delta(place_id, added=5)
+        self.places.commit()
+        sharding.session.remove()
+
+        place = self.places.get_place_details(place_id)
+        self.assertEqual(place.user.email, "ana@example.com")
+        self.assertEqual(sorted(amenity.name for amenity in place.amenities), ["Pool", "WiFi"])
+        self.assertEqual((place.review_count, len(place.reviews)), (1, 1))
+        self.assertEqual(self.places.update(place_id, {"title": "Renamed"}).title, "Renamed")
+
+    def _queries_per_shard(self, operation):
+        hits = []
+        listeners = [(engine, lambda *args, name=name: hits.append(name)) for name, engine in sharding.engines.items()]
+        for engine, listener in listeners:
+            event.listen(engine, "before_cursor_execute", listener)
+        try:
+            result = operation()
+        finally:
+            for engine, listener in listeners:
+                event.remove(engine, "before_cursor_execute", listener)
+        return result, hits
+
+    def test_lookups_by_id_hit_a_single_shard(self):
+        place_id = self._add_places(1)[0]
+        review = self.reviews.find_all_by_attribute("place_id", place_id)[0]
+        review_id, shard = review.id, sharding.shard_for(place_id)
+        self.assertEqual(int(review_id[:4], 16), bucket_for(place_id, 16))
+        self.assertEqual(str(uuid.UUID(review_id)), review_id)
+        sharding.session.remove()
+
+        found, hits = self._queries_per_shard(lambda: self.reviews.get(review_id))
+        self.assertEqual((found.place_id, hits), (place_id, [shard]))
+        found, hits = self._queries_per_shard(lambda: self.places.get(place_id))
+        self.assertEqual((found.id, hits), (place_id, [shard]))
+
+        stray = Review(text="Nice", rating=3, place_id=place_id, user_id=self.owner_id)
+        stray.id = "ffff" + review_id[4:]
+        with self.assertRaises(ValueError):
+            self.reviews.add(stray)
+
+    def test_collection_version_spans_every_shard(self):
+        place_ids = self._add_places(6)
+        self.places.add_amenity_links([(place_ids[0], self.wifi.id)])
+        self.places.commit()
+        latest, counts = self.places.get_collection_version()
+        self.assertEqual(counts, (6, 6, 2, 1))
+        self.assertEqual(self.reviews.get_collection_version()[1], 6)
+
+        self.reviews.update(self.reviews.get_reviews_by_place(place_ids[5])[0].id, {"text": "Edited"})
+        self.assertGreater(self.places.get_collection_version()[0], latest)
+
+    def test_rebalance_moves_buckets_to_a_new_shard(self):
+        self._stop()
+        self._start(["shard_a", "shard_b"])
+        sharding.create_all()
+        place_ids = self._add_places(30)
+        self._stop()
+
+        self._start(["shard_a", "shard_b", "shard_c"])
+        self.assertEqual(sharding.status()["shard_c"], {"buckets": 0, "places": 0, "reviews": 0})
+        report = sharding.rebalance(batch_size=4)
+        status = sharding.status()
+
+        self.assertEqual(sorted(entry["buckets"] for entry in status.values()), [5, 5, 6])
+        self.assertEqual(len(report.moved), 5)  # solo lo que le toca a la partición nueva
+        self.assertEqual(sum(entry["places"] for entry in status.values()), 30)
+        self.assertEqual(sum(entry["reviews"] for entry in status.values()), 30)
+        for place_id in place_ids:
+            self.assertIn(place_id, self._ids_in(sharding.shard_for(place_id), "places"))
+            self.assertIsNotNone(self.places.get(place_id))
+        self.assertEqual(sharding.rebalance().to_dict()["buckets_moved"], 0)
+
+        # Vaciar una partición antes de quitarla de SHARDS
+        sharding.rebalance(exclude=["shard_a"])
+        self.assertEqual(sharding.status()["shard_a"], {"buckets": 0, "places": 0, "reviews": 0})
+        self.assertEqual(self.places.count(), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
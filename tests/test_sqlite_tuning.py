@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import unittest
+from app import create_app, db
+from app.persistence.sqlite_tuning import read_pragmas
+from hbnb.config import SQLITE_PROFILES
+
+PRAGMAS = ("journal_mode", "synchronous", "busy_timeout", "temp_store", "mmap_size", "cache_size")
+
+
+class SQLiteTuningTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        shutil.rmtree(self.directory)
+
+    def _effective(self, config, profile, name):
+        app = create_app(config, {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self.directory, name)}",
+            "SQLITE_PRAGMAS": SQLITE_PROFILES[profile],
+        })
+        with app.app_context():
+            try:
+                return read_pragmas(db.engine, PRAGMAS), db.engine.pool
+            finally:
+                db.engine.dispose()
+
+    def test_wal_profile_is_applied_to_every_connection(self):
+        pragmas, _ = self._effective("testing", "wal", "wal.db")
+        self.assertEqual(pragmas, {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000,
+                                   "temp_store": 2, "mmap_size": 268435456, "cache_size": -65536})
+
+    def test_default_profile_keeps_sqlite_defaults(self):
+        pragmas, _ = self._effective("testing", "default", "default.db")
+        self.assertEqual(pragmas["journal_mode"], "delete")
+        self.assertEqual(pragmas["mmap_size"], 0)
+
+    def test_production_pool_uses_pre_ping(self):
+        _, pool = self._effective("production", "wal", "production.db")
+        self.assertEqual(pool.size(), 10)
+        self.assertTrue(pool._pre_ping)
+
+    def test_invalid_pragma_is_rejected(self):
+        with self.assertRaises(ValueError):
+            create_app("testing", {"SQLITE_PRAGMAS": {"journal_mode": "WAL; DROP TABLE users"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from sqlalchemy import event
+from app import create_app, db, unit_of_work as request_unit_of_work
+from app.models.amenity import Amenity
+from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.unit_of_work import transaction
+
+
+class CommitCounter:
+    """Cuenta los COMMIT enviados al motor / Counts COMMITs sent to the engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_commit(self, conn):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "commit", self._on_commit)
+
+
+class UnitOfWorkTestCase(unittest.TestCase):
+    def setUp(self):
+        """Configuración inicial antes de cada prueba"""
+        self.app = create_app("testing")
+        self.app.add_url_rule("/_probe/<int:status>", "probe", self._probe, methods=["POST"])
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.repo = SQLAlchemyRepository(Amenity, db)
+        request_unit_of_work.reset_stats()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _probe(self, status):
+        # Tres llamadas al repositorio que antes hacían un commit cada una
+        wifi = Amenity(name="WiFi")
+        self.repo.add(wifi)
+        self.repo.add(Amenity(name="Pool"))
+        self.repo.update(wifi.id, {"name": "Fast WiFi"})
+        return {"id": wifi.id}, status
+
+    def _names(self):
+        db.session.expire_all()
+        return sorted(amenity.name for amenity in self.repo.get_all())
+
+    def test_repository_calls_commit_once_per_transaction(self):
+        with CommitCounter(db.engine) as outside:
+            self.repo.add(Amenity(name="Sauna"))
+            self.repo.add(Amenity(name="Gym"))
+        self.assertEqual(outside.count, 2)
+
+        with CommitCounter(db.engine) as inside:
+            with transaction(db.session):
+                wifi = Amenity(name="WiFi")
+                self.repo.add(wifi)
+                self.repo.update(wifi.id, {"name": "Fast WiFi"})
+                self.repo.delete(wifi.id)
+                self.repo.add(Amenity(name="Pool"))
+        self.assertEqual(inside.count, 1)
+        self.assertEqual(self._names(), ["Gym", "Pool", "Sauna"])
+
+    def test_exception_rolls_back_the_whole_unit(self):
+        with self.assertRaises(RuntimeError):
+            with transaction(db.session):
+                self.repo.add(Amenity(name="WiFi"))
+                raise RuntimeError("boom")
+        self.assertEqual(self._names(), [])
+
+    def test_one_commit_per_request(self):
+        client = self.app.test_client()
+        with CommitCounter(db.engine) as commits:
+            response = client.post("/_probe/201")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(commits.count, 1)
+        self.assertEqual(self._names(), ["Fast WiFi", "Pool"])
+
+        # Una respuesta de error revierte todo lo que hizo la petición
+        client.post("/_probe/400")
+        self.assertEqual(self._names(), ["Fast WiFi", "Pool"])
+
+        stats = request_unit_of_work.stats()
+        self.assertEqual((stats["requests"], stats["commits"]), (2, 1))
+        self.assertEqual(stats["histogram"], {0: 1, 1: 1})
+
+    def test_disabled_unit_of_work_keeps_commit_per_call(self):
+        self.app.config["UNIT_OF_WORK"] = False
+        with CommitCounter(db.engine) as commits:
+            self.app.test_client().post("/_probe/201")
+        self.assertEqual(commits.count, 3)
+        self.assertEqual(request_unit_of_work.stats()["commits_per_request"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()